@@ -1,6 +1,14 @@
 from django.contrib import admin
 from django.contrib.auth import get_user_model
 
+from .models import OutboxEmail
+
 User = get_user_model()
 
 admin.site.register(User)
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ("subject", "status", "attempts", "created_at", "sent_at")
+    list_filter = ("status",)
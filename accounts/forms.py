@@ -3,8 +3,10 @@ from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth import get_user_model
 from allauth.account.forms import SignupForm as BaseSignupForm
-from django.contrib.auth.forms import AuthenticationForm
+from django.contrib.auth.forms import AuthenticationForm, PasswordResetForm
+from django.template import loader
 from .adapters import CustomAccountAdapter
+from .outbox import enqueue_email
 
 User = get_user_model()
 
@@ -376,3 +378,26 @@ class PasswordChangeForm(forms.ModelForm):
         if new_password1 != new_password2:
             raise forms.ValidationError("새 비밀번호가 일치하지 않습니다.")
         return new_password2
+
+
+class OutboxPasswordResetForm(PasswordResetForm):
+    """
+    비밀번호 찾기 메일을 바로 보내지 않고 발송 대기열에 저장
+    """
+
+    def send_mail(
+        self,
+        subject_template_name,
+        email_template_name,
+        context,
+        from_email,
+        to_email,
+        html_email_template_name=None,
+    ):
+        subject = loader.render_to_string(subject_template_name, context)
+        subject = "".join(subject.splitlines())
+        body = loader.render_to_string(email_template_name, context)
+        html_body = ""
+        if html_email_template_name is not None:
+            html_body = loader.render_to_string(html_email_template_name, context)
+        enqueue_email(subject, body, [to_email], from_email, html_body)
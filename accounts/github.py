@@ -0,0 +1,116 @@
+"""
+GitHub OAuth 클라이언트
+- 세션 하나를 재사용하여 GitHub 연결(TLS)을 매번 새로 열지 않고, 모든 요청에 timeout 설정
+- 프로필(/user)과 이메일(/user/emails)은 동시에 조회
+- 프로필(login, avatar_url)은 세션에 저장한 임의 토큰별로 이메일과 함께 서버의 캐시에 저장하며,
+  이전에 GitHub 로그인 콜백을 거친 세션은 캐시의 이메일이 GitHub의 이메일과 같으면
+  프로필을 조회하지 않음 (이메일은 항상 GitHub에서 확인하고 브라우저에는 저장하지 않음)
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
+
+
+class GitHubOAuthError(Exception):
+    pass
+
+
+def get_profile_cache_key(token):
+    return f"github:profile:{token}"
+
+
+def get_primary_email(emails):
+    """
+    인증된 기본 이메일, 없으면 첫 번째 이메일
+    """
+    for email in emails:
+        if email.get("primary") and email.get("verified"):
+            return email.get("email")
+    return emails[0].get("email") if emails else None
+
+
+class GitHubOAuthClient:
+    def __init__(self, pool_size=10):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers["Accept"] = "application/json"
+        self.executor = ThreadPoolExecutor(
+            max_workers=pool_size, thread_name_prefix="github"
+        )
+
+    def request(self, method, url, **kwargs):
+        try:
+            response = self.session.request(
+                method, url, timeout=settings.GITHUB_OAUTH_TIMEOUT, **kwargs
+            )
+            response.raise_for_status()
+            return response.json()
+        except requests.Timeout:
+            raise GitHubOAuthError("GitHub 응답 시간이 초과되었습니다.")
+        except (requests.RequestException, ValueError) as error:
+            raise GitHubOAuthError(f"GitHub 요청에 실패했습니다. ({error})")
+
+    def exchange_code(self, code, client_id, client_secret):
+        """
+        인증 코드로 access token 발급
+        """
+        token_json = self.request(
+            "POST",
+            f"{settings.GITHUB_OAUTH_URL}/login/oauth/access_token",
+            data={"client_id": client_id, "client_secret": client_secret, "code": code},
+        )
+        if token_json.get("error"):
+            raise GitHubOAuthError(token_json["error"])
+        return token_json.get("access_token")
+
+    def api_get(self, access_token, path):
+        return self.request(
+            "GET",
+            f"{settings.GITHUB_API_URL}{path}",
+            headers={"Authorization": f"token {access_token}"},
+        )
+
+    def fetch_user(self, access_token, profile_token=None):
+        """
+        이메일과 프로필 조회
+        profile_token으로 캐시한 이메일이 GitHub의 이메일과 같으면 프로필은 조회하지 않음
+        반환값: (이메일, 프로필 {"login", "avatar_url"})
+        """
+        cached = None
+        if profile_token:
+            cached = cache.get(get_profile_cache_key(profile_token))
+        profile = cached["profile"] if cached else None
+
+        emails_future = self.executor.submit(self.api_get, access_token, "/user/emails")
+        profile_future = None
+        if profile is None:
+            profile_future = self.executor.submit(self.api_get, access_token, "/user")
+
+        email = get_primary_email(emails_future.result())
+        if email is None:
+            raise GitHubOAuthError("GitHub 계정의 이메일을 확인할 수 없습니다.")
+        if profile_future is None and email.lower() != cached["email"].lower():
+            # 다른 GitHub 계정으로 로그인한 경우
+            profile_future = self.executor.submit(self.api_get, access_token, "/user")
+        if profile_future is not None:
+            profile_json = profile_future.result()
+            profile = {
+                "login": profile_json.get("login"),
+                "avatar_url": profile_json.get("avatar_url"),
+            }
+            if profile_token:
+                cache.set(
+                    get_profile_cache_key(profile_token),
+                    {"email": email, "profile": profile},
+                    settings.GITHUB_PROFILE_CACHE_TTL,
+                )
+        return email, profile
+
+
+github_client = GitHubOAuthClient()
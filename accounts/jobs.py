@@ -0,0 +1,26 @@
+import datetime
+
+from jobs.registry import register
+
+from .outbox import send_queued_emails
+from .tools import purge_unverified_accounts
+
+
+@register("expire_account", at=datetime.time(hour=1))
+def expire_account():
+    """
+    이메일 미인증 계정 만료
+    """
+    result = purge_unverified_accounts()
+    return (
+        f"{result['users']}명 삭제, {result['chunks']}개 chunk, {result['seconds']}초"
+    )
+
+
+@register("send_emails", interval=datetime.timedelta(seconds=5))
+def send_emails():
+    """
+    발송 대기 메일 발송
+    """
+    result = send_queued_emails()
+    return f"발송 {result['sent']}, 재시도 {result['retry']}, 실패 {result['failed']}"
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from accounts.tools import purge_unverified_accounts
+
+
+class Command(BaseCommand):
+    help = (
+        "이메일 인증 기간이 지난 미인증 계정을 chunk 단위로 삭제합니다. "
+        "--dry-run이면 삭제하지 않고 삭제될 객체 수만 출력합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size", type=int, default=500, help="한 트랜잭션에서 삭제할 계정 수"
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="삭제하지 않고 삭제될 객체 수만 계산"
+        )
+
+    def handle(self, *args, **options):
+        result = purge_unverified_accounts(
+            chunk_size=options["chunk_size"], dry_run=options["dry_run"]
+        )
+        prefix = "[dry-run] " if options["dry_run"] else ""
+        self.stdout.write(
+            f"{prefix}계정 {result['users']}명, chunk {result['chunks']}개, "
+            f"{result['seconds']}초"
+        )
+        for label, count in sorted(result["objects"].items()):
+            if count:
+                self.stdout.write(f"  {label}: {count}")
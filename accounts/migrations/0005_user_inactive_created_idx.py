@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-17 07:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0004_user_login_method"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                condition=models.Q(("is_active", False)),
+                fields=["created_at"],
+                name="user_inactive_created_idx",
+            ),
+        ),
+    ]
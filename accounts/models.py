@@ -43,6 +43,14 @@ class User(AbstractBaseUser, PermissionsMixin):
     class Meta:
         verbose_name = "사용자"
         verbose_name_plural = "사용자"
+        indexes = [
+            # 미인증 계정 삭제용 부분 인덱스
+            models.Index(
+                fields=["created_at"],
+                condition=models.Q(is_active=False),
+                name="user_inactive_created_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.email
@@ -86,3 +94,49 @@ class UserReport(models.Model):
     class Meta:
         verbose_name = "사용자 신고"
         verbose_name_plural = "사용자 신고"
+
+
+class OutboxEmail(models.Model):
+    """
+    발송 대기 메일 모델
+    요청 처리 중에는 저장만 하고, 작업 실행기(runjobs)의 send_emails 작업이 발송
+    """
+
+    STATUS_QUEUED = "queued"
+    STATUS_SENT = "sent"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = (
+        (STATUS_QUEUED, "대기"),
+        (STATUS_SENT, "발송 완료"),
+        (STATUS_FAILED, "발송 실패"),
+    )
+
+    subject = models.CharField(max_length=200)
+    body = models.TextField()
+    html_body = models.TextField(blank=True, default="")
+    from_email = models.CharField(max_length=200)
+    to = models.JSONField()
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField()
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "발송 대기 메일"
+        verbose_name_plural = "발송 대기 메일"
+        indexes = [
+            # 발송할 메일 조회용 부분 인덱스
+            models.Index(
+                fields=["next_attempt_at"],
+                condition=models.Q(status="queued"),
+                name="outbox_queued_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to)} ({self.status})"
@@ -0,0 +1,131 @@
+"""
+메일 발송 대기열(outbox)
+- 회원가입 인증, 비밀번호 찾기 메일은 요청 처리 중에 SMTP로 보내지 않고 OutboxEmail에 저장
+- send_queued_emails는 발송할 메일을 batch_size개씩 가져와 SMTP 연결 하나로 발송
+- 발송에 실패한 메일은 EMAIL_OUTBOX_RETRY_BACKOFF초부터 두 배씩 늘려 다시 발송하며,
+  EMAIL_OUTBOX_MAX_ATTEMPTS번 실패하면 발송 실패로 기록
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.utils import timezone
+
+from jobs.claims import claim_rows
+from jobs.runner import check_lock
+
+from .models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+# 발송 중 종료된 메일은 이 시간이 지나면 다시 발송
+SENDING_TIMEOUT = timedelta(minutes=5)
+
+
+def enqueue_email(subject, body, to, from_email=None, html_body=""):
+    """
+    메일을 발송 대기열에 저장
+    """
+    return OutboxEmail.objects.create(
+        subject=subject,
+        body=body,
+        html_body=html_body or "",
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        to=list(to),
+        next_attempt_at=timezone.now(),
+    )
+
+
+def get_retry_delay(attempts):
+    return timedelta(seconds=settings.EMAIL_OUTBOX_RETRY_BACKOFF * 2 ** (attempts - 1))
+
+
+def build_message(outbox_email, connection):
+    message = EmailMultiAlternatives(
+        outbox_email.subject,
+        outbox_email.body,
+        outbox_email.from_email,
+        outbox_email.to,
+        connection=connection,
+    )
+    if outbox_email.html_body:
+        message.attach_alternative(outbox_email.html_body, "text/html")
+    return message
+
+
+def claim_emails(batch_size, now):
+    """
+    발송할 메일을 가져오고, 발송 중 다른 작업이 가져가지 않도록 다음 발송 시각 변경
+    여러 실행기가 동시에 가져가도 한 메일은 한 곳에서만 발송 (jobs.claims)
+    """
+    return claim_rows(
+        OutboxEmail.objects.filter(
+            status=OutboxEmail.STATUS_QUEUED, next_attempt_at__lte=now
+        ).order_by("next_attempt_at", "id"),
+        batch_size,
+        now + SENDING_TIMEOUT,
+    )
+
+
+def mark_failed(outbox_email, error, now):
+    outbox_email.attempts += 1
+    outbox_email.last_error = error
+    if outbox_email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+        outbox_email.status = OutboxEmail.STATUS_FAILED
+        logger.error("메일 발송 실패: %s %s", outbox_email.id, error)
+    else:
+        outbox_email.next_attempt_at = now + get_retry_delay(outbox_email.attempts)
+
+
+def send_queued_emails(batch_size=None, now=None):
+    """
+    발송 대기 메일 발송
+    batch마다 SMTP 연결을 한 번만 열고, 발송 결과는 한 번에 저장
+    반환값: {"sent": 발송한 메일 수, "retry": 다시 발송할 메일 수, "failed": 발송 실패한 메일 수}
+    """
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    result = {"sent": 0, "retry": 0, "failed": 0}
+    while True:
+        check_lock()
+        # now를 지정하지 않으면 batch마다 현재 시각을 다시 구함
+        batch_now = now or timezone.now()
+        emails = claim_emails(batch_size, batch_now)
+        if not emails:
+            return result
+
+        connection = get_connection(fail_silently=False)
+        try:
+            connection.open()
+        except Exception as error:
+            # 연결하지 못하면 batch의 모든 메일을 다시 발송
+            for outbox_email in emails:
+                mark_failed(outbox_email, repr(error), batch_now)
+        else:
+            try:
+                for outbox_email in emails:
+                    try:
+                        build_message(outbox_email, connection).send()
+                    except Exception as error:
+                        mark_failed(outbox_email, repr(error), batch_now)
+                    else:
+                        outbox_email.attempts += 1
+                        outbox_email.status = OutboxEmail.STATUS_SENT
+                        outbox_email.sent_at = timezone.now()
+            finally:
+                connection.close()
+
+        OutboxEmail.objects.bulk_update(
+            emails,
+            ["status", "attempts", "next_attempt_at", "last_error", "sent_at"],
+        )
+        for outbox_email in emails:
+            if outbox_email.status == OutboxEmail.STATUS_SENT:
+                result["sent"] += 1
+            elif outbox_email.status == OutboxEmail.STATUS_FAILED:
+                result["failed"] += 1
+            else:
+                result["retry"] += 1
+        if len(emails) < batch_size:
+            return result
@@ -1,13 +1,33 @@
+import json
+import os
+import threading
+import time
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from unittest import mock
+
+from freezegun import freeze_time
+
+from django.core.cache import cache
+
 from django.core import mail
+from django.core.mail.backends import locmem
+from django.core.management import call_command
 from django.urls import reverse
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.utils.encoding import force_bytes
 from django.contrib.auth import get_user_model
 from django.contrib.messages import get_messages
 from django.utils.http import urlsafe_base64_encode
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.contrib.auth.tokens import default_token_generator
+from django.utils import timezone
 
+from .github import github_client
+from .models import OutboxEmail, UserBlock
+from .outbox import enqueue_email, send_queued_emails
+from .tools import purge_unverified_accounts
 
 User = get_user_model()
 
@@ -219,6 +239,9 @@ class TestAccountSignupEmail(TestCase):
             "인증 URL이 전송되었습니다. 메일을 확인해주세요.",
         )
 
+        # 요청 처리 중에는 발송하지 않고, 발송 대기열에서 발송
+        self.assertEqual(len(mail.outbox), 0)
+        send_queued_emails()
         self.assertEqual(len(mail.outbox), 1)
         self.assertEqual(mail.outbox[0].subject, "deVtail 인증 메일입니다.")
         self.assertEqual(mail.outbox[0].to, [self.email])
@@ -1244,6 +1267,7 @@ class TestPasswordReset(TestCase):
         )
         self.assertEqual(response.status_code, 302)
         self.assertRedirects(response, reverse("accounts:login"))
+        send_queued_emails()
         self.assertEqual(len(mail.outbox), 1)
         self.assertEqual(mail.outbox[0].subject, "deVtail 비밀번호 변경 메일입니다.")
         self.assertEqual(mail.outbox[0].to, [self.signup_data["email"]])
@@ -1266,3 +1290,372 @@ class TestPasswordReset(TestCase):
         print(
             "-- 비밀번호 찾기 테스트 - 이메일 전송 테스트 - 존재하지 않는 이메일 END --"
         )
+
+
+class TestPurgeUnverifiedAccounts(TestCase):
+    """
+    미인증 계정 삭제 테스트
+    """
+
+    def setUp(self):
+        self.now = timezone.now()
+        self.expired_users = [
+            User.objects.create_user(
+                email=f"expired{num}@gmail.com",
+                password="test1234!",
+                nickname=f"expired{num}",
+                is_active=False,
+            )
+            for num in range(5)
+        ]
+        User.objects.filter(id__in=[user.id for user in self.expired_users]).update(
+            created_at=self.now - timedelta(days=2)
+        )
+        self.new_user = User.objects.create_user(
+            email="new@gmail.com",
+            password="test1234!",
+            nickname="new",
+            is_active=False,
+        )
+        self.active_user = User.objects.create_user(
+            email="active@gmail.com", password="test1234!", nickname="active"
+        )
+        User.objects.filter(id=self.active_user.id).update(
+            created_at=self.now - timedelta(days=2)
+        )
+        UserBlock.objects.create(
+            blocking_user=self.active_user, blocked_user=self.expired_users[0]
+        )
+
+    def test_purge_in_chunks(self):
+        """
+        만료된 미인증 계정만 chunk 단위로 삭제
+        """
+        print("-- 미인증 계정 삭제 테스트 - chunk 단위 삭제 BEGIN --")
+        result = purge_unverified_accounts(chunk_size=2, now=self.now)
+        self.assertEqual(result["users"], 5)
+        self.assertEqual(result["chunks"], 3)
+        self.assertEqual(result["objects"]["accounts.UserBlock"], 1)
+        self.assertEqual(
+            set(User.objects.values_list("email", flat=True)),
+            {"new@gmail.com", "active@gmail.com"},
+        )
+        print("-- 미인증 계정 삭제 테스트 - chunk 단위 삭제 END --")
+
+    def test_dry_run(self):
+        """
+        dry-run은 삭제하지 않고 삭제될 객체 수만 계산
+        """
+        print("-- 미인증 계정 삭제 테스트 - dry-run BEGIN --")
+        result = purge_unverified_accounts(chunk_size=2, dry_run=True, now=self.now)
+        self.assertEqual(result["users"], 5)
+        self.assertEqual(result["objects"]["accounts.UserBlock"], 1)
+        self.assertEqual(User.objects.count(), 7)
+        self.assertEqual(UserBlock.objects.count(), 1)
+        print("-- 미인증 계정 삭제 테스트 - dry-run END --")
+
+    def test_command(self):
+        """
+        purge_unverified_accounts 명령
+        """
+        print("-- 미인증 계정 삭제 테스트 - 명령 BEGIN --")
+        out = StringIO()
+        call_command("purge_unverified_accounts", "--dry-run", stdout=out)
+        self.assertIn("[dry-run] 계정 5명", out.getvalue())
+        call_command("purge_unverified_accounts", stdout=out)
+        self.assertEqual(User.objects.count(), 2)
+        print("-- 미인증 계정 삭제 테스트 - 명령 END --")
+
+
+class CountingEmailBackend(locmem.EmailBackend):
+    """
+    SMTP 연결 횟수를 세는 테스트용 메일 backend
+    """
+
+    opened = 0
+
+    def open(self):
+        CountingEmailBackend.opened += 1
+        return super().open()
+
+
+class FailingEmailBackend(locmem.EmailBackend):
+    """
+    발송에 실패하는 테스트용 메일 backend
+    """
+
+    def send_messages(self, messages):
+        raise ConnectionError("SMTP 연결 실패")
+
+
+class TestEmailOutbox(TestCase):
+    """
+    메일 발송 대기열 테스트
+    """
+
+    @override_settings(
+        EMAIL_BACKEND="accounts.tests.CountingEmailBackend", EMAIL_OUTBOX_BATCH_SIZE=3
+    )
+    def test_send_in_batches(self):
+        """
+        batch마다 SMTP 연결을 한 번만 열고 발송 결과 기록
+        """
+        print("-- 메일 발송 대기열 테스트 - batch 발송 BEGIN --")
+        CountingEmailBackend.opened = 0
+        for num in range(5):
+            enqueue_email(f"제목 {num}", "내용", [f"test{num}@gmail.com"])
+        self.assertEqual(len(mail.outbox), 0)
+
+        result = send_queued_emails()
+        self.assertEqual(result, {"sent": 5, "retry": 0, "failed": 0})
+        self.assertEqual(CountingEmailBackend.opened, 2)
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertFalse(
+            OutboxEmail.objects.exclude(status=OutboxEmail.STATUS_SENT).exists()
+        )
+        self.assertEqual(send_queued_emails()["sent"], 0)
+        print("-- 메일 발송 대기열 테스트 - batch 발송 END --")
+
+    @override_settings(
+        EMAIL_BACKEND="accounts.tests.FailingEmailBackend",
+        EMAIL_OUTBOX_RETRY_BACKOFF=10,
+        EMAIL_OUTBOX_MAX_ATTEMPTS=3,
+    )
+    def test_retry_with_backoff(self):
+        """
+        발송에 실패하면 간격을 늘려 다시 발송하고, 최대 횟수를 넘으면 실패로 기록
+        """
+        print("-- 메일 발송 대기열 테스트 - 재발송 BEGIN --")
+        outbox_email = enqueue_email("제목", "내용", ["test@gmail.com"])
+        now = timezone.now()
+
+        self.assertEqual(send_queued_emails(now=now)["retry"], 1)
+        outbox_email.refresh_from_db()
+        self.assertEqual(outbox_email.attempts, 1)
+        self.assertEqual(outbox_email.next_attempt_at, now + timedelta(seconds=10))
+        self.assertIn("SMTP 연결 실패", outbox_email.last_error)
+
+        self.assertEqual(send_queued_emails(now=now + timedelta(seconds=9))["retry"], 0)
+        now += timedelta(seconds=10)
+        self.assertEqual(send_queued_emails(now=now)["retry"], 1)
+        outbox_email.refresh_from_db()
+        self.assertEqual(outbox_email.next_attempt_at, now + timedelta(seconds=20))
+
+        with self.assertLogs("accounts.outbox", level="ERROR"):
+            result = send_queued_emails(now=now + timedelta(seconds=20))
+        self.assertEqual(result["failed"], 1)
+        outbox_email.refresh_from_db()
+        self.assertEqual(outbox_email.status, OutboxEmail.STATUS_FAILED)
+        self.assertEqual(outbox_email.attempts, 3)
+        print("-- 메일 발송 대기열 테스트 - 재발송 END --")
+
+    @override_settings(
+        EMAIL_BACKEND="accounts.tests.FailingEmailBackend",
+        EMAIL_OUTBOX_RETRY_BACKOFF=60,
+    )
+    def test_retry_time_per_batch(self):
+        """
+        batch마다 현재 시각을 다시 구하여 다음 발송 시각 계산
+        """
+        print("-- 메일 발송 대기열 테스트 - batch별 시각 BEGIN --")
+        for num in range(2):
+            enqueue_email(f"제목 {num}", "내용", [f"test{num}@gmail.com"])
+        now = timezone.now()
+        with freeze_time(now, auto_tick_seconds=5):
+            self.assertEqual(send_queued_emails(batch_size=1)["retry"], 2)
+        self.assertEqual(
+            list(
+                OutboxEmail.objects.order_by("id").values_list(
+                    "next_attempt_at", flat=True
+                )
+            ),
+            [now + timedelta(seconds=60), now + timedelta(seconds=65)],
+        )
+        print("-- 메일 발송 대기열 테스트 - batch별 시각 END --")
+
+
+class GitHubStubHandler(BaseHTTPRequestHandler):
+    """
+    GitHub OAuth, API 응답을 흉내 내는 테스트용 HTTP 핸들러
+    """
+
+    def do_POST(self):
+        self.respond()
+
+    def do_GET(self):
+        self.respond()
+
+    def respond(self):
+        stub = self.server.stub
+        path = self.path.split("?")[0]
+        stub.requests.append(path)
+        time.sleep(stub.delay)
+        if path == "/login/oauth/access_token":
+            body = {"access_token": "token"}
+            length = int(self.headers.get("Content-Length", 0))
+            if "code=bad" in self.rfile.read(length).decode():
+                body = {"error": "bad_verification_code"}
+        elif path == "/user":
+            body = {"login": "octocat", "avatar_url": "https://example.com/a.png"}
+        elif path == "/user/emails":
+            body = [
+                {"email": "other@gmail.com", "primary": False, "verified": True},
+                {"email": stub.email, "primary": True, "verified": True},
+            ]
+        else:
+            self.send_error(404)
+            return
+        content = json.dumps(body).encode()
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+        except ConnectionError:
+            # timeout 테스트에서 클라이언트가 먼저 연결을 끊은 경우
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+class GitHubStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # 클라이언트가 연결을 끊어 생긴 오류는 출력하지 않음
+        pass
+
+
+@mock.patch.dict(
+    os.environ, {"GITHUB_CLIENT_ID": "client", "GITHUB_CLIENT_SECRET": "secret"}
+)
+class TestGitHubCallback(TestCase):
+    """
+    GitHub 로그인 콜백 테스트 (로컬 HTTP 서버를 GitHub 대신 사용)
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.server = GitHubStubServer(("127.0.0.1", 0), GitHubStubHandler)
+        self.server.stub = self
+        self.requests = []
+        self.delay = 0
+        self.email = "octocat@gmail.com"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{self.server.server_port}"
+        self.settings_override = override_settings(
+            GITHUB_OAUTH_URL=url, GITHUB_API_URL=url
+        )
+        self.settings_override.enable()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        # 연결 풀에 남은 연결을 닫은 뒤 서버 종료
+        github_client.session.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def callback(self, code="code"):
+        return self.client.get(reverse("accounts:github_callback"), {"code": code})
+
+    def test_new_user_signup_form(self):
+        """
+        가입하지 않은 이메일이면 GitHub 프로필로 채운 가입 폼 표시
+        """
+        print("-- GitHub 로그인 테스트 - 신규 가입 BEGIN --")
+        response = self.callback()
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "accounts/github_signup.html")
+        form = response.context["form"]
+        self.assertEqual(form.initial["email"], "octocat@gmail.com")
+        self.assertEqual(form.initial["nickname"], "octocat")
+        self.assertEqual(
+            sorted(self.requests),
+            ["/login/oauth/access_token", "/user", "/user/emails"],
+        )
+
+        # 가입하지 않고 다시 로그인하면 캐시한 프로필로 가입 폼 표시
+        self.requests.clear()
+        response = self.callback()
+        form = response.context["form"]
+        self.assertEqual(form.initial["nickname"], "octocat")
+        self.assertEqual(form.initial["profile_image"], "https://example.com/a.png")
+        self.assertEqual(
+            sorted(self.requests), ["/login/oauth/access_token", "/user/emails"]
+        )
+        print("-- GitHub 로그인 테스트 - 신규 가입 END --")
+
+    def test_repeat_login_skips_profile(self):
+        """
+        GitHub으로 가입한 계정은 로그인하고, 다시 로그인할 때는 프로필을 조회하지 않음
+        """
+        print("-- GitHub 로그인 테스트 - 재로그인 BEGIN --")
+        User.objects.create_user(
+            email="octocat@gmail.com",
+            password="testpassword",
+            nickname="octocat",
+            login_method=User.LOGIN_GITHUB,
+        )
+        response = self.callback()
+        self.assertRedirects(response, reverse("main:home"))
+        self.assertIn("/user", self.requests)
+        # 이메일은 브라우저에 저장하지 않고, 세션의 임의 토큰으로 서버의 캐시에서 조회
+        self.assertNotIn("github_email", response.cookies)
+        token = self.client.session["github_profile_token"]
+        self.assertNotIn("octocat", token)
+
+        # 로그아웃해도 새 세션에 토큰이 남아 있음
+        self.client.post(reverse("accounts:logout"))
+        self.assertNotIn("_auth_user_id", self.client.session)
+        self.assertEqual(self.client.session["github_profile_token"], token)
+        self.requests.clear()
+        response = self.callback()
+        self.assertRedirects(response, reverse("main:home"))
+        self.assertEqual(
+            sorted(self.requests), ["/login/oauth/access_token", "/user/emails"]
+        )
+        self.assertEqual(
+            int(self.client.session["_auth_user_id"]), User.objects.get().pk
+        )
+        print("-- GitHub 로그인 테스트 - 재로그인 END --")
+
+    def test_other_account(self):
+        """
+        캐시한 프로필의 이메일과 다른 GitHub 계정으로 로그인하면 프로필을 다시 조회
+        """
+        print("-- GitHub 로그인 테스트 - 다른 계정 BEGIN --")
+        self.callback()
+        self.email = "hubot@gmail.com"
+        self.requests.clear()
+        response = self.callback()
+        self.assertEqual(response.context["form"].initial["email"], "hubot@gmail.com")
+        self.assertIn("/user", self.requests)
+        print("-- GitHub 로그인 테스트 - 다른 계정 END --")
+
+    def test_bad_code(self):
+        """
+        잘못된 코드이면 로그인 페이지에 오류 표시
+        """
+        print("-- GitHub 로그인 테스트 - 잘못된 코드 BEGIN --")
+        response = self.callback(code="bad")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.context["error"], "잘못된 GitHub코드입니다.")
+        print("-- GitHub 로그인 테스트 - 잘못된 코드 END --")
+
+    @override_settings(GITHUB_OAUTH_TIMEOUT=0.2)
+    def test_timeout(self):
+        """
+        GitHub 응답이 늦으면 기다리지 않고 오류 표시
+        """
+        print("-- GitHub 로그인 테스트 - 응답 시간 초과 BEGIN --")
+        self.delay = 1
+        started = time.perf_counter()
+        response = self.callback()
+        self.assertLess(time.perf_counter() - started, 1)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            str(response.context["error"]), "GitHub 응답 시간이 초과되었습니다."
+        )
+        print("-- GitHub 로그인 테스트 - 응답 시간 초과 END --")
@@ -1,15 +1,79 @@
+import time
+from collections import Counter
 from datetime import timedelta
-from django.utils import timezone
+
 from django.contrib.auth import get_user_model
+from django.db import router, transaction
+from django.db.models.deletion import Collector
+from django.utils import timezone
+
+from jobs.runner import check_lock
 
+# 가입 후 이메일 인증을 하지 않은 계정을 삭제하기까지의 기간
+EXPIRE_AFTER = timedelta(days=1)
 
-def delete_expire_account():
+
+def get_expired_accounts(now=None):
+    """
+    이메일 인증 기간이 지난 미인증 계정
+    """
+    User = get_user_model()
+    expired_at = (now or timezone.now()) - EXPIRE_AFTER
+    return User.objects.filter(is_active=False, created_at__lt=expired_at)
+
+
+def collect_counts(users):
+    """
+    삭제하지 않고 함께 삭제될 모델별 객체 수 계산 (dry-run)
+    """
+    collector = Collector(using=router.db_for_write(users.model))
+    collector.collect(users)
+    counts = Counter()
+    for model, instances in collector.data.items():
+        counts[model._meta.label] += len(instances)
+    for queryset in collector.fast_deletes:
+        counts[queryset.model._meta.label] += queryset.count()
+    return counts
+
+
+def purge_unverified_accounts(chunk_size=500, dry_run=False, now=None):
     """
     이메일 인증을 하지 않은 계정 삭제
+    - 만료 조건은 SQL에서 필터링하고, chunk_size명씩 짧은 트랜잭션으로 삭제하여
+      가입이 몰려도 사용자 테이블을 오래 잠그지 않음
+    - 연결된 객체는 chunk마다 한 번에 모아서 삭제
+    - 작업 실행기가 리더 잠금을 잃으면 다음 chunk를 삭제하기 전에 중단 (jobs.runner.check_lock)
+    - dry_run이면 삭제하지 않고 삭제될 객체 수만 계산
+    반환값: {"users": 삭제한 계정 수, "objects": 모델별 삭제한 객체 수,
+            "chunks": chunk 수, "seconds": 걸린 시간}
     """
-    now = timezone.now()
+    started = time.perf_counter()
+    expired = get_expired_accounts(now).order_by("id")
+    counts = Counter()
+    chunks = 0
+    last_id = 0
+    while True:
+        check_lock()
+        # 삭제 중 인증한 계정은 제외되도록 chunk마다 만료 조건으로 다시 조회
+        user_ids = list(
+            expired.filter(id__gt=last_id).values_list("id", flat=True)[:chunk_size]
+        )
+        if not user_ids:
+            break
+        last_id = user_ids[-1]
+        chunks += 1
+        users = expired.filter(id__in=user_ids)
+        if dry_run:
+            counts.update(collect_counts(users))
+            continue
+        with transaction.atomic():
+            _, deleted = users.delete()
+        counts.update(deleted)
+
     User = get_user_model()
-    expire_users = User.objects.filter(is_active=False)
-    for user in expire_users:
-        if now - user.created_at > timedelta(days=1):
-            user.delete()
+    return {
+        "users": counts[User._meta.label],
+        "objects": dict(counts),
+        "chunks": chunks,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
@@ -1,4 +1,4 @@
-import requests
+import secrets
 import uuid, environ
 from typing import Any
 from pathlib import Path
@@ -7,7 +7,6 @@ from django.urls import reverse
 from django.contrib import messages
 from django.urls import reverse_lazy
 from django.shortcuts import redirect, render
-from django.core.mail import EmailMessage
 from django.contrib.auth import get_user_model
 from django.contrib.auth import login as auth_login
 from django.contrib.auth.views import (
@@ -26,12 +25,16 @@ from django.http import HttpRequest, HttpResponseBadRequest
 from allauth.account.views import LogoutView
 from allauth.socialaccount.views import SignupView as BaseSignupView
 
+from chats.presence import is_online
+from .github import github_client
+from .outbox import enqueue_email
 from .forms import (
     SignupForm,
     CustomLoginForm,
     AccountUpdateForm,
     AccountDeleteForm,
     PasswordChangeForm,
+    OutboxPasswordResetForm,
 )
 
 User = get_user_model()
@@ -39,6 +42,9 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 env = environ.Env(DEBUG=(bool, True))
 environ.Env.read_env(env_file="../../.env")
 
+# GitHub 프로필 캐시 키로 사용하는 임의 토큰의 세션 키 (이메일은 서버의 캐시에만 저장)
+GITHUB_PROFILE_SESSION_KEY = "github_profile_token"
+
 
 class SignupView(CreateView):
     """
@@ -72,8 +78,7 @@ class SignupView(CreateView):
             message = (
                 "인증을 완료하시려면 링크를 클릭해주세요.\n인증 URL: " + confirm_link
             )
-            email = EmailMessage(title, message, "elwl5515@gmail.com", [user.email])
-            email.send()
+            enqueue_email(title, message, [user.email], "elwl5515@gmail.com")
             messages.success(request, "인증 URL이 전송되었습니다. 메일을 확인해주세요.")
             return render(request, "accounts/signup_success.html", {"form": form})
         else:
@@ -156,10 +161,15 @@ class CustomLogoutView(LogoutView):
     def dispatch(self, request, *args, **kwargs):
         """
         로그아웃 메서드
+        다시 GitHub으로 로그인할 때 캐시한 프로필을 사용하도록 새 세션에도 프로필 토큰 유지
         """
         if not request.user.is_authenticated:
             return HttpResponseBadRequest(_("로그인되지 않은 사용자입니다."))
-        return super().dispatch(request, *args, **kwargs)
+        profile_token = request.session.get(GITHUB_PROFILE_SESSION_KEY)
+        response = super().dispatch(request, *args, **kwargs)
+        if profile_token and not request.user.is_authenticated:
+            request.session[GITHUB_PROFILE_SESSION_KEY] = profile_token
+        return response
 
 
 class ProfileView(LoginRequiredMixin, DetailView):
@@ -194,6 +204,14 @@ class ProfileView(LoginRequiredMixin, DetailView):
             return HttpResponse(_("존재하지 않는 사용자입니다."), status=404)
         return super().get(request, *args, **kwargs)
 
+    def get_context_data(self, **kwargs):
+        """
+        프로필 유저의 채팅 접속 여부를 추가하는 메서드
+        """
+        context = super().get_context_data(**kwargs)
+        context["is_online"] = is_online(self.object.id)
+        return context
+
 
 class AccountUpdateView(LoginRequiredMixin, UpdateView):
     model = User
@@ -345,6 +363,7 @@ class PasswordChangeView(LoginRequiredMixin, UpdateView):
 
 
 class PasswordResetCustomView(PasswordResetView):
+    form_class = OutboxPasswordResetForm
     template_name = "accounts/password_find.html"
     email_template_name = "registration/password_reset_email.html"
     subject_template_name = "accounts/password_reset_subject.txt"
@@ -440,6 +459,17 @@ def github_login(request):
         return redirect("accounts:login")
 
 
+def get_github_profile_token(request):
+    """
+    GitHub 프로필 캐시 키로 사용하는 세션의 임의 토큰, 없으면 생성
+    """
+    token = request.session.get(GITHUB_PROFILE_SESSION_KEY)
+    if token is None:
+        token = secrets.token_urlsafe(32)
+        request.session[GITHUB_PROFILE_SESSION_KEY] = token
+    return token
+
+
 def github_callback(request):
     try:
         if request.user.is_authenticated:
@@ -448,34 +478,10 @@ def github_callback(request):
         client_id = env("GITHUB_CLIENT_ID")
         client_secret = env("GITHUB_CLIENT_SECRET")
 
-        token_request = requests.post(
-            f"https://github.com/login/oauth/access_token?client_id={client_id}&client_secret={client_secret}&code={code}",
-            headers={"Accept": "application/json"},
-        )
-        token_json = token_request.json()
-        error = token_json.get("error", None)
-
-        if error:
-            raise Exception(error)
-
-        access_token = token_json.get("access_token")
-        profile_response = requests.get(
-            "https://api.github.com/user",
-            headers={
-                "Authorization": f"token {access_token}",
-                "Accept": "application/json",
-            },
-        )
-        email_response = requests.get(
-            "https://api.github.com/user/emails",
-            headers={
-                "Authorization": f"token {access_token}",
-                "Accept": "application/json",
-            },
+        access_token = github_client.exchange_code(code, client_id, client_secret)
+        email, profile = github_client.fetch_user(
+            access_token, profile_token=get_github_profile_token(request)
         )
-        profile_json = profile_response.json()
-        email_json = email_response.json()[0]
-        email = email_json.get("email", None)
         if User.objects.filter(email=email).exists():
             user = User.objects.get(email=email)
             if user.login_method != User.LOGIN_GITHUB:
@@ -496,17 +502,18 @@ def github_callback(request):
             signup_form = SignupForm(
                 initial={
                     "email": email,
-                    "nickname": profile_json.get("login"),
-                    "profile_image": profile_json.get("avatar_url"),
+                    "nickname": profile["login"],
+                    "profile_image": profile["avatar_url"],
                 }
             )
 
             context["form"] = signup_form
 
+            # 가입을 마치지 않고 다시 로그인하면 캐시한 프로필로 가입 폼 표시
             return render(request, "accounts/github_signup.html", context)
     except Exception as error:
         context = {}
-        if "bad_verification_code" in error:
+        if "bad_verification_code" in str(error):
             context["error"] = "잘못된 GitHub코드입니다."
         else:
             context["error"] = error
@@ -0,0 +1,99 @@
+import asyncio
+from urllib.parse import parse_qs
+
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from django.conf import settings
+from django.utils.dateparse import parse_datetime
+
+from .delivery import get_alert_group, get_replay_alerts, get_unread_count
+
+
+class AlertConsumer(AsyncJsonWebsocketConsumer):
+    """
+    알림 consumer
+    - 로그인 유저의 알림 그룹(alerts_{유저 id})에 참여하여 새 알림을 바로 전달
+    - 연결 시 ?since=커서 이후의 읽지 않은 알림을 다시 전달하며,
+      커서가 없으면 최근 읽지 않은 알림 전달
+    - 짧은 시간에 몰린 알림은 ALERT_PUSH_BATCH_MS 동안 모아서 한 프레임으로 전달하고,
+      같은 알림이 여러 번 갱신된 경우 마지막 내용만 전달
+    """
+
+    async def connect(self):
+        """
+        웹소켓 연결 시 호출되는 함수
+        로그인하지 않은 경우 연결 거부
+        """
+        self.group_name = None
+        self.user = self.scope["user"]
+        if not self.user.is_authenticated:
+            await self.close()
+            return
+
+        self.pending = {}
+        self.unread = None
+        self.cursor = ""
+        self.flush_task = None
+        self.group_name = get_alert_group(self.user.id)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+
+        alerts, unread = await database_sync_to_async(self.get_replay)(self.get_since())
+        await self.send_alerts(alerts, unread, replay=True)
+
+    async def disconnect(self, close_code):
+        """
+        사용자의 연결이 끊겼을 때 호출되는 함수
+        """
+        if self.group_name is None:
+            return
+        if self.flush_task is not None:
+            self.flush_task.cancel()
+        await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    def get_since(self):
+        """
+        쿼리 문자열의 커서, 잘못된 커서는 없는 것으로 처리
+        """
+        query = parse_qs(self.scope.get("query_string", b"").decode())
+        try:
+            return parse_datetime(query["since"][0])
+        except (KeyError, ValueError):
+            return None
+
+    def get_replay(self, since):
+        return get_replay_alerts(self.user.id, since), get_unread_count(self.user.id)
+
+    async def alert_push(self, event):
+        """
+        그룹에서 새 알림을 받았을 때 호출되는 함수
+        바로 보내지 않고 ALERT_PUSH_BATCH_MS 동안 모아서 전달
+        연결 시 다시 보낸 알림보다 이전의 알림은 전달하지 않음
+        """
+        for alert in event["alerts"]:
+            if alert["cursor"] <= self.cursor:
+                continue
+            self.pending.pop(alert["id"], None)
+            self.pending[alert["id"]] = alert
+        self.unread = event["unread"]
+        if self.flush_task is None:
+            self.flush_task = asyncio.create_task(self.flush_later())
+
+    async def flush_later(self):
+        await asyncio.sleep(settings.ALERT_PUSH_BATCH_MS / 1000)
+        self.flush_task = None
+        alerts, self.pending = list(self.pending.values()), {}
+        await self.send_alerts(alerts, self.unread)
+
+    async def send_alerts(self, alerts, unread, replay=False):
+        if alerts:
+            self.cursor = max(self.cursor, alerts[-1]["cursor"])
+        await self.send_json(
+            {
+                "type": "alerts",
+                "replay": replay,
+                "alerts": alerts,
+                "unread": unread,
+                "cursor": self.cursor or None,
+            }
+        )
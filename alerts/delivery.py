@@ -0,0 +1,304 @@
+"""
+알림 전달
+- 도메인 이벤트(DevMate 신청/수락, 스터디 가입 승인/거절, 채팅 메시지, 할 일 담당자 지정)는
+  enqueue_alerts로 예약하고, 트랜잭션이 커밋되면 유저별로 합쳐 한 번에 저장
+- 같은 유저, 같은 url의 채팅 알림은 하나로 합치며, 아직 읽지 않은 알림이 있으면
+  새로 만들지 않고 내용과 시간만 갱신
+- 읽지 않은 알림 수는 캐시한 카운터에서 조회하며, 알림 생성 시 증가, 읽음 처리 시 감소
+- 저장한 알림은 유저별 채널 그룹으로 보내 AlertConsumer가 웹소켓으로 전달
+- ALERT_QUEUE_THRESHOLD명보다 많은 유저에게 보내는 알림은 요청을 막지 않도록 AlertBatch에
+  저장하고, 작업 실행기의 deliver_alerts 작업이 batch별로 저장, 전달
+"""
+
+from collections import namedtuple
+from datetime import timedelta
+from functools import partial
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from jobs.claims import claim_rows
+from jobs.runner import check_lock
+
+from .models import Alert, AlertBatch
+
+AlertEvent = namedtuple("AlertEvent", ["user_id", "category", "content", "url"])
+
+# 같은 url의 읽지 않은 알림을 하나로 합치는 카테고리
+COALESCE_CATEGORIES = {"alert_chat"}
+
+CONTENT_MAX_LENGTH = Alert._meta.get_field("content").max_length
+
+# 전달 중 종료된 batch는 이 시간이 지나면 다시 전달
+DELIVERING_TIMEOUT = timedelta(minutes=5)
+
+
+def get_coalesce_key(event):
+    if event.category in COALESCE_CATEGORIES:
+        return (event.user_id, event.category, event.url)
+    return (event.user_id, event.category, event.url, event.content)
+
+
+def coalesce_events(events):
+    """
+    유저별로 같은 알림을 하나로 합침
+    합친 알림은 마지막 이벤트의 내용 사용
+    """
+    pending = {}
+    for event in events:
+        key = get_coalesce_key(event)
+        pending.pop(key, None)
+        pending[key] = event
+    return list(pending.values())
+
+
+def enqueue_alerts(events):
+    """
+    알림 이벤트를 모아서 저장하도록 예약
+    현재 트랜잭션이 커밋된 뒤 저장하며(롤백되면 저장하지 않음), 트랜잭션 밖에서는 바로 저장
+    ALERT_QUEUE_THRESHOLD개보다 많으면 현재 트랜잭션에서 대기열에 저장
+    """
+    events = coalesce_events(
+        event._replace(content=event.content[:CONTENT_MAX_LENGTH])
+        for event in events
+        if event.user_id is not None
+    )
+    if len(events) > settings.ALERT_QUEUE_THRESHOLD:
+        queue_alerts(events)
+    elif events:
+        transaction.on_commit(partial(deliver_alerts, events))
+
+
+def alert_users(user_ids, category, content, url=None):
+    """
+    user_ids의 유저에게 같은 알림 예약
+    """
+    enqueue_alerts(AlertEvent(user_id, category, content, url) for user_id in user_ids)
+
+
+def queue_alerts(events):
+    """
+    알림 이벤트를 ALERT_QUEUE_BATCH_SIZE개씩 나눠 대기열에 저장
+    """
+    now = timezone.now()
+    size = settings.ALERT_QUEUE_BATCH_SIZE
+    AlertBatch.objects.bulk_create(
+        AlertBatch(
+            events=[list(event) for event in events[i : i + size]], next_attempt_at=now
+        )
+        for i in range(0, len(events), size)
+    )
+
+
+def deliver_queued_alerts(batch_size=10):
+    """
+    대기열의 알림 전달
+    batch 저장과 대기열 삭제는 한 트랜잭션에서 처리하여 다시 실행해도 중복 저장하지 않음
+    반환값: 전달한 알림 이벤트 수
+    """
+    count = 0
+    while True:
+        check_lock()
+        now = timezone.now()
+        batches = claim_rows(
+            AlertBatch.objects.filter(next_attempt_at__lte=now).order_by(
+                "next_attempt_at", "id"
+            ),
+            batch_size,
+            now + DELIVERING_TIMEOUT,
+        )
+        if not batches:
+            return count
+
+        for batch in batches:
+            events = [AlertEvent(*event) for event in batch.events]
+            with transaction.atomic():
+                # 시간이 지나 다른 곳에서 다시 가져간 batch는 건너뜀
+                deleted, _ = AlertBatch.objects.filter(
+                    pk=batch.pk, next_attempt_at=batch.next_attempt_at
+                ).delete()
+                if not deleted:
+                    continue
+                alerts, _ = save_alerts(events)
+            publish_alerts(alerts)
+            count += len(events)
+
+
+def deliver_alerts(events):
+    """
+    알림 저장 후 웹소켓으로 전달
+    반환값: 새로 생성한 알림 목록
+    """
+    alerts, created = save_alerts(events)
+    publish_alerts(alerts)
+    return created
+
+
+def save_alerts(events):
+    """
+    알림 저장
+    합칠 수 있는 알림은 읽지 않은 같은 알림을 갱신하고, 나머지는 bulk_create로 저장
+    반환값: (저장한 알림 목록, 새로 생성한 알림 목록)
+    """
+    now = timezone.now()
+    coalescable = [event for event in events if event.category in COALESCE_CATEGORIES]
+    existing = {}
+    if coalescable:
+        condition = Q()
+        for event in coalescable:
+            condition |= Q(
+                user_id=event.user_id, category=event.category, url=event.url
+            )
+        for alert in Alert.objects.filter(condition, is_read=False).order_by("id"):
+            existing[(alert.user_id, alert.category, alert.url)] = alert
+
+    updated = []
+    created = []
+    for event in events:
+        alert = existing.get((event.user_id, event.category, event.url))
+        if event.category in COALESCE_CATEGORIES and alert is not None:
+            alert.content = event.content
+            alert.created_at = now
+            updated.append(alert)
+        else:
+            created.append(
+                Alert(
+                    user_id=event.user_id,
+                    category=event.category,
+                    content=event.content,
+                    url=event.url,
+                )
+            )
+
+    with transaction.atomic():
+        if updated:
+            Alert.objects.bulk_update(updated, ["content", "created_at"])
+        Alert.objects.bulk_create(created)
+
+    counts = {}
+    for alert in created:
+        counts[alert.user_id] = counts.get(alert.user_id, 0) + 1
+    for user_id, count in counts.items():
+        incr_unread_count(user_id, count)
+    return updated + created, created
+
+
+# 웹소켓 전달
+
+
+def get_alert_group(user_id):
+    return f"alerts_{user_id}"
+
+
+def get_alert_cursor(alert):
+    """
+    알림 커서
+    합친 알림은 created_at이 갱신되므로 created_at을 커서로 사용하며,
+    문자열로 비교할 수 있도록 마이크로초까지 같은 형식으로 변환
+    """
+    return alert.created_at.isoformat(timespec="microseconds")
+
+
+def serialize_alert(alert):
+    return {
+        "id": alert.id,
+        "category": alert.category,
+        "content": alert.content,
+        "url": alert.url,
+        "cursor": get_alert_cursor(alert),
+    }
+
+
+def publish_alerts(alerts):
+    """
+    유저별 채널 그룹에 알림 전달
+    유저마다 한 번만 보내며, 채널 레이어 호출은 한 번의 async_to_sync로 처리
+    """
+    user_alerts = {}
+    for alert in alerts:
+        user_alerts.setdefault(alert.user_id, []).append(serialize_alert(alert))
+    if not user_alerts:
+        return
+    messages = [
+        (
+            get_alert_group(user_id),
+            {
+                "type": "alert_push",
+                "alerts": serialized,
+                "unread": get_unread_count(user_id),
+            },
+        )
+        for user_id, serialized in user_alerts.items()
+    ]
+    async_to_sync(send_group_messages)(messages)
+
+
+async def send_group_messages(messages):
+    channel_layer = get_channel_layer()
+    for group, message in messages:
+        await channel_layer.group_send(group, message)
+
+
+def get_replay_alerts(user_id, since=None):
+    """
+    웹소켓 연결 시 다시 보낼 읽지 않은 알림
+    since 이후에 생성(갱신)된 알림 중 최근 ALERT_REPLAY_LIMIT개를 오래된 순으로 반환
+    """
+    alerts = Alert.objects.filter(user_id=user_id, is_read=False)
+    if since is not None:
+        alerts = alerts.filter(created_at__gt=since)
+    alerts = list(alerts.order_by("-created_at", "-id")[: settings.ALERT_REPLAY_LIMIT])
+    alerts.reverse()
+    return [serialize_alert(alert) for alert in alerts]
+
+
+# 읽지 않은 알림 수 카운터
+
+
+def get_unread_count_key(user_id):
+    return f"alerts:unread:{user_id}"
+
+
+def get_unread_count(user_id):
+    """
+    읽지 않은 알림 수
+    캐시에 없는 경우에만 COUNT 쿼리 실행
+    """
+    key = get_unread_count_key(user_id)
+    count = cache.get(key)
+    if count is None:
+        count = Alert.objects.filter(user_id=user_id, is_read=False).count()
+        cache.add(key, count, settings.ALERT_UNREAD_COUNT_TTL)
+        count = cache.get(key, count)
+    return count
+
+
+def incr_unread_count(user_id, delta=1):
+    """
+    캐시된 카운터 증가 (delta가 음수이면 감소)
+    캐시에 없으면 다음 조회 시 COUNT로 다시 계산
+    """
+    try:
+        cache.incr(get_unread_count_key(user_id), delta)
+    except ValueError:
+        pass
+
+
+def mark_read(user_id, alert_ids=None):
+    """
+    알림 읽음 처리
+    alert_ids가 없으면 유저의 모든 알림 읽음 처리
+    반환값: 읽음 처리한 알림 수
+    """
+    alerts = Alert.objects.filter(user_id=user_id, is_read=False)
+    if alert_ids is not None:
+        alerts = alerts.filter(id__in=alert_ids)
+    count = alerts.update(is_read=True)
+    if count:
+        incr_unread_count(user_id, -count)
+    return count
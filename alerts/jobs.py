@@ -0,0 +1,14 @@
+import datetime
+
+from jobs.registry import register
+
+from .delivery import deliver_queued_alerts
+
+
+@register("deliver_alerts", interval=datetime.timedelta(seconds=5))
+def deliver_alerts():
+    """
+    전달 대기 알림 전달
+    """
+    count = deliver_queued_alerts()
+    return f"{count}개 알림 전달"
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.7 on 2026-10-17 05:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("alerts", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="alert",
+            index=models.Index(
+                fields=["user", "is_read", "-created_at"], name="alert_user_read_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="alert",
+            index=models.Index(
+                condition=models.Q(("is_read", False)),
+                fields=["user", "-created_at"],
+                name="alert_user_unread_idx",
+            ),
+        ),
+    ]
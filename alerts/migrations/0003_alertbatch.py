@@ -0,0 +1,39 @@
+# Generated by Django 4.2.7 on 2026-10-17 08:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("alerts", "0002_alert_alert_user_read_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AlertBatch",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("events", models.JSONField()),
+                ("next_attempt_at", models.DateTimeField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "전달 대기 알림",
+                "verbose_name_plural": "전달 대기 알림",
+                "indexes": [
+                    models.Index(
+                        fields=["next_attempt_at"], name="alert_batch_attempt_idx"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -26,3 +26,34 @@ class Alert(models.Model):
     class Meta:
         verbose_name = "알림"
         verbose_name_plural = "알림"
+        indexes = [
+            models.Index(
+                fields=["user", "is_read", "-created_at"], name="alert_user_read_idx"
+            ),
+            # 읽지 않은 알림 조회용 부분 인덱스
+            models.Index(
+                fields=["user", "-created_at"],
+                condition=models.Q(is_read=False),
+                name="alert_user_unread_idx",
+            ),
+        ]
+
+
+class AlertBatch(models.Model):
+    """
+    전달 대기 알림 모델
+    한 번에 많은 유저에게 보내는 알림은 요청 처리 중에는 저장만 하고,
+    작업 실행기(runjobs)의 deliver_alerts 작업이 전달
+    - events: [유저 id, 카테고리, 내용, url] 목록
+    """
+
+    events = models.JSONField()
+    next_attempt_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "전달 대기 알림"
+        verbose_name_plural = "전달 대기 알림"
+        indexes = [
+            models.Index(fields=["next_attempt_at"], name="alert_batch_attempt_idx"),
+        ]
@@ -1,3 +1,334 @@
-from django.test import TestCase
+from urllib.parse import quote
 
-# Create your tests here.
+from channels.db import database_sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from chats.buffer import save_messages
+from chats.models import DirectChat
+from deVtail.asgi import application
+from .delivery import (
+    AlertEvent,
+    alert_users,
+    coalesce_events,
+    deliver_alerts,
+    deliver_queued_alerts,
+    enqueue_alerts,
+    get_alert_cursor,
+    get_unread_count,
+    mark_read,
+)
+from .models import Alert, AlertBatch
+
+User = get_user_model()
+
+
+class TestAlertDelivery(TestCase):
+    """
+    알림 전달 테스트
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user1 = User.objects.create_user(
+            email="test1@naver.com", password="test1", nickname="test1"
+        )
+        self.user2 = User.objects.create_user(
+            email="test2@naver.com", password="test2", nickname="test2"
+        )
+
+    def test_coalesce_events(self):
+        """
+        같은 채팅방의 채팅 알림은 마지막 알림 하나로 합침
+        """
+        events = coalesce_events(
+            [
+                AlertEvent(self.user1.id, "alert_chat", "첫 번째", "/chat/1/"),
+                AlertEvent(self.user1.id, "alert_chat", "두 번째", "/chat/1/"),
+                AlertEvent(self.user2.id, "alert_chat", "세 번째", "/chat/1/"),
+                AlertEvent(self.user1.id, "alert_todo", "할 일", "/todo/1/"),
+            ]
+        )
+        self.assertEqual(len(events), 3)
+        self.assertIn(
+            AlertEvent(self.user1.id, "alert_chat", "두 번째", "/chat/1/"), events
+        )
+
+    def test_deliver_on_commit(self):
+        """
+        트랜잭션이 커밋된 뒤 한 번에 저장
+        """
+        with self.captureOnCommitCallbacks() as callbacks:
+            alert_users([self.user1.id, self.user2.id], "alert_other", "알림")
+        self.assertEqual(Alert.objects.count(), 0)
+
+        with CaptureQueriesContext(connection) as queries:
+            for callback in callbacks:
+                callback()
+        inserts = [query for query in queries if query["sql"].startswith("INSERT")]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(Alert.objects.filter(content="알림").count(), 2)
+
+    @override_settings(ALERT_QUEUE_THRESHOLD=1, ALERT_QUEUE_BATCH_SIZE=1)
+    def test_queue_large_fan_out(self):
+        """
+        많은 유저에게 보내는 알림은 요청 처리 중에 저장하지 않고 대기열에 저장
+        """
+        with self.captureOnCommitCallbacks() as callbacks:
+            alert_users([self.user1.id, self.user2.id], "alert_other", "알림")
+        self.assertEqual(callbacks, [])
+        self.assertEqual(AlertBatch.objects.count(), 2)
+        self.assertEqual(Alert.objects.count(), 0)
+
+        self.assertEqual(deliver_queued_alerts(), 2)
+        self.assertEqual(deliver_queued_alerts(), 0)
+        self.assertFalse(AlertBatch.objects.exists())
+        self.assertEqual(
+            set(Alert.objects.values_list("user_id", "content")),
+            {(self.user1.id, "알림"), (self.user2.id, "알림")},
+        )
+        self.assertEqual(get_unread_count(self.user2.id), 1)
+
+    def test_chat_alert_updates_unread_alert(self):
+        """
+        읽지 않은 같은 채팅 알림이 있으면 새로 만들지 않고 갱신
+        """
+        for content in ["첫 번째", "두 번째"]:
+            with self.captureOnCommitCallbacks(execute=True):
+                enqueue_alerts(
+                    [AlertEvent(self.user1.id, "alert_chat", content, "/chat/1/")]
+                )
+        alerts = Alert.objects.filter(user=self.user1)
+        self.assertEqual(alerts.count(), 1)
+        self.assertEqual(alerts.get().content, "두 번째")
+
+    def test_unread_count_cache(self):
+        """
+        읽지 않은 알림 수는 캐시한 카운터에서 조회
+        """
+        self.assertEqual(get_unread_count(self.user1.id), 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            alert_users([self.user1.id], "alert_other", "알림 1")
+            alert_users([self.user1.id], "alert_other", "알림 2")
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_unread_count(self.user1.id), 2)
+
+        mark_read(self.user1.id, [Alert.objects.filter(user=self.user1).first().id])
+        with self.assertNumQueries(0):
+            self.assertEqual(get_unread_count(self.user1.id), 1)
+
+        mark_read(self.user1.id)
+        self.assertEqual(get_unread_count(self.user1.id), 0)
+        self.assertFalse(Alert.objects.filter(is_read=False).exists())
+
+    def test_new_chat_message_alert(self):
+        """
+        새 채팅 메시지는 보낸 유저를 제외한 채팅방 유저에게 채팅방별로 하나만 알림
+        """
+        chat_room = DirectChat.objects.create()
+        chat_room.users.add(self.user1, self.user2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            save_messages(
+                [
+                    {
+                        "message": f"메시지 {num}",
+                        "author_id": self.user1.id,
+                        "direct_chat_id": chat_room.id,
+                        "sequence": num,
+                    }
+                    for num in range(1, 6)
+                ]
+            )
+
+        self.assertFalse(Alert.objects.filter(user=self.user1).exists())
+        alert = Alert.objects.get(user=self.user2)
+        self.assertEqual(alert.category, "alert_chat")
+        self.assertEqual(alert.content, "test1님이 메시지를 보냈습니다.")
+        self.assertEqual(
+            alert.url, reverse("chats:connect_direct_chat", args=[chat_room.id])
+        )
+
+        # 알림 링크로 채팅방에 입장 (채팅방 유저만 가능)
+        self.client.force_login(self.user2)
+        self.assertEqual(self.client.get(alert.url).status_code, 200)
+        outsider = User.objects.create_user(
+            email="test3@naver.com", password="test3", nickname="test3"
+        )
+        self.client.force_login(outsider)
+        self.assertEqual(self.client.get(alert.url).status_code, 404)
+
+
+class TestAlertView(TestCase):
+    """
+    알림 view 테스트
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user1 = User.objects.create_user(
+            email="test1@naver.com", password="test1", nickname="test1"
+        )
+        self.user2 = User.objects.create_user(
+            email="test2@naver.com", password="test2", nickname="test2"
+        )
+        self.alert = Alert.objects.create(
+            user=self.user1, category="alert_other", content="알림", url="/"
+        )
+
+    def test_alert_list(self):
+        """
+        로그인 후 알림 목록 조회
+        """
+        self.client.force_login(self.user1)
+        response = self.client.get(reverse("alerts:alert_list"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context["alerts"]), [self.alert])
+
+    def test_alert_list_without_login(self):
+        """
+        로그인 하지 않고 알림 목록 조회
+        """
+        response = self.client.get(reverse("alerts:alert_list"))
+        self.assertEqual(response.status_code, 302)
+
+    def test_unread_count(self):
+        """
+        읽지 않은 알림 수 조회
+        """
+        self.client.force_login(self.user1)
+        response = self.client.get(reverse("alerts:unread_count"))
+        self.assertEqual(response.json(), {"unread": 1})
+
+    def test_read_alert(self):
+        """
+        알림 읽음 처리 후 알림의 url로 이동
+        다른 유저의 알림은 읽음 처리할 수 없음
+        """
+        self.client.force_login(self.user2)
+        response = self.client.post(reverse("alerts:read_alert", args=[self.alert.id]))
+        self.assertEqual(response.status_code, 404)
+
+        self.client.force_login(self.user1)
+        response = self.client.post(reverse("alerts:read_alert", args=[self.alert.id]))
+        self.assertRedirects(response, "/", fetch_redirect_response=False)
+        self.alert.refresh_from_db()
+        self.assertTrue(self.alert.is_read)
+
+    def test_devmate_create_alert(self):
+        """
+        DevMate 신청 시 신청받은 유저에게 알림
+        """
+        self.client.force_login(self.user2)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("devmates:devmate_create", kwargs={"pk": self.user1.id})
+            )
+        alert = Alert.objects.get(user=self.user1, category="alert_devmate")
+        self.assertEqual(alert.content, "test2님이 DevMate를 신청했습니다.")
+        self.assertEqual(alert.url, reverse("devmates:devmate_received_list"))
+
+
+@override_settings(ALERT_PUSH_BATCH_MS=500)
+class TestAlertConsumer(TestCase):
+    """
+    알림 consumer 테스트
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user1 = User.objects.create_user(
+            email="test1@naver.com", password="test1", nickname="test1"
+        )
+        self.user2 = User.objects.create_user(
+            email="test2@naver.com", password="test2", nickname="test2"
+        )
+        client = Client()
+        client.force_login(self.user1)
+        self.session_key = client.cookies["sessionid"].value
+
+    def get_communicator(self, path="/ws/alerts/", login=True):
+        headers = []
+        if login:
+            headers.append((b"cookie", f"sessionid={self.session_key}".encode()))
+        return WebsocketCommunicator(application, path, headers=headers)
+
+    async def connect(self, communicator):
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        return await communicator.receive_json_from()
+
+    async def test_connect_without_login(self):
+        """
+        로그인하지 않은 경우 연결 거부
+        """
+        connected, _ = await self.get_communicator(login=False).connect()
+        self.assertFalse(connected)
+
+    async def test_replay_since_cursor(self):
+        """
+        연결 시 커서 이후의 읽지 않은 알림만 다시 전달
+        """
+        alerts = []
+        for num in range(3):
+            alerts.append(
+                await database_sync_to_async(Alert.objects.create)(
+                    user=self.user1, category="alert_other", content=f"알림 {num}"
+                )
+            )
+        await database_sync_to_async(Alert.objects.create)(
+            user=self.user1, category="alert_other", content="읽은 알림", is_read=True
+        )
+
+        communicator = self.get_communicator(
+            f"/ws/alerts/?since={quote(get_alert_cursor(alerts[0]))}"
+        )
+        frame = await self.connect(communicator)
+        self.assertTrue(frame["replay"])
+        self.assertEqual(
+            [alert["content"] for alert in frame["alerts"]], ["알림 1", "알림 2"]
+        )
+        self.assertEqual(frame["unread"], 3)
+        self.assertEqual(frame["cursor"], get_alert_cursor(alerts[2]))
+        await communicator.disconnect()
+
+    async def test_burst_in_one_frame(self):
+        """
+        짧은 시간에 몰린 알림은 한 프레임으로 전달
+        같은 채팅방의 알림은 마지막 내용만 전달
+        """
+        communicator = self.get_communicator()
+        frame = await self.connect(communicator)
+        self.assertEqual(frame["alerts"], [])
+
+        for num in range(30):
+            await database_sync_to_async(deliver_alerts)(
+                [
+                    AlertEvent(
+                        self.user1.id,
+                        "alert_chat",
+                        f"메시지 {num}",
+                        f"/chat/{num % 3}/",
+                    )
+                ]
+            )
+        # 다른 유저의 알림은 전달하지 않음
+        await database_sync_to_async(deliver_alerts)(
+            [AlertEvent(self.user2.id, "alert_chat", "다른 유저", "/chat/0/")]
+        )
+
+        frame = await communicator.receive_json_from(timeout=3)
+        self.assertFalse(frame["replay"])
+        self.assertEqual(
+            [alert["content"] for alert in frame["alerts"]],
+            ["메시지 27", "메시지 28", "메시지 29"],
+        )
+        self.assertEqual(frame["unread"], 3)
+        self.assertTrue(await communicator.receive_nothing(timeout=0.6))
+        await communicator.disconnect()
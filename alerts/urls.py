@@ -1,5 +1,12 @@
-from django.urls import path, include
+from django.urls import path
+
 from . import views
 
+app_name = "alerts"
+
 urlpatterns = [
-]
\ No newline at end of file
+    path("", views.AlertListView.as_view(), name="alert_list"),
+    path("unread-count/", views.unread_count, name="unread_count"),
+    path("<int:pk>/read/", views.read_alert, name="read_alert"),
+    path("read-all/", views.read_all_alerts, name="read_all_alerts"),
+]
@@ -1,3 +1,56 @@
-from django.shortcuts import render
+from django.contrib.auth.decorators import login_required
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404, redirect
+from django.views.decorators.http import require_POST
+from django.views.generic import ListView
 
-# Create your views here.
+from main.pagination import CursorPaginationMixin
+from .delivery import get_unread_count, mark_read
+from .models import Alert
+
+
+class AlertListView(LoginRequiredMixin, CursorPaginationMixin, ListView):
+    """
+    알림 목록
+    Detail:
+        로그인한 유저의 알림을 최신순으로 커서 페이지네이션
+    """
+
+    template_name = "alerts/alert_list.html"
+    context_object_name = "alerts"
+    paginate_by = 20
+    cursor_ordering = ("-created_at", "-id")
+
+    def get_queryset(self):
+        return Alert.objects.filter(user=self.request.user)
+
+
+@login_required
+def unread_count(request):
+    """
+    읽지 않은 알림 수 조회
+    매 요청마다 COUNT 쿼리를 실행하지 않도록 캐시한 카운터 사용
+    """
+    return JsonResponse({"unread": get_unread_count(request.user.id)})
+
+
+@login_required
+@require_POST
+def read_alert(request, pk):
+    """
+    알림 읽음 처리 후 알림의 url로 이동
+    """
+    alert = get_object_or_404(Alert, pk=pk, user=request.user)
+    mark_read(request.user.id, [alert.id])
+    return redirect(alert.url or "alerts:alert_list")
+
+
+@login_required
+@require_POST
+def read_all_alerts(request):
+    """
+    모든 알림 읽음 처리
+    """
+    mark_read(request.user.id)
+    return redirect("alerts:alert_list")
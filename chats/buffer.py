@@ -0,0 +1,391 @@
+import asyncio
+import atexit
+import itertools
+import json
+import logging
+import os
+import uuid
+from collections import defaultdict
+from pathlib import Path
+
+from channels.db import database_sync_to_async
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Max
+
+from .models import ChatMessage
+from .notifications import notify_new_messages
+
+ROOM_FIELDS = ("direct_chat_id", "study_chat_id")
+
+logger = logging.getLogger(__name__)
+
+# 이 프로세스에서 실행 중인 버퍼의 spool 파일 이름 앞부분
+live_spool_prefixes = set()
+
+
+class ChatMessageBuffer:
+    """
+    채팅 메시지 write-behind 버퍼
+    - 메시지는 add() 시 방별 순번(sequence)을 발급받아 바로 브로드캐스트하고,
+      DB 저장은 batch_size개 또는 flush_interval_ms마다 bulk_create로 모아서 처리
+    - 저장 전 메시지는 spool 파일에 한 줄씩 기록하며, 프로세스가 비정상 종료되면
+      다음 실행 시 첫 메시지를 기록하기 전에 recover()에서 spool 파일의 메시지를 저장
+    - spool 파일 이름은 "pid-실행별 id-번호"로, 컨테이너가 재시작되어 같은 pid로 실행되어도
+      이전 실행의 파일과 구분
+    - 방별 순번은 프로세스 메모리에서 발급하며, 채널 레이어가 sequences 확장을 제공하면
+      여러 채팅 프로세스가 공유하는 레이어에서 브로드캐스트 전에 원자적으로 발급
+      (여러 채팅 프로세스를 실행하려면 sequences 확장을 제공하는 레이어가 필요)
+    - 다른 프로세스의 버퍼에 있는 메시지는 그 프로세스가 저장하기 전까지(최대 flush_interval_ms)
+      대화 조회에 포함되지 않음
+    """
+
+    def __init__(self, batch_size=None, flush_interval_ms=None, spool_dir=None):
+        self._batch_size = batch_size
+        self._flush_interval_ms = flush_interval_ms
+        self._spool_dir = spool_dir
+        self.pending = []
+        self.sequences = {}
+        self.loading_sequences = {}
+        self.spool_file = None
+        self.spool_segments = []
+        self.segment_counter = itertools.count()
+        self._spool_prefix = None
+        self.flush_task = None
+        self.flush_lock = None
+        self.recovery = None
+
+    @property
+    def batch_size(self):
+        return self._batch_size or settings.CHAT_MESSAGE_BATCH_SIZE
+
+    @property
+    def flush_interval(self):
+        return (
+            self._flush_interval_ms or settings.CHAT_MESSAGE_FLUSH_INTERVAL_MS
+        ) / 1000
+
+    @property
+    def spool_dir(self):
+        return Path(self._spool_dir or settings.CHAT_MESSAGE_SPOOL_DIR)
+
+    @property
+    def spool_prefix(self):
+        """
+        spool 파일 이름 앞부분 (pid-실행별 id), fork된 프로세스에서는 새로 생성
+        """
+        pid = os.getpid()
+        if self._spool_prefix is None or not self._spool_prefix.startswith(f"{pid}-"):
+            live_spool_prefixes.discard(self._spool_prefix)
+            self._spool_prefix = f"{pid}-{uuid.uuid4().hex[:12]}"
+            live_spool_prefixes.add(self._spool_prefix)
+        return self._spool_prefix
+
+    def get_room(self, **room):
+        """
+        direct_chat_id 또는 study_chat_id로 방 키 생성
+        """
+        field, room_id = next(
+            (field, room[field]) for field in ROOM_FIELDS if room.get(field)
+        )
+        return (field, room_id)
+
+    async def add(self, message, author_id, **room):
+        """
+        메시지를 버퍼에 추가하고 발급한 방별 순번 반환
+        """
+        await self.recover()
+        field, room_id = self.get_room(**room)
+        sequence = await self.next_sequence(field, room_id)
+        data = {
+            "message": message,
+            "author_id": author_id,
+            field: room_id,
+            "sequence": sequence,
+        }
+        self.write_spool(data)
+        self.pending.append(data)
+
+        if len(self.pending) >= self.batch_size:
+            await self.flush()
+        elif not self.is_flush_scheduled():
+            self.flush_task = asyncio.create_task(self.flush_later())
+        return sequence
+
+    async def next_sequence(self, field, room_id):
+        """
+        방별 순번 발급
+        처음 메시지를 받은 방은 DB에 저장된 마지막 순번부터 시작
+        """
+        key = (field, room_id)
+        if key not in self.sequences:
+            # DB 조회 중 같은 방에 도착한 메시지도 도착 순서대로 순번을 발급받도록
+            # 조회는 한 번만 실행하고 함께 기다림
+            if key not in self.loading_sequences:
+                self.loading_sequences[key] = asyncio.ensure_future(
+                    database_sync_to_async(get_last_sequence)(field, room_id)
+                )
+            last_sequence = await self.loading_sequences[key]
+            self.loading_sequences.pop(key, None)
+            self.sequences.setdefault(key, last_sequence)
+
+        channel_layer = get_channel_layer()
+        if "sequences" in getattr(channel_layer, "extensions", []):
+            self.sequences[key] = await channel_layer.sequence_next(
+                "chat_sequence.%s.%s" % key, self.sequences[key]
+            )
+        else:
+            self.sequences[key] += 1
+        return self.sequences[key]
+
+    def is_flush_scheduled(self):
+        return (
+            self.flush_task is not None
+            and not self.flush_task.done()
+            and self.flush_task.get_loop() is asyncio.get_running_loop()
+        )
+
+    def cancel_flush_task(self):
+        task, self.flush_task = self.flush_task, None
+        if (
+            task is not None
+            and task is not asyncio.current_task()
+            and not task.get_loop().is_closed()
+        ):
+            task.cancel()
+
+    async def flush_later(self):
+        await asyncio.sleep(self.flush_interval)
+        # 저장 중에는 다른 flush()에서 취소하지 않도록 예약 해제
+        if self.flush_task is asyncio.current_task():
+            self.flush_task = None
+        try:
+            await self.flush()
+        except Exception:
+            # 메시지는 버퍼와 spool 파일에 남아 있으므로 다음 flush에서 다시 저장
+            logger.exception("채팅 메시지 저장 실패")
+
+    def get_flush_lock(self):
+        """
+        이벤트 루프별 flush 잠금
+        """
+        loop = asyncio.get_running_loop()
+        if self.flush_lock is None or self.flush_lock[0] is not loop:
+            self.flush_lock = (loop, asyncio.Lock())
+        return self.flush_lock[1]
+
+    async def flush(self):
+        """
+        버퍼의 메시지를 저장하고, 저장한 메시지의 spool 파일 삭제
+        저장에 실패한 경우 메시지와 spool 파일을 유지하고 다음 flush에서 다시 저장
+        다른 flush()가 저장 중이면 끝날 때까지 기다리므로, flush()가 끝나면 호출 전에
+        추가된 메시지는 모두 저장되어 있음 (대화 조회 전에 호출)
+        """
+        self.cancel_flush_task()
+
+        async with self.get_flush_lock():
+            messages, self.pending = self.pending, []
+            segments = self.rotate_spool()
+            if not messages:
+                remove_files(segments)
+                return
+
+            try:
+                conflicts = await database_sync_to_async(save_messages)(messages)
+            except Exception:
+                self.pending = messages + self.pending
+                self.spool_segments = segments + self.spool_segments
+                raise
+            remove_files(segments)
+            # 순번이 겹친 방은 다음 메시지에서 DB의 마지막 순번을 다시 조회하여
+            # 저장된 순번 뒤부터 발급
+            for key in conflicts:
+                self.sequences.pop(key, None)
+
+    def flush_sync(self):
+        """
+        프로세스 종료 시 남은 메시지 저장
+        """
+        messages, self.pending = self.pending, []
+        segments = self.rotate_spool()
+        if messages:
+            save_messages(messages)
+        remove_files(segments)
+
+    async def recover(self):
+        """
+        이전 프로세스가 저장하지 못한 spool 파일의 메시지 저장
+        복구 중 도착한 메시지도 복구가 끝난 뒤 순번을 발급받고 spool 파일에 기록
+        """
+        if self.recovery is None:
+            self.recovery = asyncio.ensure_future(
+                database_sync_to_async(recover_spool)(self.spool_dir)
+            )
+        try:
+            await self.recovery
+        except Exception:
+            # 다음 메시지에서 다시 복구
+            self.recovery = None
+            raise
+
+    def write_spool(self, data):
+        """
+        메시지를 spool 파일에 기록
+        flush()로 운영체제에 기록하므로 프로세스가 종료되어도 유지됨
+        """
+        if self.spool_file is None:
+            self.spool_dir.mkdir(parents=True, exist_ok=True)
+            path = (
+                self.spool_dir
+                / f"{self.spool_prefix}-{next(self.segment_counter)}.jsonl"
+            )
+            self.spool_file = open(path, "a", encoding="utf-8")
+            self.spool_segments.append(path)
+        self.spool_file.write(json.dumps(data, ensure_ascii=False) + "\n")
+        self.spool_file.flush()
+
+    def rotate_spool(self):
+        """
+        현재 spool 파일을 닫고, 지금까지 기록한 spool 파일 목록 반환
+        이후 메시지는 새 spool 파일에 기록
+        """
+        if self.spool_file is not None:
+            self.spool_file.close()
+            self.spool_file = None
+        segments, self.spool_segments = self.spool_segments, []
+        return segments
+
+
+def get_last_sequence(field, room_id):
+    return (
+        ChatMessage.objects.filter(**{field: room_id}).aggregate(Max("sequence"))[
+            "sequence__max"
+        ]
+        or 0
+    )
+
+
+def save_messages(messages):
+    """
+    메시지를 한 번의 쿼리로 저장하고 새 메시지 알림 예약
+    이미 저장된 (방, 순번)이 있으면 save_conflicting_messages()로 다시 저장
+    반환값: 다른 메시지와 순번이 겹친 방 키 목록
+    """
+    conflicts = set()
+    try:
+        with transaction.atomic():
+            ChatMessage.objects.bulk_create([ChatMessage(**data) for data in messages])
+    except IntegrityError:
+        messages, conflicts = save_conflicting_messages(messages)
+    notify_new_messages(messages)
+    return conflicts
+
+
+def save_conflicting_messages(messages):
+    """
+    이미 저장된 (방, 순번)과 겹치는 메시지 저장
+    메시지는 발급한 순번으로 이미 브로드캐스트되어 클라이언트가 순번으로 중복을 거르므로
+    순번을 바꾸지 않고, (방, 순번)이 겹치는 메시지는 저장하지 않음
+    - 같은 메시지가 저장되어 있으면(spool 파일을 다시 복구한 경우) 이미 저장된 메시지
+    - 다른 메시지가 저장되어 있으면(순번 카운터가 유실되어 같은 순번을 다시 발급한 경우)
+      먼저 저장된 메시지를 유지하고 에러 로그를 남김
+    반환값: (새로 저장한 메시지, 다른 메시지와 순번이 겹친 방 키 목록)
+    """
+    rooms = defaultdict(list)
+    for data in messages:
+        field = next(field for field in ROOM_FIELDS if data.get(field))
+        rooms[(field, data[field])].append(data)
+
+    saved = []
+    conflicts = set()
+    with transaction.atomic():
+        for (field, room_id), room_messages in rooms.items():
+            stored = {
+                sequence: (author_id, message)
+                for sequence, author_id, message in ChatMessage.objects.filter(
+                    **{field: room_id},
+                    sequence__in=[data["sequence"] for data in room_messages],
+                ).values_list("sequence", "author_id", "message")
+            }
+            for data in room_messages:
+                saved_message = stored.get(data["sequence"])
+                if saved_message is None:
+                    stored[data["sequence"]] = (data["author_id"], data["message"])
+                    saved.append(data)
+                elif saved_message != (data["author_id"], data["message"]):
+                    conflicts.add((field, room_id))
+                    logger.error(
+                        "채팅방 %s=%s 순번 %s 중복, 먼저 저장된 메시지를 유지",
+                        field,
+                        room_id,
+                        data["sequence"],
+                    )
+        # 확인 후 다른 프로세스가 먼저 저장한 메시지도 무시
+        ChatMessage.objects.bulk_create(
+            [ChatMessage(**data) for data in saved], ignore_conflicts=True
+        )
+    return saved, conflicts
+
+
+def remove_files(paths):
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def is_running(pid):
+    """
+    spool 파일을 기록한 프로세스가 실행 중인지 확인
+    """
+    if pid == os.getpid():
+        # 같은 pid로 재시작한 경우 이전 실행의 파일 (이 프로세스의 파일은 is_live_spool에서 확인)
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def is_live_spool(path):
+    """
+    실행 중인 버퍼가 기록 중인 spool 파일인지 확인
+    """
+    prefix = path.name.rsplit("-", 1)[0]
+    if prefix in live_spool_prefixes:
+        return True
+    return is_running(int(path.name.split("-")[0]))
+
+
+def recover_spool(spool_dir):
+    """
+    spool 디렉터리에 남은 메시지를 저장하고 저장한 파일 삭제
+    반환값: 저장을 시도한 메시지 수
+    """
+    paths = [
+        path
+        for path in sorted(Path(spool_dir).glob("*.jsonl"))
+        if not is_live_spool(path)
+    ]
+    messages = []
+    for path in paths:
+        with open(path, encoding="utf-8") as spool_file:
+            for line in spool_file:
+                try:
+                    messages.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # 기록 중 종료되어 잘린 마지막 줄
+                    continue
+    if messages:
+        save_messages(messages)
+    remove_files(paths)
+    return len(messages)
+
+
+message_buffer = ChatMessageBuffer()
+atexit.register(message_buffer.flush_sync)
@@ -1,278 +1,310 @@
-import json
-from channels.layers import get_channel_layer
-from channels.generic.websocket import JsonWebsocketConsumer
-from asgiref.sync import async_to_sync
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.contrib.sessions.models import Session
 
-from .models import DirectChat
+from studies.models import StudyMember
+
+from . import presence
+from .buffer import message_buffer
+from .history import HISTORY_PAGE_SIZE, get_history
+from .middleware import TTLCache
+from .models import DirectChat, StudyChat
 from .models import ChatMessage
 
 User = get_user_model()
 
+# (스터디 id, 유저 id) -> 승인된 스터디 멤버 여부
+study_member_cache = TTLCache(settings.CHAT_STUDY_MEMBER_CACHE_TTL)
+
 
-class OnlineUserManager:
+def is_study_member(study_id, user_id):
     """
-    현재 접속자 관리자
+    승인된 스터디 멤버인지 확인
+    재연결이 몰려도 같은 유저는 캐시 만료 시간마다 한 번만 조회하며,
+    StudyMember가 변경되면 signals에서 캐시 삭제
     """
+    key = (study_id, user_id)
+    is_member = study_member_cache.get(key)
+    if is_member is None:
+        is_member = StudyMember.objects.filter(
+            study_id=study_id, user_id=user_id, is_accepted=True
+        ).exists()
+        study_member_cache.set(key, is_member)
+    return is_member
 
-    _instance = None
-    chat_rooms = {}
-
-    def __new__(cls, chat_room_name):
-        if chat_room_name not in cls.chat_rooms:
-            cls.chat_rooms[chat_room_name] = super(OnlineUserManager, cls).__new__(cls)
-            cls.chat_rooms[chat_room_name].online_users = set()
-        return cls.chat_rooms[chat_room_name]
-
-    def add_user(self, user):
-        self.online_users.add(user)
-
-    def remove_user(self, user):
-        self.online_users.discard(user)
-
-    def get_online_users(self):
-        return list(self.online_users)
 
+class ChatConsumer(AsyncJsonWebsocketConsumer):
+    """
+    채팅 consumer
+    - 로그인 유저는 CachedAuthMiddleware가 scope["user"]에 설정
+    - 연결 시 채팅방을 한 번만 조회하여 보관하고, 이후 메시지 처리에는 DB를 조회하지 않음
+    - 메시지는 채팅방별 순번을 붙여 바로 그룹에 전달하고, 저장은 message_buffer에서 모아서 처리
+    - 대화 조회는 순번 기준으로 처리하며, 입장 시 조회한 대화와 그룹 메시지는 중복 전송하지 않음
+    - 현재 접속자는 채널 레이어에 채널별로 저장하므로 여러 채팅 프로세스에서 공유
+    - 입장 시 현재 접속자 목록을 한 번 보내고, 이후에는 입장, 퇴장한 유저만 그룹에 전달
+    - 클라이언트는 heartbeat_interval초마다 heartbeat를 보내며, heartbeat가 끊긴
+      접속자는 같은 방의 다른 접속자의 heartbeat에서 퇴장 처리
+    """
 
-class DirectChatConsumer(JsonWebsocketConsumer):
-    layer = get_channel_layer()
-    room_group_name = None
+    previous_message_count = 10
+    # ChatMessage의 채팅방 필드, 그룹 이름 prefix
+    room_field = None
+    group_prefix = None
 
-    def connect(self):
+    async def connect(self):
         """
         웹소켓 연결 시 호출되는 함수
+        채팅방 멤버가 아닌 경우 연결 거부
         """
-        room_id = self.scope["url_route"]["kwargs"]["room_id"]
-        self.chat_room = DirectChat.objects.get(id=room_id)
-        user = self.get_user_from_session()
-        self.scope["user"] = user
-        print(self.scope)
-
-        self.accept()
-        users = self.chat_room.users.all()
-        self.send(
-            text_data=json.dumps(
-                {
-                    "type": "login",
-                    "name": str(self.chat_room),
-                    "message": f"{users[0].nickname}, {users[1].nickname}의 채팅",
-                }
-            )
-        )
-        return
+        self.room_id = self.scope["url_route"]["kwargs"]["room_id"]
+        self.room = {self.room_field: self.room_id}
+        self.room_group_name = None
+        self.last_sequence = 0
+
+        self.user = self.scope["user"]
+        if not self.user.is_authenticated:
+            await self.close()
+            return
 
-    def get_user_from_session(self):
-        """
-        세션 키를 통해 유저 정보를 가져오는 함수
-        """
-        session_key = self.get_session_key_from_headers()
-        session = Session.objects.get(session_key=session_key)
-        user_id = session.get_decoded().get("_auth_user_id")
-        return User.objects.get(id=user_id)
+        self.chat_room, login_message = await self.get_chatroom()
+        if self.chat_room is None:
+            await self.close()
+            return
 
-    def get_session_key_from_headers(self):
-        """
-        채팅방 접속 시 헤더에서 세션 키를 가져오는 함수
-        """
-        for name, value in self.scope["headers"]:
-            if name == b"cookie":
-                cookies = value.decode("utf-8").split("; ")
-                for cookie in cookies:
-                    if cookie.startswith("sessionid="):
-                        return cookie.split("=")[1]
-        return None
-
-    def disconnect(self, close_code):
+        await self.accept()
+        await self.send_json(
+            {
+                "type": "login",
+                "name": str(self.chat_room),
+                "message": login_message,
+                "heartbeat_interval": settings.CHAT_PRESENCE_HEARTBEAT_INTERVAL,
+            }
+        )
+
+    async def disconnect(self, close_code):
         """
         사용자의 연결이 끊겼을 때 호출되는 함수
+        저장하지 않은 메시지를 저장한 뒤 그룹에서 제거
         """
-        self.remove_user_from_group()
+        if not hasattr(self, "room_group_name"):
+            return
+        await message_buffer.flush()
+        await self.remove_user_from_group()
 
-    def authorize(self, message):
+    async def authorize(self, message):
         """
-        채팅방에 입장 시,
-        채팅방에 등록된 유저와 현재 로그인한 유저가 일치하는지 확인
+        채팅방 입장 처리
+        연결 시 채팅방 멤버 여부를 확인했으므로 그룹에 추가하고 이전 대화 전달
+        재연결 시 since로 마지막으로 받은 순번을 보내면 이후의 메시지만 전달
         """
-        is_login = self.login(message)
-        if is_login is False:
+        if self.room_group_name is not None:
             return
 
-        user = self.scope["user"]
-        if user.is_anonymous:
-            self.close()
-            return
-
-        chat_room = self.get_chatroom()
-        if chat_room is None:
-            print("채팅방 없음")
-            self.close()
-            return
-
-        self.room_group_name = f"chatroom_{chat_room.id}"
-        self.add_user_to_group()
-        self.fetch_previous_message()
+        self.room_group_name = f"{self.group_prefix}_{self.room_id}"
+        await self.add_user_to_group()
+        if message.get("since") is not None:
+            await self.fetch_history(since=message["since"])
+        else:
+            await self.fetch_history(limit=self.previous_message_count)
 
-    def receive_json(self, content_dict, **kwargs):
+    async def receive_json(self, content_dict, **kwargs):
         """
         채팅 메시지를 받았을 때 호출되는 함수
+        보낸 사람은 클라이언트가 보낸 user_id가 아닌 연결 시 인증한 유저로 처리
         """
-        if content_dict["type"] == "auth":
-            self.authorize(message=content_dict)
+        if content_dict.get("type") == "auth":
+            await self.authorize(message=content_dict)
             return
 
-        if content_dict["type"] == "chat_message":
-            room_id = self.scope["url_route"]["kwargs"]["room_id"]
-            user_id = content_dict["user_id"]
-            print("여기 receive_json")
-            print(content_dict)
-            print(self.scope)
+        if content_dict.get("type") == "heartbeat":
+            if self.room_group_name is None:
+                return
+            await self.heartbeat()
+            return
 
-            content_dict["sender"] = user_id
+        if content_dict.get("type") == "history":
+            if self.room_group_name is None:
+                return
+            await self.fetch_history(
+                before=content_dict.get("before"),
+                since=content_dict.get("since"),
+            )
+            return
 
-            chat_room = DirectChat.objects.get(id=room_id)
-            user = User.objects.get(id=user_id)
+        if content_dict.get("type") == "chat_message":
+            if self.room_group_name is None:
+                return
 
-            _ = ChatMessage.objects.create(
-                message=content_dict["message"], direct_chat=chat_room, author=user
-            )
+            message = str(content_dict.get("message", ""))[
+                : ChatMessage._meta.get_field("message").max_length
+            ]
+            if not message.strip():
+                return
 
-            nickname = user.nickname
-            content_dict["nickname"] = nickname
-            async_to_sync(self.channel_layer.group_send)(
-                self.room_group_name, content_dict
+            sequence = await message_buffer.add(message, self.user.id, **self.room)
+            await self.channel_layer.group_send(
+                self.room_group_name,
+                {
+                    "type": "chat_message",
+                    "message": message,
+                    "sender": self.user.id,
+                    "nickname": self.user.nickname,
+                    "sequence": sequence,
+                },
             )
 
-    def login(self, message):
-        """
-        로그인 여부 확인
-        """
-        if self.scope["user"] is None:
-            self.close()
-            return False
-        return True
-
-    def chat_message(self, event):
+    async def chat_message(self, event):
         """
         그룹에서 채팅 메시지를 받았을 때 호출되는 함수
+        입장 시 조회한 대화에 포함된 메시지는 전송하지 않음
         """
-        user_id = self.scope["user"]
-
-        message = event["message"]
-        sender = event["sender"]
-        nickname = event["nickname"]
-
-        if sender != user_id:
-            self.send(
-                text_data=json.dumps(
-                    {
-                        "message": message,
-                        "sender": sender,
-                        "nickname": nickname,
-                    }
-                )
-            )
+        if event["sequence"] <= self.last_sequence:
+            return
+        self.last_sequence = event["sequence"]
+        await self.send_json(
+            {
+                "message": event["message"],
+                "sender": event["sender"],
+                "nickname": event["nickname"],
+                "sequence": event["sequence"],
+            }
+        )
 
-    def get_chatroom(self):
+    async def get_chatroom(self):
         """
-        유저 ID와 채팅방 ID로 채팅방을 가져오는 함수
+        채팅방과 입장 메시지를 가져오는 함수
+        채팅방이 없거나 멤버가 아닌 경우 (None, None)
         """
-        try:
-            user = self.scope["user"]
-            room_id = self.scope["url_route"]["kwargs"]["room_id"]
+        raise NotImplementedError
 
-            chat_room = DirectChat.objects.get(id=room_id)
-            # is_member = chat_room.team.member.filter(pk=user.id).exists()
-            # if is_member is True:
-            #     return chat_room
-            return chat_room
-
-        except Exception as e:
-            return None
-
-    def add_user_to_group(self):
+    async def add_user_to_group(self):
         """
         채팅방 그룹에 유저 추가
+        현재 접속자 목록은 입장한 유저에게만 보내고, 그룹에는 새로 입장한 경우에만 전달
         """
-        user = self.scope["user"]
-
-        async_to_sync(self.layer.group_add)(self.room_group_name, self.channel_name)
-
-        OnlineUserManager(self.room_group_name).add_user(user)
-        self.refresh_online_users()
+        await self.channel_layer.group_add(self.room_group_name, self.channel_name)
+        joined = await presence.join(self.room_group_name, self.channel_name, self.user)
+        await self.send_json(
+            {
+                "type": "current_users",
+                "users": await presence.get_room_users(self.room_group_name),
+            }
+        )
+        if joined:
+            await self.publish_presence("join", presence.serialize_user(self.user))
 
-    def remove_user_from_group(self):
+    async def remove_user_from_group(self):
         """
         채팅방 그룹의 유저 제거
+        다른 채널(탭)로 접속 중이지 않은 경우에만 퇴장 전달
         """
         if self.room_group_name is None:
             return
 
-        user = self.scope["user"]
-        async_to_sync(self.layer.group_discard)(self.room_group_name, self.channel_name)
-
-        OnlineUserManager(self.room_group_name).remove_user(user)
-        self.refresh_online_users()
+        await self.channel_layer.group_discard(self.room_group_name, self.channel_name)
+        if await presence.leave(self.room_group_name, self.channel_name, self.user):
+            await self.publish_presence("leave", presence.serialize_user(self.user))
 
-    def refresh_online_users(self):
+    async def heartbeat(self):
         """
-        현재 접속자 정보 제공
+        접속 정보 만료 시간 연장
+        만료된 접속 정보가 있으면 퇴장 전달
         """
-        users = OnlineUserManager(self.room_group_name).get_online_users()
-        self.publish_current_users(users)
+        rejoined, left_users = await presence.heartbeat(
+            self.room_group_name, self.channel_name, self.user
+        )
+        if rejoined:
+            await self.publish_presence("join", presence.serialize_user(self.user))
+        for user in left_users:
+            await self.publish_presence("leave", user)
 
-    def fetch_previous_message(self):
+    async def fetch_history(self, before=None, since=None, limit=None):
         """
-        이전 대화 조회
+        대화 조회
+        아직 저장하지 않은 메시지도 조회되도록 버퍼의 메시지를 먼저 저장
+        이 프로세스의 버퍼만 저장하므로, 그룹 추가 직전에 다른 채팅 프로세스에서 보낸 메시지는
+        그 프로세스가 저장하기 전이면(최대 CHAT_MESSAGE_FLUSH_INTERVAL_MS) 조회되지 않고
+        브로드캐스트로도 받지 못함 (알려진 제한, 누락을 줄이려면 저장 간격을 줄임)
         """
-        room_id = self.scope["url_route"]["kwargs"]["room_id"]
-
-        chat_room = DirectChat.objects.get(id=room_id)
-
-        # 최근 10개의 메시지 조회
-        messages = ChatMessage.objects.filter(direct_chat=chat_room).order_by("-id")[
-            :10
-        ]
+        try:
+            before = int(before) if before is not None else None
+            since = int(since) if since is not None else None
+        except (TypeError, ValueError):
+            return
 
-        for message in reversed(messages):
-            sender = User.objects.get(id=message.author.id)
-            self.send_json(
-                {
-                    "type": "chat_message",
-                    "message": message.message,
-                    "sender": message.author.id,
-                    "nickname": sender.nickname,
-                }
+        await message_buffer.flush()
+        history = await database_sync_to_async(get_history)(
+            self.room, before=before, since=since, limit=limit or HISTORY_PAGE_SIZE
+        )
+        if history["messages"] and before is None:
+            self.last_sequence = max(
+                self.last_sequence, history["messages"][-1]["sequence"]
             )
+        await self.send_json(
+            {"type": "history", "before": before, "since": since, **history}
+        )
 
-    def publish_current_users(self, users):
+    async def publish_presence(self, event, user):
         """
-        현재 접속자 정보 퍼블리시
+        입장, 퇴장 퍼블리시
         """
-        serialized_users = [
-            {"id": user.id, "nickname": user.nickname} for user in users
-        ]
-
-        async_to_sync(self.layer.group_send)(
+        await self.channel_layer.group_send(
             self.room_group_name,
-            {
-                "type": "current_users",
-                "users": serialized_users,
-            },
+            {"type": "presence_event", "event": event, "user": user},
         )
 
-    def current_users(self, event):
+    async def presence_event(self, event):
         """
-        current_users 타입 메시지 처리
+        presence_event 타입 메시지 처리
         """
-        users = event["users"]
+        await self.send_json(
+            {"type": "presence", "event": event["event"], "user": event["user"]}
+        )
 
-        self.send(
-            text_data=json.dumps(
-                {
-                    "type": "current_users",
-                    "users": users,
-                }
-            )
+
+class DirectChatConsumer(ChatConsumer):
+    """
+    개인 채팅 consumer
+    """
+
+    room_field = "direct_chat_id"
+    group_prefix = "chatroom"
+
+    @database_sync_to_async
+    def get_chatroom(self):
+        """
+        채팅방 ID로 채팅방을 가져오고 채팅방에 등록된 유저인지 확인하는 함수
+        """
+        chat_room = DirectChat.objects.filter(id=self.room_id).first()
+        if chat_room is None:
+            return None, None
+        room_users = list(chat_room.users.only("id", "nickname"))
+        if self.user.id not in [user.id for user in room_users]:
+            return None, None
+        return chat_room, f"{', '.join(user.nickname for user in room_users)}의 채팅"
+
+
+class StudyChatConsumer(ChatConsumer):
+    """
+    스터디 채팅 consumer
+    - 연결 시 한 번만 승인된 스터디 멤버인지 확인
+    """
+
+    room_field = "study_chat_id"
+    group_prefix = "studychat"
+
+    @database_sync_to_async
+    def get_chatroom(self):
+        """
+        채팅방 ID로 채팅방을 가져오고 승인된 스터디 멤버인지 확인하는 함수
+        """
+        chat_room = (
+            StudyChat.objects.select_related("study")
+            .only("id", "study__id", "study__title")
+            .filter(id=self.room_id)
+            .first()
         )
+        if chat_room is None or not is_study_member(chat_room.study_id, self.user.id):
+            return None, None
+        return chat_room, f"{chat_room.study.title}의 채팅"
@@ -0,0 +1,50 @@
+from .models import ChatMessage
+
+HISTORY_PAGE_SIZE = 30
+HISTORY_MAX_PAGE_SIZE = 100
+
+
+def serialize_message(message):
+    """
+    채팅 메시지를 웹소켓 chat_message와 같은 형식의 dict로 변환
+    """
+    return {
+        "sequence": message["sequence"],
+        "sender": message["author_id"],
+        "nickname": message["author__nickname"] or "",
+        "message": message["message"],
+        "created_at": message["created_at"].isoformat(),
+    }
+
+
+def get_history(room, before=None, since=None, limit=HISTORY_PAGE_SIZE):
+    """
+    채팅방 대화 조회
+    - room: {"direct_chat_id": 1} 또는 {"study_chat_id": 1}
+    - before: 해당 순번 이전의 메시지를 최신순으로 limit개 조회 (이전 대화 더보기)
+    - since: 해당 순번 이후의 메시지를 오래된 순으로 limit개 조회 (재연결 시 놓친 메시지)
+    - 둘 다 없으면 최근 메시지 limit개 조회
+    messages는 항상 오래된 순으로 정렬하며, has_more는 같은 방향으로 더 조회할 메시지가 있는지 여부
+    """
+    limit = max(1, min(int(limit), HISTORY_MAX_PAGE_SIZE))
+    queryset = ChatMessage.objects.filter(**room).values(
+        "sequence", "message", "created_at", "author_id", "author__nickname"
+    )
+
+    if since is not None:
+        messages = list(
+            queryset.filter(sequence__gt=since).order_by("sequence")[: limit + 1]
+        )
+        has_more = len(messages) > limit
+        messages = messages[:limit]
+    else:
+        if before is not None:
+            queryset = queryset.filter(sequence__lt=before)
+        messages = list(queryset.order_by("-sequence")[: limit + 1])
+        has_more = len(messages) > limit
+        messages = messages[:limit][::-1]
+
+    return {
+        "messages": [serialize_message(message) for message in messages],
+        "has_more": has_more,
+    }
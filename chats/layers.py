@@ -0,0 +1,796 @@
+"""
+채팅 채널 레이어
+모든 레이어는 groups 확장과 함께 접속자(presence) 확장을 제공
+- presence_add(group, channel, user, ttl): 그룹의 채널에 접속한 유저({"id", "nickname"})를
+  ttl초 동안 등록 (ttl이 없으면 group_expiry)
+- presence_touch(group, channel, ttl): 접속 정보 만료 시간 연장, 접속 정보가 없으면 False
+- presence_discard(group, channel): 채널의 접속 정보 삭제
+- presence_expire(group): 만료된 접속 정보를 삭제하고 해당 유저 목록 반환
+- presence_list(group): 그룹에 접속한 유저 목록 (유저별로 한 번만, 접속한 순서)
+- presence_filter(group, user_ids): user_ids 중 그룹에 접속한 유저 id 집합
+여러 프로세스가 공유하는 레이어는 sequences 확장도 제공
+- sequence_next(name, initial): name의 다음 순번 발급 (마지막 순번과 initial 중 큰 값의 다음 값)
+"""
+
+import asyncio
+import json
+import random
+import sqlite3
+import string
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+
+from channels.exceptions import ChannelFull
+from channels.layers import BaseChannelLayer, InMemoryChannelLayer
+from django.core.exceptions import ImproperlyConfigured
+
+
+def unique_users(users):
+    """
+    같은 유저가 여러 채널(탭)로 접속한 경우 한 번만 포함
+    """
+    result = {}
+    for user in users:
+        result.setdefault(user["id"], user)
+    return list(result.values())
+
+
+class LocalChannelLayer(InMemoryChannelLayer):
+    """
+    단일 프로세스용 메모리 채널 레이어
+    - 만료된 메시지 정리는 송수신할 때마다 모든 채널을 검사하지 않고 clean_interval초마다 실행
+    - group_send는 메시지를 한 번만 복사하여 그룹의 채널이 공유하므로,
+      consumer는 그룹 메시지를 수정하지 않아야 함
+    """
+
+    extensions = ["groups", "flush", "presence"]
+    clean_interval = 1
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # 그룹 -> 채널 -> (유저, 만료 시간), 그룹 -> 유저 id -> 채널 집합
+        self.presence = {}
+        self.presence_users = {}
+        self.cleaned_at = 0
+
+    def _clean_expired(self):
+        now = time.time()
+        if now - self.cleaned_at < self.clean_interval:
+            return
+        self.cleaned_at = now
+        super()._clean_expired()
+
+    async def group_send(self, group, message):
+        assert isinstance(message, dict), "Message is not a dict"
+        assert self.valid_group_name(group), "Invalid group name"
+        self._clean_expired()
+
+        item = (time.time() + self.expiry, deepcopy(message))
+        for channel in list(self.groups.get(group, {})):
+            queue = self.channels.setdefault(channel, asyncio.Queue())
+            # 용량을 넘은 채널은 건너뜀
+            if queue.qsize() < self.capacity:
+                queue.put_nowait(item)
+
+    async def flush(self):
+        await super().flush()
+        self.presence = {}
+        self.presence_users = {}
+
+    def _remove_from_groups(self, channel):
+        super()._remove_from_groups(channel)
+        for group in list(self.presence):
+            self.remove_presence(group, channel)
+
+    def remove_presence(self, group, channel):
+        """
+        채널의 접속 정보 삭제
+        반환값: 삭제한 (유저, 만료 시간), 없으면 None
+        """
+        channels = self.presence.get(group, {})
+        entry = channels.pop(channel, None)
+        if entry is not None:
+            users = self.presence_users[group]
+            user_channels = users[entry[0]["id"]]
+            user_channels.discard(channel)
+            if not user_channels:
+                del users[entry[0]["id"]]
+        if not channels:
+            self.presence.pop(group, None)
+            self.presence_users.pop(group, None)
+        return entry
+
+    def get_presence_ttl(self, ttl):
+        return self.group_expiry if ttl is None else ttl
+
+    async def presence_add(self, group, channel, user, ttl=None):
+        assert self.valid_group_name(group), "Invalid group name"
+        self.remove_presence(group, channel)
+        self.presence.setdefault(group, {})[channel] = (
+            dict(user),
+            time.time() + self.get_presence_ttl(ttl),
+        )
+        self.presence_users.setdefault(group, {}).setdefault(user["id"], set()).add(
+            channel
+        )
+
+    async def presence_touch(self, group, channel, ttl=None):
+        entry = self.presence.get(group, {}).get(channel)
+        if entry is None or entry[1] <= time.time():
+            return False
+        self.presence[group][channel] = (
+            entry[0],
+            time.time() + self.get_presence_ttl(ttl),
+        )
+        return True
+
+    async def presence_discard(self, group, channel):
+        self.remove_presence(group, channel)
+
+    async def presence_expire(self, group):
+        now = time.time()
+        expired = [
+            channel
+            for channel, (_, expires) in self.presence.get(group, {}).items()
+            if expires <= now
+        ]
+        return [self.remove_presence(group, channel)[0] for channel in expired]
+
+    async def presence_list(self, group):
+        now = time.time()
+        return unique_users(
+            user
+            for user, expires in self.presence.get(group, {}).values()
+            if expires > now
+        )
+
+    async def presence_filter(self, group, user_ids):
+        # 그룹 전체 접속자가 아닌 조회한 유저의 채널만 확인
+        now = time.time()
+        channels = self.presence.get(group, {})
+        users = self.presence_users.get(group, {})
+        return {
+            user_id
+            for user_id in set(user_ids)
+            if any(channels[channel][1] > now for channel in users.get(user_id, ()))
+        }
+
+
+class SQLiteChannelLayer(BaseChannelLayer):
+    """
+    SQLite(WAL) 파일을 공유하는 다중 프로세스 채널 레이어
+    - 별도 서비스 없이 같은 서버의 여러 채팅 프로세스가 메시지, 그룹, 접속자를 공유
+    - 프로세스별 채널(new_channel)로 보낸 메시지는 프로세스마다 하나의 polling 작업이
+      한 번에 가져와 채널별 큐로 나눠 전달
+    - polling 간격은 메시지가 있으면 poll_interval, 없으면 max_poll_interval까지 증가
+    - 메시지는 JSON으로 저장하므로 JSON으로 변환할 수 있는 값만 전송 가능
+    """
+
+    extensions = ["groups", "flush", "presence", "sequences"]
+
+    def __init__(
+        self,
+        path,
+        expiry=60,
+        group_expiry=86400,
+        capacity=100,
+        channel_capacity=None,
+        poll_interval=0.005,
+        max_poll_interval=0.05,
+        cleanup_interval=10,
+    ):
+        super().__init__(
+            expiry=expiry, capacity=capacity, channel_capacity=channel_capacity
+        )
+        self.channel_capacity = self.compile_capacities(channel_capacity or {})
+        self.path = str(path)
+        self.group_expiry = group_expiry
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.cleanup_interval = cleanup_interval
+        self.client_prefix = uuid.uuid4().hex[:12]
+        self.receive_buffer = {}
+        self.pollers = {}
+        self.last_cleanup = 0
+        self.local = threading.local()
+        # 프로세스의 DB 작업은 하나의 스레드, 하나의 연결에서 순서대로 처리
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.run_sync(self.create_tables)
+
+    # DB
+
+    def get_connection(self):
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path, isolation_level=None, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA busy_timeout=5000")
+            self.local.connection = connection
+        return connection
+
+    def run_sync(self, func, *args):
+        return self.executor.submit(func, *args).result()
+
+    async def run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor, func, *args
+        )
+
+    def create_tables(self):
+        connection = self.get_connection()
+        connection.executescript("""
+            CREATE TABLE IF NOT EXISTS channel_messages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                channel TEXT NOT NULL,
+                receiver TEXT NOT NULL,
+                expires REAL NOT NULL,
+                body TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS channel_messages_receiver
+                ON channel_messages (receiver, id);
+            CREATE INDEX IF NOT EXISTS channel_messages_channel
+                ON channel_messages (channel);
+            CREATE TABLE IF NOT EXISTS channel_groups (
+                name TEXT NOT NULL,
+                channel TEXT NOT NULL,
+                expires REAL NOT NULL,
+                PRIMARY KEY (name, channel)
+            );
+            CREATE TABLE IF NOT EXISTS channel_presence (
+                name TEXT NOT NULL,
+                channel TEXT NOT NULL,
+                user_id INTEGER NOT NULL,
+                user TEXT NOT NULL,
+                joined REAL NOT NULL,
+                expires REAL NOT NULL,
+                PRIMARY KEY (name, channel)
+            );
+            CREATE INDEX IF NOT EXISTS channel_presence_user
+                ON channel_presence (name, user_id);
+            CREATE TABLE IF NOT EXISTS channel_sequences (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+            """)
+
+    def insert_messages(self, channels, body):
+        """
+        채널별 용량을 넘지 않은 채널에 메시지 저장
+        반환값: 용량 초과로 저장하지 못한 채널 목록
+        """
+        connection = self.get_connection()
+        now = time.time()
+        full = []
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            rows = []
+            for channel in channels:
+                (count,) = connection.execute(
+                    "SELECT COUNT(*) FROM channel_messages "
+                    "WHERE channel = ? AND expires > ?",
+                    (channel, now),
+                ).fetchone()
+                if count >= self.get_capacity(channel):
+                    full.append(channel)
+                    continue
+                rows.append(
+                    (channel, self.non_local_name(channel), now + self.expiry, body)
+                )
+            connection.executemany(
+                "INSERT INTO channel_messages (channel, receiver, expires, body) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        return full
+
+    def fetch_messages(self, receiver):
+        """
+        receiver(프로세스별 채널의 경우 프로세스)에게 온 메시지를 가져오고 삭제
+        """
+        connection = self.get_connection()
+        rows = connection.execute(
+            "DELETE FROM channel_messages WHERE receiver = ? "
+            "RETURNING id, channel, expires, body",
+            (receiver,),
+        ).fetchall()
+        now = time.time()
+        return [
+            (channel, json.loads(body))
+            for _, channel, expires, body in sorted(rows)
+            if expires > now
+        ]
+
+    def fetch_message(self, channel):
+        """
+        일반 채널의 가장 오래된 메시지 하나를 가져오고 삭제
+        """
+        connection = self.get_connection()
+        row = connection.execute(
+            "DELETE FROM channel_messages WHERE id = ("
+            "SELECT id FROM channel_messages WHERE receiver = ? AND expires > ? "
+            "ORDER BY id LIMIT 1) RETURNING body",
+            (channel, time.time()),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def clean_expired(self):
+        """
+        만료된 메시지, 그룹 정보 삭제
+        메시지가 만료된 채널은 종료된 것으로 보고 그룹, 접속자 정보에서도 삭제
+        """
+        connection = self.get_connection()
+        now = time.time()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            channels = {
+                channel
+                for (channel,) in connection.execute(
+                    "DELETE FROM channel_messages WHERE expires <= ? RETURNING channel",
+                    (now,),
+                )
+            }
+            connection.executemany(
+                "DELETE FROM channel_groups WHERE channel = ?",
+                [(channel,) for channel in channels],
+            )
+            connection.executemany(
+                "DELETE FROM channel_presence WHERE channel = ?",
+                [(channel,) for channel in channels],
+            )
+            connection.execute("DELETE FROM channel_groups WHERE expires <= ?", (now,))
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+
+    def clear_tables(self):
+        self.get_connection().executescript(
+            "DELETE FROM channel_messages; DELETE FROM channel_groups; "
+            "DELETE FROM channel_presence; DELETE FROM channel_sequences;"
+        )
+
+    def next_value(self, name, initial):
+        connection = self.get_connection()
+        connection.execute(
+            "INSERT OR IGNORE INTO channel_sequences (name, value) VALUES (?, ?)",
+            (name, initial),
+        )
+        (value,) = connection.execute(
+            "UPDATE channel_sequences SET value = MAX(value, ?) + 1 WHERE name = ? "
+            "RETURNING value",
+            (initial, name),
+        ).fetchone()
+        return value
+
+    def execute(self, sql, params=()):
+        return self.get_connection().execute(sql, params).fetchall()
+
+    async def maybe_clean_expired(self):
+        if time.time() - self.last_cleanup >= self.cleanup_interval:
+            self.last_cleanup = time.time()
+            await self.run(self.clean_expired)
+
+    # Channel layer API
+
+    async def send(self, channel, message):
+        assert isinstance(message, dict), "message is not a dict"
+        assert self.valid_channel_name(channel), "Channel name not valid"
+        assert "__asgi_channel__" not in message
+
+        full = await self.run(self.insert_messages, [channel], json.dumps(message))
+        if full:
+            raise ChannelFull(channel)
+
+    async def receive(self, channel):
+        assert self.valid_channel_name(channel)
+
+        if "!" not in channel:
+            interval = self.poll_interval
+            while True:
+                message = await self.run(self.fetch_message, channel)
+                if message is not None:
+                    return message
+                await asyncio.sleep(interval)
+                interval = min(interval * 2, self.max_poll_interval)
+
+        queue = self.receive_buffer.setdefault(channel, asyncio.Queue())
+        self.ensure_poller(self.non_local_name(channel))
+        try:
+            return await queue.get()
+        finally:
+            if queue.empty() and self.receive_buffer.get(channel) is queue:
+                del self.receive_buffer[channel]
+
+    def ensure_poller(self, receiver):
+        loop = asyncio.get_running_loop()
+        poller = self.pollers.get(receiver)
+        if poller is None or poller.done() or poller.get_loop() is not loop:
+            self.pollers[receiver] = loop.create_task(self.poll(receiver))
+
+    async def poll(self, receiver):
+        """
+        프로세스별 채널로 온 메시지를 가져와 채널별 큐에 전달
+        """
+        interval = self.poll_interval
+        while True:
+            messages = await self.run(self.fetch_messages, receiver)
+            for channel, message in messages:
+                self.receive_buffer.setdefault(channel, asyncio.Queue()).put_nowait(
+                    message
+                )
+            interval = (
+                self.poll_interval
+                if messages
+                else min(interval * 2, self.max_poll_interval)
+            )
+            await self.maybe_clean_expired()
+            await asyncio.sleep(interval)
+
+    async def new_channel(self, prefix="specific."):
+        return "%s.sqlite.%s!%s" % (
+            prefix,
+            self.client_prefix,
+            "".join(random.choice(string.ascii_letters) for _ in range(12)),
+        )
+
+    # Flush extension
+
+    async def flush(self):
+        await self.run(self.clear_tables)
+        self.receive_buffer = {}
+
+    async def close(self):
+        for poller in self.pollers.values():
+            if not poller.get_loop().is_closed():
+                poller.cancel()
+        self.pollers = {}
+
+    # Groups extension
+
+    async def group_add(self, group, channel):
+        assert self.valid_group_name(group), "Group name not valid"
+        assert self.valid_channel_name(channel), "Channel name not valid"
+        await self.run(
+            self.execute,
+            "INSERT OR REPLACE INTO channel_groups (name, channel, expires) "
+            "VALUES (?, ?, ?)",
+            (group, channel, time.time() + self.group_expiry),
+        )
+
+    async def group_discard(self, group, channel):
+        assert self.valid_channel_name(channel), "Invalid channel name"
+        assert self.valid_group_name(group), "Invalid group name"
+        await self.run(
+            self.execute,
+            "DELETE FROM channel_groups WHERE name = ? AND channel = ?",
+            (group, channel),
+        )
+
+    async def group_send(self, group, message):
+        assert isinstance(message, dict), "Message is not a dict"
+        assert self.valid_group_name(group), "Invalid group name"
+        channels = [
+            channel
+            for (channel,) in await self.run(
+                self.execute,
+                "SELECT channel FROM channel_groups WHERE name = ? AND expires > ?",
+                (group, time.time()),
+            )
+        ]
+        if channels:
+            # 용량을 넘은 채널은 건너뜀
+            await self.run(self.insert_messages, channels, json.dumps(message))
+
+    # Presence extension
+
+    def get_presence_ttl(self, ttl):
+        return self.group_expiry if ttl is None else ttl
+
+    def expire_presence(self, group):
+        rows = (
+            self.get_connection()
+            .execute(
+                "DELETE FROM channel_presence WHERE name = ? AND expires <= ? "
+                "RETURNING joined, user",
+                (group, time.time()),
+            )
+            .fetchall()
+        )
+        return [json.loads(user) for _, user in sorted(rows)]
+
+    async def presence_add(self, group, channel, user, ttl=None):
+        assert self.valid_group_name(group), "Invalid group name"
+        now = time.time()
+        await self.run(
+            self.execute,
+            "INSERT OR REPLACE INTO channel_presence "
+            "(name, channel, user_id, user, joined, expires) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                group,
+                channel,
+                user["id"],
+                json.dumps(user),
+                now,
+                now + self.get_presence_ttl(ttl),
+            ),
+        )
+
+    async def presence_touch(self, group, channel, ttl=None):
+        now = time.time()
+        rows = await self.run(
+            self.execute,
+            "UPDATE channel_presence SET expires = ? "
+            "WHERE name = ? AND channel = ? AND expires > ? RETURNING channel",
+            (now + self.get_presence_ttl(ttl), group, channel, now),
+        )
+        return bool(rows)
+
+    async def presence_discard(self, group, channel):
+        await self.run(
+            self.execute,
+            "DELETE FROM channel_presence WHERE name = ? AND channel = ?",
+            (group, channel),
+        )
+
+    async def presence_expire(self, group):
+        return await self.run(self.expire_presence, group)
+
+    async def presence_list(self, group):
+        rows = await self.run(
+            self.execute,
+            "SELECT user FROM channel_presence WHERE name = ? AND expires > ? "
+            "ORDER BY joined",
+            (group, time.time()),
+        )
+        return unique_users(json.loads(user) for (user,) in rows)
+
+    async def presence_filter(self, group, user_ids):
+        user_ids = list(user_ids)
+        if not user_ids:
+            return set()
+        rows = await self.run(
+            self.execute,
+            "SELECT DISTINCT user_id FROM channel_presence "
+            "WHERE name = ? AND expires > ? AND user_id IN (%s)"
+            % ", ".join("?" * len(user_ids)),
+            (group, time.time(), *user_ids),
+        )
+        return {user_id for (user_id,) in rows}
+
+    # Sequences extension
+
+    async def sequence_next(self, name, initial=0):
+        return await self.run(self.next_value, name, initial)
+
+
+try:
+    from channels_redis.core import RedisChannelLayer as BaseRedisChannelLayer
+except ImportError:  # pragma: no cover
+    BaseRedisChannelLayer = None
+
+
+# 순번 발급 (ARGV: initial)
+# 카운터가 유실되어 initial보다 작으면 initial 다음 값부터 발급
+SEQUENCE_NEXT_SCRIPT = """
+local value = redis.call("INCR", KEYS[1])
+if value <= tonumber(ARGV[1]) then
+    value = tonumber(ARGV[1]) + 1
+    redis.call("SET", KEYS[1], value)
+end
+return value
+"""
+
+# Redis 접속 정보 스크립트
+# 한 그룹의 키는 모두 같은 Redis 서버(consistent_hash(group))에 저장하므로 유저별 키는 스크립트 안에서 생성
+# KEYS[1]: 그룹 hash(채널 -> 접속 정보), KEYS[2]: 그룹의 만료 시간 sorted set(채널 -> 만료 시간)
+# 유저별 sorted set(채널 -> 만료 시간)의 키는 ARGV의 접두어 + 유저 id
+
+# 접속 정보 저장 (ARGV: 채널, 접속 정보 JSON, 만료 시간, 유저별 키, 키 유지 시간)
+PRESENCE_ADD_SCRIPT = """
+redis.call("HSET", KEYS[1], ARGV[1], ARGV[2])
+redis.call("ZADD", KEYS[2], ARGV[3], ARGV[1])
+redis.call("ZADD", ARGV[4], ARGV[3], ARGV[1])
+for _, key in ipairs({KEYS[1], KEYS[2], ARGV[4]}) do
+    redis.call("EXPIRE", key, ARGV[5])
+end
+return 1
+"""
+
+# 접속 정보가 있고 만료되지 않았을 때만 만료 시간을 갱신
+# (ARGV: 채널, 현재 시간, 새 만료 시간, 유저별 키 접두어, 키 유지 시간)
+PRESENCE_TOUCH_SCRIPT = """
+local value = redis.call("HGET", KEYS[1], ARGV[1])
+if not value then
+    return 0
+end
+local entry = cjson.decode(value)
+if entry["expires"] <= tonumber(ARGV[2]) then
+    return 0
+end
+entry["expires"] = tonumber(ARGV[3])
+local user_key = ARGV[4] .. string.format("%d", entry["user"]["id"])
+redis.call("HSET", KEYS[1], ARGV[1], cjson.encode(entry))
+redis.call("ZADD", KEYS[2], ARGV[3], ARGV[1])
+redis.call("ZADD", user_key, ARGV[3], ARGV[1])
+for _, key in ipairs({KEYS[1], KEYS[2], user_key}) do
+    redis.call("EXPIRE", key, ARGV[5])
+end
+return 1
+"""
+
+# 접속 정보 삭제, ARGV[3]이 있으면 그 시간까지 만료된 경우에만 삭제
+# (ARGV: 채널, 유저별 키 접두어, 만료 기준 시간)
+# 반환값: 삭제한 접속 정보 JSON, 삭제하지 않았으면 nil
+PRESENCE_REMOVE_SCRIPT = """
+local value = redis.call("HGET", KEYS[1], ARGV[1])
+if not value then
+    redis.call("ZREM", KEYS[2], ARGV[1])
+    return false
+end
+local entry = cjson.decode(value)
+if ARGV[3] ~= "" and entry["expires"] > tonumber(ARGV[3]) then
+    return false
+end
+redis.call("HDEL", KEYS[1], ARGV[1])
+redis.call("ZREM", KEYS[2], ARGV[1])
+redis.call("ZREM", ARGV[2] .. string.format("%d", entry["user"]["id"]), ARGV[1])
+return value
+"""
+
+
+if BaseRedisChannelLayer is not None:
+
+    class RedisChannelLayer(BaseRedisChannelLayer):
+        """
+        여러 서버에서 채팅 프로세스를 실행할 때 사용하는 Redis 채널 레이어
+        접속자 정보는 그룹별로 세 가지 키에 저장하여, 접속 여부 조회와 만료 정리가
+        그룹 전체 접속자 수와 관계없이 조회한 유저 수, 만료된 채널 수만큼만 실행되도록 함
+        - hash(채널 -> 접속 정보): 채팅방 접속자 목록
+        - sorted set(채널 -> 만료 시간): 만료된 채널 조회
+        - 유저별 sorted set(채널 -> 만료 시간): 유저 접속 여부 조회
+        """
+
+        extensions = ["groups", "flush", "presence", "sequences"]
+
+        def presence_key(self, group):
+            return f"{self.prefix}:presence:{group}"
+
+        def presence_expires_key(self, group):
+            return f"{self.prefix}:presence:{group}:expires"
+
+        def presence_user_key_prefix(self, group):
+            return f"{self.prefix}:presence:{group}:user:"
+
+        def presence_connection(self, group):
+            return self.connection(self.consistent_hash(group))
+
+        def get_presence_ttl(self, ttl):
+            return self.group_expiry if ttl is None else ttl
+
+        async def get_presence_entries(self, group):
+            entries = await self.presence_connection(group).hgetall(
+                self.presence_key(group)
+            )
+            return sorted(
+                (
+                    (channel.decode(), json.loads(value))
+                    for channel, value in entries.items()
+                ),
+                key=lambda item: item[1]["joined"],
+            )
+
+        async def presence_add(self, group, channel, user, ttl=None):
+            assert self.valid_group_name(group), "Invalid group name"
+            now = time.time()
+            expires = now + self.get_presence_ttl(ttl)
+            await self.presence_connection(group).eval(
+                PRESENCE_ADD_SCRIPT,
+                2,
+                self.presence_key(group),
+                self.presence_expires_key(group),
+                channel,
+                json.dumps({"user": user, "joined": now, "expires": expires}),
+                expires,
+                f"{self.presence_user_key_prefix(group)}{user['id']}",
+                self.group_expiry,
+            )
+
+        async def presence_touch(self, group, channel, ttl=None):
+            # 조회와 저장 사이에 삭제된 접속 정보를 다시 저장하지 않도록 Lua 스크립트로 한 번에 실행
+            now = time.time()
+            return bool(
+                await self.presence_connection(group).eval(
+                    PRESENCE_TOUCH_SCRIPT,
+                    2,
+                    self.presence_key(group),
+                    self.presence_expires_key(group),
+                    channel,
+                    now,
+                    now + self.get_presence_ttl(ttl),
+                    self.presence_user_key_prefix(group),
+                    self.group_expiry,
+                )
+            )
+
+        async def presence_remove(self, group, channels, expired_at=""):
+            """
+            채널들의 접속 정보 삭제
+            반환값: 삭제한 접속 정보 목록
+            """
+            async with self.presence_connection(group).pipeline(
+                transaction=False
+            ) as pipe:
+                for channel in channels:
+                    pipe.eval(
+                        PRESENCE_REMOVE_SCRIPT,
+                        2,
+                        self.presence_key(group),
+                        self.presence_expires_key(group),
+                        channel,
+                        self.presence_user_key_prefix(group),
+                        expired_at,
+                    )
+                values = await pipe.execute()
+            return [json.loads(value) for value in values if value]
+
+        async def presence_discard(self, group, channel):
+            await self.presence_remove(group, [channel])
+
+        async def presence_expire(self, group):
+            now = time.time()
+            channels = await self.presence_connection(group).zrangebyscore(
+                self.presence_expires_key(group), "-inf", now
+            )
+            if not channels:
+                return []
+            # 조회한 뒤 다시 입장, 갱신한 채널은 삭제하지 않음
+            entries = await self.presence_remove(
+                group, [channel.decode() for channel in channels], now
+            )
+            return [entry["user"] for entry in entries]
+
+        async def presence_list(self, group):
+            now = time.time()
+            return unique_users(
+                entry["user"]
+                for _, entry in await self.get_presence_entries(group)
+                if entry["expires"] > now
+            )
+
+        async def presence_filter(self, group, user_ids):
+            user_ids = list(dict.fromkeys(user_ids))
+            if not user_ids:
+                return set()
+            now = time.time()
+            prefix = self.presence_user_key_prefix(group)
+            async with self.presence_connection(group).pipeline(
+                transaction=False
+            ) as pipe:
+                for user_id in user_ids:
+                    pipe.zcount(f"{prefix}{user_id}", f"({now}", "+inf")
+                counts = await pipe.execute()
+            return {user_id for user_id, count in zip(user_ids, counts) if count}
+
+        async def sequence_next(self, name, initial=0):
+            key = f"{self.prefix}:sequence:{name}"
+            connection = self.connection(self.consistent_hash(name))
+            return await connection.eval(SEQUENCE_NEXT_SCRIPT, 1, key, initial)
+
+else:
+
+    class RedisChannelLayer:
+        def __init__(self, *args, **kwargs):
+            raise ImproperlyConfigured(
+                "Redis 채널 레이어를 사용하려면 channels-redis 패키지를 설치해야 합니다."
+            )
@@ -0,0 +1,196 @@
+import asyncio
+import resource
+import statistics
+import time
+import uuid
+
+from channels.layers import get_channel_layer
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.management.base import BaseCommand
+from django.urls import path
+from django.utils.module_loading import import_string
+
+from chats.middleware import CachedAuthMiddlewareStack
+from chats.models import ChatMessage, DirectChat
+
+User = get_user_model()
+
+
+def percentile(values, percent):
+    """
+    정렬된 값에서 백분위 값 반환
+    """
+    if not values:
+        return 0.0
+    index = min(int(len(values) * percent / 100), len(values) - 1)
+    return values[index]
+
+
+def create_session(user):
+    session = SessionStore()
+    session[SESSION_KEY] = str(user.pk)
+    session[BACKEND_SESSION_KEY] = "django.contrib.auth.backends.ModelBackend"
+    session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+    session.create()
+    return session.session_key
+
+
+async def connect(communicator, enter=True):
+    connected, _ = await communicator.connect(timeout=30)
+    if not connected:
+        raise RuntimeError("웹소켓 연결에 실패했습니다.")
+    await communicator.receive_json_from(timeout=30)
+    if enter:
+        await communicator.send_json_to({"type": "auth"})
+
+
+async def drain(communicator):
+    while not await communicator.receive_nothing(timeout=0.2):
+        await communicator.receive_output()
+
+
+class Command(BaseCommand):
+    help = (
+        "개인 채팅 consumer의 초당 처리 메시지 수와 메시지 전달 지연(p50, p99)을 측정합니다. "
+        "측정용 유저와 채팅방은 측정 후 삭제됩니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--consumer",
+            default="chats.consumers.DirectChatConsumer",
+            help="측정할 consumer 경로 (이전 consumer와 비교할 때 사용)",
+        )
+        parser.add_argument(
+            "--sockets", type=int, default=20, help="채팅방에 입장하는 소켓 수"
+        )
+        parser.add_argument(
+            "--messages", type=int, default=200, help="전송할 메시지 수"
+        )
+        parser.add_argument(
+            "--idle",
+            type=int,
+            default=0,
+            help="측정 전에 연결만 유지하는 소켓 수",
+        )
+
+    def handle(self, *args, **options):
+        consumer = import_string(options["consumer"])
+        self.application = CachedAuthMiddlewareStack(
+            URLRouter([path("ws/directchat/<int:room_id>/", consumer.as_asgi())])
+        )
+
+        suffix = uuid.uuid4().hex[:8]
+        users = [
+            User.objects.create_user(
+                email=f"benchmark{num}_{suffix}@devtail.local",
+                password=None,
+                nickname=f"bench{num}_{suffix}",
+            )
+            for num in range(2)
+        ]
+        chat_room = DirectChat.objects.create()
+        chat_room.users.add(*users)
+        self.session_keys = [create_session(user) for user in users]
+        self.sender_id = users[0].id
+
+        try:
+            result = asyncio.run(self.run(chat_room.id, options))
+        finally:
+            ChatMessage.objects.filter(direct_chat=chat_room).delete()
+            chat_room.delete()
+            for session_key in self.session_keys:
+                SessionStore(session_key=session_key).delete()
+            User.objects.filter(id__in=[user.id for user in users]).delete()
+
+        self.stdout.write(f"consumer: {options['consumer']}")
+        for name, value in result.items():
+            self.stdout.write(f"{name}: {value}")
+
+    def get_communicator(self, room_id, num):
+        session_key = self.session_keys[num % len(self.session_keys)]
+        return WebsocketCommunicator(
+            self.application,
+            f"/ws/directchat/{room_id}/",
+            headers=[(b"cookie", f"sessionid={session_key}".encode())],
+        )
+
+    async def receive_messages(self, communicator, count, sent_at, latencies):
+        """
+        벤치마크 메시지를 count개 받을 때까지 수신하며 전달 지연 기록
+        """
+        received = 0
+        while received < count:
+            message = await communicator.receive_json_from(timeout=60)
+            key = message.get("message", "")
+            if key in sent_at:
+                latencies.append(time.perf_counter() - sent_at[key])
+                received += 1
+
+    async def run(self, room_id, options):
+        # 수신 속도보다 전송 속도가 빨라도 채널 용량 초과로 메시지가 버려지지 않도록 설정
+        get_channel_layer().capacity = max(options["messages"] * 2, 100)
+
+        # 연결만 유지하는 소켓
+        idle_communicators = []
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        started = time.perf_counter()
+        for num in range(options["idle"]):
+            communicator = self.get_communicator(room_id, num)
+            await connect(communicator, enter=False)
+            idle_communicators.append(communicator)
+        idle_seconds = time.perf_counter() - started
+        rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        communicators = [
+            self.get_communicator(room_id, num) for num in range(options["sockets"])
+        ]
+        for communicator in communicators:
+            await connect(communicator)
+        for communicator in communicators:
+            await drain(communicator)
+
+        sender = communicators[0]
+        sent_at = {}
+        latencies = []
+        receivers = [
+            asyncio.create_task(
+                self.receive_messages(
+                    communicator, options["messages"], sent_at, latencies
+                )
+            )
+            for communicator in communicators
+        ]
+
+        started = time.perf_counter()
+        for num in range(options["messages"]):
+            key = f"benchmark-{num}"
+            sent_at[key] = time.perf_counter()
+            await sender.send_json_to(
+                {"type": "chat_message", "message": key, "user_id": self.sender_id}
+            )
+        await asyncio.gather(*receivers)
+        elapsed = time.perf_counter() - started
+
+        for communicator in communicators + idle_communicators:
+            await communicator.disconnect(timeout=30)
+
+        latencies.sort()
+        result = {
+            "sockets": options["sockets"],
+            "messages": options["messages"],
+            "elapsed_seconds": round(elapsed, 3),
+            "messages_per_second": round(options["messages"] / elapsed, 1),
+            "deliveries_per_second": round(len(latencies) / elapsed, 1),
+            "latency_p50_ms": round(statistics.median(latencies) * 1000, 2),
+            "latency_p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        }
+        if options["idle"]:
+            result["idle_sockets"] = options["idle"]
+            result["idle_connect_seconds"] = round(idle_seconds, 3)
+            result["idle_max_rss_delta_kb"] = rss_after - rss_before
+        return result
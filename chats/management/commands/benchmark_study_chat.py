@@ -0,0 +1,172 @@
+import asyncio
+import datetime
+import statistics
+import time
+import uuid
+
+from channels.layers import get_channel_layer
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.management.base import BaseCommand
+
+from chats.middleware import session_user_cache
+from chats.models import StudyChat
+from deVtail.asgi import application
+from studies.models import Category, Study, StudyMember
+
+from .benchmark_chat import connect, create_session, drain, percentile
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "스터디 채팅방 인원별 브로드캐스트 처리량과 메시지별 전달 지연을 측정합니다. "
+        "메시지 전달 지연(fanout)은 메시지를 보낸 뒤 마지막 멤버가 받을 때까지의 시간입니다. "
+        "측정용 유저, 스터디, 채팅방은 측정 후 삭제됩니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--members",
+            type=int,
+            nargs="+",
+            default=[50, 100, 500],
+            help="측정할 채팅방 인원 (여러 개 입력 가능)",
+        )
+        parser.add_argument(
+            "--messages", type=int, default=50, help="채팅방별 전송할 메시지 수"
+        )
+        parser.add_argument(
+            "--senders", type=int, default=5, help="메시지를 보내는 멤버 수"
+        )
+
+    def handle(self, *args, **options):
+        suffix = uuid.uuid4().hex[:8]
+        category = Category.objects.create(name=f"bench_{suffix}")
+        try:
+            for members in options["members"]:
+                result = self.run_room(category, members, options, suffix)
+                self.stdout.write(
+                    " ".join(f"{name}={value}" for name, value in result.items())
+                )
+        finally:
+            category.delete()
+
+    def run_room(self, category, members, options, suffix):
+        """
+        members명이 입장한 스터디 채팅방을 만들어 측정한 뒤 삭제
+        """
+        today = datetime.date.today()
+        study = Study.objects.create(
+            category=category,
+            goal="benchmark",
+            start_at=today,
+            end_at=today,
+            title=f"benchmark {members}",
+            difficulty="중",
+            max_member=members,
+        )
+        users = User.objects.bulk_create(
+            User(
+                email=f"benchmark{num}_{members}_{suffix}@devtail.local",
+                nickname=f"b{num}_{members}_{suffix}",
+                password="!",
+            )
+            for num in range(members)
+        )
+        StudyMember.objects.bulk_create(
+            StudyMember(study=study, user=user, is_accepted=True, is_manager=num == 0)
+            for num, user in enumerate(users)
+        )
+        chat_room = StudyChat.objects.create(study=study)
+        session_keys = [create_session(user) for user in users]
+
+        try:
+            return asyncio.run(self.run(chat_room.id, session_keys, options))
+        finally:
+            study.delete()
+            for session_key in session_keys:
+                SessionStore(session_key=session_key).delete()
+                session_user_cache.delete(session_key)
+            User.objects.filter(id__in=[user.id for user in users]).delete()
+
+    def get_communicator(self, room_id, session_key):
+        return WebsocketCommunicator(
+            application,
+            f"/ws/studychat/{room_id}/",
+            headers=[(b"cookie", f"sessionid={session_key}".encode())],
+        )
+
+    async def receive_messages(self, communicator, count, sent_at, received_at):
+        """
+        벤치마크 메시지를 count개 받을 때까지 수신하며 메시지별 수신 시각 기록
+        """
+        received = 0
+        while received < count:
+            message = await communicator.receive_json_from(timeout=120)
+            key = message.get("message", "")
+            if key in sent_at:
+                received_at[key].append(time.perf_counter())
+                received += 1
+
+    async def run(self, room_id, session_keys, options):
+        members = len(session_keys)
+        message_count = options["messages"]
+        # 입장, 퇴장 이벤트와 메시지가 채널 용량 초과로 버려지지 않도록 설정
+        get_channel_layer().capacity = max(message_count + members * 2, 100)
+
+        communicators = [
+            self.get_communicator(room_id, session_key) for session_key in session_keys
+        ]
+        started = time.perf_counter()
+        for communicator in communicators:
+            await connect(communicator)
+        await asyncio.gather(*(drain(communicator) for communicator in communicators))
+        connect_seconds = time.perf_counter() - started
+
+        sent_at = {}
+        received_at = {f"benchmark-{num}": [] for num in range(message_count)}
+        receivers = [
+            asyncio.create_task(
+                self.receive_messages(communicator, message_count, sent_at, received_at)
+            )
+            for communicator in communicators
+        ]
+
+        senders = communicators[: max(1, min(options["senders"], members))]
+        started = time.perf_counter()
+        for num in range(message_count):
+            key = f"benchmark-{num}"
+            sent_at[key] = time.perf_counter()
+            await senders[num % len(senders)].send_json_to(
+                {"type": "chat_message", "message": key}
+            )
+        await asyncio.gather(*receivers)
+        elapsed = time.perf_counter() - started
+
+        for communicator in communicators:
+            await communicator.disconnect(timeout=30)
+
+        deliveries = sorted(
+            received - sent_at[key]
+            for key, times in received_at.items()
+            for received in times
+        )
+        fanouts = sorted(
+            max(times) - sent_at[key] for key, times in received_at.items()
+        )
+        return {
+            "members": members,
+            "messages": message_count,
+            "connect_seconds": round(connect_seconds, 3),
+            "elapsed_seconds": round(elapsed, 3),
+            "messages_per_second": round(message_count / elapsed, 1),
+            "deliveries_per_second": round(len(deliveries) / elapsed, 1),
+            "delivery_p50_ms": round(statistics.median(deliveries) * 1000, 2),
+            "delivery_p99_ms": round(percentile(deliveries, 99) * 1000, 2),
+            "fanout_p50_ms": round(statistics.median(fanouts) * 1000, 2),
+            "fanout_p99_ms": round(percentile(fanouts, 99) * 1000, 2),
+            "fanout_max_ms": round(fanouts[-1] * 1000, 2),
+        }
@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from chats.buffer import recover_spool
+
+
+class Command(BaseCommand):
+    help = (
+        "채팅 프로세스가 비정상 종료되어 저장하지 못한 spool 파일의 메시지를 저장합니다. "
+        "실행 중인 프로세스의 spool 파일은 제외합니다."
+    )
+
+    def handle(self, *args, **options):
+        count = recover_spool(settings.CHAT_MESSAGE_SPOOL_DIR)
+        self.stdout.write(self.style.SUCCESS(f"{count}개의 메시지를 복구했습니다."))
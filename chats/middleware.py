@@ -0,0 +1,135 @@
+import time
+from collections import OrderedDict
+
+from channels.auth import AuthMiddleware, get_user
+from channels.db import database_sync_to_async
+from channels.sessions import CookieMiddleware, SessionMiddleware
+from django.conf import settings
+from django.contrib.auth import HASH_SESSION_KEY, get_user_model
+from django.core.cache import caches
+from django.utils.crypto import constant_time_compare
+
+
+class TTLCache:
+    """
+    만료 시간이 있는 프로세스 메모리 캐시
+    - max_size개를 넘으면 가장 오래전에 저장한 값부터 삭제
+    """
+
+    def __init__(self, ttl, max_size=10000, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.clock = clock
+        self.data = OrderedDict()
+
+    def get(self, key):
+        item = self.data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at <= self.clock():
+            self.data.pop(key, None)
+            return None
+        return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        self.data[key] = (value, self.clock() + ttl)
+        self.data.move_to_end(key)
+        while len(self.data) > self.max_size:
+            self.data.popitem(last=False)
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def clear(self):
+        self.data.clear()
+
+
+class SessionUserCache:
+    """
+    세션 키 -> (유저 id, 세션 인증 해시) 캐시
+    - CHAT_SESSION_CACHE의 Django 캐시에 저장하므로, 공유 캐시(Redis 등)를 사용하면
+      다른 프로세스에서 로그아웃해도 바로 삭제됨
+    """
+
+    prefix = "chat_session_user:"
+
+    @property
+    def cache(self):
+        return caches[settings.CHAT_SESSION_CACHE]
+
+    def get_ttl(self, ttl=None):
+        return (
+            settings.CHAT_SESSION_CACHE_TTL
+            if ttl is None
+            else min(ttl, settings.CHAT_SESSION_CACHE_TTL)
+        )
+
+    def get(self, session_key):
+        return self.cache.get(self.prefix + session_key)
+
+    async def aget(self, session_key):
+        return await self.cache.aget(self.prefix + session_key)
+
+    async def aset(self, session_key, value, ttl=None):
+        await self.cache.aset(self.prefix + session_key, value, self.get_ttl(ttl))
+
+    def delete(self, session_key):
+        self.cache.delete(self.prefix + session_key)
+
+    async def adelete(self, session_key):
+        await self.cache.adelete(self.prefix + session_key)
+
+
+session_user_cache = SessionUserCache()
+
+
+@database_sync_to_async
+def get_active_user(user_id):
+    return get_user_model().objects.filter(pk=user_id, is_active=True).first()
+
+
+@database_sync_to_async
+def get_session_expiry_age(session):
+    return session.get_expiry_age()
+
+
+class CachedAuthMiddleware(AuthMiddleware):
+    """
+    세션 키 -> (유저 id, 세션 인증 해시)를 캐시하는 웹소켓 인증 middleware
+    - 재연결이 몰려도 세션 테이블 조회와 세션 복호화를 캐시 만료 시간(CHAT_SESSION_CACHE_TTL)마다 한 번만 실행
+    - 캐시 만료 시간은 세션 만료 시간을 넘지 않으며, 로그아웃 시 캐시에서 삭제
+    - 캐시에는 세션의 인증 해시도 저장하여, 캐시된 세션도 연결할 때마다 유저의 현재 해시와 비교
+      (다른 프로세스에서 비밀번호를 바꾸면 캐시된 세션도 바로 무효)
+    - 비로그인, 만료된 세션은 AnonymousUser
+    """
+
+    async def resolve_scope(self, scope):
+        session_key = scope["session"].session_key
+        user = None
+
+        cached = await session_user_cache.aget(session_key) if session_key else None
+        if cached is not None:
+            user_id, session_hash = cached
+            user = await get_active_user(user_id)
+            if user is None or not constant_time_compare(
+                session_hash, user.get_session_auth_hash()
+            ):
+                user = None
+                await session_user_cache.adelete(session_key)
+
+        if user is None:
+            user = await get_user(scope)
+            if user.is_authenticated:
+                await session_user_cache.aset(
+                    session_key,
+                    (user.pk, scope["session"].get(HASH_SESSION_KEY, "")),
+                    ttl=await get_session_expiry_age(scope["session"]),
+                )
+
+        scope["user"]._wrapped = user
+
+
+def CachedAuthMiddlewareStack(inner):
+    return CookieMiddleware(SessionMiddleware(CachedAuthMiddleware(inner)))
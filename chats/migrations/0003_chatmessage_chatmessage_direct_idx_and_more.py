@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-17 05:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chats", "0002_alter_chatmessage_direct_chat_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="chatmessage",
+            index=models.Index(
+                fields=["direct_chat", "-id"], name="chatmessage_direct_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="chatmessage",
+            index=models.Index(
+                fields=["study_chat", "-id"], name="chatmessage_study_idx"
+            ),
+        ),
+    ]
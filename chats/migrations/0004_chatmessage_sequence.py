@@ -0,0 +1,54 @@
+# Generated by Django 4.2.7 on 2026-10-17 06:26
+
+from django.db import migrations, models
+
+
+def set_sequences(apps, schema_editor):
+    """
+    기존 메시지에 채팅방별로 id 순서대로 순번 부여
+    """
+    ChatMessage = apps.get_model("chats", "ChatMessage")
+
+    sequences = {}
+    messages = []
+    for message in ChatMessage.objects.order_by("id").only(
+        "id", "direct_chat_id", "study_chat_id"
+    ):
+        if message.direct_chat_id is not None:
+            room = ("direct_chat", message.direct_chat_id)
+        elif message.study_chat_id is not None:
+            room = ("study_chat", message.study_chat_id)
+        else:
+            continue
+        sequences[room] = sequences.get(room, 0) + 1
+        message.sequence = sequences[room]
+        messages.append(message)
+    ChatMessage.objects.bulk_update(messages, ["sequence"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chats", "0003_chatmessage_chatmessage_direct_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="chatmessage",
+            name="sequence",
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.RunPython(set_sequences, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="chatmessage",
+            constraint=models.UniqueConstraint(
+                fields=("direct_chat", "sequence"), name="unique_direct_chat_sequence"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="chatmessage",
+            constraint=models.UniqueConstraint(
+                fields=("study_chat", "sequence"), name="unique_study_chat_sequence"
+            ),
+        ),
+    ]
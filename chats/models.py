@@ -34,9 +34,11 @@ class ChatMessage(models.Model):
     채팅 메시지 모델
     Detail:
         메시지를 작성한 유저의 data가 삭제될 경우 author를 null로 설정, FE에서 별도 처리
+        sequence는 채팅방별 메시지 순번으로, 메시지를 모아서 저장해도 보낸 순서를 유지
     """
 
     message = models.CharField(max_length=500)
+    sequence = models.PositiveBigIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
 
     author = models.ForeignKey("accounts.User", on_delete=models.SET_NULL, null=True)
@@ -50,3 +52,15 @@ class ChatMessage(models.Model):
     class Meta:
         verbose_name = "채팅 메시지"
         verbose_name_plural = "채팅 메시지"
+        indexes = [
+            models.Index(fields=["direct_chat", "-id"], name="chatmessage_direct_idx"),
+            models.Index(fields=["study_chat", "-id"], name="chatmessage_study_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["direct_chat", "sequence"], name="unique_direct_chat_sequence"
+            ),
+            models.UniqueConstraint(
+                fields=["study_chat", "sequence"], name="unique_study_chat_sequence"
+            ),
+        ]
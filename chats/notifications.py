@@ -0,0 +1,121 @@
+"""
+새 채팅 메시지 알림
+- 메시지 버퍼가 저장한 메시지를 채팅방별로 모아, 채팅방 멤버 중 메시지를 보낸 유저와
+  현재 채팅방에 접속 중인 유저를 제외하고 알림
+- 같은 채팅방의 알림은 alerts.delivery에서 읽지 않은 알림 하나로 합치므로
+  메시지가 몰려도 유저별로 알림이 하나만 남음
+"""
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from alerts.delivery import AlertEvent, enqueue_alerts
+from studies.models import StudyMember
+
+from .models import DirectChat, StudyChat
+
+User = get_user_model()
+
+
+def get_present_user_ids(group, user_ids):
+    """
+    user_ids 중 채팅방에 접속 중인 유저 id 집합
+    """
+    channel_layer = get_channel_layer()
+    if not user_ids or "presence" not in getattr(channel_layer, "extensions", []):
+        return set()
+    return async_to_sync(channel_layer.presence_filter)(group, user_ids)
+
+
+def get_direct_chat_targets(room_ids):
+    """
+    개인 채팅방별 (멤버 id 목록, 그룹 이름, 알림 내용, 알림 url)
+    알림 내용은 메시지를 보낸 유저에 따라 달라지므로 None
+    """
+    members = {room_id: [] for room_id in room_ids}
+    for room_id, user_id in DirectChat.users.through.objects.filter(
+        directchat_id__in=room_ids
+    ).values_list("directchat_id", "user_id"):
+        members[room_id].append(user_id)
+    return {
+        room_id: (
+            user_ids,
+            f"chatroom_{room_id}",
+            None,
+            reverse("chats:connect_direct_chat", args=[room_id]),
+        )
+        for room_id, user_ids in members.items()
+    }
+
+
+def get_study_chat_targets(room_ids):
+    """
+    스터디 채팅방별 (승인된 멤버 id 목록, 그룹 이름, 알림 내용, 알림 url)
+    """
+    rooms = {
+        study_id: (room_id, title)
+        for room_id, study_id, title in StudyChat.objects.filter(
+            id__in=room_ids
+        ).values_list("id", "study_id", "study__title")
+    }
+    members = {study_id: [] for study_id in rooms}
+    for study_id, user_id in StudyMember.objects.filter(
+        study_id__in=rooms, is_accepted=True
+    ).values_list("study_id", "user_id"):
+        members[study_id].append(user_id)
+    return {
+        room_id: (
+            members[study_id],
+            f"studychat_{room_id}",
+            f"'{title}' 스터디 채팅에 새 메시지가 있습니다.",
+            reverse("chats:connect_study_chat", args=[study_id]),
+        )
+        for study_id, (room_id, title) in rooms.items()
+    }
+
+
+def notify_new_messages(messages):
+    """
+    저장한 채팅 메시지의 알림 예약
+    채팅방마다 한 번만 알림을 만들며, 개인 채팅은 마지막 메시지를 보낸 유저 기준으로 작성
+    """
+    rooms = {"direct_chat_id": {}, "study_chat_id": {}}
+    for data in messages:
+        for field in rooms:
+            if data.get(field):
+                rooms[field].setdefault(data[field], []).append(data)
+    if not any(rooms.values()):
+        return
+
+    targets = {}
+    if rooms["direct_chat_id"]:
+        targets["direct_chat_id"] = get_direct_chat_targets(rooms["direct_chat_id"])
+    if rooms["study_chat_id"]:
+        targets["study_chat_id"] = get_study_chat_targets(rooms["study_chat_id"])
+    nicknames = dict(
+        User.objects.filter(
+            id__in={data["author_id"] for data in messages}
+        ).values_list("id", "nickname")
+    )
+
+    events = []
+    for field, room_messages in rooms.items():
+        for room_id, room_data in room_messages.items():
+            if room_id not in targets[field]:
+                continue
+            member_ids, group, content, url = targets[field][room_id]
+            author_id = room_data[-1]["author_id"]
+            if content is None:
+                content = f"{nicknames.get(author_id, '')}님이 메시지를 보냈습니다."
+
+            author_ids = {data["author_id"] for data in room_data}
+            user_ids = [user_id for user_id in member_ids if user_id not in author_ids]
+            present_user_ids = get_present_user_ids(group, user_ids)
+            events.extend(
+                AlertEvent(user_id, "alert_chat", content, url)
+                for user_id in user_ids
+                if user_id not in present_user_ids
+            )
+    enqueue_alerts(events)
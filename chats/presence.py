@@ -0,0 +1,106 @@
+"""
+접속자(presence) 관리
+- 접속 정보는 채널 레이어의 presence 확장에 채널(웹소켓)별로 (id, nickname)만 저장
+- 클라이언트는 CHAT_PRESENCE_HEARTBEAT_INTERVAL초마다 heartbeat를 보내고,
+  CHAT_PRESENCE_TTL초 동안 heartbeat가 없는 접속 정보는 만료
+- 채팅방 그룹과 함께 전체 접속자 그룹(ONLINE_GROUP)에도 등록하여
+  웹소켓 없이 다른 페이지에서 유저의 접속 여부 조회
+"""
+
+import time
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+
+ONLINE_GROUP = "presence_online"
+
+# 전체 접속자 그룹의 만료된 접속 정보는 프로세스마다 CHAT_PRESENCE_TTL초에 한 번만 정리
+online_expired_at = 0
+
+
+def get_presence_ttl():
+    return settings.CHAT_PRESENCE_TTL
+
+
+def serialize_user(user):
+    return {"id": user.id, "nickname": user.nickname}
+
+
+async def join(group, channel, user):
+    """
+    채팅방 입장
+    반환값: 다른 채널(탭)로 이미 접속 중이지 않아 새로 입장한 경우 True
+    """
+    channel_layer = get_channel_layer()
+    ttl = get_presence_ttl()
+    online_user_ids = await channel_layer.presence_filter(group, [user.id])
+    await channel_layer.presence_add(group, channel, serialize_user(user), ttl)
+    await channel_layer.presence_add(ONLINE_GROUP, channel, serialize_user(user), ttl)
+    return user.id not in online_user_ids
+
+
+async def leave(group, channel, user):
+    """
+    채팅방 퇴장
+    반환값: 다른 채널(탭)로 접속 중이지 않아 퇴장한 경우 True
+    """
+    channel_layer = get_channel_layer()
+    await channel_layer.presence_discard(group, channel)
+    await channel_layer.presence_discard(ONLINE_GROUP, channel)
+    return user.id not in await channel_layer.presence_filter(group, [user.id])
+
+
+async def heartbeat(group, channel, user):
+    """
+    접속 정보 만료 시간 연장, 그룹의 만료된 접속 정보 정리
+    비정상 종료된 웹소켓의 접속 정보는 같은 그룹의 다른 유저의 heartbeat에서 정리
+    반환값: (다시 입장한 경우 True, 만료되어 퇴장한 유저 목록)
+    """
+    channel_layer = get_channel_layer()
+    ttl = get_presence_ttl()
+    rejoined = False
+    if not await channel_layer.presence_touch(group, channel, ttl):
+        rejoined = await join(group, channel, user)
+    elif not await channel_layer.presence_touch(ONLINE_GROUP, channel, ttl):
+        await channel_layer.presence_add(
+            ONLINE_GROUP, channel, serialize_user(user), ttl
+        )
+
+    await expire_online_group(ttl)
+    expired_users = await channel_layer.presence_expire(group)
+    online_user_ids = await channel_layer.presence_filter(
+        group, [expired_user["id"] for expired_user in expired_users]
+    )
+    left_users = {
+        expired_user["id"]: expired_user
+        for expired_user in expired_users
+        if expired_user["id"] not in online_user_ids
+    }
+    return rejoined, list(left_users.values())
+
+
+async def expire_online_group(ttl):
+    global online_expired_at
+    if time.monotonic() - online_expired_at < ttl:
+        return
+    online_expired_at = time.monotonic()
+    await get_channel_layer().presence_expire(ONLINE_GROUP)
+
+
+async def get_room_users(group):
+    return await get_channel_layer().presence_list(group)
+
+
+def get_online_user_ids(user_ids):
+    """
+    user_ids 중 접속 중인 유저 id 집합
+    """
+    user_ids = [user_id for user_id in user_ids if user_id is not None]
+    if not user_ids:
+        return set()
+    return async_to_sync(get_channel_layer().presence_filter)(ONLINE_GROUP, user_ids)
+
+
+def is_online(user_id):
+    return user_id in get_online_user_ids([user_id])
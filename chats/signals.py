@@ -0,0 +1,26 @@
+from django.contrib.auth.signals import user_logged_out
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from studies.models import StudyMember
+
+from .consumers import study_member_cache
+from .middleware import session_user_cache
+
+
+@receiver(user_logged_out)
+def clear_session_user_cache(sender, request, user, **kwargs):
+    """
+    로그아웃 시 웹소켓 인증 캐시에서 세션 삭제
+    """
+    if request is not None and request.session.session_key:
+        session_user_cache.delete(request.session.session_key)
+
+
+@receiver([post_save, post_delete], sender=StudyMember)
+def clear_study_member_cache(sender, instance, **kwargs):
+    """
+    스터디 멤버 변경 시 스터디 채팅 멤버 캐시 삭제
+    다른 채팅 프로세스의 캐시는 CHAT_STUDY_MEMBER_CACHE_TTL 후 만료
+    """
+    study_member_cache.delete((instance.study_id, instance.user_id))
@@ -1,3 +1,1465 @@
-from django.test import TestCase
+import asyncio
+import datetime
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from io import StringIO
+from pathlib import Path
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from channels.db import database_sync_to_async
+from channels.exceptions import ChannelFull
+from channels.layers import get_channel_layer
+from channels.testing import WebsocketCommunicator
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from chats.buffer import (
+    ChatMessageBuffer,
+    message_buffer,
+    recover_spool,
+    save_messages,
+)
+from chats.history import get_history
+from chats.layers import LocalChannelLayer, RedisChannelLayer, SQLiteChannelLayer
+from chats.consumers import study_member_cache
+from chats.presence import ONLINE_GROUP, get_online_user_ids
+from chats.middleware import CachedAuthMiddlewareStack, TTLCache, session_user_cache
+from chats.models import ChatMessage, DirectChat, StudyChat
+from deVtail.asgi import application
+from studies.models import Category, Study, StudyMember
+
+User = get_user_model()
+
+SPOOL_DIR = Path(tempfile.gettempdir()) / "devtail_chat_spool_test"
+
+
+class SpoolDirMixin:
+    """
+    테스트용 spool 디렉터리 생성, 삭제
+    """
+
+    def setUp(self):
+        super().setUp()
+        SPOOL_DIR.mkdir(parents=True, exist_ok=True)
+        self.addCleanup(shutil.rmtree, SPOOL_DIR, ignore_errors=True)
+
+
+@override_settings(CHAT_MESSAGE_SPOOL_DIR=SPOOL_DIR, CHAT_MESSAGE_BATCH_SIZE=5)
+class TestDirectChatConsumer(SpoolDirMixin, TestCase):
+    """
+    개인 채팅 consumer 테스트
+    """
+
+    def setUp(self):
+        super().setUp()
+        message_buffer.sequences.clear()
+        self.user1 = User.objects.create_user(
+            email="test1@naver.com", password="test1", nickname="test1"
+        )
+        self.user2 = User.objects.create_user(
+            email="test2@naver.com", password="test2", nickname="test2"
+        )
+        self.user3 = User.objects.create_user(
+            email="test3@naver.com", password="test3", nickname="test3"
+        )
+        self.chat_room = DirectChat.objects.create()
+        self.chat_room.users.add(self.user1, self.user2)
+        ChatMessage.objects.create(
+            message="이전 메시지",
+            direct_chat=self.chat_room,
+            author=self.user2,
+            sequence=1,
+        )
+        self.session_keys = {
+            user.id: self.get_session_key(user)
+            for user in [self.user1, self.user2, self.user3]
+        }
+
+    def get_session_key(self, user):
+        client = Client()
+        client.force_login(user)
+        return client.cookies["sessionid"].value
+
+    def get_communicator(self, user=None):
+        headers = []
+        if user is not None:
+            headers.append(
+                (b"cookie", f"sessionid={self.session_keys[user.id]}".encode())
+            )
+        return WebsocketCommunicator(
+            application, f"/ws/directchat/{self.chat_room.id}/", headers=headers
+        )
+
+    async def enter(self, communicator):
+        """
+        연결 후 입장 메시지를 보내고 수신한 메시지 반환
+        """
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        login = await communicator.receive_json_from()
+        self.assertEqual(login["type"], "login")
+        await communicator.send_json_to({"type": "auth"})
+        return await self.drain(communicator)
+
+    async def drain(self, communicator):
+        """
+        대기 중인 메시지를 모두 수신
+        """
+        messages = []
+        while not await communicator.receive_nothing(timeout=0.1):
+            messages.append(await communicator.receive_json_from())
+        return messages
+
+    async def test_connect_and_previous_message(self):
+        """
+        채팅방 입장 시 이전 대화를 받는지 테스트
+        """
+        communicator = self.get_communicator(self.user1)
+        messages = await self.enter(communicator)
+        self.assertIn(
+            {
+                "type": "current_users",
+                "users": [{"id": self.user1.id, "nickname": "test1"}],
+            },
+            messages,
+        )
+        history = next(message for message in messages if message["type"] == "history")
+        self.assertEqual(len(history["messages"]), 1)
+        self.assertEqual(history["has_more"], False)
+        self.assertEqual(
+            {
+                key: history["messages"][0][key]
+                for key in ["message", "sender", "nickname", "sequence"]
+            },
+            {
+                "message": "이전 메시지",
+                "sender": self.user2.id,
+                "nickname": "test2",
+                "sequence": 1,
+            },
+        )
+        await communicator.disconnect()
+
+    async def test_history_and_reconnect(self):
+        """
+        이전 대화 더보기와 재연결 시 놓친 메시지만 받는지 테스트
+        """
+        await ChatMessage.objects.abulk_create(
+            [
+                ChatMessage(
+                    message=f"message{num}",
+                    direct_chat=self.chat_room,
+                    author=self.user2,
+                    sequence=num,
+                )
+                for num in range(2, 16)
+            ]
+        )
+        communicator1 = self.get_communicator(self.user1)
+        messages = await self.enter(communicator1)
+        history = next(message for message in messages if message["type"] == "history")
+        self.assertEqual(
+            [message["sequence"] for message in history["messages"]],
+            list(range(6, 16)),
+        )
+        self.assertTrue(history["has_more"])
+
+        await communicator1.send_json_to({"type": "history", "before": 6})
+        history = await communicator1.receive_json_from()
+        self.assertEqual(history["before"], 6)
+        self.assertEqual(
+            [message["sequence"] for message in history["messages"]],
+            list(range(1, 6)),
+        )
+        self.assertFalse(history["has_more"])
+        await communicator1.disconnect()
+
+        # user1이 연결이 끊긴 동안 user2가 보낸 메시지
+        communicator2 = self.get_communicator(self.user2)
+        await self.enter(communicator2)
+        for num in range(3):
+            await communicator2.send_json_to(
+                {"type": "chat_message", "message": f"missed{num}"}
+            )
+        await self.drain(communicator2)
+
+        communicator1 = self.get_communicator(self.user1)
+        await communicator1.connect()
+        await communicator1.receive_json_from()
+        await communicator1.send_json_to({"type": "auth", "since": 15})
+        messages = await self.drain(communicator1)
+        received = [
+            message["message"]
+            for frame in messages
+            for message in (
+                frame["messages"] if frame.get("type") == "history" else [frame]
+            )
+            if "message" in message
+        ]
+        self.assertEqual(received, ["missed0", "missed1", "missed2"])
+
+        # 재연결 후 보낸 메시지는 한 번만 받음
+        await communicator2.send_json_to({"type": "chat_message", "message": "new"})
+        message = await communicator1.receive_json_from()
+        self.assertEqual((message["message"], message["sequence"]), ("new", 19))
+        self.assertTrue(await communicator1.receive_nothing())
+        await communicator1.disconnect()
+        await communicator2.disconnect()
+
+    async def test_reject_not_member(self):
+        """
+        채팅방에 등록되지 않은 유저, 비로그인 유저의 연결 거부 테스트
+        """
+        for user in [self.user3, None]:
+            communicator = self.get_communicator(user)
+            connected, _ = await communicator.connect()
+            self.assertFalse(connected)
+
+    async def test_chat_message(self):
+        """
+        메시지가 상대방에게 전달되고, 보낸 사람은 인증한 유저로 저장되는지 테스트
+        """
+        communicator1 = self.get_communicator(self.user1)
+        communicator2 = self.get_communicator(self.user2)
+        await self.enter(communicator1)
+        await self.enter(communicator2)
+        await self.drain(communicator1)
+
+        await communicator1.send_json_to(
+            {"type": "chat_message", "message": "안녕하세요", "user_id": self.user3.id}
+        )
+        for communicator in [communicator1, communicator2]:
+            message = await communicator.receive_json_from()
+            self.assertEqual(message["message"], "안녕하세요")
+            self.assertEqual(message["sender"], self.user1.id)
+            self.assertEqual(message["nickname"], "test1")
+            self.assertEqual(message["sequence"], 2)
+
+        await communicator1.disconnect()
+        await communicator2.disconnect()
+        self.assertTrue(
+            await ChatMessage.objects.filter(
+                message="안녕하세요", author=self.user1
+            ).aexists()
+        )
+
+    async def test_batch_message_save(self):
+        """
+        메시지를 message_batch_size개씩 모아서 저장하는지 테스트
+        """
+        communicator = self.get_communicator(self.user1)
+        await self.enter(communicator)
+
+        batch_size = 5
+        for num in range(batch_size + 1):
+            await communicator.send_json_to(
+                {"type": "chat_message", "message": f"message{num}"}
+            )
+            await communicator.receive_json_from()
+        self.assertEqual(
+            await ChatMessage.objects.filter(author=self.user1).acount(), batch_size
+        )
+        self.assertEqual(len(os.listdir(SPOOL_DIR)), 1)
+
+        await communicator.disconnect()
+        self.assertEqual(
+            await ChatMessage.objects.filter(author=self.user1).acount(),
+            batch_size + 1,
+        )
+
+
+class TestChatMessageBuffer(SpoolDirMixin, TestCase):
+    """
+    채팅 메시지 write-behind 버퍼 테스트
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(
+            email="test1@naver.com", password="test1", nickname="test1"
+        )
+        self.chat_room = DirectChat.objects.create()
+        self.other_chat_room = DirectChat.objects.create()
+        ChatMessage.objects.create(
+            message="이전 메시지",
+            direct_chat=self.chat_room,
+            author=self.user,
+            sequence=5,
+        )
+        self.buffer = ChatMessageBuffer(
+            batch_size=3, flush_interval_ms=10000, spool_dir=SPOOL_DIR
+        )
+
+    def get_messages(self, chat_room):
+        return list(
+            ChatMessage.objects.filter(direct_chat=chat_room)
+            .order_by("sequence")
+            .values_list("message", "sequence")
+        )
+
+    async def test_batch_and_sequence(self):
+        """
+        batch_size개씩 모아서 저장하고, 채팅방별 순번이 보낸 순서대로 발급되는지 테스트
+        """
+        sequences = []
+        for num in range(4):
+            sequences.append(
+                await self.buffer.add(
+                    f"message{num}", self.user.id, direct_chat_id=self.chat_room.id
+                )
+            )
+        other_sequence = await self.buffer.add(
+            "other", self.user.id, direct_chat_id=self.other_chat_room.id
+        )
+        self.assertEqual(sequences, [6, 7, 8, 9])
+        self.assertEqual(other_sequence, 1)
+        self.assertEqual(await ChatMessage.objects.filter(author=self.user).acount(), 4)
+
+        await self.buffer.flush()
+        self.assertEqual(
+            await self.aget_messages(),
+            [("이전 메시지", 5)] + [(f"message{num}", num + 6) for num in range(4)],
+        )
+        self.assertEqual(os.listdir(SPOOL_DIR), [])
+
+    async def aget_messages(self):
+        return [
+            (message.message, message.sequence)
+            async for message in ChatMessage.objects.filter(
+                direct_chat=self.chat_room
+            ).order_by("sequence")
+        ]
+
+    async def test_flush_interval(self):
+        """
+        flush_interval_ms가 지나면 batch_size보다 적은 메시지도 저장하는지 테스트
+        """
+        self.buffer = ChatMessageBuffer(
+            batch_size=100, flush_interval_ms=50, spool_dir=SPOOL_DIR
+        )
+        await self.buffer.add("message", self.user.id, direct_chat_id=self.chat_room.id)
+        self.assertFalse(await ChatMessage.objects.filter(sequence=6).aexists())
+        await asyncio.sleep(0.3)
+        self.assertTrue(await ChatMessage.objects.filter(sequence=6).aexists())
+
+    def write_spool(self, name, lines):
+        with open(SPOOL_DIR / name, "w", encoding="utf-8") as spool_file:
+            spool_file.write("\n".join(lines))
+
+    def test_recover_spool(self):
+        """
+        종료된 프로세스의 spool 파일 메시지를 중복 없이 저장하는지 테스트
+        """
+        lines = [
+            json.dumps(
+                {
+                    "message": f"message{num}",
+                    "author_id": self.user.id,
+                    "direct_chat_id": self.chat_room.id,
+                    "sequence": num + 6,
+                }
+            )
+            for num in range(2)
+        ]
+        # 기록 중 종료되어 잘린 줄
+        lines.append('{"message": "mess')
+        self.write_spool("999999999-a1b2c3-0.jsonl", lines)
+        # 컨테이너 재시작으로 같은 pid를 받은 이전 실행의 파일
+        self.write_spool(f"{os.getpid()}-a1b2c3-0.jsonl", lines[:1])
+        self.write_spool(f"{os.getppid()}-a1b2c3-0.jsonl", lines[:1])
+        self.write_spool(f"{self.buffer.spool_prefix}-0.jsonl", lines[:1])
+
+        self.assertEqual(recover_spool(SPOOL_DIR), 3)
+        self.assertEqual(
+            self.get_messages(self.chat_room),
+            [("이전 메시지", 5), ("message0", 6), ("message1", 7)],
+        )
+        # 실행 중인 프로세스, 실행 중인 버퍼의 spool 파일은 유지
+        self.assertEqual(
+            sorted(os.listdir(SPOOL_DIR)),
+            sorted(
+                [
+                    f"{os.getppid()}-a1b2c3-0.jsonl",
+                    f"{self.buffer.spool_prefix}-0.jsonl",
+                ]
+            ),
+        )
+
+        # 같은 메시지를 다시 복구해도 중복 저장되지 않음
+        self.write_spool("999999999-a1b2c3-1.jsonl", lines)
+        out = StringIO()
+        with override_settings(CHAT_MESSAGE_SPOOL_DIR=SPOOL_DIR):
+            call_command("recover_chat_spool", stdout=out)
+        self.assertIn("2개의 메시지를 복구했습니다.", out.getvalue())
+        self.assertEqual(len(self.get_messages(self.chat_room)), 3)
+
+    async def test_recover_before_first_write(self):
+        """
+        같은 pid로 재시작한 뒤 첫 메시지를 기록하기 전에 이전 실행의 메시지를 저장하는지 테스트
+        """
+        self.write_spool(
+            f"{os.getpid()}-a1b2c3-0.jsonl",
+            [
+                json.dumps(
+                    {
+                        "message": "재시작 전",
+                        "author_id": self.user.id,
+                        "direct_chat_id": self.chat_room.id,
+                        "sequence": 6,
+                    }
+                )
+            ],
+        )
+        sequence = await self.buffer.add(
+            "재시작 후", self.user.id, direct_chat_id=self.chat_room.id
+        )
+        await self.buffer.flush()
+
+        self.assertEqual(sequence, 7)
+        self.assertEqual(
+            await self.aget_messages(),
+            [("이전 메시지", 5), ("재시작 전", 6), ("재시작 후", 7)],
+        )
+        self.assertEqual(os.listdir(SPOOL_DIR), [])
+
+    async def test_sequence_conflict(self):
+        """
+        여러 프로세스가 같은 순번을 발급하면 브로드캐스트한 순번을 바꾸지 않고
+        먼저 저장된 메시지를 유지하며, 이후 순번은 저장된 순번 뒤부터 발급하는지 테스트
+        """
+        other_buffer = ChatMessageBuffer(
+            batch_size=3, flush_interval_ms=10000, spool_dir=SPOOL_DIR
+        )
+        for buffer in (self.buffer, other_buffer):
+            await buffer.add(
+                f"{id(buffer)}", self.user.id, direct_chat_id=self.chat_room.id
+            )
+        await self.buffer.flush()
+        with self.assertLogs("chats.buffer", "ERROR"):
+            await other_buffer.flush()
+        # 같은 메시지를 다시 저장하면 무시
+        with self.assertNoLogs("chats.buffer", "ERROR"):
+            await database_sync_to_async(save_messages)(
+                [
+                    {
+                        "message": f"{id(self.buffer)}",
+                        "author_id": self.user.id,
+                        "direct_chat_id": self.chat_room.id,
+                        "sequence": 6,
+                    }
+                ]
+            )
+        self.assertEqual(
+            await other_buffer.add(
+                "다음 메시지", self.user.id, direct_chat_id=self.chat_room.id
+            ),
+            7,
+        )
+        await other_buffer.flush()
+
+        self.assertEqual(
+            await self.aget_messages(),
+            [
+                ("이전 메시지", 5),
+                (f"{id(self.buffer)}", 6),
+                ("다음 메시지", 7),
+            ],
+        )
+
+    async def test_sequence_conflict_since(self):
+        """
+        순번이 겹친 메시지를 저장한 뒤 since로 놓친 메시지를 조회해도
+        이미 받은 순번의 메시지가 다른 순번으로 다시 조회되지 않는지 테스트
+        """
+        other_buffer = ChatMessageBuffer(
+            batch_size=3, flush_interval_ms=10000, spool_dir=SPOOL_DIR
+        )
+        await self.buffer.add("메시지1", self.user.id, direct_chat_id=self.chat_room.id)
+        await other_buffer.add(
+            "메시지2", self.user.id, direct_chat_id=self.chat_room.id
+        )
+        await self.buffer.flush()
+        with self.assertLogs("chats.buffer", "ERROR"):
+            await other_buffer.flush()
+
+        # 순번 6의 메시지를 받은 클라이언트가 재연결하여 since=6으로 조회
+        history = await database_sync_to_async(get_history)(
+            {"direct_chat_id": self.chat_room.id}, since=6
+        )
+        self.assertEqual(history["messages"], [])
+        history = await database_sync_to_async(get_history)(
+            {"direct_chat_id": self.chat_room.id}, since=5
+        )
+        self.assertEqual(
+            [
+                (message["message"], message["sequence"])
+                for message in history["messages"]
+            ],
+            [("메시지1", 6)],
+        )
+
+    async def test_flush_waits_for_pending_save(self):
+        """
+        다른 flush()가 저장 중일 때 입장하여 대화를 조회해도 저장 중인 메시지가 조회되는지 테스트
+        """
+        saving = threading.Event()
+        saved = threading.Event()
+
+        def slow_save(messages):
+            saving.set()
+            time.sleep(0.2)
+            conflicts = save_messages(messages)
+            saved.set()
+            return conflicts
+
+        for num in range(2):
+            await self.buffer.add(
+                f"message{num}", self.user.id, direct_chat_id=self.chat_room.id
+            )
+        with mock.patch("chats.buffer.save_messages", slow_save):
+            pending_flush = asyncio.ensure_future(self.buffer.flush())
+            while not saving.is_set():
+                await asyncio.sleep(0.01)
+            # 입장 시 대화 조회 (ChatConsumer.fetch_history)
+            await self.buffer.flush()
+            self.assertTrue(saved.is_set())
+            history = await database_sync_to_async(get_history)(
+                {"direct_chat_id": self.chat_room.id}, limit=10
+            )
+            await pending_flush
+
+        self.assertEqual(
+            [message["sequence"] for message in history["messages"]], [5, 6, 7]
+        )
+
+    async def test_study_chat_sequence(self):
+        """
+        스터디 채팅방 메시지의 순번 발급 테스트
+        """
+        study = await Study.objects.acreate(
+            category=await Category.objects.acreate(name="test"),
+            goal="test",
+            title="test",
+            start_at=datetime.date.today(),
+            end_at=datetime.date.today(),
+            difficulty=Study.difficulty_choices[0][0],
+            max_member=10,
+        )
+        study_chat = await StudyChat.objects.acreate(study=study)
+
+        for _ in range(2):
+            await self.buffer.add("study", self.user.id, study_chat_id=study_chat.id)
+        await self.buffer.flush()
+        self.assertEqual(
+            [
+                message.sequence
+                async for message in study_chat.chat_messages.order_by("sequence")
+            ],
+            [1, 2],
+        )
+
+
+class TestDirectChatHistory(TestCase):
+    """
+    개인 채팅방 대화 조회 API 테스트
+    """
+
+    def setUp(self):
+        self.user1 = User.objects.create_user(
+            email="test1@naver.com", password="test1", nickname="test1"
+        )
+        self.user2 = User.objects.create_user(
+            email="test2@naver.com", password="test2", nickname="test2"
+        )
+        self.user3 = User.objects.create_user(
+            email="test3@naver.com", password="test3", nickname="test3"
+        )
+        self.chat_room = DirectChat.objects.create()
+        self.chat_room.users.add(self.user1, self.user2)
+        ChatMessage.objects.bulk_create(
+            [
+                ChatMessage(
+                    message=f"message{num}",
+                    direct_chat=self.chat_room,
+                    author=[self.user1, self.user2][num % 2],
+                    sequence=num,
+                )
+                for num in range(1, 51)
+            ]
+        )
+        self.url = reverse(
+            "chats:direct_chat_history", kwargs={"room_id": self.chat_room.id}
+        )
+
+    def get_sequences(self, response):
+        return [message["sequence"] for message in response.json()["messages"]]
+
+    def test_history_pages(self):
+        """
+        최근 대화부터 이전 대화로 중복, 누락 없이 조회되는지 테스트
+        """
+        self.client.force_login(self.user1)
+        response = self.client.get(self.url)
+        self.assertEqual(self.get_sequences(response), list(range(21, 51)))
+        self.assertTrue(response.json()["has_more"])
+        self.assertEqual(
+            response.json()["messages"][0],
+            {
+                "sequence": 21,
+                "sender": self.user2.id,
+                "nickname": "test2",
+                "message": "message21",
+                "created_at": response.json()["messages"][0]["created_at"],
+            },
+        )
+
+        response = self.client.get(self.url + "?before=21")
+        self.assertEqual(self.get_sequences(response), list(range(1, 21)))
+        self.assertFalse(response.json()["has_more"])
+
+    def test_history_since(self):
+        """
+        since 이후의 메시지만 오래된 순으로 조회되는지 테스트
+        """
+        self.client.force_login(self.user1)
+        response = self.client.get(self.url + "?since=45&limit=3")
+        self.assertEqual(self.get_sequences(response), [46, 47, 48])
+        self.assertTrue(response.json()["has_more"])
+        response = self.client.get(self.url + "?since=48&limit=3")
+        self.assertEqual(self.get_sequences(response), [49, 50])
+        self.assertFalse(response.json()["has_more"])
+
+    def test_history_query_count(self):
+        """
+        작성자 정보를 포함하여 한 번의 쿼리로 조회하는지 테스트
+        """
+        with self.assertNumQueries(1):
+            history = get_history({"direct_chat_id": self.chat_room.id}, limit=50)
+        self.assertEqual(len(history["messages"]), 50)
+
+    def test_history_permission(self):
+        """
+        채팅방 멤버가 아닌 유저, 잘못된 커서 테스트
+        """
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 302)
+
+        self.client.force_login(self.user3)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 404)
+
+        self.client.force_login(self.user1)
+        response = self.client.get(self.url + "?before=abc")
+        self.assertEqual(response.status_code, 400)
+
+
+class TestCachedAuthMiddleware(TestCase):
+    """
+    웹소켓 인증 middleware 테스트
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test1@naver.com", password="test1", nickname="test1"
+        )
+        session_user_cache.cache.clear()
+        self.addCleanup(session_user_cache.cache.clear)
+
+    def login(self):
+        self.client.force_login(self.user)
+        return self.client.cookies["sessionid"].value
+
+    def resolve_user(self, session_key=None):
+        """
+        middleware를 거친 scope의 user 반환
+        """
+        scopes = []
+
+        async def inner(scope, receive, send):
+            scopes.append(scope)
+
+        headers = []
+        if session_key is not None:
+            headers.append((b"cookie", f"sessionid={session_key}".encode()))
+        async_to_sync(CachedAuthMiddlewareStack(inner))(
+            {"type": "websocket", "path": "/", "headers": headers}, None, None
+        )
+        return scopes[0]["user"]
+
+    def test_anonymous(self):
+        """
+        세션이 없거나 잘못된 세션인 경우 AnonymousUser 테스트
+        """
+        self.assertTrue(self.resolve_user().is_anonymous)
+        self.assertTrue(self.resolve_user("invalidsessionkey").is_anonymous)
+
+    def test_expired_session(self):
+        """
+        만료된 세션인 경우 AnonymousUser 테스트
+        """
+        session_key = self.login()
+        Session.objects.filter(session_key=session_key).update(
+            expire_date=timezone.now() - datetime.timedelta(seconds=1)
+        )
+        self.assertTrue(self.resolve_user(session_key).is_anonymous)
+
+    def test_cached_session(self):
+        """
+        같은 세션으로 다시 연결하면 세션 테이블을 조회하지 않고,
+        로그아웃하면 캐시에서 삭제되는지 테스트
+        """
+        session_key = self.login()
+        with self.assertNumQueries(2):
+            self.assertEqual(self.resolve_user(session_key), self.user)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.resolve_user(session_key), self.user)
+
+        self.client.logout()
+        self.assertIsNone(session_user_cache.get(session_key))
+        self.assertTrue(self.resolve_user(session_key).is_anonymous)
+
+    def test_password_changed(self):
+        """
+        다른 프로세스에서 비밀번호를 바꾸면 캐시된 세션도 AnonymousUser
+        """
+        session_key = self.login()
+        self.assertEqual(self.resolve_user(session_key), self.user)
+        self.assertIsNotNone(session_user_cache.get(session_key))
+
+        self.user.set_password("changed")
+        self.user.save()
+        self.assertTrue(self.resolve_user(session_key).is_anonymous)
+        self.assertIsNone(session_user_cache.get(session_key))
+
+    def test_inactive_user(self):
+        """
+        캐시된 유저가 비활성화된 경우 AnonymousUser 테스트
+        """
+        session_key = self.login()
+        self.resolve_user(session_key)
+        User.objects.filter(id=self.user.id).update(is_active=False)
+        self.assertTrue(self.resolve_user(session_key).is_anonymous)
+
+    def test_ttl_cache(self):
+        """
+        TTL 만료, 최대 개수 초과 시 삭제 테스트
+        """
+        now = [0]
+        cache = TTLCache(ttl=60, max_size=2, clock=lambda: now[0])
+        cache.set("a", 1)
+        cache.set("b", 2, ttl=10)
+        now[0] = 30
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+
+        cache.set("b", 2)
+        cache.set("c", 3)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("c"), 3)
+
+        now[0] = 91
+        self.assertIsNone(cache.get("b"))
+
+
+class TestLocalChannelLayer(TestCase):
+    """
+    단일 프로세스 채널 레이어 접속자 테스트
+    """
+
+    async def test_presence(self):
+        """
+        같은 유저가 여러 채널로 접속해도 한 번만 포함되는지 테스트
+        """
+        layer = LocalChannelLayer()
+        await layer.presence_add("room", "channel1", {"id": 1, "nickname": "a"})
+        await layer.presence_add("room", "channel2", {"id": 2, "nickname": "b"})
+        await layer.presence_add("room", "channel3", {"id": 1, "nickname": "a"})
+        self.assertEqual(
+            await layer.presence_list("room"),
+            [{"id": 1, "nickname": "a"}, {"id": 2, "nickname": "b"}],
+        )
+
+        await layer.presence_discard("room", "channel1")
+        self.assertEqual(len(await layer.presence_list("room")), 2)
+        await layer.presence_discard("room", "channel3")
+        self.assertEqual(
+            await layer.presence_list("room"), [{"id": 2, "nickname": "b"}]
+        )
+
+    async def test_presence_ttl(self):
+        """
+        만료된 접속 정보는 목록에서 제외되고 presence_expire에서 삭제되는지 테스트
+        """
+        layer = LocalChannelLayer()
+        await layer.presence_add("room", "channel1", {"id": 1, "nickname": "a"}, ttl=-1)
+        await layer.presence_add("room", "channel2", {"id": 2, "nickname": "b"}, ttl=60)
+        self.assertEqual(await layer.presence_filter("room", [1, 2, 3]), {2})
+        self.assertFalse(await layer.presence_touch("room", "channel1", ttl=60))
+        self.assertTrue(await layer.presence_touch("room", "channel2", ttl=60))
+
+        self.assertEqual(
+            await layer.presence_expire("room"), [{"id": 1, "nickname": "a"}]
+        )
+        self.assertEqual(await layer.presence_expire("room"), [])
+
+    async def test_presence_filter_by_user(self):
+        """
+        접속 여부 조회는 그룹 전체 접속자 목록을 만들지 않고 조회한 유저의 채널만 확인
+        """
+        layer = LocalChannelLayer()
+        for num in range(100):
+            await layer.presence_add(
+                "room", f"channel{num}", {"id": num, "nickname": "a"}
+            )
+        await layer.presence_add(
+            "room", "channel100", {"id": 0, "nickname": "a"}, ttl=-1
+        )
+        with mock.patch.object(layer, "presence_list", side_effect=AssertionError):
+            self.assertEqual(await layer.presence_filter("room", [0, 1, 200]), {0, 1})
+            await layer.presence_discard("room", "channel0")
+            self.assertEqual(await layer.presence_filter("room", [0]), set())
+        self.assertEqual(
+            await layer.presence_expire("room"), [{"id": 0, "nickname": "a"}]
+        )
+        self.assertNotIn(0, layer.presence_users["room"])
+
+
+CHANNEL_LAYER_WORKER = """
+import asyncio, json, sys
+import django
+
+django.setup()
+from chats.layers import SQLiteChannelLayer
+
+
+async def main():
+    layer = SQLiteChannelLayer(sys.argv[1])
+    channel = await layer.new_channel()
+    await layer.group_add("chatroom_1", channel)
+    await layer.presence_add("chatroom_1", channel, {"id": 2, "nickname": "worker"})
+    print("ready", flush=True)
+    message = await layer.receive(channel)
+    await layer.group_send("chatroom_reply", {"type": "reply", "message": message})
+    print(json.dumps(message), flush=True)
+    await layer.close()
+
+
+asyncio.run(main())
+"""
+
+
+class TestSQLiteChannelLayer(TestCase):
+    """
+    SQLite 다중 프로세스 채널 레이어 테스트
+    """
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.path = os.path.join(directory, "channels.sqlite3")
+
+    def get_layer(self, **kwargs):
+        layer = SQLiteChannelLayer(self.path, **kwargs)
+        self.addCleanup(layer.executor.shutdown)
+        return layer
+
+    async def test_send_receive(self):
+        """
+        일반 채널, 프로세스별 채널 메시지 전달 테스트
+        """
+        layer = self.get_layer()
+        await layer.send("test-channel", {"type": "test", "value": 1})
+        await layer.send("test-channel", {"type": "test", "value": 2})
+        self.assertEqual((await layer.receive("test-channel"))["value"], 1)
+        self.assertEqual((await layer.receive("test-channel"))["value"], 2)
+
+        channel = await layer.new_channel()
+        await layer.send(channel, {"type": "test", "value": 3})
+        self.assertEqual(
+            await asyncio.wait_for(layer.receive(channel), 5),
+            {"type": "test", "value": 3},
+        )
+        await layer.close()
+
+    async def test_capacity(self):
+        """
+        채널 용량을 넘으면 send는 ChannelFull, group_send는 해당 채널만 건너뛰는지 테스트
+        """
+        layer = self.get_layer(capacity=2)
+        await layer.group_add("room", "full-channel")
+        await layer.group_add("room", "other-channel")
+        await layer.send("full-channel", {"type": "test"})
+        await layer.send("full-channel", {"type": "test"})
+        with self.assertRaises(ChannelFull):
+            await layer.send("full-channel", {"type": "test"})
+
+        await layer.group_send("room", {"type": "group"})
+        self.assertEqual((await layer.receive("other-channel"))["type"], "group")
+
+    async def test_groups_between_instances(self):
+        """
+        같은 파일을 사용하는 다른 레이어 인스턴스(프로세스)의 그룹에 메시지 전달 테스트
+        """
+        layer1 = self.get_layer()
+        layer2 = self.get_layer()
+        channel1 = await layer1.new_channel()
+        channel2 = await layer2.new_channel()
+        await layer1.group_add("room", channel1)
+        await layer2.group_add("room", channel2)
+
+        await layer1.group_send("room", {"type": "chat_message", "message": "hi"})
+        self.assertEqual(
+            (await asyncio.wait_for(layer1.receive(channel1), 5))["message"], "hi"
+        )
+        self.assertEqual(
+            (await asyncio.wait_for(layer2.receive(channel2), 5))["message"], "hi"
+        )
+
+        await layer2.group_discard("room", channel2)
+        await layer1.group_send("room", {"type": "chat_message", "message": "bye"})
+        await asyncio.wait_for(layer1.receive(channel1), 5)
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(layer2.receive(channel2), 0.2)
+        await layer1.close()
+        await layer2.close()
+
+    async def test_presence_and_sequence(self):
+        """
+        레이어 인스턴스 간 접속자, 순번 공유 테스트
+        """
+        layer1 = self.get_layer()
+        layer2 = self.get_layer()
+        await layer1.presence_add("room", "channel1", {"id": 1, "nickname": "a"})
+        await layer2.presence_add("room", "channel2", {"id": 2, "nickname": "b"})
+        await layer2.presence_add("room", "channel3", {"id": 1, "nickname": "a"})
+        self.assertEqual(
+            await layer2.presence_list("room"),
+            [{"id": 1, "nickname": "a"}, {"id": 2, "nickname": "b"}],
+        )
+        await layer1.presence_discard("room", "channel2")
+        self.assertEqual(
+            await layer1.presence_list("room"), [{"id": 1, "nickname": "a"}]
+        )
+
+        await layer2.presence_add(
+            "room", "channel4", {"id": 3, "nickname": "c"}, ttl=-1
+        )
+        self.assertEqual(await layer1.presence_filter("room", [1, 2, 3]), {1})
+        self.assertFalse(await layer1.presence_touch("room", "channel4", ttl=60))
+        self.assertEqual(
+            await layer1.presence_expire("room"), [{"id": 3, "nickname": "c"}]
+        )
+
+        self.assertEqual(await layer1.sequence_next("room", 5), 6)
+        self.assertEqual(await layer2.sequence_next("room", 0), 7)
+        self.assertEqual(await layer1.sequence_next("room", 5), 8)
+        # 카운터가 DB에 저장된 순번보다 작으면 initial 다음 값부터 발급
+        self.assertEqual(await layer2.sequence_next("room", 20), 21)
+
+    async def test_presence_filter_uses_index(self):
+        """
+        접속 여부 조회는 전체 접속 정보를 읽지 않고 (그룹, 유저) 인덱스로 조회하는지 테스트
+        """
+        layer = self.get_layer()
+        await layer.presence_add("room", "channel1", {"id": 1, "nickname": "a"})
+        plan = await layer.run(
+            layer.execute,
+            "EXPLAIN QUERY PLAN SELECT DISTINCT user_id FROM channel_presence "
+            "WHERE name = ? AND expires > ? AND user_id IN (?, ?)",
+            ("room", time.time(), 1, 2),
+        )
+        self.assertIn("channel_presence_user", str(plan))
+
+    async def test_clean_expired(self):
+        """
+        메시지가 만료된 채널은 그룹, 접속자 정보에서 삭제되는지 테스트
+        """
+        layer = self.get_layer(expiry=0)
+        await layer.group_add("room", "dead-channel")
+        await layer.presence_add("room", "dead-channel", {"id": 1, "nickname": "a"})
+        await layer.send("dead-channel", {"type": "test"})
+
+        await layer.run(layer.clean_expired)
+        self.assertEqual(await layer.presence_list("room"), [])
+        self.assertEqual(
+            await layer.run(layer.execute, "SELECT COUNT(*) FROM channel_groups"),
+            [(0,)],
+        )
+
+    def test_cross_process_delivery(self):
+        """
+        다른 프로세스의 채팅 워커와 그룹 메시지, 접속자 공유 테스트
+        """
+        worker = subprocess.Popen(
+            [sys.executable, "-c", CHANNEL_LAYER_WORKER, self.path],
+            cwd=settings.BASE_DIR,
+            env={**os.environ, "DJANGO_SETTINGS_MODULE": "deVtail.settings"},
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        self.addCleanup(worker.kill)
+        self.assertEqual(worker.stdout.readline().strip(), "ready")
+
+        async def send_and_receive():
+            layer = self.get_layer()
+            channel = await layer.new_channel()
+            await layer.group_add("chatroom_reply", channel)
+            users = await layer.presence_list("chatroom_1")
+            await layer.group_send(
+                "chatroom_1", {"type": "chat_message", "message": "안녕"}
+            )
+            reply = await asyncio.wait_for(layer.receive(channel), 10)
+            await layer.close()
+            return users, reply
+
+        users, reply = async_to_sync(send_and_receive)()
+        output, errors = worker.communicate(timeout=10)
+        self.assertEqual(worker.returncode, 0, errors)
+        self.assertEqual(users, [{"id": 2, "nickname": "worker"}])
+        self.assertEqual(
+            json.loads(output), {"type": "chat_message", "message": "안녕"}
+        )
+        self.assertEqual(reply["message"]["message"], "안녕")
+
+
+REDIS_TEST_URL = os.environ.get("REDIS_TEST_URL", "redis://localhost:6379/15")
+
+
+def redis_available():
+    try:
+        import redis
+
+        client = redis.Redis.from_url(REDIS_TEST_URL, socket_connect_timeout=0.5)
+        client.ping()
+        client.close()
+    except Exception:
+        return False
+    return True
+
+
+@skipUnless(redis_available(), "Redis 서버가 없습니다. (REDIS_TEST_URL)")
+class TestRedisChannelLayer(TestCase):
+    """
+    Redis 채널 레이어 테스트 (Redis 서버가 있을 때만 실행)
+    """
+
+    def get_layer(self):
+        layer = RedisChannelLayer(
+            hosts=[REDIS_TEST_URL], prefix=f"test-{uuid.uuid4().hex}"
+        )
+        self.addCleanup(async_to_sync(self.close_layer), layer)
+        return layer
+
+    async def close_layer(self, layer):
+        await layer.flush()
+        await layer.close_pools()
+
+    async def test_send_receive(self):
+        """
+        채널, 그룹 메시지 전달 테스트
+        """
+        layer = self.get_layer()
+        channel = await layer.new_channel()
+        await layer.group_add("room", channel)
+        await layer.group_send("room", {"type": "chat_message", "message": "hi"})
+        self.assertEqual(
+            (await asyncio.wait_for(layer.receive(channel), 5))["message"], "hi"
+        )
+
+    async def test_presence_and_sequence(self):
+        """
+        접속자 추가, 갱신, 삭제, 만료와 순번 테스트
+        """
+        layer = self.get_layer()
+        await layer.presence_add("room", "channel1", {"id": 1, "nickname": "a"})
+        await layer.presence_add("room", "channel2", {"id": 2, "nickname": "b"})
+        await layer.presence_add("room", "channel3", {"id": 1, "nickname": "a"})
+        self.assertEqual(
+            await layer.presence_list("room"),
+            [{"id": 1, "nickname": "a"}, {"id": 2, "nickname": "b"}],
+        )
+        self.assertTrue(await layer.presence_touch("room", "channel2", ttl=60))
+        await layer.presence_discard("room", "channel2")
+        self.assertFalse(await layer.presence_touch("room", "channel2", ttl=60))
+        self.assertEqual(await layer.presence_filter("room", [1, 2]), {1})
+
+        await layer.presence_add("room", "channel4", {"id": 3, "nickname": "c"}, ttl=-1)
+        self.assertFalse(await layer.presence_touch("room", "channel4", ttl=60))
+        self.assertEqual(
+            await layer.presence_expire("room"), [{"id": 3, "nickname": "c"}]
+        )
+
+        self.assertEqual(await layer.sequence_next("room", 5), 6)
+        self.assertEqual(await layer.sequence_next("room", 0), 7)
+        self.assertEqual(await layer.sequence_next("room", 20), 21)
+
+    async def test_touch_does_not_resurrect(self):
+        """
+        갱신과 삭제가 동시에 실행되어도 삭제된 접속 정보가 다시 저장되지 않는지 테스트
+        """
+        layer = self.get_layer()
+        for num in range(20):
+            channel = f"channel{num}"
+            await layer.presence_add("room", channel, {"id": num, "nickname": "a"})
+            await asyncio.gather(
+                *[layer.presence_touch("room", channel, ttl=60) for _ in range(5)],
+                layer.presence_discard("room", channel),
+                *[layer.presence_touch("room", channel, ttl=60) for _ in range(5)],
+            )
+        self.assertEqual(await layer.presence_list("room"), [])
+
+    async def test_presence_filter_cost(self):
+        """
+        접속 여부 조회는 다른 접속자 수와 관계없이 조회한 유저마다 명령 하나만 실행하는지 테스트
+        """
+        from redis.asyncio.client import Pipeline, Redis
+
+        layer = self.get_layer()
+        for num in range(100):
+            await layer.presence_add(
+                "online", f"channel{num}", {"id": num, "nickname": "a"}
+            )
+        with mock.patch.object(
+            Redis, "hgetall", side_effect=AssertionError
+        ), mock.patch.object(
+            Pipeline,
+            "execute_command",
+            autospec=True,
+            side_effect=Pipeline.execute_command,
+        ) as execute_command:
+            self.assertEqual(await layer.presence_filter("online", [0, 1, 200]), {0, 1})
+        self.assertEqual(execute_command.call_count, 3)
+
+        # 만료 정리도 만료된 채널만 확인
+        await layer.presence_add(
+            "online", "channel0", {"id": 0, "nickname": "a"}, ttl=-1
+        )
+        with mock.patch.object(Redis, "hgetall", side_effect=AssertionError):
+            self.assertEqual(
+                await layer.presence_expire("online"), [{"id": 0, "nickname": "a"}]
+            )
+        self.assertEqual(await layer.presence_filter("online", [0, 1]), {1})
+
+
+@override_settings(CHAT_MESSAGE_SPOOL_DIR=SPOOL_DIR, CHAT_PRESENCE_TTL=1)
+class TestChatPresence(SpoolDirMixin, TestCase):
+    """
+    채팅 접속자 테스트
+    """
+
+    def setUp(self):
+        super().setUp()
+        async_to_sync(get_channel_layer().flush)()
+        self.user1 = User.objects.create_user(
+            email="test1@naver.com", password="test1", nickname="test1"
+        )
+        self.user2 = User.objects.create_user(
+            email="test2@naver.com", password="test2", nickname="test2"
+        )
+        self.chat_room = DirectChat.objects.create()
+        self.chat_room.users.add(self.user1, self.user2)
+        self.session_keys = {}
+        for user in [self.user1, self.user2]:
+            client = Client()
+            client.force_login(user)
+            self.session_keys[user.id] = client.cookies["sessionid"].value
+
+    def get_communicator(self, user):
+        return WebsocketCommunicator(
+            application,
+            f"/ws/directchat/{self.chat_room.id}/",
+            headers=[(b"cookie", f"sessionid={self.session_keys[user.id]}".encode())],
+        )
+
+    async def enter(self, communicator):
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        login = await communicator.receive_json_from()
+        self.assertEqual(login["heartbeat_interval"], 20)
+        await communicator.send_json_to({"type": "auth"})
+        return await self.drain(communicator)
+
+    async def drain(self, communicator):
+        messages = []
+        while not await communicator.receive_nothing(timeout=0.1):
+            messages.append(await communicator.receive_json_from())
+        return [message for message in messages if message.get("type") != "history"]
+
+    def presence(self, event, user):
+        return {
+            "type": "presence",
+            "event": event,
+            "user": {"id": user.id, "nickname": user.nickname},
+        }
+
+    async def test_join_and_leave(self):
+        """
+        입장 시 접속자 목록은 본인에게만 보내고, 그룹에는 입장, 퇴장만 전달하는지 테스트
+        같은 유저의 다른 탭은 입장, 퇴장으로 전달하지 않음
+        """
+        communicator1 = self.get_communicator(self.user1)
+        self.assertEqual(
+            await self.enter(communicator1),
+            [
+                {
+                    "type": "current_users",
+                    "users": [{"id": self.user1.id, "nickname": "test1"}],
+                },
+                self.presence("join", self.user1),
+            ],
+        )
+
+        communicator2 = self.get_communicator(self.user2)
+        messages = await self.enter(communicator2)
+        self.assertIn(
+            {
+                "type": "current_users",
+                "users": [
+                    {"id": self.user1.id, "nickname": "test1"},
+                    {"id": self.user2.id, "nickname": "test2"},
+                ],
+            },
+            messages,
+        )
+        self.assertEqual(
+            await self.drain(communicator1), [self.presence("join", self.user2)]
+        )
+
+        other_tab = self.get_communicator(self.user2)
+        await self.enter(other_tab)
+        self.assertEqual(await self.drain(communicator1), [])
+        await other_tab.disconnect()
+        self.assertEqual(await self.drain(communicator1), [])
+
+        await communicator2.disconnect()
+        self.assertEqual(
+            await self.drain(communicator1), [self.presence("leave", self.user2)]
+        )
+        await communicator1.disconnect()
+
+    async def test_heartbeat_expiry(self):
+        """
+        heartbeat가 끊긴 접속자는 다른 접속자의 heartbeat에서 퇴장 처리되는지 테스트
+        """
+        communicator1 = self.get_communicator(self.user1)
+        communicator2 = self.get_communicator(self.user2)
+        await self.enter(communicator1)
+        await self.enter(communicator2)
+        await self.drain(communicator1)
+
+        await asyncio.sleep(0.6)
+        await communicator1.send_json_to({"type": "heartbeat"})
+        self.assertEqual(await self.drain(communicator1), [])
+        await asyncio.sleep(0.6)
+        await communicator1.send_json_to({"type": "heartbeat"})
+        self.assertEqual(
+            await self.drain(communicator1), [self.presence("leave", self.user2)]
+        )
+
+        # 만료된 접속자가 다시 heartbeat를 보내면 입장 처리
+        await communicator2.send_json_to({"type": "heartbeat"})
+        self.assertEqual(
+            await self.drain(communicator1), [self.presence("join", self.user2)]
+        )
+        await communicator1.disconnect()
+        await communicator2.disconnect()
+
+    def test_online_users(self):
+        """
+        웹소켓 없이 유저 접속 여부 조회 테스트
+        """
+        async_to_sync(get_channel_layer().presence_add)(
+            ONLINE_GROUP, "channel", {"id": self.user2.id, "nickname": "test2"}, 60
+        )
+        self.assertEqual(
+            get_online_user_ids([self.user1.id, self.user2.id]), {self.user2.id}
+        )
+
+        self.client.force_login(self.user1)
+        response = self.client.get(
+            reverse("chats:online_users"),
+            {"user_id": [self.user1.id, self.user2.id]},
+        )
+        self.assertEqual(response.json(), {"online": [self.user2.id]})
+        response = self.client.get(reverse("chats:online_users"), {"user_id": "a"})
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.get(
+            reverse("accounts:profile", kwargs={"pk": self.user2.id})
+        )
+        self.assertTrue(response.context["is_online"])
+
+
+@override_settings(CHAT_MESSAGE_SPOOL_DIR=SPOOL_DIR, CHAT_MESSAGE_BATCH_SIZE=5)
+class TestStudyChatConsumer(SpoolDirMixin, TestCase):
+    """
+    스터디 채팅 consumer 테스트
+    """
+
+    def setUp(self):
+        super().setUp()
+        message_buffer.sequences.clear()
+        study_member_cache.clear()
+        self.users = [
+            User.objects.create_user(
+                email=f"test{num}@naver.com", password="test", nickname=f"test{num}"
+            )
+            for num in range(4)
+        ]
+        self.study = Study.objects.create(
+            category=Category.objects.create(name="test"),
+            goal="test",
+            title="스터디",
+            start_at=datetime.date.today(),
+            end_at=datetime.date.today(),
+            difficulty=Study.difficulty_choices[0][0],
+            max_member=10,
+        )
+        for num, user in enumerate(self.users[:3]):
+            StudyMember.objects.create(
+                study=self.study, user=user, is_accepted=True, is_manager=num == 0
+            )
+        # 승인 대기 중인 멤버
+        self.pending_member = StudyMember.objects.create(
+            study=self.study, user=self.users[3], is_accepted=False
+        )
+        self.chat_room = StudyChat.objects.create(study=self.study)
+        self.session_keys = {}
+        for user in self.users:
+            client = Client()
+            client.force_login(user)
+            self.session_keys[user.id] = client.cookies["sessionid"].value
+
+    def get_communicator(self, user):
+        return WebsocketCommunicator(
+            application,
+            f"/ws/studychat/{self.chat_room.id}/",
+            headers=[(b"cookie", f"sessionid={self.session_keys[user.id]}".encode())],
+        )
+
+    async def enter(self, communicator):
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        login = await communicator.receive_json_from()
+        self.assertEqual(login["message"], "스터디의 채팅")
+        await communicator.send_json_to({"type": "auth"})
+
+    async def drain(self, communicator):
+        while not await communicator.receive_nothing(timeout=0.1):
+            await communicator.receive_json_from()
+
+    async def test_broadcast(self):
+        """
+        스터디 멤버 모두에게 메시지가 전달되고 스터디 채팅방에 저장되는지 테스트
+        """
+        communicators = [self.get_communicator(user) for user in self.users[:3]]
+        for communicator in communicators:
+            await self.enter(communicator)
+        for communicator in communicators:
+            await self.drain(communicator)
+
+        await communicators[1].send_json_to(
+            {"type": "chat_message", "message": "안녕하세요"}
+        )
+        for communicator in communicators:
+            message = await communicator.receive_json_from()
+            self.assertEqual(
+                message,
+                {
+                    "message": "안녕하세요",
+                    "sender": self.users[1].id,
+                    "nickname": "test1",
+                    "sequence": 1,
+                },
+            )
+
+        for communicator in communicators:
+            await communicator.disconnect()
+        self.assertEqual(
+            [
+                (message.message, message.author_id)
+                async for message in ChatMessage.objects.filter(
+                    study_chat=self.chat_room
+                )
+            ],
+            [("안녕하세요", self.users[1].id)],
+        )
+
+    async def test_reject_not_member(self):
+        """
+        승인되지 않은 멤버, 스터디 멤버가 아닌 유저의 연결 거부 테스트
+        """
+        connected, _ = await self.get_communicator(self.users[3]).connect()
+        self.assertFalse(connected)
+
+        await StudyMember.objects.filter(id=self.pending_member.id).adelete()
+        connected, _ = await self.get_communicator(self.users[3]).connect()
+        self.assertFalse(connected)
+
+    def test_member_cache(self):
+        """
+        멤버 여부는 캐시하고, StudyMember 변경 시 캐시를 삭제하는지 테스트
+        """
+
+        async def connect(user):
+            communicator = self.get_communicator(user)
+            connected, _ = await communicator.connect()
+            await communicator.disconnect()
+            return connected
+
+        self.assertFalse(async_to_sync(connect)(self.users[3]))
+        # 세션 유저, 채팅방만 조회하고 멤버 여부는 캐시 사용
+        with self.assertNumQueries(2):
+            self.assertFalse(async_to_sync(connect)(self.users[3]))
+
+        self.pending_member.is_accepted = True
+        self.pending_member.save()
+        self.assertTrue(async_to_sync(connect)(self.users[3]))
+
+    def test_study_chat_view(self):
+        """
+        스터디 채팅방 연결, 대화 조회 view 테스트
+        """
+        self.client.force_login(self.users[3])
+        response = self.client.get(
+            reverse("chats:connect_study_chat", kwargs={"study_id": self.study.id})
+        )
+        self.assertEqual(response.status_code, 403)
+        response = self.client.get(
+            reverse("chats:study_chat_history", kwargs={"room_id": self.chat_room.id})
+        )
+        self.assertEqual(response.status_code, 404)
+
+        ChatMessage.objects.create(
+            message="이전 메시지",
+            study_chat=self.chat_room,
+            author=self.users[0],
+            sequence=1,
+        )
+        self.client.force_login(self.users[0])
+        response = self.client.get(
+            reverse("chats:connect_study_chat", kwargs={"study_id": self.study.id})
+        )
+        self.assertEqual(response.context["room_id"], self.chat_room.id)
+        self.assertEqual(response.context["chat_type"], "studychat")
+        response = self.client.get(
+            reverse("chats:study_chat_history", kwargs={"room_id": self.chat_room.id})
+        )
+        self.assertEqual(
+            [message["message"] for message in response.json()["messages"]],
+            ["이전 메시지"],
+        )
@@ -10,4 +10,25 @@ urlpatterns = [
         views.create_or_connect_direct_chat,
         name="create_or_connect_direct_chat",
     ),
+    path(
+        "directchat/<int:room_id>/",
+        views.connect_direct_chat,
+        name="connect_direct_chat",
+    ),
+    path(
+        "directchat/<int:room_id>/messages/",
+        views.direct_chat_history,
+        name="direct_chat_history",
+    ),
+    path(
+        "studychat/<int:study_id>/",
+        views.connect_study_chat,
+        name="connect_study_chat",
+    ),
+    path(
+        "studychat/rooms/<int:room_id>/messages/",
+        views.study_chat_history,
+        name="study_chat_history",
+    ),
+    path("presence/", views.online_users, name="online_users"),
 ]
@@ -1,9 +1,12 @@
 from django.shortcuts import render, get_object_or_404
-from django.http import JsonResponse
+from django.http import Http404, JsonResponse
 from django.contrib.auth.decorators import login_required
 from django.urls import reverse
 from django.http import HttpResponseRedirect
-from .models import DirectChat
+from .history import HISTORY_PAGE_SIZE, get_history
+from .presence import get_online_user_ids
+from .models import DirectChat, StudyChat
+from studies.models import Study, StudyMember
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -43,3 +46,93 @@ def create_or_connect_direct_chat(request):
         return render(request, "chats/temp_direct_chat.html", {"room_id": room_id})
     # 우선 JsonResponse로 에러 처리 (추후 리다이렉트로 변경)
     return JsonResponse({"error": "Invalid room ID."}, status=400)
+
+
+@login_required
+def connect_direct_chat(request, room_id):
+    """
+    개인 채팅방 연결 (채팅 알림 링크)
+    채팅방 유저만 입장 가능
+    """
+    get_object_or_404(DirectChat, id=room_id, users=request.user)
+    return render(request, "chats/temp_direct_chat.html", {"room_id": room_id})
+
+
+@login_required
+def direct_chat_history(request, room_id):
+    """
+    개인 채팅방 대화 조회
+    - before: 해당 순번 이전의 메시지 조회 (이전 대화 더보기)
+    - since: 해당 순번 이후의 메시지 조회 (재연결 시 놓친 메시지)
+    - limit: 조회할 메시지 수
+    """
+    get_object_or_404(DirectChat, id=room_id, users=request.user)
+    return get_history_response(request, {"direct_chat_id": room_id})
+
+
+@login_required
+def connect_study_chat(request, study_id):
+    """
+    스터디 채팅방 연결
+    승인된 스터디 멤버만 입장할 수 있으며, 채팅방이 없으면 생성
+    """
+    study = get_object_or_404(Study, id=study_id)
+    if not StudyMember.objects.filter(
+        study=study, user=request.user, is_accepted=True
+    ).exists():
+        return JsonResponse({"error": "Not a study member."}, status=403)
+
+    chat_room = StudyChat.objects.filter(study=study).order_by("id").first()
+    if chat_room is None:
+        chat_room = StudyChat.objects.create(study=study)
+    return render(
+        request,
+        "chats/temp_direct_chat.html",
+        {"room_id": chat_room.id, "chat_type": "studychat"},
+    )
+
+
+@login_required
+def study_chat_history(request, room_id):
+    """
+    스터디 채팅방 대화 조회
+    파라미터는 direct_chat_history와 같음
+    """
+    chat_room = get_object_or_404(StudyChat, id=room_id)
+    if not StudyMember.objects.filter(
+        study_id=chat_room.study_id, user=request.user, is_accepted=True
+    ).exists():
+        raise Http404
+    return get_history_response(request, {"study_chat_id": room_id})
+
+
+def get_history_response(request, room):
+    """
+    before, since, limit 파라미터로 대화를 조회하여 JSON으로 반환
+    """
+    try:
+        params = {
+            name: int(request.GET[name])
+            for name in ["before", "since", "limit"]
+            if request.GET.get(name)
+        }
+    except ValueError:
+        return JsonResponse({"error": "Invalid cursor."}, status=400)
+
+    params.setdefault("limit", HISTORY_PAGE_SIZE)
+    return JsonResponse(get_history(room, **params))
+
+
+@login_required
+def online_users(request):
+    """
+    유저 접속 여부 조회
+    - user_id: 조회할 유저 id (여러 개 가능, 최대 100개)
+    - online: user_id 중 접속 중인 유저 id 목록
+    """
+    try:
+        user_ids = [int(user_id) for user_id in request.GET.getlist("user_id")[:100]]
+    except ValueError:
+        return JsonResponse({"error": "Invalid user ID."}, status=400)
+
+    return JsonResponse({"online": sorted(get_online_user_ids(user_ids))})
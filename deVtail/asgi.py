@@ -3,15 +3,21 @@ from django.core.asgi import get_asgi_application
 from channels.routing import ProtocolTypeRouter, URLRouter
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "deVtail.settings")
-application = get_asgi_application()
+# 앱 import 전에 Django 설정을 불러오기 위해 먼저 생성
+django_asgi_application = get_asgi_application()
 
+import alerts.routing
 import chats.routing
+from chats.middleware import CachedAuthMiddlewareStack
 
 application = ProtocolTypeRouter(
     {
-        "http": get_asgi_application(),
-        "websocket": URLRouter(
-            chats.routing.websocket_urlpatterns,
+        "http": django_asgi_application,
+        "websocket": CachedAuthMiddlewareStack(
+            URLRouter(
+                chats.routing.websocket_urlpatterns
+                + alerts.routing.websocket_urlpatterns,
+            )
         ),
     }
 )
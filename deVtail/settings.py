@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 from pathlib import Path
 import environ
 import os
+from urllib.parse import urlparse
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -60,9 +61,12 @@ INSTALLED_APPS = [
     "devmates",
     "todos",
     "chats",
+    "jobs",
+    "images",
 ]
 
 MIDDLEWARE = [
+    "main.queries.QueryBudgetMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "allauth.account.middleware.AccountMiddleware",
@@ -94,7 +98,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "deVtail.wsgi.application"
-ASGI_APPLICATION = "chats.routing.application"
+ASGI_APPLICATION = "deVtail.asgi.application"
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
@@ -177,6 +181,13 @@ DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 EMAIL_CONFIRMATION_AUTHENTICATED_REDIRECT_URL = "/accounts/login/"
 ACCOUNT_EMAIL_CONFIRMATION_EXPIRE_DAYS = 1
 
+# 메일 발송 대기열 설정
+# 대기 메일은 EMAIL_OUTBOX_BATCH_SIZE개씩 SMTP 연결 하나로 발송하고,
+# 실패하면 EMAIL_OUTBOX_RETRY_BACKOFF초부터 두 배씩 늘려 EMAIL_OUTBOX_MAX_ATTEMPTS번까지 발송
+EMAIL_OUTBOX_BATCH_SIZE = 50
+EMAIL_OUTBOX_RETRY_BACKOFF = 30
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+
 SITE_ID = 3
 
 ACCOUNT_AUTHENTICATION_METHOD = "email"
@@ -193,11 +204,134 @@ LOGIN_REDIRECT_URL = "/"
 LOGIN_URL = "accounts:login"
 PASSWORD_RESET_TIMEOUT = 3600
 
-os.environ["DJANGO_ALLOW_ASYNC_UNSAFE"] = "true"
-
 # Django Channels 설정
-CHANNEL_LAYERS = {
-    "default": {
-        "BACKEND": "channels.layers.InMemoryChannelLayer",
-    },
+# 채널 레이어
+# - memory:// : 단일 프로세스 (기본값)
+# - sqlite:///<path> : 같은 서버의 여러 채팅 프로세스가 SQLite 파일 공유
+# - redis://<host>:<port>/<db> : 여러 서버 (channels-redis 설치 필요)
+CHANNEL_LAYER_URL = env("CHANNEL_LAYER_URL", default="memory://")
+_channel_layer_url = urlparse(CHANNEL_LAYER_URL)
+
+if _channel_layer_url.scheme in ("redis", "rediss"):
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "chats.layers.RedisChannelLayer",
+            "CONFIG": {"hosts": [CHANNEL_LAYER_URL]},
+        },
+    }
+elif _channel_layer_url.scheme == "sqlite":
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "chats.layers.SQLiteChannelLayer",
+            "CONFIG": {
+                "path": _channel_layer_url.path or BASE_DIR / "channels.sqlite3"
+            },
+        },
+    }
+else:
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "chats.layers.LocalChannelLayer",
+        },
+    }
+
+# 채팅 메시지 저장 설정
+# 메시지를 CHAT_MESSAGE_BATCH_SIZE개 또는 CHAT_MESSAGE_FLUSH_INTERVAL_MS마다 모아서 저장
+CHAT_MESSAGE_BATCH_SIZE = 50
+CHAT_MESSAGE_FLUSH_INTERVAL_MS = 200
+CHAT_MESSAGE_SPOOL_DIR = BASE_DIR / "chat_spool"
+
+# 웹소켓 인증 시 세션 키 -> 유저 id 캐시 유지 시간(초)와 캐시
+# 여러 프로세스에서 실행하면 공유 캐시를 지정하여 로그아웃 시 모든 프로세스에서 바로 삭제
+CHAT_SESSION_CACHE_TTL = 60
+CHAT_SESSION_CACHE = "default"
+
+# 스터디 채팅 연결 시 스터디 멤버 여부 캐시 유지 시간(초)
+CHAT_STUDY_MEMBER_CACHE_TTL = 60
+
+# 읽지 않은 알림 수 캐시 유지 시간(초)
+# 알림 생성, 읽음 처리 시 카운터를 갱신하며, 캐시가 만료되면 다시 계산
+ALERT_UNREAD_COUNT_TTL = 300
+
+# 한 번에 ALERT_QUEUE_THRESHOLD명보다 많은 유저에게 보내는 알림은 요청 처리 중에 전달하지 않고
+# 대기열에 저장하며, 작업 실행기가 ALERT_QUEUE_BATCH_SIZE개씩 나눠 전달
+ALERT_QUEUE_THRESHOLD = 20
+ALERT_QUEUE_BATCH_SIZE = 200
+
+# 공휴일 달력 설정 (main.holiday_calendar)
+# 올해 기준 HOLIDAY_CALENDAR_YEARS_BEFORE년 전 ~ HOLIDAY_CALENDAR_YEARS_AFTER년 후의 공휴일을 미리 계산
+HOLIDAY_CALENDAR_COUNTRY = "KR"
+HOLIDAY_CALENDAR_LANGUAGE = "ko"
+HOLIDAY_CALENDAR_YEARS_BEFORE = 1
+HOLIDAY_CALENDAR_YEARS_AFTER = 2
+
+# 메인 화면 fragment 캐시 유지 시간(초) (main.fragments)
+# 공휴일은 날짜별로 캐시하고, 스터디 둘러보기는 스터디, 스터디 멤버가 바뀌면 삭제
+# 참여 중 스터디는 유저별로 짧게 캐시하고, 해당 유저의 멤버 정보가 바뀌면 삭제
+HOME_HOLIDAYS_CACHE_TTL = 60 * 60 * 24
+HOME_STUDIES_CACHE_TTL = 60 * 10
+HOME_MY_STUDIES_CACHE_TTL = 60
+
+# 작업 실행기(manage.py runjobs) 설정
+# 리더는 JOB_LOCK_TTL초 동안 잠금을 유지하며(작업 실행 중에는 JOB_LOCK_TTL / 3초마다 연장),
+# JOB_POLL_INTERVAL초마다 실행할 작업 확인
+JOB_LOCK_TTL = 60
+JOB_POLL_INTERVAL = 1
+JOB_RUN_HISTORY_DAYS = 14
+
+# 할 일 알림 동기화 시 마지막 동기화 시각보다 이 시간(초) 전부터 변경된 할 일을 다시 조회
+# (동기화 후에 커밋된 트랜잭션의 updated_at은 동기화 시각보다 이를 수 있음)
+TODO_REMINDER_SYNC_OVERLAP = 60 * 5
+
+# 알림 웹소켓 설정
+# 짧은 시간에 몰린 알림은 ALERT_PUSH_BATCH_MS 동안 모아서 한 번에 전달하고,
+# 연결 시 커서 이후의 읽지 않은 알림을 최대 ALERT_REPLAY_LIMIT개까지 다시 전달
+ALERT_PUSH_BATCH_MS = 200
+ALERT_REPLAY_LIMIT = 50
+
+# 채팅 접속자 설정
+# 클라이언트는 CHAT_PRESENCE_HEARTBEAT_INTERVAL초마다 heartbeat를 보내고,
+# CHAT_PRESENCE_TTL초 동안 heartbeat가 없으면 퇴장 처리
+CHAT_PRESENCE_HEARTBEAT_INTERVAL = 20
+CHAT_PRESENCE_TTL = 60
+
+# GitHub OAuth 설정
+# 모든 요청에 (연결, 응답) GITHUB_OAUTH_TIMEOUT초 timeout을 설정하고,
+# GitHub 프로필은 GITHUB_PROFILE_CACHE_TTL초 동안 캐시
+GITHUB_OAUTH_URL = "https://github.com"
+GITHUB_API_URL = "https://api.github.com"
+GITHUB_OAUTH_TIMEOUT = (3.05, 5)
+GITHUB_PROFILE_CACHE_TTL = 60 * 60 * 24
+
+# 이미지 변환 설정
+# 필드별 preset 크기(너비, 높이)로 IMAGE_RENDITION_DENSITIES배 크기의 WebP, JPEG 이미지를 만들며,
+# 높이가 None이면 원본 비율 유지
+IMAGE_RENDITION_PRESETS = {
+    "avatar": (64, 64),
+    "profile": (288, 288),
+    "thumbnail": (288, 288),
+    "cover": (720, None),
+}
+IMAGE_RENDITION_FIELDS = {
+    "accounts.User.profile_image": ("avatar", "profile"),
+    "studies.Study.thumbnail": ("thumbnail", "cover"),
 }
+IMAGE_RENDITION_DENSITIES = (1, 2)
+IMAGE_RENDITION_QUALITY = 80
+IMAGE_TASK_BATCH_SIZE = 20
+IMAGE_TASK_RETRY_DELAY = 60
+IMAGE_TASK_MAX_ATTEMPTS = 3
+
+# 원격 프로필 이미지는 IMAGE_REMOTE_HOSTS에서만 IMAGE_REMOTE_MAX_BYTES 크기까지 가져옴
+IMAGE_REMOTE_HOSTS = ["avatars.githubusercontent.com"]
+IMAGE_REMOTE_TIMEOUT = (3.05, 10)
+IMAGE_REMOTE_MAX_BYTES = 5 * 1024 * 1024
+
+# 요청별 쿼리 기록 설정 (main.queries.QueryBudgetMiddleware)
+# DEBUG이거나 QUERY_BUDGET_ENABLED이면 기록하며, 뷰의 쿼리 수가 예산(QUERY_BUDGETS, 없으면
+# QUERY_BUDGET_DEFAULT)을 넘거나 같은 형태의 쿼리가 QUERY_BUDGET_DUPLICATES번 이상 실행되면
+# 경고 로그를 남기고, DEBUG이면 화면에 요약 패널 표시
+QUERY_BUDGET_ENABLED = env.bool("QUERY_BUDGET_ENABLED", default=False)
+QUERY_BUDGET_DEFAULT = 30
+QUERY_BUDGET_DUPLICATES = 3
+QUERY_BUDGETS = {}
@@ -0,0 +1,58 @@
+# Generated by Django 4.2.7 on 2026-10-17 05:58
+
+from django.db import migrations, models
+import django.db.models.functions.comparison
+
+
+def remove_duplicates(apps, schema_editor):
+    """
+    제약조건 추가 전 중복 데이터 정리
+    - 신청 방향과 관계없이 두 사용자 사이의 DevMate는 1개만 남김
+    - 수락된 DevMate를 우선으로 남김
+    """
+    DevMate = apps.get_model("devmates", "DevMate")
+
+    pairs = set()
+    duplicate_ids = []
+    for devmate in DevMate.objects.order_by("-is_accepted", "id"):
+        pair = frozenset((devmate.sent_user_id, devmate.received_user_id))
+        if pair in pairs:
+            duplicate_ids.append(devmate.id)
+        pairs.add(pair)
+    DevMate.objects.filter(id__in=duplicate_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("devmates", "0002_remove_devmate_created_at"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicates, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="devmate",
+            index=models.Index(
+                fields=["sent_user", "is_accepted"], name="devmate_sent_accept_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="devmate",
+            index=models.Index(
+                fields=["received_user", "is_accepted"],
+                name="devmate_received_accept_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="devmate",
+            constraint=models.UniqueConstraint(
+                django.db.models.functions.comparison.Least(
+                    "sent_user", "received_user"
+                ),
+                django.db.models.functions.comparison.Greatest(
+                    "sent_user", "received_user"
+                ),
+                name="unique_devmate",
+            ),
+        ),
+    ]
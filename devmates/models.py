@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Greatest, Least
 
 
 class DevMate(models.Model):
@@ -18,6 +19,25 @@ class DevMate(models.Model):
     )
     is_accepted = models.BooleanField(default=False)
 
+    class Meta:
+        constraints = [
+            # 신청 방향과 관계없이 두 사용자 사이의 DevMate는 1개만 존재
+            models.UniqueConstraint(
+                Least("sent_user", "received_user"),
+                Greatest("sent_user", "received_user"),
+                name="unique_devmate",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["sent_user", "is_accepted"], name="devmate_sent_accept_idx"
+            ),
+            models.Index(
+                fields=["received_user", "is_accepted"],
+                name="devmate_received_accept_idx",
+            ),
+        ]
+
     def __str__(self):
         return (
             self.sent_user.nickname
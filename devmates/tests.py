@@ -1,5 +1,6 @@
 from django.contrib.auth import get_user_model
 from django.urls import reverse
+from django.db import IntegrityError, transaction
 from django.test import TestCase
 from .models import DevMate
 
@@ -129,3 +130,10 @@ class TestDevMate(TestCase):
             {"_method": "delete"},
         )
         self.assertEqual(response.status_code, 302)  # 삭제 성공, redirect
+
+    def test_devmate_unique_constraint(self):
+        """
+        신청 방향과 관계없이 두 유저 사이의 devmate가 중복 생성되지 않는지 확인
+        """
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            DevMate.objects.create(sent_user=self.user2, received_user=self.user1)
@@ -4,23 +4,30 @@ from django.views import View
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.db.models import Q
 from django.shortcuts import get_object_or_404, redirect
+from django.urls import reverse
 from django.views.generic import ListView, UpdateView, DeleteView
+from alerts.delivery import alert_users
+from chats.presence import get_online_user_ids
+from main.pagination import CursorPaginationMixin
 from .models import DevMate
 
 User = get_user_model()
 
 
-class DevMateListView(LoginRequiredMixin, ListView):
+class DevMateListView(LoginRequiredMixin, CursorPaginationMixin, ListView):
     """
     DevMate 목록 보기
     Detail:
         is_accepted가 True인 경우의 목록
+        최근 맺은 순(id)으로 커서 페이지네이션, 전체 페이지 수는 추정값
     """
 
     template_name = "devmate_list.html"
     model = DevMate
     context_object_name = "devmates"
     paginate_by = 8
+    cursor_ordering = ("-id",)
+    approximate_count = True
 
     def get_queryset(self):
         return DevMate.objects.filter(
@@ -28,6 +35,19 @@ class DevMateListView(LoginRequiredMixin, ListView):
             is_accepted=True,
         )
 
+    def get_context_data(self, **kwargs):
+        """
+        현재 페이지 DevMate의 채팅 접속 여부 추가
+        """
+        context = super().get_context_data(**kwargs)
+        context["online_user_ids"] = get_online_user_ids(
+            devmate.received_user_id
+            if devmate.sent_user_id == self.request.user.id
+            else devmate.sent_user_id
+            for devmate in context["page_obj"]
+        )
+        return context
+
 
 class DevMateReceivedListView(LoginRequiredMixin, ListView):
     """
@@ -70,6 +90,12 @@ class DevMateCreateView(LoginRequiredMixin, View):
                 received_user=received_user,
                 is_accepted=False,
             )
+            alert_users(
+                [received_user.id],
+                "alert_devmate",
+                f"{self.request.user.nickname}님이 DevMate를 신청했습니다.",
+                url=reverse("devmates:devmate_received_list"),
+            )
             messages.success(self.request, "DevMate 신청이 완료되었습니다.")
             return redirect("devmates:devmate_list")
 
@@ -88,6 +114,12 @@ class DevMateUpdateView(LoginRequiredMixin, UpdateView):
         if request.POST.get("_method") == "put":
             devmate.is_accepted = True
             devmate.save()
+            alert_users(
+                [devmate.sent_user_id],
+                "alert_devmate",
+                f"{devmate.received_user.nickname}님이 DevMate 신청을 수락했습니다.",
+                url=reverse("devmates:devmate_list"),
+            )
         return redirect("devmates:devmate_list")
 
 
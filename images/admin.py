@@ -0,0 +1,9 @@
+from django.contrib import admin
+
+from .models import ImageTask
+
+
+@admin.register(ImageTask)
+class ImageTaskAdmin(admin.ModelAdmin):
+    list_display = ("source", "field", "status", "attempts", "next_attempt_at")
+    list_filter = ("field", "status")
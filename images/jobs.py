@@ -0,0 +1,14 @@
+import datetime
+
+from jobs.registry import register
+
+from .renditions import process_image_tasks
+
+
+@register("process_images", interval=datetime.timedelta(seconds=5))
+def process_images():
+    """
+    이미지 변환 대기열 처리
+    """
+    result = process_image_tasks()
+    return f"변환 {result['done']}, 재시도 {result['retry']}, 실패 {result['failed']}"
@@ -0,0 +1,25 @@
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from images.renditions import enqueue_image
+
+
+class Command(BaseCommand):
+    help = (
+        "저장된 프로필 이미지, 스터디 썸네일 중 변환하지 않은 이미지를 변환 대기열에 등록합니다. "
+        "변환은 작업 실행기(runjobs)에서 처리합니다."
+    )
+
+    def handle(self, *args, **options):
+        for field in settings.IMAGE_RENDITION_FIELDS:
+            app_label, model_name, field_name = field.split(".")
+            model = apps.get_model(app_label, model_name)
+            names = (
+                model.objects.exclude(**{f"{field_name}__isnull": True})
+                .exclude(**{field_name: ""})
+                .values_list(field_name, flat=True)
+                .distinct()
+            )
+            queued = sum(1 for name in names.iterator() if enqueue_image(field, name))
+            self.stdout.write(f"{field}: {queued}개 등록")
@@ -0,0 +1,40 @@
+from django.db import models
+
+
+class ImageTask(models.Model):
+    """
+    이미지 변환 대기열 모델
+    source는 저장소의 이미지 경로 또는 아직 가져오지 않은 원격 이미지 URL
+    field는 이미지가 저장된 모델 필드 ("app_label.Model.field")
+    """
+
+    STATUS_QUEUED = "queued"
+    STATUS_FAILED = "failed"
+    STATUS_CATEGORY = (
+        (STATUS_QUEUED, "대기"),
+        (STATUS_FAILED, "실패"),
+    )
+
+    source = models.CharField(max_length=500, unique=True)
+    field = models.CharField(max_length=100)
+    status = models.CharField(
+        choices=STATUS_CATEGORY, max_length=20, default=STATUS_QUEUED
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField()
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "이미지 변환 작업"
+        verbose_name_plural = "이미지 변환 작업"
+        indexes = [
+            models.Index(
+                fields=["next_attempt_at"],
+                name="imagetask_queued_idx",
+                condition=models.Q(status="queued"),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.field} {self.source} ({self.status})"
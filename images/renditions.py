@@ -0,0 +1,248 @@
+"""
+이미지 변환(rendition)
+- 프로필 이미지, 스터디 썸네일은 원본 크기로 저장되므로, 화면에 표시할 크기(preset)별로
+  1x, 2x 크기의 WebP, JPEG 이미지를 만들어 renditions/ 아래에 저장
+- 변환은 요청 처리 중에 하지 않고, 이미지가 저장되면 ImageTask에 등록한 뒤
+  작업 실행기(runjobs)에서 처리
+- GitHub 프로필 이미지처럼 URL로 저장된 이미지는 허용된 호스트에서만 가져와 저장소에 저장하고,
+  모델 필드도 저장한 경로로 변경하여 외부 이미지를 직접 불러오지 않음
+"""
+
+import hashlib
+import logging
+from datetime import timedelta
+from io import BytesIO
+from urllib.parse import urlsplit
+
+import requests
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from jobs.claims import claim_rows
+
+from .models import ImageTask
+
+logger = logging.getLogger(__name__)
+
+RENDITION_FORMATS = (("webp", "WEBP"), ("jpg", "JPEG"))
+REMOTE_FORMATS = {"JPEG": "jpg", "PNG": "png", "GIF": "gif", "WEBP": "webp"}
+
+# 변환 중 종료된 작업은 이 시간이 지나면 다시 처리
+PROCESSING_TIMEOUT = timedelta(minutes=5)
+
+# 변환 완료 여부 캐시 유지 시간(초), 변환 전이면 짧게 캐시
+READY_CACHE_TTL = 60 * 60 * 24
+NOT_READY_CACHE_TTL = 60
+
+
+def is_remote(name):
+    return name.startswith(("http://", "https://"))
+
+
+def get_digest(name):
+    return hashlib.sha1(name.encode()).hexdigest()
+
+
+def get_rendition_name(name, preset, density, ext):
+    return f"renditions/{get_digest(name)}/{preset}_{density}x.{ext}"
+
+
+def get_rendition_size(preset, density=1):
+    """
+    preset의 (너비, 높이), 높이가 None이면 원본 비율 유지
+    """
+    width, height = settings.IMAGE_RENDITION_PRESETS[preset]
+    return width * density, height * density if height else None
+
+
+def get_ready_cache_key(name, preset):
+    return f"images:ready:{get_digest(name)}:{preset}"
+
+
+def is_ready(name, preset):
+    """
+    preset 변환 완료 여부
+    preset마다 마지막으로 저장하는 파일이 있으면 변환 완료
+    """
+    key = get_ready_cache_key(name, preset)
+    ready = cache.get(key)
+    if ready is None:
+        density = max(settings.IMAGE_RENDITION_DENSITIES)
+        ready = default_storage.exists(
+            get_rendition_name(name, preset, density, RENDITION_FORMATS[-1][0])
+        )
+        cache.set(key, ready, READY_CACHE_TTL if ready else NOT_READY_CACHE_TTL)
+    return ready
+
+
+def get_presets(field):
+    return settings.IMAGE_RENDITION_FIELDS[field]
+
+
+def render_image(image, size, image_format):
+    """
+    preset 크기로 자르거나 줄인 이미지를 image_format으로 저장한 bytes
+    """
+    width, height = size
+    if height is None:
+        height = max(1, round(image.height * width / image.width))
+    resized = ImageOps.fit(image, (width, height), Image.LANCZOS)
+    if image_format == "JPEG" and resized.mode != "RGB":
+        # 투명한 부분은 흰색 배경으로 채움
+        background = Image.new("RGB", resized.size, (255, 255, 255))
+        background.paste(resized, mask=resized.getchannel("A"))
+        resized = background
+    buffer = BytesIO()
+    resized.save(
+        buffer, image_format, quality=settings.IMAGE_RENDITION_QUALITY, optimize=True
+    )
+    return buffer.getvalue()
+
+
+def save_file(name, content):
+    # 같은 경로에 저장해야 하므로 기존 파일은 삭제 (FileSystemStorage는 다른 이름으로 저장)
+    if default_storage.exists(name):
+        default_storage.delete(name)
+    return default_storage.save(name, ContentFile(content))
+
+
+def generate_renditions(name, presets):
+    """
+    저장소의 이미지 name을 presets 크기로 변환하여 저장
+    반환값: 저장한 파일 수
+    """
+    density = max(settings.IMAGE_RENDITION_DENSITIES)
+    max_width = max(get_rendition_size(preset, density)[0] for preset in presets)
+    with default_storage.open(name, "rb") as file:
+        image = Image.open(file)
+        # JPEG는 필요한 크기 이상으로만 디코딩
+        image.draft(None, (max_width, max_width))
+        image = ImageOps.exif_transpose(image)
+        has_alpha = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+    saved = 0
+    for preset in presets:
+        for density in sorted(settings.IMAGE_RENDITION_DENSITIES):
+            size = get_rendition_size(preset, density)
+            for ext, image_format in RENDITION_FORMATS:
+                save_file(
+                    get_rendition_name(name, preset, density, ext),
+                    render_image(image, size, image_format),
+                )
+                saved += 1
+        cache.set(get_ready_cache_key(name, preset), True, READY_CACHE_TTL)
+    return saved
+
+
+def fetch_remote_image(url):
+    """
+    원격 이미지를 가져와 저장소에 저장
+    반환값: 저장한 경로
+    """
+    if urlsplit(url).hostname not in settings.IMAGE_REMOTE_HOSTS:
+        raise ValueError(f"허용되지 않은 이미지 호스트입니다. ({url})")
+    max_bytes = settings.IMAGE_REMOTE_MAX_BYTES
+    # 다른 호스트로 이동하지 않도록 redirect는 따라가지 않음
+    with requests.get(
+        url, timeout=settings.IMAGE_REMOTE_TIMEOUT, stream=True, allow_redirects=False
+    ) as response:
+        response.raise_for_status()
+        content = response.raw.read(max_bytes + 1, decode_content=True)
+    if len(content) > max_bytes:
+        raise ValueError(f"이미지가 너무 큽니다. ({url})")
+
+    image = Image.open(BytesIO(content))
+    image.verify()
+    ext = REMOTE_FORMATS.get(image.format)
+    if ext is None:
+        raise ValueError(f"지원하지 않는 이미지 형식입니다. ({image.format})")
+    return save_file(
+        f"remote/{hashlib.sha256(url.encode()).hexdigest()}.{ext}", content
+    )
+
+
+def enqueue_image(field, name):
+    """
+    이미지 변환 대기열에 등록
+    이미 변환한 이미지는 등록하지 않음
+    """
+    if not name:
+        return None
+    if not is_remote(name) and all(is_ready(name, p) for p in get_presets(field)):
+        return None
+    task, _ = ImageTask.objects.get_or_create(
+        source=name, defaults={"field": field, "next_attempt_at": timezone.now()}
+    )
+    return task
+
+
+def process_image_task(task):
+    """
+    원격 이미지는 저장소에 저장하여 모델 필드를 변경한 뒤 변환
+    """
+    name = task.source
+    if is_remote(name):
+        name = fetch_remote_image(task.source)
+        app_label, model_name, field_name = task.field.split(".")
+        model = apps.get_model(app_label, model_name)
+        model.objects.filter(**{field_name: task.source}).update(**{field_name: name})
+    return generate_renditions(name, get_presets(task.field))
+
+
+def claim_tasks(batch_size, now):
+    """
+    처리할 작업을 가져오고, 처리 중 다른 작업이 가져가지 않도록 다음 처리 시각 변경
+    여러 실행기가 동시에 가져가도 한 작업은 한 곳에서만 처리 (jobs.claims)
+    """
+    return claim_rows(
+        ImageTask.objects.filter(
+            status=ImageTask.STATUS_QUEUED, next_attempt_at__lte=now
+        ).order_by("next_attempt_at", "id"),
+        batch_size,
+        now + PROCESSING_TIMEOUT,
+    )
+
+
+def process_image_tasks(batch_size=None, now=None):
+    """
+    이미지 변환 대기열 처리
+    처리한 작업은 삭제하고, 실패한 작업은 IMAGE_TASK_RETRY_DELAY초씩 늘려 다시 처리하며
+    IMAGE_TASK_MAX_ATTEMPTS번 실패하면 실패로 기록
+    반환값: {"done": 처리한 이미지 수, "retry": 다시 처리할 이미지 수, "failed": 실패한 이미지 수}
+    """
+    batch_size = batch_size or settings.IMAGE_TASK_BATCH_SIZE
+    now = now or timezone.now()
+    result = {"done": 0, "retry": 0, "failed": 0}
+    tasks = claim_tasks(batch_size, now)
+    done = []
+    for task in tasks:
+        try:
+            process_image_task(task)
+        except Exception as error:
+            task.attempts += 1
+            task.last_error = repr(error)
+            if task.attempts >= settings.IMAGE_TASK_MAX_ATTEMPTS:
+                task.status = ImageTask.STATUS_FAILED
+                logger.error("이미지 변환 실패: %s %s", task.source, task.last_error)
+                result["failed"] += 1
+            else:
+                task.next_attempt_at = now + timedelta(
+                    seconds=settings.IMAGE_TASK_RETRY_DELAY * task.attempts
+                )
+                result["retry"] += 1
+        else:
+            done.append(task.id)
+            result["done"] += 1
+
+    ImageTask.objects.filter(id__in=done).delete()
+    ImageTask.objects.bulk_update(
+        [task for task in tasks if task.id not in done],
+        ["status", "attempts", "next_attempt_at", "last_error"],
+    )
+    return result
@@ -0,0 +1,31 @@
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save
+
+from .renditions import enqueue_image
+
+
+def connect_image_field(field):
+    """
+    field에 이미지가 저장되면 커밋 후 변환 대기열에 등록
+    """
+    app_label, model_name, field_name = field.split(".")
+
+    def image_saved(sender, instance, update_fields=None, **kwargs):
+        if update_fields is not None and field_name not in update_fields:
+            return
+        name = getattr(instance, field_name).name
+        if name:
+            transaction.on_commit(lambda: enqueue_image(field, name))
+
+    post_save.connect(
+        image_saved,
+        sender=apps.get_model(app_label, model_name),
+        weak=False,
+        dispatch_uid=f"images:{field}",
+    )
+
+
+for field in settings.IMAGE_RENDITION_FIELDS:
+    connect_image_field(field)
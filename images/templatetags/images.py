@@ -0,0 +1,61 @@
+from django import template
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.forms.utils import flatatt
+from django.utils.html import format_html
+
+from images.renditions import (
+    get_rendition_name,
+    get_rendition_size,
+    is_ready,
+    is_remote,
+)
+
+register = template.Library()
+
+
+def get_srcset(name, preset, ext):
+    return ", ".join(
+        f"{default_storage.url(get_rendition_name(name, preset, density, ext))} {density}x"
+        for density in sorted(settings.IMAGE_RENDITION_DENSITIES)
+    )
+
+
+@register.simple_tag
+def rendition(image, preset, **attrs):
+    """
+    preset 크기로 변환한 이미지 태그
+    변환한 이미지가 있으면 WebP, JPEG srcset을 사용하고, 없으면 원본 이미지 사용
+    사용법: {% rendition user.profile_image "avatar" alt="프로필 이미지" class="bg-current" %}
+    """
+    name = getattr(image, "name", image)
+    if not name:
+        return ""
+    width, height = get_rendition_size(preset)
+    attrs = {
+        "width": width,
+        "height": height,
+        "loading": "lazy",
+        "decoding": "async",
+        **attrs,
+    }
+
+    if is_remote(name) or not is_ready(name, preset):
+        src = name if is_remote(name) else default_storage.url(name)
+        return format_html("<img{}>", flatatt({"src": src, **attrs}))
+
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}"><img{}></picture>',
+        get_srcset(name, preset, "webp"),
+        flatatt(
+            {
+                "src": default_storage.url(
+                    get_rendition_name(
+                        name, preset, min(settings.IMAGE_RENDITION_DENSITIES), "jpg"
+                    )
+                ),
+                "srcset": get_srcset(name, preset, "jpg"),
+                **attrs,
+            }
+        ),
+    )
@@ -0,0 +1,200 @@
+import shutil
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from .models import ImageTask
+from .renditions import (
+    generate_renditions,
+    get_rendition_name,
+    is_ready,
+    process_image_tasks,
+)
+
+User = get_user_model()
+
+
+def make_image(size=(800, 600), mode="RGBA", image_format="PNG"):
+    buffer = BytesIO()
+    Image.new(mode, size, (200, 100, 50, 128)[: len(mode)]).save(buffer, image_format)
+    return buffer.getvalue()
+
+
+class AvatarHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        content = make_image((460, 460), "RGB", "JPEG")
+        self.send_response(200)
+        self.send_header("Content-Type", "image/jpeg")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ImageTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def create_user(self, profile_image):
+        with self.captureOnCommitCallbacks(execute=True):
+            return User.objects.create_user(
+                email="test@gmail.com",
+                password="testpassword",
+                nickname="test",
+                profile_image=profile_image,
+            )
+
+    def render(self, user):
+        return Template(
+            '{% load images %}{% rendition user.profile_image "avatar" alt="프로필" %}'
+        ).render(Context({"user": user}))
+
+
+class TestRenditions(ImageTestCase):
+    """
+    이미지 변환 테스트
+    """
+
+    def test_generate_renditions(self):
+        """
+        preset별 1x, 2x 크기의 WebP, JPEG 이미지 저장
+        """
+        print("-- 이미지 변환 테스트 - 변환 BEGIN --")
+        name = default_storage.save("user/imgs/test.png", ContentFile(make_image()))
+        self.assertEqual(generate_renditions(name, ("avatar", "cover")), 8)
+
+        expected = {
+            ("avatar", 1): (64, 64),
+            ("avatar", 2): (128, 128),
+            ("cover", 1): (720, 540),
+            ("cover", 2): (1440, 1080),
+        }
+        for (preset, density), size in expected.items():
+            for ext, image_format in (("webp", "WEBP"), ("jpg", "JPEG")):
+                with default_storage.open(
+                    get_rendition_name(name, preset, density, ext)
+                ) as file:
+                    image = Image.open(file)
+                    self.assertEqual(image.size, size)
+                    self.assertEqual(image.format, image_format)
+        self.assertTrue(is_ready(name, "avatar"))
+        self.assertFalse(is_ready(name, "thumbnail"))
+        print("-- 이미지 변환 테스트 - 변환 END --")
+
+    def test_upload_is_processed_off_request(self):
+        """
+        이미지를 저장하면 대기열에 등록하고, 변환 후에는 srcset으로 변환한 이미지 사용
+        """
+        print("-- 이미지 변환 테스트 - 업로드 BEGIN --")
+        user = self.create_user(
+            SimpleUploadedFile("profile.png", make_image(), content_type="image/png")
+        )
+        task = ImageTask.objects.get()
+        self.assertEqual(task.source, user.profile_image.name)
+        self.assertEqual(task.field, "accounts.User.profile_image")
+
+        html = self.render(user)
+        self.assertIn(f'src="{user.profile_image.url}"', html)
+        self.assertNotIn("<picture>", html)
+
+        self.assertEqual(process_image_tasks(), {"done": 1, "retry": 0, "failed": 0})
+        self.assertFalse(ImageTask.objects.exists())
+
+        html = self.render(user)
+        webp = default_storage.url(
+            get_rendition_name(user.profile_image.name, "avatar", 2, "webp")
+        )
+        self.assertIn("<picture>", html)
+        self.assertIn(f"{webp} 2x", html)
+        self.assertIn('width="64"', html)
+        self.assertIn('height="64"', html)
+        self.assertIn('alt="프로필"', html)
+        print("-- 이미지 변환 테스트 - 업로드 END --")
+
+    def test_unrelated_save_is_not_queued(self):
+        """
+        이미지 외의 필드만 저장하면 대기열에 등록하지 않음
+        """
+        print("-- 이미지 변환 테스트 - 다른 필드 저장 BEGIN --")
+        user = self.create_user(
+            SimpleUploadedFile("profile.png", make_image(), content_type="image/png")
+        )
+        process_image_tasks()
+        with self.captureOnCommitCallbacks(execute=True):
+            user.save(update_fields=["last_login"])
+            user.save()
+        self.assertFalse(ImageTask.objects.exists())
+        print("-- 이미지 변환 테스트 - 다른 필드 저장 END --")
+
+
+class TestRemoteAvatar(ImageTestCase):
+    """
+    원격 프로필 이미지 저장 테스트
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), AvatarHandler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/u/1?v=4"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        super().tearDown()
+
+    @override_settings(IMAGE_REMOTE_HOSTS=["127.0.0.1"])
+    def test_remote_avatar_is_cached(self):
+        """
+        원격 이미지를 저장소에 저장하고 프로필 이미지 경로 변경
+        """
+        print("-- 원격 프로필 이미지 테스트 - 저장 BEGIN --")
+        user = self.create_user(self.url)
+        self.assertIn(f'src="{self.url}"', self.render(user))
+
+        self.assertEqual(process_image_tasks()["done"], 1)
+        user.refresh_from_db()
+        self.assertTrue(user.profile_image.name.startswith("remote/"))
+        self.assertTrue(default_storage.exists(user.profile_image.name))
+        self.assertTrue(is_ready(user.profile_image.name, "avatar"))
+        self.assertIn("<picture>", self.render(user))
+        print("-- 원격 프로필 이미지 테스트 - 저장 END --")
+
+    @override_settings(IMAGE_TASK_MAX_ATTEMPTS=2)
+    def test_disallowed_host(self):
+        """
+        허용되지 않은 호스트의 이미지는 가져오지 않고 실패로 기록
+        """
+        print("-- 원격 프로필 이미지 테스트 - 허용되지 않은 호스트 BEGIN --")
+        user = self.create_user(self.url)
+        self.assertEqual(process_image_tasks()["retry"], 1)
+        task = ImageTask.objects.get()
+        self.assertIn("허용되지 않은 이미지 호스트", task.last_error)
+
+        with self.assertLogs("images.renditions", level="ERROR"):
+            result = process_image_tasks(now=task.next_attempt_at)
+        self.assertEqual(result["failed"], 1)
+        self.assertEqual(ImageTask.objects.get().status, ImageTask.STATUS_FAILED)
+        user.refresh_from_db()
+        self.assertEqual(user.profile_image.name, self.url)
+        print("-- 원격 프로필 이미지 테스트 - 허용되지 않은 호스트 END --")
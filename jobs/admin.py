@@ -0,0 +1,12 @@
+from django.contrib import admin
+
+from .models import JobLock, JobRun
+
+
+@admin.register(JobRun)
+class JobRunAdmin(admin.ModelAdmin):
+    list_display = ("job_name", "status", "started_at", "duration_ms", "runner")
+    list_filter = ("job_name", "status")
+
+
+admin.site.register(JobLock)
@@ -0,0 +1,30 @@
+"""
+대기열 작업 가져오기 (메일 발송, 이미지 변환)
+- 리더가 바뀌는 중에 이전 리더가 작업을 계속 실행하는 경우처럼 여러 곳에서 동시에 가져가도
+  한 행은 한 곳에서만 처리
+- skip_locked를 지원하는 DB는 다른 트랜잭션이 잠근 행을 건너뛰고, 모든 DB에서
+  조회한 next_attempt_at이 그대로인 행만 조건부 UPDATE로 가져감
+"""
+
+from django.db import connections, transaction
+
+
+def claim_rows(queryset, batch_size, until):
+    """
+    queryset에서 batch_size개를 가져오고, until까지 다른 곳에서 가져가지 않도록
+    next_attempt_at을 until로 변경
+    반환값: 가져온 객체 목록
+    """
+    with transaction.atomic(using=queryset.db):
+        candidates = queryset
+        if connections[queryset.db].features.has_select_for_update_skip_locked:
+            candidates = candidates.select_for_update(skip_locked=True)
+        claimed = []
+        for row in candidates[:batch_size]:
+            updated = queryset.filter(
+                pk=row.pk, next_attempt_at=row.next_attempt_at
+            ).update(next_attempt_at=until)
+            if updated:
+                row.next_attempt_at = until
+                claimed.append(row)
+    return claimed
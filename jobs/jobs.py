@@ -0,0 +1,17 @@
+import datetime
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import JobRun
+from .registry import register
+
+
+@register("prune_job_runs", at=datetime.time(hour=4))
+def prune_job_runs():
+    """
+    JOB_RUN_HISTORY_DAYS일이 지난 작업 실행 기록 삭제
+    """
+    expired_at = timezone.now() - datetime.timedelta(days=settings.JOB_RUN_HISTORY_DAYS)
+    deleted, _ = JobRun.objects.filter(started_at__lt=expired_at).delete()
+    return f"{deleted}개 삭제"
@@ -0,0 +1,64 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from jobs.models import JobRun
+from jobs.runner import JobRunner
+
+
+class Command(BaseCommand):
+    help = (
+        "등록된 작업(각 앱의 jobs.py)을 실행합니다. "
+        "여러 서버에서 실행해도 DB 잠금을 얻은 리더 하나만 작업을 실행합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="리더인 경우 실행할 시각이 된 작업을 한 번만 실행하고 종료",
+        )
+        parser.add_argument(
+            "--list", action="store_true", help="등록된 작업과 마지막 실행 기록 출력"
+        )
+
+    def handle(self, *args, **options):
+        runner = JobRunner()
+        if options["list"]:
+            self.list_jobs(runner)
+            return
+
+        if not options["once"]:
+            self.stdout.write(f"작업 실행기 시작: {runner.owner}")
+            runner.run_forever()
+            return
+
+        if not runner.acquire():
+            self.stdout.write("다른 실행기가 리더입니다.")
+            return
+        try:
+            for job_run in runner.run_pending():
+                self.stdout.write(
+                    f"{job_run.job_name}: {job_run.get_status_display()} "
+                    f"{job_run.duration_ms}ms {job_run.result}"
+                )
+        finally:
+            runner.release()
+
+    def list_jobs(self, runner):
+        now = timezone.now()
+        for job in runner.get_jobs():
+            last_run = (
+                JobRun.objects.filter(job_name=job.name).order_by("-started_at").first()
+            )
+            last_started_at = last_run.started_at if last_run else None
+            next_run_at = job.get_next_run_at(last_started_at, now)
+            last = (
+                f"{timezone.localtime(last_run.started_at):%Y-%m-%d %H:%M:%S} "
+                f"{last_run.get_status_display()} {last_run.duration_ms}ms"
+                if last_run
+                else "-"
+            )
+            self.stdout.write(
+                f"{job.name}: 마지막 실행 {last}, "
+                f"다음 실행 {timezone.localtime(next_run_at):%Y-%m-%d %H:%M:%S}"
+            )
@@ -0,0 +1,71 @@
+# Generated by Django 4.2.7 on 2026-10-17 07:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="JobLock",
+            fields=[
+                (
+                    "name",
+                    models.CharField(max_length=50, primary_key=True, serialize=False),
+                ),
+                ("owner", models.CharField(max_length=100)),
+                ("expires_at", models.DateTimeField()),
+            ],
+            options={
+                "verbose_name": "작업 잠금",
+                "verbose_name_plural": "작업 잠금",
+            },
+        ),
+        migrations.CreateModel(
+            name="JobRun",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("job_name", models.CharField(max_length=50)),
+                ("runner", models.CharField(max_length=100)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("running", "실행 중"),
+                            ("success", "성공"),
+                            ("failed", "실패"),
+                        ],
+                        default="running",
+                        max_length=20,
+                    ),
+                ),
+                ("started_at", models.DateTimeField()),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                ("duration_ms", models.PositiveIntegerField(blank=True, null=True)),
+                ("result", models.CharField(blank=True, default="", max_length=200)),
+                ("error", models.TextField(blank=True, default="")),
+            ],
+            options={
+                "verbose_name": "작업 실행 기록",
+                "verbose_name_plural": "작업 실행 기록",
+                "indexes": [
+                    models.Index(
+                        fields=["job_name", "-started_at"], name="jobrun_job_idx"
+                    ),
+                    models.Index(fields=["started_at"], name="jobrun_started_at_idx"),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,51 @@
+from django.db import models
+
+
+class JobLock(models.Model):
+    """
+    작업 실행 리더 잠금 모델
+    expires_at까지 owner만 작업을 실행하며, 리더는 만료 전에 계속 연장
+    """
+
+    name = models.CharField(max_length=50, primary_key=True)
+    owner = models.CharField(max_length=100)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "작업 잠금"
+        verbose_name_plural = "작업 잠금"
+
+    def __str__(self):
+        return f"{self.name} ({self.owner})"
+
+
+class JobRun(models.Model):
+    """
+    작업 실행 기록 모델
+    """
+
+    STATUS_CATEGORY = (
+        ("running", "실행 중"),
+        ("success", "성공"),
+        ("failed", "실패"),
+    )
+
+    job_name = models.CharField(max_length=50)
+    runner = models.CharField(max_length=100)
+    status = models.CharField(choices=STATUS_CATEGORY, max_length=20, default="running")
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField(null=True, blank=True)
+    duration_ms = models.PositiveIntegerField(null=True, blank=True)
+    result = models.CharField(max_length=200, blank=True, default="")
+    error = models.TextField(blank=True, default="")
+
+    class Meta:
+        verbose_name = "작업 실행 기록"
+        verbose_name_plural = "작업 실행 기록"
+        indexes = [
+            models.Index(fields=["job_name", "-started_at"], name="jobrun_job_idx"),
+            models.Index(fields=["started_at"], name="jobrun_started_at_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.job_name} {self.started_at:%Y-%m-%d %H:%M:%S} {self.status}"
@@ -0,0 +1,73 @@
+"""
+작업 목록
+- 각 앱의 jobs.py에서 register로 작업을 등록하고, runjobs를 실행할 때만 불러옴
+  (웹 서버 프로세스에서는 작업을 불러오거나 스케줄러 스레드를 만들지 않음)
+- interval: 마지막 실행 시작 후 interval이 지나면 실행
+- at: 매일 at(TIME_ZONE 기준) 이후 오늘 실행하지 않았으면 실행
+"""
+
+import datetime
+
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+registry = {}
+
+
+class Job:
+    def __init__(self, name, func, interval=None, at=None):
+        if (interval is None) == (at is None):
+            raise ValueError("interval, at 중 하나만 설정해야 합니다.")
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.at = at
+
+    def __repr__(self):
+        return f"<Job {self.name}>"
+
+    def __call__(self):
+        return self.func()
+
+    def get_next_run_at(self, last_started_at, now):
+        """
+        다음 실행 시각
+        한 번도 실행하지 않은 작업은 interval 작업이면 지금, at 작업이면 오늘 at
+        """
+        if self.interval is not None:
+            if last_started_at is None:
+                return now
+            return last_started_at + self.interval
+
+        local_now = timezone.localtime(now)
+        run_at = timezone.make_aware(
+            datetime.datetime.combine(local_now.date(), self.at)
+        )
+        if last_started_at is not None and last_started_at >= run_at:
+            run_at += datetime.timedelta(days=1)
+        return run_at
+
+    def is_due(self, last_started_at, now):
+        return self.get_next_run_at(last_started_at, now) <= now
+
+
+def register(name, interval=None, at=None):
+    """
+    작업 등록 데코레이터
+    """
+
+    def decorator(func):
+        if name in registry:
+            raise ValueError(f"이미 등록된 작업입니다: {name}")
+        registry[name] = Job(name, func, interval=interval, at=at)
+        return func
+
+    return decorator
+
+
+def get_jobs():
+    """
+    각 앱의 jobs.py를 불러와 등록된 작업 목록 반환
+    """
+    autodiscover_modules("jobs")
+    return list(registry.values())
@@ -0,0 +1,229 @@
+"""
+작업 실행기
+- 여러 서버에서 runjobs를 실행해도 DB 잠금(JobLock)을 얻은 리더 하나만 작업 실행
+- 리더는 JOB_LOCK_TTL초 동안 잠금을 유지하며 작업을 실행하기 전마다 연장하고,
+  작업 실행 중에는 LockHeartbeat 스레드가 JOB_LOCK_TTL / 3초마다 연장
+- 연장에 실패하면(다른 실행기가 리더가 된 경우) 작업은 check_lock()에서 LockLost로 중단하고
+  실행기는 리더에서 물러남, 리더가 종료되면 잠금이 만료된 뒤 다른 실행기가 리더가 됨
+- 작업별 실행 시작, 종료 시각과 실행 시간은 JobRun에 기록하며, 다음 실행 시각은
+  마지막 실행 기록으로 계산하므로 리더가 바뀌어도 같은 작업을 중복 실행하지 않음
+- JOB_RUN_HISTORY_DAYS일이 지난 실행 기록은 매일 prune_job_runs 작업이 삭제
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, connection, transaction
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from .models import JobLock, JobRun
+from .registry import get_jobs
+
+logger = logging.getLogger(__name__)
+
+LOCK_NAME = "runjobs"
+
+# 실행 중인 작업의 잠금 연장 스레드
+current_heartbeat = None
+
+
+class LockLost(Exception):
+    """
+    작업 실행 중 리더 잠금 연장에 실패한 경우
+    """
+
+
+def check_lock():
+    """
+    오래 걸리는 작업은 batch마다 호출하여, 잠금 연장에 실패했으면 LockLost로 중단
+    작업 실행기 밖에서 호출하면 아무것도 하지 않음
+    """
+    heartbeat = current_heartbeat
+    if heartbeat is not None and heartbeat.lost.is_set():
+        raise LockLost("리더 잠금 연장에 실패하여 작업을 중단합니다.")
+
+
+def get_owner():
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class LockHeartbeat(threading.Thread):
+    """
+    작업 실행 중 interval초마다 리더 잠금 연장
+    다른 실행기가 잠금을 가져갔거나, DB 오류로 잠금이 만료될 때까지 연장하지 못하면
+    lost를 설정하고 종료
+    """
+
+    def __init__(self, runner, interval):
+        super().__init__(name="runjobs-heartbeat", daemon=True)
+        self.runner = runner
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.lost = threading.Event()
+
+    def run(self):
+        expires_at = time.monotonic() + self.runner.lock_ttl
+        try:
+            while not self.stopped.wait(self.interval):
+                try:
+                    renewed = self.runner.renew()
+                except Exception:
+                    logger.exception("리더 잠금 연장 실패: %s", self.runner.owner)
+                    if time.monotonic() < expires_at:
+                        continue
+                    renewed = False
+                if not renewed:
+                    logger.error("리더 잠금을 잃었습니다: %s", self.runner.owner)
+                    self.lost.set()
+                    return
+                expires_at = time.monotonic() + self.runner.lock_ttl
+        finally:
+            connection.close()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+class JobRunner:
+    """
+    작업 실행기
+    jobs를 지정하지 않으면 각 앱의 jobs.py에 등록된 작업 실행
+    """
+
+    def __init__(self, jobs=None, owner=None, lock_ttl=None):
+        self.jobs = jobs
+        self.owner = owner or get_owner()
+        self.lock_ttl = lock_ttl or settings.JOB_LOCK_TTL
+        self.is_leader = False
+        self.last_started = {}
+
+    def get_jobs(self):
+        if self.jobs is None:
+            self.jobs = get_jobs()
+        return self.jobs
+
+    def acquire(self, now=None):
+        """
+        리더 잠금 획득 또는 연장
+        잠금이 없거나, 만료되었거나, 이미 리더인 경우에만 한 번의 UPDATE로 획득
+        반환값: 리더 여부
+        """
+        now = now or timezone.now()
+        expires_at = now + timedelta(seconds=self.lock_ttl)
+        acquired = (
+            JobLock.objects.filter(name=LOCK_NAME)
+            .filter(Q(owner=self.owner) | Q(expires_at__lte=now))
+            .update(owner=self.owner, expires_at=expires_at)
+        )
+        if not acquired:
+            try:
+                with transaction.atomic():
+                    JobLock.objects.create(
+                        name=LOCK_NAME, owner=self.owner, expires_at=expires_at
+                    )
+                acquired = True
+            except IntegrityError:
+                acquired = False
+
+        if acquired and not self.is_leader:
+            logger.info("작업 실행기 리더: %s", self.owner)
+            # 이전 리더가 실행한 기록으로 다음 실행 시각 계산
+            self.last_started = dict(
+                JobRun.objects.values_list("job_name").annotate(Max("started_at"))
+            )
+        self.is_leader = bool(acquired)
+        return self.is_leader
+
+    def renew(self):
+        """
+        리더인 경우 잠금 연장 (작업 실행 중 LockHeartbeat에서 호출)
+        반환값: 연장 여부
+        """
+        expires_at = timezone.now() + timedelta(seconds=self.lock_ttl)
+        return bool(
+            JobLock.objects.filter(name=LOCK_NAME, owner=self.owner).update(
+                expires_at=expires_at
+            )
+        )
+
+    def release(self):
+        """
+        종료 시 잠금을 해제하여 다른 실행기가 바로 리더가 되도록 함
+        """
+        JobLock.objects.filter(name=LOCK_NAME, owner=self.owner).delete()
+        self.is_leader = False
+
+    def run_pending(self, now=None):
+        """
+        리더인 경우 실행할 시각이 된 작업 실행
+        반환값: 실행 기록 목록
+        """
+        runs = []
+        for job in self.get_jobs():
+            current = now or timezone.now()
+            if not job.is_due(self.last_started.get(job.name), current):
+                continue
+            # 작업 실행 전에 잠금을 연장하고, 리더가 아니면 실행하지 않음
+            if not self.acquire(current):
+                break
+            runs.append(self.run_job(job, current))
+            if not self.is_leader:
+                break
+        return runs
+
+    def run_job(self, job, now=None):
+        """
+        작업을 실행하고 실행 기록 저장
+        작업이 실패해도 다음 작업은 계속 실행하며, 잠금을 잃으면 리더에서 물러남
+        """
+        global current_heartbeat
+
+        started_at = now or timezone.now()
+        self.last_started[job.name] = started_at
+        job_run = JobRun.objects.create(
+            job_name=job.name, runner=self.owner, started_at=started_at
+        )
+        heartbeat = current_heartbeat = LockHeartbeat(self, self.lock_ttl / 3)
+        heartbeat.start()
+        started = time.perf_counter()
+        try:
+            result = job()
+        except Exception:
+            logger.exception("작업 실행 실패: %s", job.name)
+            job_run.status = "failed"
+            job_run.error = traceback.format_exc()
+        else:
+            job_run.status = "success"
+            job_run.result = "" if result is None else str(result)[:200]
+        finally:
+            heartbeat.stop()
+            current_heartbeat = None
+        if heartbeat.lost.is_set():
+            self.is_leader = False
+        job_run.duration_ms = int((time.perf_counter() - started) * 1000)
+        job_run.finished_at = started_at + timedelta(milliseconds=job_run.duration_ms)
+        job_run.save(
+            update_fields=["status", "error", "result", "duration_ms", "finished_at"]
+        )
+        return job_run
+
+    def run_forever(self, poll_interval=None):
+        poll_interval = poll_interval or settings.JOB_POLL_INTERVAL
+        try:
+            while True:
+                close_old_connections()
+                if self.acquire():
+                    self.run_pending()
+                time.sleep(poll_interval)
+        finally:
+            if self.is_leader:
+                self.release()
@@ -0,0 +1,267 @@
+import datetime
+import time
+from datetime import timedelta
+from io import StringIO
+
+from django.apps import apps
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from freezegun import freeze_time
+
+from accounts.models import OutboxEmail
+from accounts.outbox import claim_emails, enqueue_email
+
+from .models import JobLock, JobRun
+from .registry import Job, get_jobs
+from .runner import JobRunner, check_lock
+
+NOW = datetime.datetime(2024, 1, 10, 3, 0, tzinfo=datetime.timezone.utc)
+
+
+class TestJobRunner(TestCase):
+    """
+    작업 실행기 테스트
+    """
+
+    def setUp(self):
+        self.calls = []
+        self.jobs = [
+            Job(
+                "interval", lambda: self.call("interval"), interval=timedelta(minutes=5)
+            ),
+            Job("daily", lambda: self.call("daily"), at=datetime.time(hour=1)),
+        ]
+
+    def call(self, name):
+        self.calls.append(name)
+        return name
+
+    def get_runner(self, owner):
+        return JobRunner(jobs=self.jobs, owner=owner, lock_ttl=60)
+
+    def test_leader_election(self):
+        """
+        잠금을 얻은 실행기 하나만 리더가 되고, 잠금이 만료되면 다른 실행기가 리더가 됨
+        """
+        runner1 = self.get_runner("runner1")
+        runner2 = self.get_runner("runner2")
+        self.assertTrue(runner1.acquire(NOW))
+        self.assertFalse(runner2.acquire(NOW))
+        self.assertEqual(runner2.run_pending(NOW), [])
+        self.assertTrue(runner1.acquire(NOW + timedelta(seconds=30)))
+
+        self.assertFalse(runner2.acquire(NOW + timedelta(seconds=89)))
+        self.assertTrue(runner2.acquire(NOW + timedelta(seconds=90)))
+        self.assertFalse(runner1.acquire(NOW + timedelta(seconds=91)))
+        self.assertEqual(JobLock.objects.get().owner, "runner2")
+
+        runner2.release()
+        self.assertTrue(runner1.acquire(NOW + timedelta(seconds=92)))
+
+    def test_run_pending_and_history(self):
+        """
+        실행할 시각이 된 작업만 실행하고 실행 기록 저장
+        """
+        runner = self.get_runner("runner1")
+        runner.acquire(NOW)
+        runs = runner.run_pending(NOW)
+        self.assertEqual(self.calls, ["interval", "daily"])
+        self.assertEqual([run.status for run in runs], ["success", "success"])
+        self.assertIsNotNone(runs[0].duration_ms)
+
+        self.assertEqual(runner.run_pending(NOW + timedelta(minutes=4)), [])
+        runner.run_pending(NOW + timedelta(minutes=5))
+        self.assertEqual(self.calls, ["interval", "daily", "interval"])
+        self.assertEqual(JobRun.objects.filter(job_name="interval").count(), 2)
+
+    def test_new_leader_uses_history(self):
+        """
+        리더가 바뀌어도 실행 기록으로 다음 실행 시각을 계산하여 중복 실행하지 않음
+        """
+        runner1 = self.get_runner("runner1")
+        runner1.acquire(NOW)
+        runner1.run_pending(NOW)
+
+        runner2 = self.get_runner("runner2")
+        later = NOW + timedelta(minutes=2)
+        self.assertTrue(runner2.acquire(later + timedelta(minutes=1)))
+        self.assertEqual(runner2.run_pending(later + timedelta(minutes=1)), [])
+        self.assertEqual(len(self.calls), 2)
+
+    def test_failed_job(self):
+        """
+        실패한 작업은 오류를 기록하고 다음 작업은 계속 실행
+        """
+
+        def fail():
+            raise RuntimeError("실패")
+
+        self.jobs.insert(0, Job("fail", fail, interval=timedelta(minutes=1)))
+        runner = self.get_runner("runner1")
+        runner.acquire(NOW)
+        with self.assertLogs("jobs.runner", level="ERROR"):
+            runs = runner.run_pending(NOW)
+        self.assertEqual(runs[0].status, "failed")
+        self.assertIn("RuntimeError", runs[0].error)
+        self.assertEqual(self.calls, ["interval", "daily"])
+
+    def test_noop_runs_recorded(self):
+        """
+        처리한 일이 없는(None을 반환한) 실행도 기록
+        """
+        self.jobs.append(Job("noop", lambda: None, interval=timedelta(seconds=5)))
+        runner = self.get_runner("runner1")
+        runner.acquire(NOW)
+        runs = runner.run_pending(NOW)
+        self.assertEqual(len(runs), 3)
+        self.assertEqual(
+            list(
+                JobRun.objects.filter(job_name="noop").values_list("status", "result")
+            ),
+            [("success", "")],
+        )
+
+    def test_daily_job(self):
+        """
+        매일 작업은 하루에 한 번, at 이후에만 실행
+        """
+        job = self.jobs[1]
+        with self.settings(TIME_ZONE="UTC"), timezone.override("UTC"):
+            today = NOW.replace(hour=1)
+            self.assertTrue(job.is_due(None, NOW))
+            self.assertFalse(job.is_due(NOW, NOW + timedelta(hours=10)))
+            self.assertTrue(job.is_due(NOW, today + timedelta(days=1)))
+            self.assertFalse(job.is_due(None, NOW.replace(hour=0)))
+
+
+class TestRunJobsCommand(TestCase):
+    """
+    runjobs 명령 테스트
+    """
+
+    def test_registered_jobs(self):
+        """
+        각 앱의 jobs.py에 등록된 작업
+        """
+        names = [job.name for job in get_jobs()]
+        self.assertIn("expire_account", names)
+        self.assertIn("todo_reminders", names)
+        self.assertIn("prune_job_runs", names)
+
+    @freeze_time(NOW)
+    def test_run_once(self):
+        """
+        --once는 실행할 작업을 한 번 실행하고 잠금 해제
+        """
+        out = StringIO()
+        call_command("runjobs", "--once", stdout=out)
+        self.assertIn("expire_account: 성공", out.getvalue())
+        self.assertFalse(JobLock.objects.exists())
+
+        out = StringIO()
+        call_command("runjobs", "--once", stdout=out)
+        self.assertEqual(out.getvalue(), "")
+
+    def test_prune_job_runs(self):
+        """
+        오래된 실행 기록 삭제
+        """
+        for days in [1, 30]:
+            JobRun.objects.create(
+                job_name="test",
+                runner="test",
+                started_at=timezone.now() - timedelta(days=days),
+            )
+        prune = next(job for job in get_jobs() if job.name == "prune_job_runs")
+        self.assertEqual(prune(), "1개 삭제")
+        self.assertEqual(JobRun.objects.count(), 1)
+
+    def test_no_scheduler_in_app_ready(self):
+        """
+        앱 로딩 시 스케줄러를 시작하지 않음
+        """
+        self.assertFalse(hasattr(apps.get_app_config("accounts"), "expire_account"))
+
+
+class TestLockHeartbeat(TransactionTestCase):
+    """
+    작업 실행 중 리더 잠금 연장 테스트
+    """
+
+    def get_runner(self, job):
+        return JobRunner(
+            jobs=[
+                Job("job", job, interval=timedelta(minutes=1)),
+                Job("next", lambda: "next", interval=timedelta(minutes=1)),
+            ],
+            owner="runner1",
+            lock_ttl=0.3,
+        )
+
+    def test_renew_while_running(self):
+        """
+        잠금 만료 시간보다 오래 걸리는 작업도 실행 중에는 잠금 유지
+        """
+        runner = self.get_runner(lambda: time.sleep(0.5) or "done")
+        runner.acquire()
+        started = timezone.now()
+        runs = runner.run_pending()
+        self.assertEqual([run.status for run in runs], ["success", "success"])
+        self.assertGreater(
+            JobLock.objects.get().expires_at, started + timedelta(seconds=0.5)
+        )
+
+    def test_abort_when_lock_lost(self):
+        """
+        다른 실행기가 잠금을 가져가면 작업을 중단하고 다음 작업을 실행하지 않음
+        """
+
+        def job():
+            JobLock.objects.update(owner="runner2")
+            time.sleep(0.3)
+            check_lock()
+            return "done"
+
+        runner = self.get_runner(job)
+        runner.acquire()
+        with self.assertLogs("jobs.runner", level="ERROR"):
+            runs = runner.run_pending()
+        self.assertEqual(len(runs), 1)
+        self.assertEqual(runs[0].status, "failed")
+        self.assertIn("LockLost", runs[0].error)
+        self.assertFalse(runner.is_leader)
+        self.assertEqual(JobLock.objects.get().owner, "runner2")
+
+
+class TestClaimRows(TestCase):
+    """
+    대기열 작업 가져오기 테스트
+    """
+
+    def test_concurrent_claim(self):
+        """
+        조회와 UPDATE 사이에 다른 곳에서 가져간 행은 가져오지 않음
+        """
+        for num in range(3):
+            enqueue_email("제목", "내용", [f"test{num}@naver.com"])
+        now = timezone.now()
+        other = None
+
+        def claim_between(execute, sql, params, many, context):
+            nonlocal other
+            if sql.startswith("UPDATE") and other is None:
+                other = []
+                other.extend(claim_emails(2, now))
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(claim_between):
+            claimed = claim_emails(3, now)
+
+        self.assertEqual(len(other), 2)
+        self.assertEqual(len(claimed), 1)
+        self.assertFalse(
+            {email.pk for email in other} & {email.pk for email in claimed}
+        )
+        self.assertFalse(OutboxEmail.objects.filter(next_attempt_at__lte=now).exists())
@@ -0,0 +1,135 @@
+"""
+대표 화면의 응답 시간, 쿼리 수 측정 (manage.py benchmark)
+- seed_scale로 만든 데이터에서 스터디 멤버로 로그인하여 화면마다 warmup 후 repeat번 요청
+- DEBUG와 QueryBudgetMiddleware의 기록을 끄고 측정하여 운영 환경에 가까운 응답 시간 기록
+- 쿼리 수는 warmup 후 한 번 더 요청하여 따로 세고, 응답 시간은 쿼리 기록 없이 측정
+- 응답 시간 백분위(p50, p90, p99), 평균과 쿼리 수를 JSON으로 저장하고,
+  기준 결과(baseline)와 비교하여 쿼리 수가 늘거나 응답 시간이 threshold 비율 이상 느려지면 회귀로 판단
+"""
+
+import platform
+import statistics
+import time
+
+import django
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from studies.models import StudyMember
+
+from .queries import QueryRecorder
+
+
+def get_benchmark_urls(member):
+    """
+    반환값: {화면 이름: URL}
+    """
+    study_id = member.study_id
+    return {
+        "studies:study_list": reverse("studies:study_list"),
+        "studies:study_detail": reverse("studies:study_detail", args=[study_id]),
+        "todo_list": reverse("todo_list"),
+        "study_todo_list": f"{reverse('study_todo_list')}?study={study_id}",
+        "main:home": reverse("main:home"),
+        "devmates:devmate_list": reverse("devmates:devmate_list"),
+        "devmates:devmate_received_list": reverse("devmates:devmate_received_list"),
+    }
+
+
+def get_percentile(values, percent):
+    """
+    정렬한 값에서 nearest-rank 방식의 백분위 값
+    """
+    values = sorted(values)
+    index = max(0, -(-len(values) * percent // 100) - 1)
+    return values[int(index)]
+
+
+def get(client, url):
+    response = client.get(url)
+    if response.status_code != 200:
+        raise RuntimeError(f"{url} 응답 코드 {response.status_code}")
+    return response
+
+
+def measure(client, url, repeat, warmup):
+    for _ in range(warmup):
+        client.get(url)
+
+    # 쿼리 기록(스택 추적, fingerprint)이 응답 시간에 포함되지 않도록 따로 요청하여 셈
+    with QueryRecorder() as recorder:
+        get(client, url)
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        get(client, url)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    return {
+        "url": url,
+        "p50_ms": round(get_percentile(timings, 50), 2),
+        "p90_ms": round(get_percentile(timings, 90), 2),
+        "p99_ms": round(get_percentile(timings, 99), 2),
+        "mean_ms": round(statistics.fmean(timings), 2),
+        "queries": recorder.count,
+    }
+
+
+def run_benchmark(repeat=20, warmup=3, views=None):
+    """
+    가입이 승인된 첫 번째 스터디 멤버로 로그인하여 측정
+    반환값: {"meta": 실행 환경, "views": {화면 이름: 측정 결과}}
+    """
+    member = (
+        StudyMember.objects.filter(is_accepted=True)
+        .select_related("user")
+        .order_by("id")
+        .first()
+    )
+    if member is None:
+        raise RuntimeError("측정할 데이터가 없습니다. seed_scale을 먼저 실행하세요.")
+
+    client = Client(SERVER_NAME="localhost")
+    client.force_login(member.user)
+    urls = get_benchmark_urls(member)
+    with override_settings(DEBUG=False, QUERY_BUDGET_ENABLED=False):
+        views = {
+            name: measure(client, url, repeat, warmup)
+            for name, url in urls.items()
+            if not views or name in views
+        }
+    return {
+        "meta": {
+            "created_at": timezone.now().isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "repeat": repeat,
+            "warmup": warmup,
+        },
+        "views": views,
+    }
+
+
+def compare_results(baseline, result, threshold=0.2):
+    """
+    기준 결과와 비교하여 회귀한 항목 목록 반환
+    - 쿼리 수가 늘어난 경우
+    - p50, p90 응답 시간이 threshold 비율 이상 늘어난 경우
+    """
+    regressions = []
+    for name, current in result["views"].items():
+        before = baseline["views"].get(name)
+        if before is None:
+            continue
+        if current["queries"] > before["queries"]:
+            regressions.append(
+                f"{name}: 쿼리 {before['queries']}개 -> {current['queries']}개"
+            )
+        for key in ("p50_ms", "p90_ms"):
+            if current[key] > before[key] * (1 + threshold):
+                regressions.append(f"{name}: {key} {before[key]}ms -> {current[key]}ms")
+    return regressions
@@ -0,0 +1,127 @@
+"""
+테스트, 대량 데이터 생성용 모델 factory
+- 비밀번호는 한 번만 해시하여 모든 유저가 같은 해시를 사용 ("password")
+"""
+
+import datetime
+import functools
+
+import factory
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from factory import fuzzy
+
+from alerts.models import Alert
+from chats.models import ChatMessage
+from devmates.models import DevMate
+from studies.models import Category, Schedule, Study, StudyMember, Tag
+from todos.models import ToDo
+
+PASSWORD = "password"
+
+
+@functools.lru_cache
+def get_password_hash():
+    return make_password(PASSWORD)
+
+
+class UserFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = get_user_model()
+
+    email = factory.Sequence(lambda n: f"user{n}@example.com")
+    nickname = factory.Sequence(lambda n: f"user{n}")
+    password = factory.LazyFunction(get_password_hash)
+    development_field = fuzzy.FuzzyChoice(
+        [choice for choice, _ in get_user_model().DEVELOPMENT_FIELD_CHOICES]
+    )
+    content = factory.Faker("sentence", locale="ko_KR")
+
+
+class CategoryFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Category
+        django_get_or_create = ("name",)
+
+    name = factory.Sequence(lambda n: f"카테고리{n}")
+
+
+class TagFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Tag
+
+    name = factory.Sequence(lambda n: f"tag{n}")
+
+
+class StudyFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Study
+
+    category = factory.SubFactory(CategoryFactory)
+    title = factory.Faker("catch_phrase", locale="ko_KR")
+    goal = factory.Faker("bs", locale="ko_KR")
+    introduce = factory.Faker("paragraph", locale="ko_KR")
+    start_at = fuzzy.FuzzyDate(
+        datetime.date.today() - datetime.timedelta(days=180), datetime.date.today()
+    )
+    end_at = factory.LazyAttribute(
+        lambda study: study.start_at + datetime.timedelta(days=90)
+    )
+    difficulty = fuzzy.FuzzyChoice([choice for choice, _ in Study.difficulty_choices])
+    max_member = fuzzy.FuzzyInteger(4, 30)
+
+
+class ScheduleFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Schedule
+
+    study = factory.SubFactory(StudyFactory)
+    day = fuzzy.FuzzyChoice([choice for choice, _ in Schedule.day_choices])
+    start_time = fuzzy.FuzzyChoice([datetime.time(hour) for hour in range(9, 22)])
+    end_time = factory.LazyAttribute(
+        lambda schedule: schedule.start_time.replace(hour=schedule.start_time.hour + 2)
+    )
+
+
+class StudyMemberFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = StudyMember
+
+    study = factory.SubFactory(StudyFactory)
+    user = factory.SubFactory(UserFactory)
+    is_accepted = True
+
+
+class ToDoFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = ToDo
+
+    title = factory.Faker("sentence", nb_words=3, locale="ko_KR")
+    content = factory.Faker("paragraph", locale="ko_KR")
+    status = fuzzy.FuzzyChoice([choice for choice, _ in ToDo.STATUS_CATEGORY])
+
+
+class AlertFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Alert
+
+    user = factory.SubFactory(UserFactory)
+    content = factory.Faker("sentence", nb_words=5, locale="ko_KR")
+    category = fuzzy.FuzzyChoice([choice for choice, _ in Alert.ALERT_CATEGORIES])
+
+
+class ChatMessageFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = ChatMessage
+
+    message = factory.Faker("sentence", locale="ko_KR")
+    author = factory.SubFactory(UserFactory)
+
+
+class DevMateFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = DevMate
+
+    sent_user = factory.SubFactory(UserFactory)
+    received_user = factory.SubFactory(UserFactory)
+    is_accepted = True
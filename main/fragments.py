@@ -0,0 +1,48 @@
+"""
+메인 화면 fragment 캐시
+- 템플릿의 {% cache %} 태그로 렌더링한 HTML을 저장하므로 locmem, 파일 캐시 등 모든 캐시 backend에서 동작
+- 공휴일: 날짜별 키로 HOME_HOLIDAYS_CACHE_TTL초 동안 캐시
+- 스터디 둘러보기: 스터디, 스터디 멤버가 바뀌면 삭제하고, HOME_STUDIES_CACHE_TTL초 후 만료
+- 참여 중 스터디: 유저별 키로 HOME_MY_STUDIES_CACHE_TTL초 동안 캐시하고, 멤버가 바뀌면 해당 유저 키 삭제
+"""
+
+from django.conf import settings
+from django.core.cache import InvalidCacheBackendError, caches
+from django.core.cache.utils import make_template_fragment_key
+from django.db import transaction
+
+HOLIDAYS_FRAGMENT = "home_holidays"
+STUDIES_FRAGMENT = "home_studies"
+MY_STUDIES_FRAGMENT = "home_my_studies"
+
+
+def get_fragment_cache():
+    """
+    {% cache %} 태그와 같은 캐시 (template_fragments가 없으면 default)
+    """
+    try:
+        return caches["template_fragments"]
+    except InvalidCacheBackendError:
+        return caches["default"]
+
+
+def get_fragment_ttls():
+    return {
+        "holidays": settings.HOME_HOLIDAYS_CACHE_TTL,
+        "studies": settings.HOME_STUDIES_CACHE_TTL,
+        "my_studies": settings.HOME_MY_STUDIES_CACHE_TTL,
+    }
+
+
+def invalidate_home_studies(user_ids=()):
+    """
+    스터디 둘러보기와 user_ids 유저의 참여 중 스터디 fragment 삭제
+    트랜잭션이 끝나기 전 다른 요청이 변경 전 데이터로 다시 캐시할 수 있으므로 커밋 후 한 번 더 삭제
+    """
+    keys = [make_template_fragment_key(STUDIES_FRAGMENT)] + [
+        make_template_fragment_key(MY_STUDIES_FRAGMENT, [user_id])
+        for user_id in user_ids
+    ]
+    cache = get_fragment_cache()
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
@@ -0,0 +1,107 @@
+"""
+공휴일 달력
+- 올해 기준 HOLIDAY_CALENDAR_YEARS_BEFORE년 전 ~ HOLIDAY_CALENDAR_YEARS_AFTER년 후의 공휴일을
+  (날짜, 이름, 대체공휴일 여부) 정렬 배열로 만들어 두고 bisect로 조회
+- 프로세스에서 처음 조회할 때 만들고, 날짜가 범위의 마지막 해에 들어서면 다시 만듦
+  (연말에도 다음 해 공휴일을 찾을 수 있음)
+- 메인 화면 공휴일, 할 일 보드, 스터디 일정에서 사용
+"""
+
+import bisect
+import datetime
+from collections import namedtuple
+
+import holidays
+from django.conf import settings
+
+Holiday = namedtuple("Holiday", ["date", "name", "is_substitute"])
+
+
+def is_substitute(name):
+    """
+    대체공휴일 여부
+    다른 공휴일과 겹친 날은 "부처님오신날; 어린이날"처럼 이름을 이어 붙이므로 모든 이름이 대체공휴일인 경우만 해당
+    """
+    return all("대체" in part for part in name.split("; "))
+
+
+class HolidayCalendar:
+    def __init__(self, years):
+        self.years = range(years[0], years[-1] + 1)
+        entries = holidays.country_holidays(
+            settings.HOLIDAY_CALENDAR_COUNTRY,
+            years=self.years,
+            language=settings.HOLIDAY_CALENDAR_LANGUAGE,
+        )
+        self.holidays = sorted(
+            Holiday(date, name, is_substitute(name)) for date, name in entries.items()
+        )
+        self.dates = [holiday.date for holiday in self.holidays]
+
+    def covers(self, date):
+        """
+        date의 다음 해까지 범위에 포함하는지 확인
+        """
+        return date.year in self.years and date.year + 1 in self.years
+
+    def get(self, date):
+        index = bisect.bisect_left(self.dates, date)
+        if index < len(self.dates) and self.dates[index] == date:
+            return self.holidays[index]
+        return None
+
+    def get_upcoming(self, after, count=3, include_substitute=False):
+        """
+        after 다음 날부터 가까운 공휴일 count개
+        """
+        result = []
+        for holiday in self.holidays[bisect.bisect_right(self.dates, after) :]:
+            if len(result) >= count:
+                break
+            if include_substitute or not holiday.is_substitute:
+                result.append(holiday)
+        return result
+
+    def get_between(self, start, end):
+        """
+        start ~ end(포함) 사이의 공휴일
+        """
+        return self.holidays[
+            bisect.bisect_left(self.dates, start) : bisect.bisect_right(self.dates, end)
+        ]
+
+
+_calendar = None
+
+
+def get_holiday_calendar(today=None):
+    """
+    today를 포함하는 공휴일 달력
+    """
+    global _calendar
+    today = today or datetime.date.today()
+    calendar = _calendar
+    if calendar is None or not calendar.covers(today):
+        calendar = HolidayCalendar(
+            (
+                today.year - settings.HOLIDAY_CALENDAR_YEARS_BEFORE,
+                today.year + settings.HOLIDAY_CALENDAR_YEARS_AFTER,
+            )
+        )
+        _calendar = calendar
+    return calendar
+
+
+def get_upcoming_holidays(after, count=3):
+    """
+    after 다음 날부터 가까운 공휴일 count개 (대체공휴일 제외)
+    """
+    return get_holiday_calendar(after).get_upcoming(after, count)
+
+
+def get_holidays_between(start, end):
+    """
+    start ~ end(포함) 사이의 공휴일
+    오늘 기준 달력 범위 밖의 날짜는 조회하지 않음
+    """
+    return get_holiday_calendar().get_between(start, end)
@@ -0,0 +1,59 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from main.benchmark import compare_results, run_benchmark
+
+
+class Command(BaseCommand):
+    help = "대표 화면의 응답 시간 백분위와 쿼리 수를 측정하고 기준 결과와 비교합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--repeat", type=int, default=20, help="화면별 측정 횟수 (기본값: 20)"
+        )
+        parser.add_argument(
+            "--warmup", type=int, default=3, help="측정 전 요청 횟수 (기본값: 3)"
+        )
+        parser.add_argument(
+            "--view",
+            action="append",
+            dest="views",
+            help="측정할 화면 이름, 여러 번 지정 가능 (기본값: 전체)",
+        )
+        parser.add_argument("--output", help="측정 결과를 저장할 JSON 파일")
+        parser.add_argument("--compare", help="비교할 기준 결과 JSON 파일")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.2,
+            help="응답 시간 회귀로 판단할 증가 비율 (기본값: 0.2)",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            result = run_benchmark(
+                repeat=options["repeat"],
+                warmup=options["warmup"],
+                views=options["views"],
+            )
+        except RuntimeError as error:
+            raise CommandError(error)
+
+        for name, view in result["views"].items():
+            self.stdout.write(
+                f"{name}: p50 {view['p50_ms']}ms, p90 {view['p90_ms']}ms, "
+                f"p99 {view['p99_ms']}ms, 쿼리 {view['queries']}개"
+            )
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                json.dump(result, file, ensure_ascii=False, indent=2)
+
+        if options["compare"]:
+            with open(options["compare"], encoding="utf-8") as file:
+                baseline = json.load(file)
+            regressions = compare_results(baseline, result, options["threshold"])
+            if regressions:
+                raise CommandError("성능 회귀\n" + "\n".join(regressions))
+            self.stdout.write(self.style.SUCCESS("기준 결과 대비 회귀 없음"))
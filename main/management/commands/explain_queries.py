@@ -0,0 +1,93 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Q
+
+from alerts.models import Alert
+from chats.models import ChatMessage
+from devmates.models import DevMate
+from studies.models import Blacklist, Favorite, StudyMember
+from todos.models import ToDoAssignee
+
+
+def get_canonical_queries():
+    """
+    요청마다 실행되는 대표 조회 쿼리 목록
+    - 실제 데이터가 없어도 실행 계획을 확인할 수 있도록 임의의 id를 사용
+    """
+    return {
+        "StudyMember(study, user)": StudyMember.objects.filter(study=1, user=1),
+        "StudyMember(study, is_manager)": StudyMember.objects.filter(
+            study=1, is_manager=True
+        ),
+        "StudyMember(study, is_accepted)": StudyMember.objects.filter(
+            study=1, is_accepted=True
+        ),
+        "Blacklist(study, user)": Blacklist.objects.filter(study=1, user=1),
+        "Favorite(study, user)": Favorite.objects.filter(study=1, user=1),
+        "DevMate(sent_user, received_user, is_accepted)": DevMate.objects.filter(
+            sent_user=1, received_user=2, is_accepted=True
+        ),
+        "DevMate(sent_user | received_user, is_accepted)": DevMate.objects.filter(
+            Q(sent_user=1) | Q(received_user=1), is_accepted=True
+        ),
+        "DevMate(received_user, is_accepted)": DevMate.objects.filter(
+            received_user=1, is_accepted=False
+        ),
+        "ToDoAssignee(assignee)": ToDoAssignee.objects.filter(assignee=1),
+        "ChatMessage(direct_chat, -id)": ChatMessage.objects.filter(
+            direct_chat=1
+        ).order_by("-id")[:10],
+        "Alert(user, is_read, -created_at)": Alert.objects.filter(
+            user=1, is_read=False
+        ).order_by("-created_at"),
+    }
+
+
+def is_table_scan(line):
+    """
+    실행 계획의 한 줄이 테이블 전체 스캔인지 확인
+    - SQLite: "SCAN studies_studymember" (인덱스를 사용하는 "SCAN ... USING INDEX"는 제외)
+    - PostgreSQL: "Seq Scan on studies_studymember"
+    """
+    if "Seq Scan on" in line:
+        return True
+    return "SCAN " in line and "USING" not in line and "CONSTANT ROW" not in line
+
+
+def find_table_scans(plan):
+    """
+    실행 계획에서 테이블 전체 스캔에 해당하는 줄을 반환
+    """
+    return [line.strip() for line in plan.splitlines() if is_table_scan(line)]
+
+
+class Command(BaseCommand):
+    help = "대표 조회 쿼리의 실행 계획(EXPLAIN)을 출력하고 테이블 전체 스캔 여부를 확인합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fail-on-scan",
+            action="store_true",
+            help="테이블 전체 스캔이 있으면 에러로 종료합니다.",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor == "postgresql":
+            # 데이터가 적은 개발 DB에서도 인덱스 사용 가능 여부를 확인하기 위함
+            with connection.cursor() as cursor:
+                cursor.execute("SET enable_seqscan = off")
+
+        scanned = []
+        for name, queryset in get_canonical_queries().items():
+            plan = queryset.explain()
+            table_scans = find_table_scans(plan)
+            if table_scans:
+                scanned.append(name)
+
+            style = self.style.ERROR if table_scans else self.style.SUCCESS
+            self.stdout.write(style(f"[{'SCAN' if table_scans else 'OK'}] {name}"))
+            for line in plan.splitlines():
+                self.stdout.write(f"    {line}")
+
+        if scanned and options["fail_on_scan"]:
+            raise CommandError(f"테이블 전체 스캔이 발생한 쿼리: {', '.join(scanned)}")
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from main.seed import Seeder
+
+
+class Command(BaseCommand):
+    help = "성능 측정용 대량 데이터를 생성합니다. (scale=1이면 유저 100만, 채팅 메시지 1,000만)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale",
+            type=float,
+            default=1.0,
+            help="생성할 데이터 규모 (기본값: 1.0)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="한 번에 저장할 객체 수 (기본값: 5000)",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="난수 seed, 같은 seed로 실행하면 같은 데이터 생성 (기본값: 0)",
+        )
+
+    def handle(self, *args, **options):
+        created = Seeder(
+            scale=options["scale"],
+            batch_size=options["batch_size"],
+            seed=options["seed"],
+            stdout=self.stdout,
+        ).run()
+        for label, count in created.items():
+            self.stdout.write(f"{label}: {count:,}개")
+        self.stdout.write(self.style.SUCCESS("대량 데이터 생성 완료"))
@@ -0,0 +1,312 @@
+import base64
+import binascii
+import datetime
+import json
+import math
+import re
+from collections.abc import Sequence
+
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.db.models import Q
+from django.http import Http404, QueryDict
+
+NEXT = "next"
+PREVIOUS = "prev"
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def encode_cursor(direction, values=None, number=1):
+    """
+    커서 정보를 URL에 사용할 수 있는 문자열로 변환
+    - direction: 커서 기준으로 조회할 방향 (next, prev)
+    - values: 커서 기준 객체의 정렬 키 값, None이면 처음/끝 페이지
+    - number: 조회할 페이지 번호 (표시용), 알 수 없는 경우 None
+    """
+    payload = {"d": direction, "v": values, "p": number}
+    data = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(data)
+        direction = payload["d"]
+        values = payload["v"]
+        number = payload["p"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise InvalidCursor("잘못된 커서입니다.")
+    if (
+        direction not in (NEXT, PREVIOUS)
+        or not isinstance(values, (list, type(None)))
+        or not isinstance(number, (int, type(None)))
+    ):
+        raise InvalidCursor("잘못된 커서입니다.")
+    return direction, values, number
+
+
+def serialize_value(value):
+    """
+    정렬 키 값을 JSON으로 저장할 수 있는 값으로 변환
+    datetime은 마이크로초까지 보존하여 같은 시각의 객체를 구분
+    """
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    return value
+
+
+class CursorPage(Sequence):
+    """
+    커서 기반 페이지
+    Django Page와 같은 방식으로 템플릿에서 사용 가능
+    """
+
+    def __init__(
+        self,
+        object_list,
+        paginator,
+        number,
+        next_cursor=None,
+        previous_cursor=None,
+    ):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.number = number
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.query_params = None
+
+    def __repr__(self):
+        return f"<CursorPage {self.number}>"
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    def get_querystring(self, cursor):
+        """
+        현재 요청의 검색 조건을 유지한 채 cursor만 바꾼 querystring 반환
+        """
+        params = (self.query_params or QueryDict()).copy()
+        params.pop("page", None)
+        params.pop(self.paginator.cursor_query_param, None)
+        if cursor:
+            params[self.paginator.cursor_query_param] = cursor
+        return params.urlencode()
+
+    @property
+    def next_querystring(self):
+        return self.get_querystring(self.next_cursor)
+
+    @property
+    def previous_querystring(self):
+        return self.get_querystring(self.previous_cursor)
+
+    @property
+    def first_querystring(self):
+        return self.get_querystring(None)
+
+    @property
+    def last_querystring(self):
+        return self.get_querystring(self.paginator.last_cursor)
+
+
+class CursorPaginator:
+    """
+    커서(keyset) 기반 페이지네이터
+    - OFFSET 대신 마지막으로 조회한 객체의 정렬 키 값으로 다음 페이지를 조회
+    - 페이지 깊이와 관계없이 첫 페이지와 같은 비용으로 조회
+    - 전체 개수(COUNT)를 조회하지 않으며, approximate_count가 True인 경우에만
+      추정 개수를 제공
+    - ordering의 마지막 키는 id와 같이 고유한 값이어야 함
+    """
+
+    cursor_query_param = "cursor"
+    count_limit = 1000
+
+    def __init__(self, queryset, per_page, ordering, approximate_count=False):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = list(ordering)
+        self.approximate_count = approximate_count
+
+    @property
+    def last_cursor(self):
+        return encode_cursor(PREVIOUS, None, None)
+
+    def get_ordering_field(self, name):
+        """
+        정렬 키의 필드 반환, annotate한 값이면 output_field
+        """
+        annotation = self.queryset.query.annotations.get(name)
+        if annotation is not None:
+            return annotation.output_field
+        opts = self.queryset.model._meta
+        *path, name = name.split("__")
+        for part in path:
+            opts = opts.get_field(part).related_model._meta
+        return opts.pk if name == "pk" else opts.get_field(name)
+
+    def parse_values(self, values):
+        """
+        커서의 정렬 키 값을 각 필드의 값으로 변환
+        조작된 커서가 쿼리 실행 중 오류를 내지 않도록 변환할 수 없는 값은 InvalidCursor
+        """
+        if len(values) != len(self.ordering):
+            raise InvalidCursor("잘못된 커서입니다.")
+        try:
+            values = [
+                self.get_ordering_field(field.lstrip("-")).to_python(value)
+                for field, value in zip(self.ordering, values)
+            ]
+        except (ValidationError, TypeError, ValueError):
+            raise InvalidCursor("잘못된 커서입니다.")
+        if any(value is None for value in values):
+            raise InvalidCursor("잘못된 커서입니다.")
+        return values
+
+    def get_keyset_filter(self, values, direction):
+        """
+        (k1, k2, ...) 정렬 키에 대해 커서 다음(이전) 객체를 찾는 조건 생성
+        k1 < v1 OR (k1 = v1 AND k2 < v2) OR ...
+        """
+        values = self.parse_values(values)
+        condition = Q()
+        equals = {}
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip("-")
+            descending = field.startswith("-")
+            if direction == PREVIOUS:
+                descending = not descending
+            lookup = "lt" if descending else "gt"
+            condition |= Q(**equals, **{f"{name}__{lookup}": value})
+            equals[name] = value
+        return condition
+
+    def get_values(self, obj):
+        values = []
+        for field in self.ordering:
+            value = obj
+            for attr in field.lstrip("-").split("__"):
+                value = getattr(value, attr)
+            values.append(serialize_value(value))
+        return values
+
+    def reverse_ordering(self):
+        return [
+            field[1:] if field.startswith("-") else f"-{field}"
+            for field in self.ordering
+        ]
+
+    def page(self, cursor=None):
+        """
+        커서에 해당하는 페이지 반환
+        """
+        if cursor:
+            direction, values, number = decode_cursor(cursor)
+        else:
+            direction, values, number = NEXT, None, 1
+
+        queryset = self.queryset
+        if values is not None:
+            queryset = queryset.filter(self.get_keyset_filter(values, direction))
+
+        if direction == NEXT:
+            rows = list(queryset.order_by(*self.ordering)[: self.per_page + 1])
+            has_more = len(rows) > self.per_page
+            object_list = rows[: self.per_page]
+            has_next, has_previous = has_more, values is not None
+        else:
+            rows = list(
+                queryset.order_by(*self.reverse_ordering())[: self.per_page + 1]
+            )
+            has_more = len(rows) > self.per_page
+            object_list = rows[: self.per_page][::-1]
+            has_next, has_previous = values is not None, has_more
+
+        # 끝 페이지는 추정 개수가 있는 경우에만 페이지 번호를 계산
+        if direction == PREVIOUS and values is None:
+            number = self.num_pages
+
+        next_cursor = previous_cursor = None
+        if object_list and has_next:
+            next_cursor = encode_cursor(
+                NEXT, self.get_values(object_list[-1]), number and number + 1
+            )
+        if object_list and has_previous:
+            previous_cursor = encode_cursor(
+                PREVIOUS, self.get_values(object_list[0]), number and max(number - 1, 1)
+            )
+        return CursorPage(object_list, self, number, next_cursor, previous_cursor)
+
+    @property
+    def count(self):
+        """
+        추정 개수
+        - PostgreSQL: 실행 계획의 추정 행 수 (COUNT 없이 계산)
+        - 그 외: count_limit개까지만 센 개수
+        approximate_count가 False이면 None
+        """
+        if not self.approximate_count:
+            return None
+        if not hasattr(self, "_count"):
+            self._count = self.get_approximate_count()
+        return self._count
+
+    def get_approximate_count(self):
+        queryset = self.queryset.order_by()
+        if connection.vendor == "postgresql":
+            match = re.search(r"rows=(\d+)", queryset.explain())
+            if match:
+                return int(match.group(1))
+        return queryset[: self.count_limit].count()
+
+    @property
+    def num_pages(self):
+        if self.count is None:
+            return None
+        return max(math.ceil(self.count / self.per_page), 1)
+
+
+class CursorPaginationMixin:
+    """
+    ListView에서 Paginator 대신 CursorPaginator를 사용하는 mixin
+    - cursor_ordering: 커서 정렬 키, 마지막 키는 고유한 값이어야 함
+    - approximate_count: True인 경우 paginator.count, num_pages로 추정 개수 제공
+    """
+
+    cursor_ordering = ("-created_at", "-id")
+    approximate_count = False
+
+    def get_cursor_ordering(self):
+        return self.cursor_ordering
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = CursorPaginator(
+            queryset,
+            page_size,
+            self.get_cursor_ordering(),
+            approximate_count=self.approximate_count,
+        )
+        cursor = self.request.GET.get(paginator.cursor_query_param)
+        try:
+            page = paginator.page(cursor)
+        except InvalidCursor as error:
+            raise Http404(str(error))
+        page.query_params = self.request.GET
+        return (paginator, page, page.object_list, page.has_other_pages())
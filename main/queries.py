@@ -0,0 +1,183 @@
+"""
+요청별 쿼리 기록
+- 실행한 쿼리 수, SQL 실행 시간, 같은 형태(fingerprint)로 반복 실행된 쿼리(N+1 의심)와
+  각 쿼리를 실행한 템플릿 줄 또는 코드 줄 기록
+- QueryBudgetMiddleware는 DEBUG이거나 QUERY_BUDGET_ENABLED일 때 요청마다 기록하여 응답 헤더에 추가하고,
+  예산을 넘거나 반복 쿼리가 있으면 경고 로그를 남기며, DEBUG이면 HTML 응답에 요약 패널 추가
+- 테스트에서는 main.testing.QueryBudgetMixin으로 뷰별 쿼리 예산 확인
+"""
+
+import logging
+import os
+import re
+import sys
+import time
+from collections import defaultdict
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.template.base import Node
+from django.utils.html import escape
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = str(settings.BASE_DIR)
+IN_PARAMS = re.compile(r"%s(?:\s*,\s*%s)+")
+
+
+def get_fingerprint(sql):
+    """
+    파라미터 개수만 다른 IN 조건을 같은 쿼리로 묶은 SQL
+    """
+    return IN_PARAMS.sub("%s, ...", sql)
+
+
+def get_query_origin():
+    """
+    쿼리를 실행한 템플릿 줄, 템플릿 밖이면 프로젝트 코드 줄
+    """
+    code_line = None
+    frame = sys._getframe(2)
+    while frame is not None:
+        node = frame.f_locals.get("self")
+        if (
+            frame.f_code is Node.render_annotated.__code__
+            and getattr(node, "token", None) is not None
+        ):
+            template_name = node.origin.template_name or node.origin.name
+            return f"{template_name}:{node.token.lineno}"
+        filename = frame.f_code.co_filename
+        if (
+            code_line is None
+            and filename.startswith(BASE_DIR)
+            and "site-packages" not in filename
+            and not filename.endswith(os.path.join("main", "queries.py"))
+        ):
+            code_line = f"{os.path.relpath(filename, BASE_DIR)}:{frame.f_lineno}"
+        frame = frame.f_back
+    return code_line or "-"
+
+
+class QueryRecorder:
+    """
+    with 블록 안에서 실행한 쿼리 기록
+    """
+
+    def __init__(self, using=None):
+        self.using = using or list(connections)
+        self.queries = []
+
+    def __enter__(self):
+        self.stack = ExitStack()
+        for alias in self.using:
+            self.stack.enter_context(connections[alias].execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stack.close()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(
+                {
+                    "sql": sql,
+                    "fingerprint": get_fingerprint(sql),
+                    "ms": (time.perf_counter() - started) * 1000,
+                    "origin": get_query_origin(),
+                }
+            )
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def total_ms(self):
+        return sum(query["ms"] for query in self.queries)
+
+    def get_duplicates(self, threshold=2):
+        """
+        threshold번 이상 실행된 같은 형태의 쿼리
+        반환값: [(fingerprint, 실행 횟수, 실행한 위치 목록)], 실행 횟수가 많은 순
+        """
+        origins = defaultdict(list)
+        for query in self.queries:
+            origins[query["fingerprint"]].append(query["origin"])
+        duplicates = [
+            (fingerprint, len(lines), sorted(set(lines)))
+            for fingerprint, lines in origins.items()
+            if len(lines) >= threshold
+        ]
+        return sorted(duplicates, key=lambda duplicate: -duplicate[1])
+
+    def get_report(self, threshold=2):
+        lines = [f"쿼리 {self.count}개, {self.total_ms:.1f}ms"]
+        for fingerprint, count, origins in self.get_duplicates(threshold):
+            lines.append(f"  {count}회 [{', '.join(origins)}] {fingerprint}")
+        return "\n".join(lines)
+
+
+def render_panel(recorder, view_name):
+    duplicates = "".join(
+        f"<li><b>{count}회</b> {escape(', '.join(origins))}"
+        f"<pre style='white-space: pre-wrap'>{escape(fingerprint)}</pre></li>"
+        for fingerprint, count, origins in recorder.get_duplicates(
+            settings.QUERY_BUDGET_DUPLICATES
+        )
+    )
+    return (
+        '<details id="query-budget-panel" style="position: fixed; right: 1rem; '
+        "bottom: 1rem; z-index: 9999; max-width: 40rem; max-height: 60vh; "
+        "overflow: auto; padding: 0.5rem; background: #fff; border: 1px solid #ccc; "
+        'font-size: 12px;">'
+        f"<summary>{escape(view_name)}: 쿼리 {recorder.count}개, "
+        f"{recorder.total_ms:.1f}ms</summary><ul>{duplicates}</ul></details>"
+    )
+
+
+class QueryBudgetMiddleware:
+    """
+    요청별 쿼리 수, SQL 실행 시간, 반복 쿼리 기록
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not (settings.DEBUG or settings.QUERY_BUDGET_ENABLED):
+            return self.get_response(request)
+
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+
+        match = request.resolver_match
+        view_name = match.view_name if match else request.path
+        duplicates = recorder.get_duplicates(settings.QUERY_BUDGET_DUPLICATES)
+        budget = settings.QUERY_BUDGETS.get(view_name, settings.QUERY_BUDGET_DEFAULT)
+        response["X-Query-Count"] = recorder.count
+        response["X-Query-Time-Ms"] = f"{recorder.total_ms:.1f}"
+        response["X-Query-Duplicates"] = len(duplicates)
+        if recorder.count > budget or duplicates:
+            logger.warning(
+                "%s 쿼리 예산 %s개\n%s",
+                view_name,
+                budget,
+                recorder.get_report(settings.QUERY_BUDGET_DUPLICATES),
+            )
+
+        if (
+            settings.DEBUG
+            and not response.streaming
+            and response.get("Content-Type", "").startswith("text/html")
+            and b"</body>" in response.content
+        ):
+            response.content = response.content.replace(
+                b"</body>", render_panel(recorder, view_name).encode() + b"</body>", 1
+            )
+            if response.has_header("Content-Length"):
+                response["Content-Length"] = len(response.content)
+        return response
@@ -0,0 +1,356 @@
+"""
+운영 규모의 대량 데이터 생성 (manage.py seed_scale)
+- scale=1이면 유저 100만, 스터디 10만(태그, 일정, 멤버 포함), 채팅 메시지 1,000만,
+  할 일 300만, 알림 300만 생성
+- 유저, 스터디는 factory로 만들고, 건수가 많은 테이블은 Faker로 미리 만든 문장을 재사용하여
+  batch_size개씩 bulk_create로 저장 (signal은 실행되지 않으므로 검색 문서는 직접 생성)
+- 같은 seed로 실행하면 같은 데이터 생성
+"""
+
+import datetime
+import random
+import time
+
+import factory.random
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+from faker import Faker
+
+from alerts.models import Alert
+from chats.models import ChatMessage, DirectChat, StudyChat
+from devmates.models import DevMate
+from studies.members import repair_member_columns
+from studies.models import Favorite, Schedule, Study, StudyMember, StudySearchDocument
+from studies.search import ngram_text
+from todos.models import ToDo, ToDoAssignee
+
+from .factories import (
+    CategoryFactory,
+    ScheduleFactory,
+    StudyFactory,
+    TagFactory,
+    UserFactory,
+)
+
+# scale=1일 때 생성할 데이터 수
+SCALE_COUNTS = {
+    "users": 1_000_000,
+    "studies": 100_000,
+    "tags": 2_000,
+    "favorites": 300_000,
+    "devmates": 500_000,
+    "direct_chats": 100_000,
+    "chat_messages": 10_000_000,
+    "todos": 3_000_000,
+    "alerts": 3_000_000,
+}
+
+# 스터디별 데이터 수 (scale과 관계없이 일정)
+MEMBERS_PER_STUDY = (3, 12)
+SCHEDULES_PER_STUDY = (1, 3)
+TAGS_PER_STUDY = (1, 4)
+
+CATEGORIES = [
+    "프론트엔드",
+    "백엔드",
+    "데이터베이스",
+    "알고리즘",
+    "모바일",
+    "데브옵스",
+    "AI",
+]
+
+# 건수가 많은 테이블에서 재사용할 문장 수
+TEXT_POOL_SIZE = 2_000
+
+
+class Seeder:
+    def __init__(self, scale=1.0, batch_size=5000, seed=0, stdout=None):
+        self.counts = {
+            name: max(1, round(count * scale)) for name, count in SCALE_COUNTS.items()
+        }
+        self.batch_size = batch_size
+        self.stdout = stdout
+        self.rng = random.Random(seed)
+        factory.random.reseed_random(seed)
+        self.faker = Faker("ko_KR")
+        self.faker.seed_instance(seed)
+        self.sentences = [self.faker.sentence() for _ in range(TEXT_POOL_SIZE)]
+        self.now = timezone.now()
+        self.created = {}
+
+    def log(self, message):
+        if self.stdout is not None:
+            self.stdout.write(message)
+
+    def bulk_create(self, model, rows):
+        """
+        rows를 batch_size개씩 저장
+        반환값: 새로 저장한 객체의 id QuerySet
+        """
+        last = model.objects.order_by("-pk").values_list("pk", flat=True).first() or 0
+        batch = []
+        total = 0
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                total += self.flush(model, batch)
+                batch = []
+        if batch:
+            total += self.flush(model, batch)
+        self.created[model._meta.label] = self.created.get(model._meta.label, 0) + total
+        return (
+            model.objects.filter(pk__gt=last)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+
+    def flush(self, model, batch):
+        with transaction.atomic():
+            model.objects.bulk_create(batch)
+        return len(batch)
+
+    def sentence(self):
+        return self.rng.choice(self.sentences)
+
+    def seed_users(self):
+        start = get_user_model().objects.count()
+        self.user_ids = list(
+            self.bulk_create(
+                get_user_model(),
+                (
+                    UserFactory.build(
+                        email=f"seed{start + num}@example.com",
+                        nickname=f"seed{start + num}",
+                    )
+                    for num in range(self.counts["users"])
+                ),
+            )
+        )
+
+    def seed_studies(self):
+        categories = [CategoryFactory(name=name) for name in CATEGORIES]
+        tag_ids = list(
+            self.bulk_create(
+                TagFactory._meta.model,
+                (TagFactory.build() for _ in range(self.counts["tags"])),
+            )
+        )
+        self.study_ids = list(
+            self.bulk_create(
+                Study,
+                (
+                    StudyFactory.build(category=self.rng.choice(categories))
+                    for _ in range(self.counts["studies"])
+                ),
+            )
+        )
+        self.bulk_create(
+            StudySearchDocument,
+            (
+                StudySearchDocument(
+                    study_id=study.id,
+                    title=ngram_text(study.title),
+                    introduce=ngram_text(study.introduce),
+                )
+                for study in Study.objects.filter(id__in=self.study_ids)
+                .only("id", "title", "introduce")
+                .iterator()
+            ),
+        )
+        self.bulk_create(
+            Study.tag.through,
+            (
+                Study.tag.through(study_id=study_id, tag_id=tag_id)
+                for study_id in self.study_ids
+                for tag_id in self.rng.sample(
+                    tag_ids, min(len(tag_ids), self.rng.randint(*TAGS_PER_STUDY))
+                )
+            ),
+        )
+        self.bulk_create(
+            Schedule,
+            (
+                ScheduleFactory.build(study=Study(id=study_id))
+                for study_id in self.study_ids
+                for _ in range(self.rng.randint(*SCHEDULES_PER_STUDY))
+            ),
+        )
+
+    def seed_members(self):
+        """
+        스터디마다 스터디장 1명과 멤버 생성, 일부 멤버는 가입 대기
+        """
+        self.study_members = {}
+        for study_id in self.study_ids:
+            count = min(len(self.user_ids), self.rng.randint(*MEMBERS_PER_STUDY))
+            self.study_members[study_id] = self.rng.sample(self.user_ids, count)
+        self.bulk_create(
+            StudyMember,
+            (
+                StudyMember(
+                    study_id=study_id,
+                    user_id=user_id,
+                    is_manager=index == 0,
+                    is_accepted=index == 0 or self.rng.random() < 0.8,
+                )
+                for study_id, user_ids in self.study_members.items()
+                for index, user_id in enumerate(user_ids)
+            ),
+        )
+        # bulk_create는 StudyMember.save()를 거치지 않으므로 스터디의 멤버 컬럼을 한 번에 계산
+        repair_member_columns(Study, StudyMember, self.batch_size)
+
+    def seed_favorites(self):
+        pairs = {
+            (self.rng.choice(self.user_ids), self.rng.choice(self.study_ids))
+            for _ in range(self.counts["favorites"])
+        }
+        self.bulk_create(
+            Favorite,
+            (
+                Favorite(user_id=user_id, study_id=study_id)
+                for user_id, study_id in pairs
+            ),
+        )
+
+    def get_user_pairs(self, count):
+        """
+        중복되지 않는 유저 쌍 (i, i + distance)
+        """
+        users = len(self.user_ids)
+        for distance in range(1, users):
+            for index in range(users - distance):
+                if count <= 0:
+                    return
+                count -= 1
+                yield self.user_ids[index], self.user_ids[index + distance]
+
+    def seed_devmates(self):
+        self.bulk_create(
+            DevMate,
+            (
+                DevMate(
+                    sent_user_id=sent,
+                    received_user_id=received,
+                    is_accepted=self.rng.random() < 0.7,
+                )
+                for sent, received in self.get_user_pairs(self.counts["devmates"])
+            ),
+        )
+
+    def seed_chats(self):
+        """
+        스터디마다 채팅방 1개, 유저 쌍마다 개인 채팅방 1개를 만들고 메시지를 나누어 저장
+        """
+        study_chat_ids = list(
+            self.bulk_create(
+                StudyChat, (StudyChat(study_id=study_id) for study_id in self.study_ids)
+            )
+        )
+        pairs = list(self.get_user_pairs(self.counts["direct_chats"]))
+        direct_chat_ids = list(
+            self.bulk_create(DirectChat, (DirectChat() for _ in pairs))
+        )
+        self.bulk_create(
+            DirectChat.users.through,
+            (
+                DirectChat.users.through(directchat_id=chat_id, user_id=user_id)
+                for chat_id, pair in zip(direct_chat_ids, pairs)
+                for user_id in pair
+            ),
+        )
+
+        rooms = [
+            ("study_chat_id", chat_id, self.study_members[study_id])
+            for chat_id, study_id in zip(study_chat_ids, self.study_ids)
+        ] + [
+            ("direct_chat_id", chat_id, pair)
+            for chat_id, pair in zip(direct_chat_ids, pairs)
+        ]
+        per_room, extra = divmod(self.counts["chat_messages"], len(rooms))
+        self.bulk_create(
+            ChatMessage,
+            (
+                ChatMessage(
+                    message=self.sentence(),
+                    sequence=sequence,
+                    author_id=self.rng.choice(user_ids),
+                    **{field: chat_id},
+                )
+                for index, (field, chat_id, user_ids) in enumerate(rooms)
+                for sequence in range(1, per_room + (index < extra) + 1)
+            ),
+        )
+
+    def seed_todos(self):
+        """
+        할 일의 70%는 스터디 할 일(스터디 멤버 담당), 나머지는 개인 할 일
+        """
+        assignees = []
+
+        def todos():
+            for _ in range(self.counts["todos"]):
+                start_at = None
+                if self.rng.random() < 0.3:
+                    start_at = self.now + datetime.timedelta(
+                        hours=self.rng.randint(-720, 720)
+                    )
+                if self.rng.random() < 0.7:
+                    study_id = self.rng.choice(self.study_ids)
+                    assignees.append(self.rng.choice(self.study_members[study_id]))
+                else:
+                    study_id = None
+                    assignees.append(self.rng.choice(self.user_ids))
+                yield ToDo(
+                    study_id=study_id,
+                    title=self.sentence()[:100],
+                    content=self.sentence(),
+                    status=self.rng.choice(ToDo.STATUS_CATEGORY)[0],
+                    start_at=start_at,
+                    end_at=start_at and start_at + datetime.timedelta(hours=2),
+                )
+
+        todo_ids = self.bulk_create(ToDo, todos())
+        self.bulk_create(
+            ToDoAssignee,
+            (
+                ToDoAssignee(todo_id=todo_id, assignee_id=user_id)
+                for todo_id, user_id in zip(todo_ids.iterator(), assignees)
+            ),
+        )
+
+    def seed_alerts(self):
+        categories = [category for category, _ in Alert.ALERT_CATEGORIES]
+        self.bulk_create(
+            Alert,
+            (
+                Alert(
+                    user_id=self.rng.choice(self.user_ids),
+                    content=self.sentence()[:100],
+                    category=self.rng.choice(categories),
+                    is_read=self.rng.random() < 0.7,
+                )
+                for _ in range(self.counts["alerts"])
+            ),
+        )
+
+    def run(self):
+        """
+        반환값: {모델: 생성한 객체 수}
+        """
+        for step in (
+            self.seed_users,
+            self.seed_studies,
+            self.seed_members,
+            self.seed_favorites,
+            self.seed_devmates,
+            self.seed_chats,
+            self.seed_todos,
+            self.seed_alerts,
+        ):
+            started = time.perf_counter()
+            step()
+            self.log(f"{step.__name__}: {time.perf_counter() - started:.1f}초")
+        return self.created
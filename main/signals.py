@@ -0,0 +1,32 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from studies.models import Study, StudyMember
+
+from .fragments import invalidate_home_studies
+
+
+@receiver(post_save, sender=Study)
+@receiver(post_delete, sender=Study)
+def invalidate_study_fragments(sender, instance, raw=False, created=False, **kwargs):
+    """
+    스터디 생성, 수정, 삭제 시 메인 화면 스터디 fragment 삭제
+    스터디를 삭제하면 멤버가 먼저 삭제되므로 멤버의 fragment는 StudyMember signal에서 삭제
+    """
+    if raw:
+        return
+    user_ids = []
+    if not created and kwargs["signal"] is post_save:
+        user_ids = list(instance.members.values_list("user_id", flat=True))
+    invalidate_home_studies(user_ids)
+
+
+@receiver(post_save, sender=StudyMember)
+@receiver(post_delete, sender=StudyMember)
+def invalidate_member_fragments(sender, instance, raw=False, **kwargs):
+    """
+    스터디 가입, 승인, 탈퇴 시 멤버 수, 스터디장이 바뀌므로 메인 화면 스터디 fragment 삭제
+    """
+    if raw:
+        return
+    invalidate_home_studies([instance.user_id])
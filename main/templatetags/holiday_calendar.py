@@ -0,0 +1,25 @@
+import datetime
+
+from django import template
+from django.utils import timezone
+
+from main.holiday_calendar import get_holidays_between
+
+register = template.Library()
+
+
+def to_date(value):
+    if isinstance(value, datetime.datetime):
+        return timezone.localdate(value) if timezone.is_aware(value) else value.date()
+    return value
+
+
+@register.simple_tag
+def holidays_between(start, end):
+    """
+    start ~ end 사이의 공휴일 (날짜, 일시 모두 사용 가능)
+    사용법: {% holidays_between todo.start_at todo.end_at as todo_holidays %}
+    """
+    if not start or not end:
+        return []
+    return get_holidays_between(to_date(start), to_date(end))
@@ -0,0 +1,44 @@
+"""
+테스트용 쿼리 예산 확인
+"""
+
+from .queries import QueryRecorder
+
+
+class QueryBudgetMixin:
+    """
+    TestCase에서 뷰별 쿼리 예산을 확인하는 mixin
+    """
+
+    def record_queries(self, url, status_code=200):
+        with QueryRecorder() as recorder:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status_code)
+        return recorder, response
+
+    def assertQueryBudget(self, url, budget, grow=None, times=5):
+        """
+        url 요청의 쿼리 수가 budget 이하인지 확인
+        grow를 지정하면 grow를 times번 실행하여 데이터를 늘린 뒤에도 쿼리 수가 같은지 확인
+        실패하면 반복 실행된 쿼리와 실행한 템플릿 줄을 함께 출력
+        반환값: 마지막 요청의 응답
+        """
+        recorder, response = self.record_queries(url)
+        self.assertLessEqual(
+            recorder.count,
+            budget,
+            f"{url} 쿼리 예산 초과\n{recorder.get_report()}",
+        )
+        if grow is None:
+            return response
+
+        for _ in range(times):
+            grow()
+        grown, response = self.record_queries(url)
+        self.assertEqual(
+            grown.count,
+            recorder.count,
+            f"{url} 데이터가 늘어나면 쿼리 수 증가 ({recorder.count} -> {grown.count})\n"
+            f"{grown.get_report()}",
+        )
+        return response
@@ -1 +1,583 @@
-from django.test import TestCase
+import datetime
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from freezegun import freeze_time
+from django.urls import reverse
+
+from chats.models import ChatMessage, StudyChat
+from devmates.models import DevMate
+from main.holiday_calendar import (
+    HolidayCalendar,
+    get_holiday_calendar,
+    get_upcoming_holidays,
+)
+from main.pagination import (
+    NEXT,
+    CursorPaginator,
+    InvalidCursor,
+    decode_cursor,
+    encode_cursor,
+)
+from main.benchmark import measure
+from main.queries import QueryRecorder
+from main.testing import QueryBudgetMixin
+from studies.models import Study, StudyMember, Category
+from todos.models import ToDo
+
+User = get_user_model()
+
+# 메인 화면의 쿼리 예산
+INDEX_QUERY_BUDGET = 12
+
+
+class TestIndexQueryCount(QueryBudgetMixin, TestCase):
+    """
+    메인 화면 쿼리 수 테스트
+    스터디 카드 개수와 관계없이 쿼리 수가 일정한지 확인
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test1@naver.com", password="test1", nickname="test1"
+        )
+        self.category = Category.objects.create(name="test")
+        self.study_count = 0
+        self.create_study()
+
+    def create_study(self):
+        """
+        스터디장과 로그인 유저가 멤버인 스터디 생성
+        """
+        self.study_count += 1
+        num = self.study_count
+        study = Study.objects.create(
+            category=self.category,
+            goal=f"test{num}",
+            title=f"test{num}",
+            start_at=datetime.date.today(),
+            end_at=datetime.date.today(),
+            difficulty=Study.difficulty_choices[0][0],
+            max_member=10,
+        )
+        leader = User.objects.create_user(
+            email=f"leader{num}@naver.com", password="test", nickname=f"leader{num}"
+        )
+        StudyMember.objects.create(
+            study=study, user=leader, is_manager=True, is_accepted=True
+        )
+        StudyMember.objects.create(study=study, user=self.user, is_accepted=True)
+
+    def test_index_query_count_anonymous(self):
+        """
+        비로그인 상태의 메인 화면 쿼리 수 테스트
+        """
+        response = self.assertQueryBudget(
+            reverse("main:home"), INDEX_QUERY_BUDGET, grow=self.create_study, times=7
+        )
+        self.assertEqual(len(response.context["studies"]), 8)
+
+    def test_index_query_count_login(self):
+        """
+        로그인 상태의 메인 화면 쿼리 수 테스트
+        """
+        self.client.force_login(self.user)
+        response = self.assertQueryBudget(
+            reverse("main:home"), INDEX_QUERY_BUDGET, grow=self.create_study, times=7
+        )
+        self.assertEqual(len(response.context["my_studies"]), 4)
+        self.assertEqual(response.context["my_studies"][0].get_current_member, 2)
+
+    def test_index_study_card_data(self):
+        """
+        메인 화면 스터디 카드의 스터디장, 멤버 수 테스트
+        """
+        response = self.client.get(reverse("main:home"))
+        study = response.context["studies"][0]
+        self.assertEqual(study.get_current_member, 2)
+        self.assertEqual(study.leader.nickname, "leader1")
+
+
+class TestHomeFragmentCache(TestCase):
+    """
+    메인 화면 fragment 캐시 테스트
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="test1@naver.com", password="test1", nickname="test1"
+        )
+        self.study = Study.objects.create(
+            category=Category.objects.create(name="test"),
+            goal="test",
+            title="캐시 스터디",
+            start_at=datetime.date.today(),
+            end_at=datetime.date.today(),
+            difficulty=Study.difficulty_choices[0][0],
+            max_member=10,
+        )
+        self.member = StudyMember.objects.create(
+            study=self.study, user=self.user, is_manager=True, is_accepted=True
+        )
+        self.client.force_login(self.user)
+
+    def get_home(self):
+        with QueryRecorder() as recorder:
+            response = self.client.get(reverse("main:home"))
+        return recorder, response.content.decode()
+
+    def assert_invalidation(self):
+        first, html = self.get_home()
+        self.assertEqual(html.count("캐시 스터디"), 2)
+
+        cached, html = self.get_home()
+        self.assertLess(cached.count, first.count)
+        self.assertFalse(
+            [query for query in cached.queries if "studies_study" in query["sql"]]
+        )
+        self.assertEqual(html.count("캐시 스터디"), 2)
+
+        self.study.title = "수정한 스터디"
+        self.study.save()
+        _, html = self.get_home()
+        self.assertEqual(html.count("수정한 스터디"), 2)
+
+        self.member.delete()
+        _, html = self.get_home()
+        self.assertEqual(html.count("수정한 스터디"), 1)
+
+    def test_studies_are_cached_until_changed(self):
+        """
+        두 번째 요청은 스터디를 조회하지 않고, 스터디, 스터디 멤버가 바뀌면 다시 조회
+        """
+        self.assert_invalidation()
+
+    def test_file_based_cache(self):
+        """
+        파일 캐시에서도 같은 방식으로 동작
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(
+                CACHES={
+                    "default": {
+                        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                        "LOCATION": directory,
+                    }
+                }
+            ):
+                self.assert_invalidation()
+
+    def test_holidays_are_cached_per_day(self):
+        """
+        공휴일은 날짜별로 캐시
+        """
+        with freeze_time("2024-01-02"):
+            _, html = self.get_home()
+            self.assertIn('data-name="설날 전날"', html)
+        with freeze_time("2024-03-02"):
+            _, html = self.get_home()
+            self.assertNotIn('data-name="설날 전날"', html)
+            self.assertIn('data-name="어린이날"', html)
+
+
+class TestHolidayCalendar(TestCase):
+    """
+    공휴일 달력 테스트
+    """
+
+    def test_upcoming_skips_every_substitute(self):
+        """
+        대체공휴일은 모두 제외하고, 다른 공휴일과 겹친 날은 포함
+        """
+        calendar = HolidayCalendar((2025, 2026))
+        upcoming = calendar.get_upcoming(datetime.date(2025, 2, 28), 3)
+        dates = [holiday.date for holiday in upcoming]
+        self.assertNotIn(datetime.date(2025, 3, 3), dates)
+        self.assertNotIn(datetime.date(2025, 5, 6), dates)
+        self.assertEqual(dates[0], datetime.date(2025, 3, 1))
+        self.assertEqual(dates[1], datetime.date(2025, 5, 5))
+        self.assertTrue(calendar.get(datetime.date(2025, 5, 6)).is_substitute)
+        self.assertFalse(calendar.get(datetime.date(2025, 5, 5)).is_substitute)
+        self.assertIsNone(calendar.get(datetime.date(2025, 5, 7)))
+
+    @override_settings(HOLIDAY_CALENDAR_YEARS_BEFORE=0, HOLIDAY_CALENDAR_YEARS_AFTER=1)
+    def test_upcoming_crosses_year(self):
+        """
+        연말에는 다음 해 1월 공휴일 조회, 날짜가 범위를 벗어나면 달력을 다시 만듦
+        """
+        holidays = get_upcoming_holidays(datetime.date(2024, 12, 26), 3)
+        self.assertEqual(holidays[0].date, datetime.date(2025, 1, 1))
+        self.assertEqual(len(holidays), 3)
+
+        calendar = get_holiday_calendar(datetime.date(2030, 12, 26))
+        self.assertEqual(calendar.years, range(2030, 2032))
+        self.assertIs(get_holiday_calendar(datetime.date(2030, 12, 31)), calendar)
+        self.assertIsNot(get_holiday_calendar(datetime.date(2031, 1, 1)), calendar)
+
+    @freeze_time("2024-01-02")
+    def test_holidays_between_tag(self):
+        """
+        할 일 기간 중 공휴일 표시
+        """
+        start = timezone.make_aware(datetime.datetime(2024, 2, 8, 10))
+        html = Template(
+            "{% load holiday_calendar %}"
+            "{% holidays_between start end as holidays %}"
+            "{% for holiday in holidays %}{{ holiday.name }},{% endfor %}"
+        ).render(Context({"start": start, "end": start + datetime.timedelta(days=5)}))
+        self.assertEqual(html, "설날 전날,설날,설날 다음날,설날 대체 휴일,")
+
+
+class TestExplainQueries(TestCase):
+    """
+    대표 조회 쿼리의 실행 계획 테스트
+    """
+
+    def test_no_table_scan(self):
+        """
+        대표 조회 쿼리가 테이블 전체 스캔 없이 인덱스를 사용하는지 확인
+        """
+        out = StringIO()
+        call_command("explain_queries", "--fail-on-scan", stdout=out)
+        self.assertNotIn("[SCAN]", out.getvalue())
+
+
+class TestCursorPaginator(TestCase):
+    """
+    커서 기반 페이지네이션 테스트
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test1@naver.com", password="test1", nickname="test1"
+        )
+        self.category = Category.objects.create(name="test")
+        # 생성일이 같은 스터디가 페이지 경계에 걸치도록 생성
+        created_at = timezone.now()
+        for num in range(7):
+            Study.objects.create(
+                category=self.category,
+                goal=f"test{num}",
+                title=f"test{num}",
+                start_at=datetime.date.today(),
+                end_at=datetime.date.today(),
+                difficulty=Study.difficulty_choices[0][0],
+                max_member=10,
+            )
+        Study.objects.update(created_at=created_at)
+        self.expected = list(Study.objects.order_by("-id"))
+
+    def get_paginator(self, **kwargs):
+        return CursorPaginator(Study.objects.all(), 3, ("-created_at", "-id"), **kwargs)
+
+    def test_next_and_previous(self):
+        """
+        생성일이 같은 경우 id로 구분하여 중복, 누락 없이 조회되는지 테스트
+        """
+        paginator = self.get_paginator()
+        pages = [paginator.page()]
+        while pages[-1].has_next():
+            pages.append(paginator.page(pages[-1].next_cursor))
+
+        self.assertEqual([page.number for page in pages], [1, 2, 3])
+        self.assertEqual([study for page in pages for study in page], self.expected)
+        self.assertFalse(pages[0].has_previous())
+
+        previous = paginator.page(pages[2].previous_cursor)
+        self.assertEqual(list(previous), list(pages[1]))
+        self.assertEqual(previous.number, 2)
+        previous = paginator.page(previous.previous_cursor)
+        self.assertEqual(list(previous), list(pages[0]))
+        self.assertFalse(previous.has_previous())
+
+    def test_last_page(self):
+        """
+        끝 페이지 조회 테스트
+        """
+        paginator = self.get_paginator()
+        last = paginator.page(paginator.last_cursor)
+        self.assertEqual(list(last), self.expected[-3:])
+        self.assertFalse(last.has_next())
+        self.assertIsNone(last.number)
+
+        previous = paginator.page(last.previous_cursor)
+        self.assertEqual(list(previous), self.expected[1:4])
+
+    def test_approximate_count(self):
+        """
+        추정 개수 사용 시 페이지 수와 끝 페이지 번호 테스트
+        """
+        paginator = self.get_paginator()
+        self.assertIsNone(paginator.count)
+        self.assertIsNone(paginator.num_pages)
+
+        paginator = self.get_paginator(approximate_count=True)
+        self.assertEqual(paginator.count, 7)
+        self.assertEqual(paginator.num_pages, 3)
+        self.assertEqual(paginator.page(paginator.last_cursor).number, 3)
+
+    def test_query_count(self):
+        """
+        COUNT 쿼리 없이 한 번의 쿼리로 페이지를 조회하는지 테스트
+        """
+        paginator = self.get_paginator()
+        page = paginator.page()
+        with self.assertNumQueries(1):
+            page = paginator.page(page.next_cursor)
+            self.assertEqual(len(page), 3)
+
+    def test_invalid_cursor(self):
+        """
+        잘못된 커서 테스트
+        """
+        paginator = self.get_paginator()
+        for cursor in ["invalid", "e30", paginator.page().next_cursor[:-4]]:
+            with self.assertRaises(InvalidCursor):
+                paginator.page(cursor)
+
+        response = self.client.get(reverse("studies:study_list") + "?cursor=invalid")
+        self.assertEqual(response.status_code, 404)
+
+    def test_forged_cursor(self):
+        """
+        정렬 키 값을 변환할 수 없는 커서는 404인지 테스트
+        """
+        paginator = self.get_paginator()
+        for values in [
+            ["invalid", 1],
+            [self.expected[0].created_at.isoformat(), "invalid"],
+            [{"a": 1}, [1]],
+            [None, 1],
+        ]:
+            with self.assertRaises(InvalidCursor):
+                paginator.page(encode_cursor(NEXT, values))
+
+        url = reverse("studies:study_list")
+        for query in [
+            {"cursor": encode_cursor(NEXT, ["invalid", "invalid"])},
+            {"q": "test", "cursor": encode_cursor(NEXT, ["invalid", "invalid", 1])},
+            {"sort": "members", "cursor": encode_cursor(NEXT, [[], "invalid", 1])},
+        ]:
+            response = self.client.get(url, query)
+            self.assertEqual(response.status_code, 404)
+
+    def test_study_list_cursor(self):
+        """
+        스터디 리스트에서 검색 조건을 유지한 채 커서로 페이지 이동하는지 테스트
+        """
+        url = reverse("studies:study_list")
+        response = self.client.get(url + f"?category={self.category.id}")
+        page_obj = response.context["page_obj"]
+        self.assertEqual(list(response.context["studies"]), self.expected[:6])
+        self.assertIn(f"category={self.category.id}", page_obj.next_querystring)
+        self.assertEqual(
+            decode_cursor(page_obj.next_cursor)[1],
+            [self.expected[5].created_at.isoformat(), self.expected[5].id],
+        )
+
+        response = self.client.get(url + "?" + page_obj.next_querystring)
+        self.assertEqual(list(response.context["studies"]), self.expected[6:])
+        self.assertFalse(response.context["page_obj"].has_next())
+
+    def test_devmate_list_cursor(self):
+        """
+        DevMate 리스트 추정 페이지 수 테스트
+        """
+        for num in range(9):
+            user = User.objects.create_user(
+                email=f"mate{num}@naver.com", password="test", nickname=f"mate{num}"
+            )
+            DevMate.objects.create(
+                sent_user=self.user, received_user=user, is_accepted=True
+            )
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("devmates:devmate_list"))
+        self.assertEqual(len(response.context["devmates"]), 8)
+        self.assertContains(response, "페이지 1 of ~2.")
+
+        response = self.client.get(
+            reverse("devmates:devmate_list")
+            + "?"
+            + response.context["page_obj"].next_querystring
+        )
+        self.assertEqual(len(response.context["devmates"]), 1)
+        self.assertContains(response, "페이지 2 of ~2.")
+
+
+class TestQueryBudget(TestCase):
+    """
+    요청별 쿼리 기록 테스트
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test1@naver.com", password="test1", nickname="test1"
+        )
+        category = Category.objects.create(name="test")
+        self.study = Study.objects.create(
+            category=category,
+            goal="test",
+            title="test",
+            start_at=datetime.date.today(),
+            end_at=datetime.date.today(),
+            difficulty=Study.difficulty_choices[0][0],
+            max_member=10,
+        )
+        for num in range(3):
+            user = User.objects.create_user(
+                email=f"member{num}@naver.com", password="test", nickname=f"m{num}"
+            )
+            StudyMember.objects.create(study=self.study, user=user, is_accepted=True)
+
+    def test_duplicate_queries_with_template_line(self):
+        """
+        템플릿 반복문에서 반복 실행된 쿼리와 템플릿 줄 기록
+        """
+        template = Template(
+            "{% for member in members %}\n{{ member.user.nickname }}{% endfor %}"
+        )
+        with QueryRecorder() as recorder:
+            template.render(
+                Context({"members": StudyMember.objects.filter(study=self.study)})
+            )
+        self.assertEqual(recorder.count, 4)
+        [(fingerprint, count, origins)] = recorder.get_duplicates()
+        self.assertIn('FROM "accounts_user"', fingerprint)
+        self.assertEqual(count, 3)
+        self.assertEqual(origins, ["<unknown source>:2"])
+
+    def test_in_params_fingerprint(self):
+        """
+        IN 조건의 파라미터 개수만 다른 쿼리는 같은 형태로 기록
+        """
+        with QueryRecorder() as recorder:
+            list(User.objects.filter(id__in=[1, 2]))
+            list(User.objects.filter(id__in=[1, 2, 3]))
+        self.assertEqual(recorder.get_duplicates()[0][1], 2)
+
+    @override_settings(QUERY_BUDGET_ENABLED=True, QUERY_BUDGET_DUPLICATES=2)
+    def test_middleware(self):
+        """
+        응답 헤더에 쿼리 수를 추가하고, 반복 쿼리가 있으면 경고 로그 기록
+        """
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("main:home"))
+        self.assertGreater(int(response["X-Query-Count"]), 0)
+        self.assertIn("X-Query-Time-Ms", response)
+        self.assertNotContains(response, "query-budget-panel")
+
+        with self.assertLogs("main.queries", level="WARNING") as logs:
+            with override_settings(QUERY_BUDGETS={"main:home": 1}):
+                self.client.get(reverse("main:home"))
+        self.assertIn("main:home 쿼리 예산 1개", logs.output[0])
+
+    @override_settings(DEBUG=True)
+    def test_debug_panel(self):
+        """
+        DEBUG이면 HTML 응답에 쿼리 요약 패널 추가
+        """
+        response = self.client.get(reverse("main:home"))
+        self.assertContains(response, 'id="query-budget-panel"')
+        self.assertContains(response, f"main:home: 쿼리 {response['X-Query-Count']}개")
+
+
+class TestSeedScale(TestCase):
+    """
+    대량 데이터 생성, 성능 측정 테스트
+    """
+
+    def setUp(self):
+        call_command(
+            "seed_scale", "--scale", "0.00005", "--batch-size", "40", stdout=StringIO()
+        )
+
+    def test_seed_scale(self):
+        """
+        scale 비율만큼 데이터를 만들고 스터디마다 스터디장 1명, 채팅방별 메시지 순서가 연속인지 확인
+        """
+        self.assertEqual(User.objects.count(), 50)
+        self.assertEqual(Study.objects.count(), 5)
+        self.assertEqual(ChatMessage.objects.count(), 500)
+        self.assertEqual(ToDo.objects.count(), 150)
+        self.assertEqual(ToDo.objects.filter(todo_assignees__isnull=True).count(), 0)
+        for study in Study.objects.all():
+            self.assertEqual(study.members.filter(is_manager=True).count(), 1)
+            self.assertEqual(
+                study.get_study_leader, study.members.get(is_manager=True).user
+            )
+            self.assertEqual(
+                study.accepted_member_count,
+                study.members.filter(is_accepted=True).count(),
+            )
+            self.assertTrue(study.search_document)
+
+        for chat in StudyChat.objects.all():
+            sequences = list(
+                chat.chat_messages.order_by("sequence").values_list(
+                    "sequence", flat=True
+                )
+            )
+            self.assertEqual(sequences, list(range(1, len(sequences) + 1)))
+
+    def test_measure_without_recorder(self):
+        """
+        응답 시간을 측정하는 요청은 쿼리를 기록하지 않고, 쿼리 수는 한 번만 세는지 테스트
+        """
+        self.client.force_login(User.objects.first())
+        with mock.patch(
+            "main.benchmark.QueryRecorder", wraps=QueryRecorder
+        ) as recorder:
+            result = measure(self.client, reverse("main:home"), repeat=3, warmup=1)
+        self.assertEqual(recorder.call_count, 1)
+        self.assertGreater(result["queries"], 0)
+
+    def test_benchmark(self):
+        """
+        측정 결과를 JSON으로 저장하고, 기준 결과보다 쿼리 수가 늘면 에러
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "benchmark.json")
+            call_command(
+                "benchmark",
+                "--repeat",
+                "2",
+                "--warmup",
+                "1",
+                "--output",
+                output,
+                stdout=StringIO(),
+            )
+            with open(output, encoding="utf-8") as file:
+                result = json.load(file)
+            self.assertEqual(len(result["views"]), 7)
+            for view in result["views"].values():
+                self.assertGreater(view["queries"], 0)
+                self.assertLessEqual(view["p50_ms"], view["p99_ms"])
+
+            baseline = os.path.join(directory, "baseline.json")
+            result["views"]["main:home"]["queries"] -= 1
+            with open(baseline, "w", encoding="utf-8") as file:
+                json.dump(result, file)
+            with self.assertRaisesMessage(CommandError, "main:home: 쿼리"):
+                call_command(
+                    "benchmark",
+                    "--repeat",
+                    "2",
+                    "--warmup",
+                    "0",
+                    "--compare",
+                    baseline,
+                    "--threshold",
+                    "100",
+                    stdout=StringIO(),
+                )
@@ -1,50 +1,42 @@
-import holidays
 import datetime
 
 from django.shortcuts import render
+from django.utils.functional import SimpleLazyObject
 
-from studies.models import Study, StudyMember
+from studies.models import Study
+
+from .fragments import get_fragment_ttls
+from .holiday_calendar import get_upcoming_holidays
 
 
 def index(request):
     """
     메인 화면 렌더링 함수
         - 가장 가까운 공휴일 3개의 정보를 담아서 client에게 전달
-            - 공휴일 중 대체공휴일은 제외
+            - 공휴일 중 대체공휴일은 제외 (main.holiday_calendar)
         - 스터디 데이터 8개를 담아서 client에게 전달
             - 최근 스터디 순으로 정렬하여 전달
         - 로그인된 유저의 경우, 유저가 참여중인 스터디 데이터 4개를 담아서 client에게 전달
             - 최근 스터디 순으로 정렬하여 전달
+        - 각 영역은 템플릿에서 fragment 캐시하고 (main.fragments),
+          캐시가 없을 때만 데이터를 조회하도록 SimpleLazyObject로 전달
     """
-    context = {"holidays": []}
     today = datetime.date.today()
-    kr_holidays = dict(holidays.KR(years=today.year, language="ko"))
-    filtered_holidays = list(filter(lambda x: x > today, kr_holidays))
-    filtered_holidays.sort()
-    for i in range(len(filtered_holidays)):
-        if "대체" in kr_holidays[filtered_holidays[i]]:
-            filtered_holidays.pop(i)
-            break
-    for i in filtered_holidays[:3]:
-        context["holidays"].append({"date": i, "name": kr_holidays[i]})
-
-    studies = Study.objects.all().order_by("-created_at")[:8]
-
-    for study in studies:
-        study_members = StudyMember.objects.filter(study=study, is_accepted=True)
-        study.memeber_count = study_members.count()
-        study.manager = study_members.filter(is_manager=True).first().user
-
-    context["studies"] = studies
+    context = {
+        "today": today,
+        "cache_ttl": get_fragment_ttls(),
+        "holidays": SimpleLazyObject(lambda: get_upcoming_holidays(today)),
+        "studies": SimpleLazyObject(
+            lambda: list(Study.objects.with_card_data().order_by("-created_at")[:8])
+        ),
+    }
     if request.user.is_authenticated:
-        my_studies = Study.objects.filter(members__user=request.user).order_by(
-            "-created_at"
-        )[:4]
-        for study in my_studies:
-            study_members = StudyMember.objects.filter(study=study, is_accepted=True)
-            study.memeber_count = study_members.count()
-            study.manager = study_members.filter(is_manager=True).first().user
-
-        context["my_studies"] = my_studies
+        context["my_studies"] = SimpleLazyObject(
+            lambda: list(
+                Study.objects.with_card_data()
+                .filter(members__user=request.user)
+                .order_by("-created_at")[:4]
+            )
+        )
 
     return render(request, "index.html", context=context)
@@ -0,0 +1,45 @@
+const $alertBadge = document.getElementById('alert-badge');
+const alertCursorKey = 'alertCursor';
+let alertSocket = null;
+let alertRetryDelay = 1000;
+
+function renderAlertBadge(unread) {
+    if (unread === null || unread === undefined) {
+        return;
+    }
+    $alertBadge.textContent = unread > 99 ? '99+' : unread;
+    $alertBadge.classList.toggle('hidden', unread === 0);
+}
+
+function connectAlertSocket() {
+    // 마지막으로 받은 커서 이후의 알림만 다시 받음
+    const cursor = sessionStorage.getItem(alertCursorKey);
+    const protocol = window.location.protocol === 'https:' ? 'wss://' : 'ws://';
+    const query = cursor ? '?since=' + encodeURIComponent(cursor) : '';
+    alertSocket = new WebSocket(protocol + window.location.host + '/ws/alerts/' + query);
+
+    alertSocket.onopen = () => {
+        alertRetryDelay = 1000;
+    };
+
+    alertSocket.onmessage = (event) => {
+        const data = JSON.parse(event.data);
+        if (data.type !== 'alerts') {
+            return;
+        }
+        if (data.cursor) {
+            sessionStorage.setItem(alertCursorKey, data.cursor);
+        }
+        renderAlertBadge(data.unread);
+    };
+
+    alertSocket.onclose = () => {
+        // 연결이 끊기면 점점 간격을 늘려 다시 연결
+        setTimeout(connectAlertSocket, alertRetryDelay);
+        alertRetryDelay = Math.min(alertRetryDelay * 2, 30000);
+    };
+}
+
+if ($alertBadge) {
+    connectAlertSocket();
+}
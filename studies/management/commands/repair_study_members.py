@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from studies.members import repair_member_columns
+from studies.models import Study, StudyMember
+
+
+class Command(BaseCommand):
+    help = "스터디의 멤버 수, 스터디장 컬럼을 실제 멤버 기준으로 다시 계산합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10000,
+            help="한 트랜잭션에서 확인할 스터디 수 (기본값: 10000)",
+        )
+
+    def handle(self, *args, **options):
+        repaired = repair_member_columns(
+            Study, StudyMember, batch_size=options["batch_size"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"스터디 {repaired}개 재계산 완료"))
@@ -0,0 +1,64 @@
+"""
+스터디 멤버 컬럼(accepted_member_count, pending_member_count, leader) 재계산
+- 평소에는 StudyMember 저장, 삭제 시 F()로 갱신하고 (studies.models.StudyMember.update_study_columns)
+  bulk_create, 직접 실행한 SQL 등으로 값이 어긋난 경우 manage.py repair_study_members로 재계산
+- 마이그레이션에서도 사용하므로 모델을 인자로 받음
+"""
+
+from django.db import transaction
+from django.db.models import Count, F, Max, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+
+def get_member_columns(study_member_model):
+    """
+    반환값: {컬럼: 실제 멤버로 계산한 값의 subquery}
+    """
+    members = study_member_model.objects.filter(study=OuterRef("pk"))
+
+    def count(**filters):
+        return Coalesce(
+            Subquery(
+                members.filter(**filters)
+                .values("study")
+                .annotate(count=Count("pk"))
+                .values("count")
+            ),
+            0,
+        )
+
+    return {
+        "accepted_member_count": count(is_accepted=True),
+        "pending_member_count": count(is_accepted=False),
+        "leader": Subquery(members.filter(is_manager=True).values("user")[:1]),
+    }
+
+
+def repair_member_columns(study_model, study_member_model, batch_size=10000):
+    """
+    pk 구간별로 컬럼 값이 실제 멤버와 다른 스터디만 다시 계산
+    반환값: 다시 계산한 스터디 수
+    """
+    columns = get_member_columns(study_member_model)
+    last = study_model.objects.aggregate(last=Max("pk"))["last"] or 0
+    repaired = 0
+    for start in range(0, last, batch_size):
+        with transaction.atomic():
+            ids = list(
+                study_model.objects.filter(pk__gt=start, pk__lte=start + batch_size)
+                .annotate(
+                    actual_accepted=columns["accepted_member_count"],
+                    actual_pending=columns["pending_member_count"],
+                    leader_key=Coalesce("leader", 0),
+                    actual_leader_key=Coalesce(columns["leader"], 0),
+                )
+                .exclude(
+                    Q(accepted_member_count=F("actual_accepted"))
+                    & Q(pending_member_count=F("actual_pending"))
+                    & Q(leader_key=F("actual_leader_key"))
+                )
+                .values_list("pk", flat=True)
+            )
+            if ids:
+                repaired += study_model.objects.filter(pk__in=ids).update(**columns)
+    return repaired
@@ -0,0 +1,199 @@
+"""
+스터디 가입 신청, 승인, 거절, 탈퇴, 스터디장 위임
+- 스터디 row를 select_for_update로 잠근 트랜잭션 안에서 멤버 상태를 다시 읽고 변경하여
+  같은 스터디에 대한 요청을 순서대로 처리
+- 멤버 중복, 스터디장 중복은 StudyMember의 unique 제약 조건으로, 정원 초과는
+  StudyMember.save(enforce_capacity=True)의 조건부 UPDATE로 DB에서도 막음
+- 이미 처리된 요청을 다시 실행하면 변경 없이 현재 상태를 반환 (중복 클릭, 재시도에 안전)
+- SQLite는 FOR UPDATE를 지원하지 않아 쓰기 잠금 충돌(database is locked)이 나므로
+  바깥 트랜잭션이 없으면 잠시 기다린 뒤 처음부터 다시 실행하고, LOCK_RETRY_TIMEOUT이 지나면
+  요청을 붙잡아 두지 않도록 MembershipBusyError("잠시 후 다시 시도해 주세요.")
+"""
+
+import functools
+import random
+import time
+
+from django.core.exceptions import PermissionDenied
+from django.db import IntegrityError, OperationalError, connection, transaction
+
+from .models import (
+    Blacklist,
+    MembershipBusyError,
+    MembershipError,
+    Study,
+    StudyFullError,
+    StudyMember,
+)
+
+# 잠금 충돌 시 다시 실행할 전체 시간, 첫 대기 시간과 최대 대기 시간(초)
+# 대기 시간은 실행할 때마다 2배로 늘리되 동시에 다시 실행하지 않도록 무작위로 선택
+LOCK_RETRY_TIMEOUT = 0.5
+LOCK_RETRY_DELAY = 0.005
+LOCK_RETRY_MAX_DELAY = 0.05
+
+
+def is_lock_error(error):
+    message = str(error).lower()
+    return "locked" in message or "deadlock" in message
+
+
+def retry_on_lock(func):
+    """
+    잠금 충돌로 트랜잭션이 실패하면 LOCK_RETRY_TIMEOUT 동안 다시 실행
+    - 시간 안에 처리하지 못하면 MembershipBusyError
+    - 바깥 트랜잭션 안에서 호출된 경우 트랜잭션을 다시 시작할 수 없으므로 그대로 예외 발생
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        deadline = time.monotonic() + LOCK_RETRY_TIMEOUT
+        attempt = 0
+        while True:
+            try:
+                return func(*args, **kwargs)
+            except OperationalError as error:
+                if connection.in_atomic_block or not is_lock_error(error):
+                    raise
+            delay = random.uniform(
+                0, min(LOCK_RETRY_MAX_DELAY, LOCK_RETRY_DELAY * 2**attempt)
+            )
+            if time.monotonic() + delay >= deadline:
+                raise MembershipBusyError("잠시 후 다시 시도해 주세요.")
+            time.sleep(delay)
+            attempt += 1
+
+    return wrapper
+
+
+def lock_study(study_id):
+    return Study.objects.select_for_update().get(pk=study_id)
+
+
+def check_leader(study, user):
+    if study.leader_id != user.pk:
+        raise PermissionDenied("접근 권한이 없습니다.")
+
+
+@retry_on_lock
+def apply(study_id, user):
+    """
+    가입 신청
+    이미 신청했거나 가입한 스터디면 기존 멤버 반환
+    반환값: (멤버, 새로 신청했는지 여부)
+    """
+    with transaction.atomic():
+        study = lock_study(study_id)
+        member = StudyMember.objects.filter(study=study, user=user).first()
+        if member is not None:
+            return member, False
+        if Blacklist.objects.filter(study=study, user=user).exists():
+            raise MembershipError(
+                "블랙리스트에 등록된 유저는 가입을 신청할 수 없습니다."
+            )
+        if study.is_full:
+            raise StudyFullError("스터디 정원이 가득 찼습니다.")
+        try:
+            with transaction.atomic():
+                member = StudyMember.objects.create(study=study, user=user)
+        except IntegrityError:
+            # 잠금 없이 먼저 저장된 신청이 있는 경우 (unique_study_member)
+            return StudyMember.objects.get(study=study, user=user), False
+    return member, True
+
+
+@retry_on_lock
+def approve(member_id, user):
+    """
+    가입 승인 (스터디장만 가능)
+    이미 승인된 멤버면 그대로 반환
+    반환값: (멤버, 새로 승인했는지 여부)
+    """
+    with transaction.atomic():
+        study_id = StudyMember.objects.values_list("study_id", flat=True).get(
+            pk=member_id
+        )
+        study = lock_study(study_id)
+        check_leader(study, user)
+        member = StudyMember.objects.select_for_update().get(pk=member_id)
+        if member.is_accepted:
+            return member, False
+        member.is_accepted = True
+        member.save(enforce_capacity=True)
+    return member, True
+
+
+@retry_on_lock
+def reject(member_id, user):
+    """
+    가입 거절 (스터디장만 가능), 가입 대기 중인 멤버 삭제
+    반환값: 삭제한 멤버, 이미 삭제되었거나 승인된 멤버면 None
+    """
+    with transaction.atomic():
+        study_id = (
+            StudyMember.objects.filter(pk=member_id)
+            .values_list("study_id", flat=True)
+            .first()
+        )
+        if study_id is None:
+            return None
+        study = lock_study(study_id)
+        check_leader(study, user)
+        member = (
+            StudyMember.objects.select_for_update()
+            .filter(pk=member_id, is_accepted=False)
+            .first()
+        )
+        if member is None:
+            return None
+        member.delete()
+    return member
+
+
+@retry_on_lock
+def withdraw(study_id, user):
+    """
+    스터디 탈퇴, 스터디장은 위임 후 탈퇴 가능
+    반환값: 탈퇴했는지 여부
+    """
+    with transaction.atomic():
+        lock_study(study_id)
+        member = (
+            StudyMember.objects.select_for_update()
+            .filter(study_id=study_id, user=user)
+            .first()
+        )
+        if member is None:
+            return False
+        if member.is_manager:
+            raise MembershipError("스터디장은 스터디장을 위임한 뒤 탈퇴할 수 있습니다.")
+        member.delete()
+    return True
+
+
+@retry_on_lock
+def delegate(member_id, user):
+    """
+    스터디장 위임 (스터디장만 가능), 승인된 멤버에게만 위임
+    기존 스터디장 해제와 새 스터디장 지정을 한 트랜잭션에서 처리
+    반환값: 새 스터디장 멤버
+    """
+    with transaction.atomic():
+        study_id = StudyMember.objects.values_list("study_id", flat=True).get(
+            pk=member_id
+        )
+        study = lock_study(study_id)
+        check_leader(study, user)
+        member = StudyMember.objects.select_for_update().get(pk=member_id)
+        if member.is_manager:
+            return member
+        if not member.is_accepted:
+            raise MembershipError("승인된 멤버에게만 스터디장을 위임할 수 있습니다.")
+        leader = StudyMember.objects.select_for_update().get(
+            study=study, is_manager=True
+        )
+        leader.is_manager = False
+        leader.save()
+        member.is_manager = True
+        member.save()
+    return member
@@ -0,0 +1,89 @@
+# Generated by Django 4.2.7 on 2026-10-17 05:58
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def remove_duplicates(apps, schema_editor):
+    """
+    제약조건 추가 전 중복 데이터 정리
+    - 같은 스터디, 유저의 멤버/블랙리스트/즐겨찾기는 1개만 남김
+    - 스터디장이 여러 명인 경우 가장 먼저 지정된 스터디장만 남김
+    """
+    StudyMember = apps.get_model("studies", "StudyMember")
+    Blacklist = apps.get_model("studies", "Blacklist")
+    Favorite = apps.get_model("studies", "Favorite")
+
+    for model, ordering in [
+        (StudyMember, ["-is_manager", "-is_accepted", "id"]),
+        (Blacklist, ["id"]),
+        (Favorite, ["id"]),
+    ]:
+        duplicates = (
+            model.objects.filter(study__isnull=False)
+            .values("study", "user")
+            .annotate(count=Count("id"))
+            .filter(count__gt=1)
+        )
+        for duplicate in duplicates:
+            rows = model.objects.filter(
+                study=duplicate["study"], user=duplicate["user"]
+            ).order_by(*ordering)
+            rows.exclude(id=rows[0].id).delete()
+
+    managers = (
+        StudyMember.objects.filter(is_manager=True)
+        .values("study")
+        .annotate(count=Count("id"))
+        .filter(count__gt=1)
+    )
+    for manager in managers:
+        rows = StudyMember.objects.filter(
+            study=manager["study"], is_manager=True
+        ).order_by("id")
+        rows.exclude(id=rows[0].id).update(is_manager=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("studies", "0012_alter_study_thumbnail"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicates, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="studymember",
+            index=models.Index(
+                fields=["study", "is_accepted"], name="studymember_study_accept_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="blacklist",
+            constraint=models.UniqueConstraint(
+                fields=("study", "user"), name="unique_study_blacklist"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="favorite",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("study__isnull", False)),
+                fields=("study", "user"),
+                name="unique_study_favorite",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="studymember",
+            constraint=models.UniqueConstraint(
+                fields=("study", "user"), name="unique_study_member"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="studymember",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("is_manager", True)),
+                fields=("study",),
+                name="unique_study_manager",
+            ),
+        ),
+    ]
@@ -0,0 +1,160 @@
+# Generated by Django 4.2.7 on 2026-10-17 06:05
+
+import re
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# 마이그레이션은 이후 코드가 바뀌어도 같게 실행되도록 studies.search의 이름과 토크나이저를 복사
+NGRAM_SIZE = 2
+WORD_PATTERN = re.compile(r"\w+")
+
+SQLITE_FTS_TABLE = "studies_study_fts"
+POSTGRESQL_INDEX_NAME = "studies_search_document_gin"
+
+
+def ngram_text(text):
+    """
+    색인용 n-gram 텍스트 생성 (studies.search.ngram_text)
+    """
+    tokens = []
+    for word in WORD_PATTERN.findall((text or "").lower()):
+        if len(word) >= NGRAM_SIZE:
+            grams = [
+                word[i : i + NGRAM_SIZE] for i in range(len(word) - NGRAM_SIZE + 1)
+            ]
+        else:
+            grams = [word]
+        tokens.extend(grams)
+        tokens.extend(grams[-1][i:] for i in range(1, len(grams[-1])))
+    return " ".join(tokens)
+
+
+SQLITE_CREATE_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE {SQLITE_FTS_TABLE} USING fts5(
+        title, introduce,
+        content='studies_studysearchdocument', content_rowid='study_id',
+        tokenize='unicode61', prefix='1'
+    )
+    """,
+    f"""
+    CREATE TRIGGER {SQLITE_FTS_TABLE}_ai AFTER INSERT ON studies_studysearchdocument
+    BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}(rowid, title, introduce)
+        VALUES (new.study_id, new.title, new.introduce);
+    END
+    """,
+    f"""
+    CREATE TRIGGER {SQLITE_FTS_TABLE}_ad AFTER DELETE ON studies_studysearchdocument
+    BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, title, introduce)
+        VALUES ('delete', old.study_id, old.title, old.introduce);
+    END
+    """,
+    f"""
+    CREATE TRIGGER {SQLITE_FTS_TABLE}_au AFTER UPDATE ON studies_studysearchdocument
+    BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, title, introduce)
+        VALUES ('delete', old.study_id, old.title, old.introduce);
+        INSERT INTO {SQLITE_FTS_TABLE}(rowid, title, introduce)
+        VALUES (new.study_id, new.title, new.introduce);
+    END
+    """,
+]
+
+SQLITE_DROP_SQL = [
+    f"DROP TRIGGER IF EXISTS {SQLITE_FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {SQLITE_FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {SQLITE_FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {SQLITE_FTS_TABLE}",
+]
+
+
+def get_postgresql_index():
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+
+    return GinIndex(
+        SearchVector("title", weight="A", config="simple")
+        + SearchVector("introduce", weight="B", config="simple"),
+        name=POSTGRESQL_INDEX_NAME,
+    )
+
+
+def create_search_index(apps, schema_editor):
+    """
+    DB별 전문 검색 인덱스 생성
+    - SQLite: FTS5 테이블과 동기화 트리거
+    - PostgreSQL: SearchVector GIN 인덱스
+    """
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        for sql in SQLITE_CREATE_SQL:
+            schema_editor.execute(sql)
+    elif vendor == "postgresql":
+        StudySearchDocument = apps.get_model("studies", "StudySearchDocument")
+        schema_editor.add_index(StudySearchDocument, get_postgresql_index())
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        for sql in SQLITE_DROP_SQL:
+            schema_editor.execute(sql)
+    elif vendor == "postgresql":
+        StudySearchDocument = apps.get_model("studies", "StudySearchDocument")
+        schema_editor.remove_index(StudySearchDocument, get_postgresql_index())
+
+
+def create_search_documents(apps, schema_editor):
+    """
+    기존 스터디의 검색 문서 생성
+    """
+    Study = apps.get_model("studies", "Study")
+    StudySearchDocument = apps.get_model("studies", "StudySearchDocument")
+
+    StudySearchDocument.objects.bulk_create(
+        [
+            StudySearchDocument(
+                study_id=study.id,
+                title=ngram_text(study.title),
+                introduce=ngram_text(study.introduce),
+            )
+            for study in Study.objects.only("id", "title", "introduce").iterator()
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("studies", "0013_studymember_studymember_study_accept_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StudySearchDocument",
+            fields=[
+                (
+                    "study",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="search_document",
+                        serialize=False,
+                        to="studies.study",
+                    ),
+                ),
+                ("title", models.TextField(default="")),
+                ("introduce", models.TextField(default="")),
+            ],
+            options={
+                "verbose_name": "스터디 검색 문서",
+                "verbose_name_plural": "스터디 검색 문서",
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+        migrations.RunPython(create_search_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 4.2.7 on 2026-10-17 08:14
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+from studies.members import repair_member_columns
+
+
+def fill_member_columns(apps, schema_editor):
+    repair_member_columns(
+        apps.get_model("studies", "Study"), apps.get_model("studies", "StudyMember")
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("studies", "0014_study_search_document"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="study",
+            name="accepted_member_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="study",
+            name="leader",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="leading_studies",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddField(
+            model_name="study",
+            name="pending_member_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="study",
+            index=models.Index(
+                fields=["-accepted_member_count", "-created_at", "-id"],
+                name="study_member_count_idx",
+            ),
+        ),
+        migrations.RunPython(fill_member_columns, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,54 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, F, Q, When
+
+
+class StudyQuerySet(models.QuerySet):
+    """
+    스터디 QuerySet
+    """
+
+    def with_card_data(self):
+        """
+        스터디 카드 렌더링에 필요한 데이터를 함께 조회
+        - 멤버 수와 스터디장은 Study의 accepted_member_count, leader 컬럼 사용
+        - 스터디 개수와 관계없이 일정한 쿼리 수로 카드 목록을 렌더링
+        """
+        return self.select_related("category", "leader")
+
+    def recruiting(self):
+        """
+        정원이 남은 스터디
+        """
+        return self.filter(accepted_member_count__lt=F("max_member"))
+
+
+# StudyMember를 저장, 삭제할 때 갱신하는 Study 컬럼
+MEMBER_COLUMNS = ("accepted_member_count", "pending_member_count", "leader")
+
+
+class MembershipError(Exception):
+    """
+    스터디 가입, 승인, 탈퇴, 위임을 처리할 수 없는 경우
+    """
+
+
+class StudyFullError(MembershipError):
+    pass
+
+
+class MembershipBusyError(MembershipError):
+    """
+    같은 스터디에 요청이 몰려 잠금을 얻지 못한 경우 (다시 시도하면 처리 가능)
+    """
+
+
+def get_member_counts(status):
+    """
+    반환값: 멤버 상태가 status인 멤버의 (승인된 멤버 수, 가입 대기 멤버 수)
+    """
+    if status is None:
+        return 0, 0
+    return (1, 0) if status[0] else (0, 1)
 
 
 class Study(models.Model):
@@ -28,21 +78,85 @@ class Study(models.Model):
     difficulty = models.CharField(max_length=2, choices=difficulty_choices)
     max_member = models.IntegerField()
     created_at = models.DateTimeField(auto_now_add=True)
+    # StudyMember를 저장, 삭제할 때 같은 트랜잭션에서 갱신 (manage.py repair_study_members로 재계산)
+    accepted_member_count = models.PositiveIntegerField(default=0)
+    pending_member_count = models.PositiveIntegerField(default=0)
+    leader = models.ForeignKey(
+        "accounts.User",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="leading_studies",
+    )
+
+    objects = StudyQuerySet.as_manager()
 
     class Meta:
         verbose_name = "스터디"
         verbose_name_plural = "스터디"
+        indexes = [
+            models.Index(
+                fields=["-accepted_member_count", "-created_at", "-id"],
+                name="study_member_count_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        # 멤버 컬럼은 StudyMember에서 F()로 갱신하므로, 스터디를 수정할 때는 이전에 읽은 값으로 덮어쓰지 않음
+        if (
+            not self._state.adding
+            and kwargs.get("update_fields") is None
+            and not kwargs.get("force_insert")
+        ):
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in MEMBER_COLUMNS
+            ]
+        super().save(*args, **kwargs)
+
     @property
     def get_study_leader(self):
-        return self.members.get(is_manager=True)
+        """
+        스터디장 (비정규화한 leader 컬럼, 목록에서는 select_related("leader")로 함께 조회)
+        """
+        return self.leader
 
     @property
     def get_current_member(self):
-        return self.members.filter(is_accepted=True).count()
+        return self.accepted_member_count
+
+    @property
+    def is_full(self):
+        return self.accepted_member_count >= self.max_member
+
+
+class StudySearchDocument(models.Model):
+    """
+    스터디 검색 문서 모델
+    - 스터디의 제목, 소개를 n-gram으로 분리하여 저장
+    - DB별 전문 검색 인덱스(SQLite FTS5, PostgreSQL GIN)가 이 테이블을 참조
+    - Study 저장 시 signal을 통해 갱신
+    """
+
+    study = models.OneToOneField(
+        "Study",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="search_document",
+    )
+    title = models.TextField(default="")
+    introduce = models.TextField(default="")
+
+    class Meta:
+        verbose_name = "스터디 검색 문서"
+        verbose_name_plural = "스터디 검색 문서"
+
+    def __str__(self):
+        return f"스터디 : {self.study_id}"
 
 
 class Schedule(models.Model):
@@ -198,10 +312,93 @@ class StudyMember(models.Model):
     class Meta:
         verbose_name = "스터디 멤버"
         verbose_name_plural = "스터디 멤버"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["study", "user"], name="unique_study_member"
+            ),
+            # 스터디당 스터디장은 1명만 존재
+            models.UniqueConstraint(
+                fields=["study"],
+                condition=Q(is_manager=True),
+                name="unique_study_manager",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["study", "is_accepted"], name="studymember_study_accept_idx"
+            ),
+        ]
 
     def __str__(self):
         return self.user.nickname
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._saved_status = instance.get_status()
+        return instance
+
+    def get_status(self):
+        """
+        반환값: (승인 여부, 스터디장 여부), 필드를 불러오지 않은 경우 None
+        """
+        deferred = self.get_deferred_fields()
+        if "is_accepted" in deferred or "is_manager" in deferred:
+            return None
+        return self.is_accepted, self.is_manager
+
+    def save(self, *args, enforce_capacity=False, **kwargs):
+        """
+        멤버 저장과 같은 트랜잭션에서 스터디의 멤버 수, 스터디장 갱신
+        enforce_capacity이면 정원이 찬 스터디에 승인할 때 StudyFullError
+        """
+        before = None
+        if not self._state.adding:
+            before = getattr(self, "_saved_status", None)
+            if before is None:
+                before = (
+                    StudyMember.objects.filter(pk=self.pk)
+                    .values_list("is_accepted", "is_manager")
+                    .first()
+                )
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self.update_study_columns(before, self.get_status(), enforce_capacity)
+        self._saved_status = self.get_status()
+
+    def update_study_columns(self, before, after, enforce_capacity=False):
+        """
+        멤버 상태가 before -> after로 바뀐 만큼 F()로 스터디 컬럼 갱신 (None은 멤버가 없는 상태)
+        """
+        accepted, pending = (
+            count_after - count_before
+            for count_after, count_before in zip(
+                get_member_counts(after), get_member_counts(before)
+            )
+        )
+        is_manager = bool(after and after[1])
+        was_manager = bool(before and before[1])
+
+        columns = {}
+        if accepted:
+            columns["accepted_member_count"] = F("accepted_member_count") + accepted
+        if pending:
+            columns["pending_member_count"] = F("pending_member_count") + pending
+        if is_manager and not was_manager:
+            columns["leader"] = self.user_id
+        elif was_manager and not is_manager:
+            columns["leader"] = Case(
+                When(leader=self.user_id, then=None), default=F("leader")
+            )
+        if not columns:
+            return
+
+        studies = Study.objects.filter(pk=self.study_id)
+        if enforce_capacity and accepted > 0:
+            studies = studies.filter(accepted_member_count__lt=F("max_member"))
+        if not studies.update(**columns) and enforce_capacity and accepted > 0:
+            raise StudyFullError("스터디 정원이 가득 찼습니다.")
+
 
 class Blacklist(models.Model):
     """
@@ -218,6 +415,11 @@ class Blacklist(models.Model):
     class Meta:
         verbose_name = "스터디 블랙리스트"
         verbose_name_plural = "스터디 블랙리스트"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["study", "user"], name="unique_study_blacklist"
+            ),
+        ]
 
     def __str__(self):
         return f"스터디 : {self.study}"
@@ -238,6 +440,14 @@ class Favorite(models.Model):
     class Meta:
         verbose_name = "스터디 즐겨찾기"
         verbose_name_plural = "스터디 즐겨찾기"
+        constraints = [
+            # 스터디가 삭제되어 study가 null인 즐겨찾기는 제외
+            models.UniqueConstraint(
+                fields=["study", "user"],
+                condition=Q(study__isnull=False),
+                name="unique_study_favorite",
+            ),
+        ]
 
     def __str__(self):
         return f"스터디 즐겨찾기 : {self.study}"
@@ -0,0 +1,211 @@
+import re
+
+from django.db import connection
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from .models import StudySearchDocument
+
+NGRAM_SIZE = 2
+WORD_PATTERN = re.compile(r"\w+")
+
+SQLITE_FTS_TABLE = "studies_study_fts"
+POSTGRESQL_INDEX_NAME = "studies_search_document_gin"
+
+# 검색 문서에 색인하는 스터디 필드
+SEARCH_FIELDS = frozenset(["title", "introduce"])
+
+
+def ngram_words(text):
+    """
+    텍스트를 단어 단위로 나눈 뒤 단어별 n-gram 목록으로 변환
+    - 한국어는 띄어쓰기 단위가 검색어와 일치하지 않는 경우가 많아 n-gram으로 색인
+    - n보다 짧은 단어는 그대로 사용
+    예) "자바스크립트 스터디" -> [["자바", "바스", "스크", "크립", "립트"], ["스터", "터디"]]
+    """
+    words = WORD_PATTERN.findall((text or "").lower())
+    return [
+        (
+            [word[i : i + NGRAM_SIZE] for i in range(len(word) - NGRAM_SIZE + 1)]
+            if len(word) >= NGRAM_SIZE
+            else [word]
+        )
+        for word in words
+    ]
+
+
+def split_query(q):
+    """
+    검색어를 n-gram 목록과 n보다 짧은 단어 목록으로 분리
+    - n보다 짧은 단어는 색인의 접두어 검색으로 찾음
+    예) "썬 자바" -> (["자바"], ["썬"])
+    """
+    grams, short_words = [], []
+    for word_grams in ngram_words(q):
+        if len(word_grams[0]) < NGRAM_SIZE:
+            short_words.append(word_grams[0])
+        else:
+            grams.extend(word_grams)
+    return grams, short_words
+
+
+def ngram_text(text):
+    """
+    색인용 n-gram 텍스트 생성
+    단어의 마지막 n-gram의 접미어도 색인하여, n보다 짧은 검색어를 접두어 검색으로 찾을 수 있음
+    예) "자바스크립트" -> "자바 바스 스크 크립 립트 트"
+    """
+    tokens = []
+    for grams in ngram_words(text):
+        tokens.extend(grams)
+        tokens.extend(grams[-1][i:] for i in range(1, len(grams[-1])))
+    return " ".join(tokens)
+
+
+def update_search_document(study):
+    """
+    스터디의 검색 문서 갱신
+    """
+    StudySearchDocument.objects.update_or_create(
+        study=study,
+        defaults={
+            "title": ngram_text(study.title),
+            "introduce": ngram_text(study.introduce),
+        },
+    )
+
+
+def get_study_column(queryset, prefix):
+    """
+    queryset에서 스터디 id를 가리키는 컬럼 반환
+    예) Study -> "studies_study"."id", StudyMember(prefix="study") -> "studies_studymember"."study_id"
+    """
+    opts = queryset.model._meta
+    field = opts.get_field(prefix) if prefix else opts.pk
+    return f"{connection.ops.quote_name(opts.db_table)}.{connection.ops.quote_name(field.column)}"
+
+
+def with_prefix(prefix, name):
+    return f"{prefix}__{name}" if prefix else name
+
+
+class BaseSearchBackend:
+    """
+    스터디 검색 백엔드
+    search()는 검색어와 일치하는 스터디만 남기고 search_rank를 annotate한 queryset을 반환
+    - prefix: 스터디를 참조하는 필드명 (예: StudyMember, Favorite의 경우 "study")
+    - search_rank는 값이 클수록 검색어와 관련도가 높음
+    """
+
+    def search(self, queryset, q, prefix=""):
+        raise NotImplementedError
+
+
+class DefaultSearchBackend(BaseSearchBackend):
+    """
+    전문 검색 인덱스를 사용할 수 없는 DB용 검색 백엔드
+    """
+
+    def search(self, queryset, q, prefix=""):
+        return queryset.filter(
+            Q(**{with_prefix(prefix, "title__icontains"): q})
+            | Q(**{with_prefix(prefix, "introduce__icontains"): q})
+        ).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+class SQLiteSearchBackend(BaseSearchBackend):
+    """
+    SQLite FTS5 검색 백엔드
+    - studies_studysearchdocument를 content 테이블로 사용하는 FTS5 테이블을 조회
+    - 제목에 10배 가중치를 둔 bm25로 순위 계산
+    """
+
+    def build_query(self, q):
+        """
+        FTS5 MATCH 검색어 생성
+        - 모든 n-gram을 포함하는 문서를 검색 (AND)
+        - n보다 짧은 단어는 접두어 검색 (prefix 인덱스 사용)
+        """
+        grams, short_words = split_query(q)
+        return " AND ".join(
+            [f'"{gram}"' for gram in grams] + [f'"{word}"*' for word in short_words]
+        )
+
+    def search(self, queryset, q, prefix=""):
+        match = self.build_query(q)
+        if not match:
+            return queryset.none()
+
+        study_column = get_study_column(queryset, prefix)
+        return queryset.filter(
+            **{
+                with_prefix(prefix, "pk__in"): RawSQL(
+                    f"SELECT rowid FROM {SQLITE_FTS_TABLE} "
+                    f"WHERE {SQLITE_FTS_TABLE} MATCH %s",
+                    [match],
+                )
+            }
+        ).annotate(
+            search_rank=RawSQL(
+                f"SELECT -bm25({SQLITE_FTS_TABLE}, 10.0, 1.0) FROM {SQLITE_FTS_TABLE} "
+                f"WHERE {SQLITE_FTS_TABLE} MATCH %s AND rowid = {study_column}",
+                [match],
+                output_field=FloatField(),
+            )
+        )
+
+
+class PostgreSQLSearchBackend(BaseSearchBackend):
+    """
+    PostgreSQL 전문 검색 백엔드
+    - 제목(A), 소개(B) 가중치를 둔 SearchVector를 GIN 인덱스로 조회
+    - ts_rank로 순위 계산
+    """
+
+    @staticmethod
+    def get_vector(prefix=""):
+        from django.contrib.postgres.search import SearchVector
+
+        return SearchVector(
+            with_prefix(prefix, "search_document__title"), weight="A", config="simple"
+        ) + SearchVector(
+            with_prefix(prefix, "search_document__introduce"),
+            weight="B",
+            config="simple",
+        )
+
+    def build_query(self, q):
+        """
+        to_tsquery 검색어 생성
+        - 모든 n-gram을 포함하는 문서를 검색 (&)
+        - n보다 짧은 단어는 접두어 검색 (:*)
+        """
+        grams, short_words = split_query(q)
+        return " & ".join(
+            [f"'{gram}'" for gram in grams] + [f"'{word}':*" for word in short_words]
+        )
+
+    def search(self, queryset, q, prefix=""):
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        raw_query = self.build_query(q)
+        if not raw_query:
+            return queryset.none()
+
+        query = SearchQuery(raw_query, config="simple", search_type="raw")
+        return (
+            queryset.annotate(search_vector=self.get_vector(prefix))
+            .filter(search_vector=query)
+            .annotate(search_rank=SearchRank(F("search_vector"), query))
+        )
+
+
+def get_search_backend():
+    """
+    기본 DB에 맞는 검색 백엔드 반환
+    """
+    if connection.vendor == "sqlite":
+        return SQLiteSearchBackend()
+    if connection.vendor == "postgresql":
+        return PostgreSQLSearchBackend()
+    return DefaultSearchBackend()
@@ -0,0 +1,29 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Study, StudyMember
+from .search import SEARCH_FIELDS, update_search_document
+
+
+@receiver(post_save, sender=Study)
+def sync_search_document(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    스터디 저장 시 검색 문서 갱신
+    update_fields에 색인하는 필드(제목, 소개)가 없으면 갱신하지 않음
+    스터디 삭제 시에는 검색 문서가 CASCADE로 함께 삭제됨
+    """
+    if raw:
+        return
+    if update_fields is not None and not SEARCH_FIELDS.intersection(update_fields):
+        return
+    update_search_document(instance)
+
+
+@receiver(post_delete, sender=StudyMember)
+def update_study_member_columns(sender, instance, **kwargs):
+    """
+    멤버 삭제 시 스터디의 멤버 수, 스터디장 갱신
+    삭제와 같은 트랜잭션에서 실행됨 (스터디와 함께 삭제되는 경우 갱신할 스터디가 없음)
+    """
+    before = getattr(instance, "_saved_status", None) or instance.get_status()
+    instance.update_study_columns(before, None)
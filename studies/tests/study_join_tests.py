@@ -1,4 +1,5 @@
 import datetime
+from django.db import IntegrityError, transaction
 from django.test import TestCase
 from studies.models import Study, StudyMember, Category, Blacklist
 from django.contrib.auth import get_user_model
@@ -168,3 +169,24 @@ class TestStudyJoin(TestCase):
         # 스터디 가입 거절 확인
         # 스터디 가입 거절 후 스터디 가입 신청 리스트에서 삭제됨.
         self.assertEqual(StudyMember.objects.count(), 2)
+
+    def test_study_member_unique_constraint(self):
+        """
+        같은 스터디에 같은 유저의 멤버가 중복 생성되지 않는지 테스트
+        """
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            StudyMember.objects.create(study=self.study_object, user=self.user2)
+
+    def test_study_manager_unique_constraint(self):
+        """
+        스터디장이 2명 이상 지정되지 않는지 테스트
+        """
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            StudyMember.objects.create(
+                study=self.study_object, user=self.user3, is_manager=True
+            )
+
+        # 스터디장이 아닌 멤버는 여러 명 추가 가능
+        StudyMember.objects.create(study=self.study_object, user=self.user3)
+        StudyMember.objects.create(study=self.study_object, user=self.user4)
+        self.assertEqual(StudyMember.objects.filter(study=self.study_object).count(), 4)
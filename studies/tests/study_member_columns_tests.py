@@ -0,0 +1,145 @@
+import datetime
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from studies.models import Category, Study, StudyFullError, StudyMember
+
+User = get_user_model()
+
+
+class TestStudyMemberColumns(TestCase):
+    """
+    스터디 멤버 수, 스터디장 컬럼 테스트
+    """
+
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(
+                email=f"test{num}@naver.com", password="test", nickname=f"test{num}"
+            )
+            for num in range(4)
+        ]
+        self.category = Category.objects.create(name="test")
+        self.study = self.create_study("test", max_member=3)
+        self.leader = StudyMember.objects.create(
+            study=self.study, user=self.users[0], is_manager=True, is_accepted=True
+        )
+
+    def create_study(self, title, max_member=10):
+        return Study.objects.create(
+            category=self.category,
+            goal="test",
+            title=title,
+            start_at=datetime.date.today(),
+            end_at=datetime.date.today(),
+            difficulty=Study.difficulty_choices[0][0],
+            max_member=max_member,
+        )
+
+    def assert_columns(self, accepted, pending, leader):
+        study = Study.objects.get(pk=self.study.pk)
+        self.assertEqual(study.accepted_member_count, accepted)
+        self.assertEqual(study.pending_member_count, pending)
+        self.assertEqual(study.leader, leader)
+
+    def test_member_changes(self):
+        """
+        가입 신청, 승인, 거절, 탈퇴, 스터디장 위임 시 컬럼 갱신
+        """
+        self.assert_columns(1, 0, self.users[0])
+
+        self.client.force_login(self.users[1])
+        self.client.get(reverse("studies:apply_study_join", args=[self.study.pk]))
+        self.client.force_login(self.users[2])
+        self.client.get(reverse("studies:apply_study_join", args=[self.study.pk]))
+        self.assert_columns(1, 2, self.users[0])
+
+        self.client.force_login(self.users[0])
+        member1 = StudyMember.objects.get(user=self.users[1])
+        member2 = StudyMember.objects.get(user=self.users[2])
+        self.client.get(reverse("studies:approve_study_join", args=[member1.pk]))
+        self.client.get(reverse("studies:reject_study_join", args=[member2.pk]))
+        self.assert_columns(2, 0, self.users[0])
+
+        self.client.post(
+            reverse("studies:change_study_manager", args=[self.study.pk, member1.pk]),
+            {"is_manager": "on"},
+        )
+        self.assert_columns(2, 0, self.users[1])
+
+        self.client.post(reverse("studies:withdraw_study", args=[self.study.pk]))
+        self.assert_columns(1, 0, self.users[1])
+
+    def test_get_study_leader(self):
+        """
+        스터디장은 leader 컬럼으로 조회 (select_related하면 추가 쿼리 없음)
+        """
+        study = Study.objects.with_card_data().get(pk=self.study.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(study.get_study_leader, self.users[0])
+
+    def test_study_save_keeps_columns(self):
+        """
+        이전에 조회한 스터디를 저장해도 멤버 컬럼을 덮어쓰지 않음
+        """
+        stale = Study.objects.get(pk=self.study.pk)
+        StudyMember.objects.create(study=self.study, user=self.users[1])
+        stale.title = "수정"
+        stale.save()
+        self.assert_columns(1, 1, self.users[0])
+        self.assertEqual(Study.objects.get(pk=self.study.pk).title, "수정")
+
+    def test_capacity(self):
+        """
+        정원이 가득 찬 스터디는 가입 신청, 승인 불가
+        """
+        for user in self.users[1:3]:
+            StudyMember.objects.create(study=self.study, user=user, is_accepted=True)
+        self.assert_columns(3, 0, self.users[0])
+
+        self.client.force_login(self.users[3])
+        self.client.get(reverse("studies:apply_study_join", args=[self.study.pk]))
+        self.assertFalse(StudyMember.objects.filter(user=self.users[3]).exists())
+
+        member = StudyMember.objects.create(study=self.study, user=self.users[3])
+        member.is_accepted = True
+        with self.assertRaises(StudyFullError):
+            member.save(enforce_capacity=True)
+        member.refresh_from_db()
+        self.assertFalse(member.is_accepted)
+        self.assert_columns(3, 1, self.users[0])
+
+    def test_repair_command(self):
+        """
+        어긋난 컬럼을 실제 멤버 기준으로 다시 계산
+        """
+        StudyMember.objects.create(study=self.study, user=self.users[1])
+        other = self.create_study("other")
+        Study.objects.filter(pk=self.study.pk).update(
+            accepted_member_count=5, pending_member_count=0, leader=None
+        )
+
+        out = StringIO()
+        call_command("repair_study_members", "--batch-size", "1", stdout=out)
+        self.assertIn("스터디 1개", out.getvalue())
+        self.assert_columns(1, 1, self.users[0])
+        self.assertEqual(Study.objects.get(pk=other.pk).accepted_member_count, 0)
+
+    def test_study_list_sort_and_filter(self):
+        """
+        멤버 많은 순 정렬, 모집 중 필터
+        """
+        other = self.create_study("other", max_member=10)
+        for user in self.users[1:3]:
+            StudyMember.objects.create(study=self.study, user=user, is_accepted=True)
+        StudyMember.objects.create(study=other, user=self.users[3], is_accepted=True)
+
+        response = self.client.get(reverse("studies:study_list"), {"sort": "members"})
+        self.assertEqual(list(response.context["studies"]), [self.study, other])
+
+        response = self.client.get(reverse("studies:study_list"), {"recruiting": "1"})
+        self.assertEqual(list(response.context["studies"]), [other])
@@ -0,0 +1,265 @@
+import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import PermissionDenied
+from django.db import OperationalError, connection
+from django.db.models import Count
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+
+from studies import membership
+from studies.models import (
+    Blacklist,
+    Category,
+    MembershipBusyError,
+    MembershipError,
+    Study,
+    StudyFullError,
+    StudyMember,
+)
+
+User = get_user_model()
+
+
+def create_study(max_member):
+    return Study.objects.create(
+        category=Category.objects.create(name="test"),
+        goal="test",
+        title="test",
+        start_at=datetime.date.today(),
+        end_at=datetime.date.today(),
+        difficulty=Study.difficulty_choices[0][0],
+        max_member=max_member,
+    )
+
+
+def create_users(count):
+    return User.objects.bulk_create(
+        [
+            User(email=f"test{num}@naver.com", nickname=f"test{num}", password="!")
+            for num in range(count)
+        ]
+    )
+
+
+class TestMembership(TestCase):
+    """
+    스터디 가입 신청, 승인, 거절, 탈퇴, 위임 서비스 테스트
+    """
+
+    def setUp(self):
+        self.users = create_users(5)
+        self.study = create_study(max_member=3)
+        self.leader = StudyMember.objects.create(
+            study=self.study, user=self.users[0], is_manager=True, is_accepted=True
+        )
+
+    def test_apply_is_idempotent(self):
+        member, created = membership.apply(self.study.pk, self.users[1])
+        self.assertTrue(created)
+        self.assertEqual(
+            membership.apply(self.study.pk, self.users[1]), (member, False)
+        )
+        self.assertEqual(StudyMember.objects.filter(user=self.users[1]).count(), 1)
+
+    def test_apply_blacklist_and_full(self):
+        Blacklist.objects.create(study=self.study, user=self.users[1])
+        with self.assertRaises(MembershipError):
+            membership.apply(self.study.pk, self.users[1])
+
+        StudyMember.objects.create(
+            study=self.study, user=self.users[2], is_accepted=True
+        )
+        StudyMember.objects.create(
+            study=self.study, user=self.users[3], is_accepted=True
+        )
+        with self.assertRaises(StudyFullError):
+            membership.apply(self.study.pk, self.users[4])
+
+    def test_approve_and_reject(self):
+        member, _ = membership.apply(self.study.pk, self.users[1])
+        with self.assertRaises(PermissionDenied):
+            membership.approve(member.pk, self.users[1])
+
+        self.assertEqual(membership.approve(member.pk, self.users[0])[1], True)
+        self.assertEqual(membership.approve(member.pk, self.users[0])[1], False)
+        # 승인된 멤버는 거절(삭제)하지 않음
+        self.assertIsNone(membership.reject(member.pk, self.users[0]))
+
+        pending, _ = membership.apply(self.study.pk, self.users[2])
+        self.assertEqual(
+            membership.reject(pending.pk, self.users[0]).user, self.users[2]
+        )
+        self.assertIsNone(membership.reject(pending.pk, self.users[0]))
+
+        study = Study.objects.get(pk=self.study.pk)
+        self.assertEqual(study.accepted_member_count, 2)
+        self.assertEqual(study.pending_member_count, 0)
+
+    def test_delegate_and_withdraw(self):
+        pending, _ = membership.apply(self.study.pk, self.users[1])
+        with self.assertRaises(MembershipError):
+            membership.delegate(pending.pk, self.users[0])
+        with self.assertRaises(MembershipError):
+            membership.withdraw(self.study.pk, self.users[0])
+
+        membership.approve(pending.pk, self.users[0])
+        self.assertEqual(membership.delegate(pending.pk, self.users[0]), pending)
+        # 스터디장이 아니면 이미 위임된 멤버에게도 위임할 수 없음
+        with self.assertRaises(PermissionDenied):
+            membership.delegate(pending.pk, self.users[0])
+        with self.assertRaises(PermissionDenied):
+            membership.delegate(self.leader.pk, self.users[0])
+        # 스터디장이 자신에게 위임하면 그대로 반환
+        self.assertEqual(membership.delegate(pending.pk, self.users[1]), pending)
+
+        self.assertTrue(membership.withdraw(self.study.pk, self.users[0]))
+        self.assertFalse(membership.withdraw(self.study.pk, self.users[0]))
+        study = Study.objects.get(pk=self.study.pk)
+        self.assertEqual(study.leader, self.users[1])
+        self.assertEqual(study.accepted_member_count, 1)
+
+    def test_views_show_errors(self):
+        """
+        처리할 수 없는 요청은 메시지를 남기고 상세 페이지로 이동
+        """
+        self.client.force_login(self.users[0])
+        response = self.client.post(
+            reverse("studies:withdraw_study", args=[self.study.pk])
+        )
+        self.assertRedirects(
+            response,
+            reverse("studies:study_detail", args=[self.study.pk]),
+            fetch_redirect_response=False,
+        )
+        self.assertTrue(StudyMember.objects.filter(pk=self.leader.pk).exists())
+        messages = [str(message) for message in response.wsgi_request._messages]
+        self.assertEqual(
+            messages, ["스터디장은 스터디장을 위임한 뒤 탈퇴할 수 있습니다."]
+        )
+
+
+class TestMembershipConcurrency(TransactionTestCase):
+    """
+    같은 스터디에 동시에 가입 신청, 승인, 위임해도
+    멤버 중복, 스터디장 중복, 정원 초과가 없는지 확인
+    """
+
+    workers = 8
+    # 잠금을 얻지 못해 MembershipBusyError가 나면 다시 요청할 횟수
+    busy_retries = 20
+
+    def setUp(self):
+        self.users = create_users(201)
+        self.study = create_study(max_member=20)
+        self.leader = self.users[0]
+        StudyMember.objects.create(
+            study=self.study, user=self.leader, is_manager=True, is_accepted=True
+        )
+
+    def run_concurrently(self, func, items):
+        def run(item):
+            try:
+                for _ in range(self.busy_retries):
+                    try:
+                        return func(item)
+                    except MembershipBusyError as error:
+                        # 사용자가 다시 시도하는 경우
+                        busy = error
+                return busy
+            except MembershipError as error:
+                return error
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            return list(executor.map(run, items))
+
+    def assert_invariants(self):
+        study = Study.objects.get(pk=self.study.pk)
+        members = StudyMember.objects.filter(study=study)
+        self.assertFalse(
+            members.values("user").annotate(count=Count("id")).filter(count__gt=1)
+        )
+        managers = members.filter(is_manager=True)
+        self.assertEqual(managers.count(), 1)
+        self.assertEqual(study.leader_id, managers.get().user_id)
+        accepted = members.filter(is_accepted=True).count()
+        self.assertLessEqual(accepted, study.max_member)
+        self.assertEqual(study.accepted_member_count, accepted)
+        self.assertEqual(
+            study.pending_member_count, members.filter(is_accepted=False).count()
+        )
+        return study
+
+    def test_lock_retry_timeout(self):
+        """
+        잠금을 얻지 못하면 1초 안에 다시 시도하라는 메시지를 표시
+        (TestCase의 트랜잭션 안에서는 다시 실행하지 않으므로 TransactionTestCase에서 테스트)
+        """
+        locked = OperationalError("database is locked")
+        with mock.patch.object(membership, "lock_study", side_effect=locked):
+            started = time.monotonic()
+            with self.assertRaisesMessage(
+                MembershipBusyError, "잠시 후 다시 시도해 주세요."
+            ):
+                membership.apply(self.study.pk, self.users[1])
+            self.assertLess(time.monotonic() - started, 1)
+
+            self.client.force_login(self.users[1])
+            response = self.client.get(
+                reverse("studies:apply_study_join", args=[self.study.pk])
+            )
+        messages = [str(message) for message in response.wsgi_request._messages]
+        self.assertEqual(messages, ["잠시 후 다시 시도해 주세요."])
+        self.assertFalse(StudyMember.objects.filter(user=self.users[1]).exists())
+
+    def test_apply_and_approve(self):
+        """
+        200명이 2번씩 동시에 가입 신청하고, 신청 직후 스터디장이 승인
+        """
+
+        def apply_and_approve(user):
+            member, _ = membership.apply(self.study.pk, user)
+            return membership.approve(member.pk, self.leader)[1]
+
+        results = self.run_concurrently(apply_and_approve, self.users[1:] * 2)
+
+        # 다시 시도해도 잠금을 얻지 못한 요청이 있으면 정원이 다 차지 않을 수 있음
+        study = self.assert_invariants()
+        self.assertEqual(results.count(True), study.accepted_member_count - 1)
+        self.assertLessEqual(results.count(True), study.max_member - 1)
+        self.assertTrue(
+            all(
+                isinstance(result, (bool, StudyFullError, MembershipBusyError))
+                for result in results
+            )
+        )
+        if not any(isinstance(result, MembershipBusyError) for result in results):
+            self.assertEqual(study.accepted_member_count, study.max_member)
+
+    def test_delegate(self):
+        """
+        승인된 멤버들에게 동시에 스터디장 위임
+        """
+        members = [
+            StudyMember.objects.create(study=self.study, user=user, is_accepted=True)
+            for user in self.users[1:11]
+        ]
+
+        def delegate(member):
+            try:
+                return membership.delegate(member.pk, self.leader)
+            except PermissionDenied as error:
+                return error
+
+        results = self.run_concurrently(delegate, members * 5)
+
+        # 처음 위임한 요청 외에는 이전 스터디장의 요청이므로 권한이 없어 실패
+        study = self.assert_invariants()
+        delegated = [result for result in results if isinstance(result, StudyMember)]
+        self.assertEqual(len(delegated), 1)
+        self.assertTrue(all(member.user == study.leader for member in delegated))
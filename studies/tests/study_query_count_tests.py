@@ -0,0 +1,105 @@
+import datetime
+from django.test import TestCase
+from main.testing import QueryBudgetMixin
+from studies.models import Study, StudyMember, Category, Tag, Favorite
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+User = get_user_model()
+
+# 스터디 리스트 화면의 쿼리 예산
+QUERY_BUDGET = 12
+
+
+class TestStudyCardQueryCount(QueryBudgetMixin, TestCase):
+    """
+    스터디 카드 목록의 쿼리 수 테스트
+    스터디 카드 개수와 관계없이 쿼리 수가 일정한지 확인
+    """
+
+    def setUp(self):
+        """
+        테스트용 데이터 생성
+        """
+
+        # 테스트용 유저 생성
+        self.user1 = User.objects.create_user(
+            email="test1@naver.com", password="test1", nickname="test1"
+        )
+        self.category = Category.objects.create(name="test")
+        self.tag = Tag.objects.create(name="tag_test")
+        self.study_count = 0
+
+        self.create_study()
+
+    def create_study(self):
+        """
+        스터디장, 멤버, 즐겨찾기가 있는 스터디 생성
+        """
+        self.study_count += 1
+        num = self.study_count
+        study = Study.objects.create(
+            category=self.category,
+            goal=f"test{num}",
+            title=f"test{num}",
+            introduce=f"test{num}",
+            start_at=datetime.date.today(),
+            end_at=datetime.date.today(),
+            difficulty=Study.difficulty_choices[0][0],
+            max_member=10,
+        )
+        study.tag.add(self.tag)
+
+        leader = User.objects.create_user(
+            email=f"leader{num}@naver.com", password="test", nickname=f"leader{num}"
+        )
+        member = User.objects.create_user(
+            email=f"member{num}@naver.com", password="test", nickname=f"member{num}"
+        )
+        StudyMember.objects.create(
+            study=study, user=leader, is_manager=True, is_accepted=True
+        )
+        StudyMember.objects.create(study=study, user=member, is_accepted=True)
+        StudyMember.objects.create(study=study, user=self.user1, is_accepted=True)
+        Favorite.objects.create(user=self.user1, study=study)
+        return study
+
+    def assert_constant_queries(self, url):
+        """
+        스터디 1개일 때와 6개일 때의 쿼리 수가 같고 예산 이하인지 확인
+        """
+        self.client.force_login(self.user1)
+        self.assertQueryBudget(url, QUERY_BUDGET, grow=self.create_study)
+
+    def test_study_list_query_count(self):
+        """
+        전체 스터디 리스트 쿼리 수 테스트
+        """
+        self.assert_constant_queries(reverse("studies:study_list"))
+
+    def test_study_list_by_tag_query_count(self):
+        """
+        태그 필터를 적용한 전체 스터디 리스트 쿼리 수 테스트
+        """
+        self.assert_constant_queries(reverse("studies:study_list") + "?tag=tag_test")
+
+    def test_my_study_list_query_count(self):
+        """
+        내 스터디 리스트 쿼리 수 테스트
+        """
+        self.assert_constant_queries(reverse("studies:my_study_list"))
+
+    def test_favorite_study_list_query_count(self):
+        """
+        즐겨찾기 스터디 리스트 쿼리 수 테스트
+        """
+        self.assert_constant_queries(reverse("studies:favorite_study_list"))
+
+    def test_study_card_data(self):
+        """
+        with_card_data로 조회한 스터디장, 멤버 수 테스트
+        """
+        study = Study.objects.with_card_data().get()
+        with self.assertNumQueries(0):
+            self.assertEqual(study.get_current_member, 3)
+            self.assertEqual(study.leader.nickname, "leader1")
@@ -0,0 +1,173 @@
+import datetime
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from studies.models import (
+    Study,
+    StudyMember,
+    StudySearchDocument,
+    Category,
+    Tag,
+    Favorite,
+)
+from studies.search import get_search_backend, ngram_text
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+User = get_user_model()
+
+
+class TestStudySearch(TestCase):
+    def setUp(self):
+        """
+        테스트용 데이터 생성
+        """
+
+        # 테스트용 유저 생성
+        self.user1 = User.objects.create_user(
+            email="test1@naver.com", password="test1", nickname="test1"
+        )
+
+        # 테스트용 스터디 생성
+        self.category1 = Category.objects.create(name="category1")
+        self.category2 = Category.objects.create(name="category2")
+        self.tag = Tag.objects.create(name="tag_test")
+        self.title_study = self.create_study(
+            "자바스크립트 스터디", "함께 공부해요", self.category1
+        )
+        self.introduce_study = self.create_study(
+            "프론트엔드 모임", "리액트와 자바스크립트를 공부합니다", self.category2
+        )
+        self.other_study = self.create_study(
+            "파이썬 알고리즘", "Django 백엔드 공부", self.category1
+        )
+        self.title_study.tag.add(self.tag)
+
+        for study in [self.title_study, self.introduce_study, self.other_study]:
+            StudyMember.objects.create(
+                study=study, user=self.user1, is_manager=True, is_accepted=True
+            )
+            Favorite.objects.create(user=self.user1, study=study)
+
+    def create_study(self, title, introduce, category):
+        return Study.objects.create(
+            category=category,
+            goal="test",
+            title=title,
+            introduce=introduce,
+            start_at=datetime.date.today(),
+            end_at=datetime.date.today(),
+            difficulty=Study.difficulty_choices[0][0],
+            max_member=10,
+        )
+
+    def search(self, q):
+        return list(get_search_backend().search(Study.objects.all(), q))
+
+    def test_ngram_text(self):
+        """
+        n-gram 색인 텍스트 생성 테스트
+        """
+        self.assertEqual(ngram_text("자바스크립트 A"), "자바 바스 스크 크립 립트 트 a")
+
+    def test_search_korean_partial_word(self):
+        """
+        띄어쓰기와 관계없이 단어 일부로 검색되는지 테스트
+        """
+        self.assertEqual(
+            set(self.search("스크립")), {self.title_study, self.introduce_study}
+        )
+        self.assertEqual(self.search("알고"), [self.other_study])
+        self.assertEqual(self.search("django"), [self.other_study])
+        self.assertEqual(self.search("코틀린"), [])
+
+    def test_search_single_character(self):
+        """
+        n-gram보다 짧은 검색어는 단어 중간, 끝 글자도 검색되는지 테스트
+        """
+        self.assertEqual(self.search("파"), [self.other_study])
+        self.assertEqual(self.search("썬"), [self.other_study])
+        self.assertEqual(
+            set(self.search("트")), {self.title_study, self.introduce_study}
+        )
+        self.assertEqual(self.search("트 모임"), [self.introduce_study])
+        self.assertEqual(self.search("썬 모임"), [])
+
+    def test_search_single_character_uses_index(self):
+        """
+        n-gram보다 짧은 검색어도 제목, 소개를 전체 조회하지 않고 색인의 접두어로 검색하는지 테스트
+        """
+        queryset = get_search_backend().search(Study.objects.all(), "썬")
+        self.assertNotIn("LIKE", str(queryset.query))
+        self.assertEqual(list(queryset), [self.other_study])
+
+    def test_search_rank(self):
+        """
+        제목에 검색어가 포함된 스터디가 먼저 조회되는지 테스트
+        """
+        response = self.client.get(reverse("studies:study_list") + "?q=자바스크립트")
+        self.assertEqual(
+            list(response.context["studies"]),
+            [self.title_study, self.introduce_study],
+        )
+
+    def test_search_with_filters(self):
+        """
+        검색어와 카테고리, 태그 필터를 하나의 쿼리로 조회하는지 테스트
+        """
+        queryset = get_search_backend().search(Study.objects.all(), "자바스크립트")
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                list(queryset.filter(category=self.category2)), [self.introduce_study]
+            )
+
+        response = self.client.get(
+            reverse("studies:study_list") + "?q=자바스크립트&tag=tag_test"
+        )
+        self.assertEqual(list(response.context["studies"]), [self.title_study])
+
+    def test_search_my_study_and_favorite_list(self):
+        """
+        내 스터디, 즐겨찾기 리스트 검색 테스트
+        """
+        self.client.force_login(self.user1)
+        response = self.client.get(
+            reverse("studies:my_study_list")
+            + f"?q=알고리즘&category={self.category1.id}"
+        )
+        self.assertEqual(
+            [mystudy.study for mystudy in response.context["mystudies"]],
+            [self.other_study],
+        )
+
+        response = self.client.get(reverse("studies:favorite_study_list") + "?q=리액트")
+        self.assertEqual(
+            [favorite.study for favorite in response.context["favorite_studies"]],
+            [self.introduce_study],
+        )
+
+    def test_search_document_sync(self):
+        """
+        스터디 수정, 삭제 시 검색 인덱스가 갱신되는지 테스트
+        """
+        self.other_study.title = "코틀린 스터디"
+        self.other_study.save()
+        self.assertEqual(self.search("코틀린"), [self.other_study])
+        self.assertEqual(self.search("알고리즘"), [])
+
+        # 색인하지 않는 필드만 저장하면 검색 문서를 갱신하지 않음
+        self.other_study.max_member = 5
+        with CaptureQueriesContext(connection) as context:
+            self.other_study.save(update_fields=["max_member"])
+        self.assertFalse(
+            any("studysearchdocument" in query["sql"] for query in context)
+        )
+        self.other_study.introduce = "안드로이드 공부"
+        self.other_study.save(update_fields=["introduce"])
+        self.assertEqual(self.search("안드로이드"), [self.other_study])
+
+        self.other_study.delete()
+        self.assertEqual(self.search("코틀린"), [])
+        self.assertFalse(
+            StudySearchDocument.objects.filter(title__contains="코틀").exists()
+        )
@@ -9,7 +9,9 @@ from .models import (
     Favorite,
     Schedule,
     RefLink,
+    MembershipError,
 )
+from . import membership
 from django.views.generic import (
     ListView,
     CreateView,
@@ -18,24 +20,32 @@ from django.views.generic import (
     DeleteView,
 )
 from django.shortcuts import redirect
-from django.urls import reverse_lazy
+from django.contrib import messages
+from django.urls import reverse, reverse_lazy
 from .forms import StudyForm, CommentForm, RecommentForm, BlacklistForm, FavoriteForm
-from django.db.models import Q
+from .search import get_search_backend
+from django.db.models import Prefetch
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib.auth import get_user_model
 from django.shortcuts import get_object_or_404
 from django.http import HttpResponseRedirect
-from django.core.exceptions import PermissionDenied
 from django.core.paginator import Paginator
+from main.pagination import CursorPaginationMixin
+from alerts.delivery import alert_users
+from main.holiday_calendar import get_holidays_between
+import datetime
 
 User = get_user_model()
 
 
-class StudyList(ListView):
+class StudyList(CursorPaginationMixin, ListView):
     """
     전체 스터디 리스트 조회
     스터디 새로 생성 시 생성된 스터디를 리스트에서 조회 가능
+    검색어가 있는 경우 검색 순위, 없는 경우 최신순으로 커서 페이지네이션
+    sort=members인 경우 멤버가 많은 순, recruiting이 있는 경우 정원이 남은 스터디만 조회
+    (Study의 accepted_member_count 컬럼과 인덱스 사용)
     """
 
     model = Study
@@ -46,15 +56,19 @@ class StudyList(ListView):
     paginate_by = 6
 
     def get_queryset(self):
-        queryset = super().get_queryset().prefetch_related("favorites")
+        queryset = (
+            super().get_queryset().with_card_data().prefetch_related("favorites")
+        )
         q = self.request.GET.get("q", "")
         tag = self.request.GET.get("tag", "")
         category = self.request.GET.get("category", "")
         difficulty = self.request.GET.get("difficulty", "")
 
         if q:
-            queryset = queryset.filter(
-                Q(title__icontains=q) | Q(introduce__icontains=q)
+            queryset = (
+                get_search_backend()
+                .search(queryset, q)
+                .order_by("-search_rank", "-created_at")
             )
 
         if tag:
@@ -66,8 +80,18 @@ class StudyList(ListView):
         if difficulty:
             queryset = queryset.filter(difficulty=difficulty)
 
+        if self.request.GET.get("recruiting", ""):
+            queryset = queryset.recruiting()
+
         return queryset
 
+    def get_cursor_ordering(self):
+        if self.request.GET.get("sort", "") == "members":
+            return ("-accepted_member_count", "-created_at", "-id")
+        if self.request.GET.get("q", ""):
+            return ("-search_rank", "-created_at", "-id")
+        return ("-created_at", "-id")
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["tags"] = Tag.objects.all()
@@ -76,7 +100,7 @@ class StudyList(ListView):
         return context
 
 
-class MyStudyList(LoginRequiredMixin, ListView):
+class MyStudyList(LoginRequiredMixin, CursorPaginationMixin, ListView):
     """
     내 스터디 리스트 조회
     로그인한 유저가 가입한 스터디를 리스트에서 조회 가능
@@ -88,11 +112,19 @@ class MyStudyList(LoginRequiredMixin, ListView):
     template_name = "studies/my_study_list.html"
     context_object_name = "mystudies"
     paginate_by = 6
+    cursor_ordering = ("-study__created_at", "-id")
 
     def get_queryset(self):
         queryset = super().get_queryset()
         queryset = (
-            queryset.select_related("study")
+            queryset.prefetch_related(
+                Prefetch(
+                    "study",
+                    queryset=Study.objects.with_card_data().prefetch_related(
+                        "favorites"
+                    ),
+                )
+            )
             .filter(user=self.request.user)
             .order_by("-study__created_at")
         )
@@ -103,9 +135,7 @@ class MyStudyList(LoginRequiredMixin, ListView):
         difficulty = self.request.GET.get("difficulty", "")
 
         if q:
-            queryset = queryset.filter(
-                Q(study__title__icontains=q) | Q(study__introduce__icontains=q)
-            )
+            queryset = get_search_backend().search(queryset, q, prefix="study")
 
         if tag:
             queryset = queryset.filter(study__tag__name__in=[tag])
@@ -208,6 +238,16 @@ class StudyDetail(DetailView):
             schedule.day_display = dict(Schedule.day_choices).get(schedule.day, "")
         context["schedules"] = schedules
 
+        # 오늘부터 스터디 종료일까지 일정 요일과 겹치는 공휴일
+        days = {schedule.day for schedule in schedules}
+        context["holiday_schedules"] = [
+            holiday
+            for holiday in get_holidays_between(
+                max(datetime.date.today(), self.object.start_at), self.object.end_at
+            )
+            if holiday.date.isoweekday() in days
+        ]
+
         return context
 
     def get_object(self, queryset=None):
@@ -427,6 +467,7 @@ class ApproveStudyJoinDetail(UserPassesTestMixin, DetailView):
     스터디 가입 승인
     스터디 생성자만이 스터디 가입을 승인할 수 있습니다.
     스터디 생성자가 스터디 가입을 승인하면 studymember 모델의 is_accept를 True로, is_manager를 False로 지정합니다.
+    스터디 정원이 가득 찬 경우 승인하지 않습니다.
     """
 
     model = StudyMember, Study
@@ -528,14 +569,12 @@ class DelegateAuthorityView(UserPassesTestMixin, UpdateView):
         return reverse_lazy("studies:study_detail", kwargs={"pk": self.object.study.pk})
 
     def form_valid(self, form):
-        studymember = self.get_object()
-        studyleader = StudyMember.objects.get(study=studymember.study, is_manager=True)
-        studyleader.is_manager = False
-        studyleader.save()
-
-        # 폼을 통해 처리되는 특정 모델의 인스턴스를 참조하는 경우
-        form.instance.is_manager = True
-        return super().form_valid(form)
+        # 기존 스터디장 해제와 새 스터디장 지정을 한 트랜잭션에서 처리
+        try:
+            self.object = membership.delegate(self.object.pk, self.request.user)
+        except MembershipError as error:
+            messages.error(self.request, str(error))
+        return HttpResponseRedirect(self.get_success_url())
 
 
 class WithdrawStudy(LoginRequiredMixin, DeleteView):
@@ -555,6 +594,14 @@ class WithdrawStudy(LoginRequiredMixin, DeleteView):
     def get_success_url(self):
         return reverse_lazy("studies:study_detail", kwargs={"pk": self.object.study.pk})
 
+    def form_valid(self, form):
+        # 스터디장은 위임 후 탈퇴 가능
+        try:
+            membership.withdraw(self.object.study_id, self.request.user)
+        except MembershipError as error:
+            messages.error(self.request, str(error))
+        return HttpResponseRedirect(self.get_success_url())
+
 
 class AddBlacklistUser(UserPassesTestMixin, CreateView):
     """
@@ -655,20 +702,24 @@ class FavoriteStudyCreate(LoginRequiredMixin, CreateView):
         return self.request.META.get("HTTP_REFERER", reverse_lazy("studies:study_list"))
 
 
-class FaveriteStudyList(LoginRequiredMixin, ListView):
+class FaveriteStudyList(LoginRequiredMixin, CursorPaginationMixin, ListView):
     """
     스터디 즐겨찾기 조회
     로그인한 유저만이 스터디 즐겨찾기를 조회할 수 있습니다.
+    즐겨찾기에는 생성일이 없으므로 최근 추가한 순(id)으로 조회
     """
 
     model = Favorite
     template_name = "studies/favorite_study_list.html"
     context_object_name = "favorite_studies"
     paginate_by = 6
+    cursor_ordering = ("-id",)
 
     def get_queryset(self):
         queryset = super().get_queryset()
-        queryset = queryset.select_related("study").filter(user=self.request.user)
+        queryset = queryset.prefetch_related(
+            Prefetch("study", queryset=Study.objects.with_card_data())
+        ).filter(user=self.request.user)
 
         q = self.request.GET.get("q", "")
         tag = self.request.GET.get("tag", "")
@@ -676,12 +727,10 @@ class FaveriteStudyList(LoginRequiredMixin, ListView):
         difficulty = self.request.GET.get("difficulty", "")
 
         if q:
-            queryset = queryset.filter(
-                Q(study__title__icontains=q) | Q(study__introduce__icontains=q)
-            )
+            queryset = get_search_backend().search(queryset, q, prefix="study")
 
         if tag:
-            queryset = queryset.filter(study__tags__name__in=[tag])
+            queryset = queryset.filter(study__tag__name__in=[tag])
 
         if category:
             queryset = queryset.filter(study__category=category)
@@ -724,16 +773,14 @@ def apply_study_join(request, pk):
     스터디 가입 신청
     스터디 가입 신청 시 studymember 모델의 user를 로그인한 유저로 지정합니다.
     1번 신청이 된 스터디는 다시 승인 혹은 취소 전까지 신청할 수 없습니다.
-    블랙리스트에 등록된 유저는 스터디 가입을 신청할 수 없습니다.
+    블랙리스트에 등록된 유저, 정원이 가득 찬 스터디는 가입을 신청할 수 없습니다.
+    (studies.membership.apply에서 스터디를 잠근 뒤 처리하므로 동시에 신청해도 1번만 신청됨)
     """
     study = get_object_or_404(Study, pk=pk)
-    studymember = StudyMember.objects.filter(study=study, user=request.user)
-    blacklists = Blacklist.objects.filter(study=study, user=request.user)
-    if studymember:
-        return redirect("studies:study_detail", pk=pk)
-    elif blacklists:
-        return redirect("studies:study_detail", pk=pk)
-    StudyMember.objects.create(study=study, user=request.user)
+    try:
+        membership.apply(study.pk, request.user)
+    except MembershipError as error:
+        messages.error(request, str(error))
 
     return redirect("studies:study_detail", pk=pk)
 
@@ -743,16 +790,22 @@ def approve_study_join(request, studymember_id):
     """
     스터디 가입 승인
     스터디 생성자만이 스터디 가입을 승인할 수 있습니다.
-    스터디 생성자가 스터디 가입을 승인하면 studymember 모델의 is_accept를 True로, is_manager를 False로 지정합니다.
+    스터디 생성자가 스터디 가입을 승인하면 studymember 모델의 is_accept를 True로 지정합니다.
+    이미 승인된 멤버는 다시 승인하지 않고, 정원이 가득 찬 스터디는 승인할 수 없습니다.
     """
     studymember = get_object_or_404(StudyMember, id=studymember_id)
-    studyleader = StudyMember.objects.get(study=studymember.study, is_manager=True)
-    if request.user != studyleader.user:
-        raise PermissionDenied("접근 권한이 없습니다.")
-
-    studymember.is_accepted = True
-    studymember.is_manager = False
-    studymember.save()
+    try:
+        studymember, approved = membership.approve(studymember.pk, request.user)
+    except MembershipError as error:
+        messages.error(request, str(error))
+        return HttpResponseRedirect(request.META.get('HTTP_REFERER', '/'))
+    if approved:
+        alert_users(
+            [studymember.user_id],
+            "alert_other",
+            f"'{studymember.study.title}' 스터디 가입이 승인되었습니다.",
+            url=reverse("studies:study_detail", args=[studymember.study_id]),
+        )
 
     return HttpResponseRedirect(request.META.get('HTTP_REFERER', '/'))
 
@@ -762,13 +815,20 @@ def reject_study_join(request, studymember_id):
     """
     스터디 가입 거절
     스터디 생성자만이 스터디 가입을 거절할 수 있습니다.
-    스터디 생성자가 스터디 가입을 거절하면 studymember 모델을 삭제합니다.
+    스터디 생성자가 스터디 가입을 거절하면 가입 대기 중인 studymember 모델을 삭제합니다.
     """
     studymember = get_object_or_404(StudyMember, id=studymember_id)
-    studyleader = StudyMember.objects.get(study=studymember.study, is_manager=True)
-    if request.user != studyleader.user:
-        raise PermissionDenied("접근 권한이 없습니다.")
-
-    studymember.delete()
+    try:
+        rejected = membership.reject(studymember.pk, request.user)
+    except MembershipError as error:
+        messages.error(request, str(error))
+        return HttpResponseRedirect(request.META.get('HTTP_REFERER', '/'))
+    if rejected is not None:
+        alert_users(
+            [studymember.user_id],
+            "alert_other",
+            f"'{studymember.study.title}' 스터디 가입이 거절되었습니다.",
+            url=reverse("studies:study_detail", args=[studymember.study_id]),
+        )
 
     return HttpResponseRedirect(request.META.get('HTTP_REFERER', '/'))
@@ -0,0 +1,15 @@
+from datetime import timedelta
+
+from jobs.registry import register
+
+from .reminders import reminder_scheduler
+
+
+@register("todo_reminders", interval=timedelta(seconds=30))
+def send_todo_reminders():
+    """
+    할 일 알림 전송
+    알림 힙은 runjobs 프로세스에 유지되며, 처음 실행할 때 불러온 뒤 변경된 할 일만 반영
+    """
+    sent = reminder_scheduler.run()
+    return f"{sent}개 할 일 알림"
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.7 on 2026-10-17 05:58
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def remove_duplicates(apps, schema_editor):
+    """
+    제약조건 추가 전 중복 데이터 정리
+    - 같은 todo, assignee 조합은 가장 먼저 생성된 행만 남김
+    """
+    ToDoAssignee = apps.get_model("todos", "ToDoAssignee")
+
+    duplicates = (
+        ToDoAssignee.objects.values("todo", "assignee")
+        .annotate(count=Count("id"))
+        .filter(count__gt=1)
+    )
+    for duplicate in duplicates:
+        rows = ToDoAssignee.objects.filter(
+            todo=duplicate["todo"], assignee=duplicate["assignee"]
+        ).order_by("id")
+        rows.exclude(id=rows[0].id).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("todos", "0002_alter_todo_alert_set_alter_todo_content_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicates, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="todoassignee",
+            index=models.Index(
+                fields=["assignee", "todo"], name="todoassignee_assignee_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="todoassignee",
+            constraint=models.UniqueConstraint(
+                fields=("todo", "assignee"), name="unique_todo_assignee"
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-17 07:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("todos", "0003_todoassignee_todoassignee_assignee_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="todo",
+            name="reminded_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="todo",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name="todo",
+            index=models.Index(fields=["start_at"], name="todo_start_at_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="todo",
+            index=models.Index(fields=["updated_at"], name="todo_updated_at_idx"),
+        ),
+    ]
@@ -1,7 +1,26 @@
 from django.db import models
+from django.db.models import Prefetch
 from django.urls import reverse
 
 
+class ToDoQuerySet(models.QuerySet):
+    """
+    할 일 QuerySet
+    """
+
+    def with_card_data(self):
+        """
+        할 일 카드 렌더링에 필요한 스터디, 담당자와 유저를 함께 조회
+        할 일 개수와 관계없이 일정한 쿼리 수로 카드 목록을 렌더링
+        """
+        return self.select_related("study").prefetch_related(
+            Prefetch(
+                "todo_assignees",
+                queryset=ToDoAssignee.objects.select_related("assignee").order_by("id"),
+            )
+        )
+
+
 class ToDo(models.Model):
     """
     할 일 모델
@@ -33,10 +52,18 @@ class ToDo(models.Model):
     end_at = models.DateTimeField(null=True, blank=True)
     alert_set = models.CharField(choices=ALERT_CATEGORY, max_length=20, default="없음")
     status = models.CharField(choices=STATUS_CATEGORY, max_length=20, default="ToDo")
+    # 알림을 보낸 시각 (start_at - alert_set), 시작 시각이나 알림 설정이 바뀌면 다시 알림
+    reminded_at = models.DateTimeField(null=True, blank=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+    objects = ToDoQuerySet.as_manager()
 
     class Meta:
         verbose_name = "할 일"
         verbose_name_plural = "할 일"
+        indexes = [
+            models.Index(fields=["start_at"], name="todo_start_at_idx"),
+            models.Index(fields=["updated_at"], name="todo_updated_at_idx"),
+        ]
 
     def get_absolute_url(self):
         return reverse("todo_detail", args=[self.id])
@@ -60,3 +87,11 @@ class ToDoAssignee(models.Model):
     class Meta:
         verbose_name = "할 일 담당자"
         verbose_name_plural = "할 일 담당자"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["todo", "assignee"], name="unique_todo_assignee"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["assignee", "todo"], name="todoassignee_assignee_idx"),
+        ]
@@ -0,0 +1,205 @@
+"""
+할 일 알림(ToDo.alert_set)
+- 할 일마다 알림 시각(start_at - alert_set)을 최소 힙에 저장하고, 알림 시각이 된 할 일만
+  꺼내서 담당자에게 Alert(category="alert_todo")를 한 번에 저장
+- 힙은 처음 실행할 때 시작하지 않은 할 일로 한 번만 만들고(load), 이후에는 테이블 전체를
+  다시 조회하지 않고 변경된 할 일만 반영
+  - 같은 프로세스의 변경: signals에서 schedule, unschedule
+  - 다른 프로세스(웹 서버)의 변경: updated_at이 마지막 동기화 TODO_REMINDER_SYNC_OVERLAP초 전
+    이후인 할 일만 조회(sync), 동기화 후에 커밋되었지만 updated_at은 그 전인 할 일도 반영
+- 알림을 보낸 알림 시각은 ToDo.reminded_at에 저장하므로, 재시작하거나 여러 프로세스가
+  실행해도 같은 알림을 다시 보내지 않고, 꺼져 있는 동안 지난 알림은 시작 전이면 바로 전송
+"""
+
+import heapq
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+
+from alerts.delivery import AlertEvent, enqueue_alerts
+
+from .models import ToDo, ToDoAssignee
+
+logger = logging.getLogger(__name__)
+
+# alert_set -> (시작 전 알림 시간, 알림 문구)
+REMINDER_OFFSETS = {
+    "1시간": (timedelta(hours=1), "1시간"),
+    "6시간": (timedelta(hours=6), "6시간"),
+    "하루 전": (timedelta(days=1), "하루"),
+}
+
+
+def get_fire_at(todo):
+    """
+    할 일의 알림 시각, 알림을 보내지 않는 할 일은 None
+    """
+    if todo.start_at is None or todo.alert_set not in REMINDER_OFFSETS:
+        return None
+    return todo.start_at - REMINDER_OFFSETS[todo.alert_set][0]
+
+
+class ReminderScheduler:
+    """
+    할 일 알림 스케줄러
+    - heap: (알림 시각, 할 일 id), 할 일이 변경되면 새 항목을 추가하고
+      이전 항목은 꺼낼 때 fire_times와 비교하여 버림
+    - fire_times: 할 일 id -> 현재 알림 시각
+    """
+
+    def __init__(self, batch_size=500):
+        self.batch_size = batch_size
+        self.heap = []
+        self.fire_times = {}
+        self.synced_at = None
+
+    @property
+    def loaded(self):
+        return self.synced_at is not None
+
+    def schedule(self, todo, now=None):
+        """
+        할 일의 알림 시각 등록
+        시작했거나 이미 알림을 보낸 할 일은 등록하지 않음
+        """
+        now = now or timezone.now()
+        fire_at = get_fire_at(todo)
+        if fire_at is None or todo.start_at <= now or todo.reminded_at == fire_at:
+            self.unschedule(todo.id)
+            return
+        if self.fire_times.get(todo.id) == fire_at:
+            return
+        self.fire_times[todo.id] = fire_at
+        heapq.heappush(self.heap, (fire_at, todo.id))
+
+    def unschedule(self, todo_id):
+        """
+        힙의 항목은 꺼낼 때 버림
+        """
+        self.fire_times.pop(todo_id, None)
+
+    def load(self, now=None):
+        """
+        시작하지 않은 할 일로 힙 생성 (재시작 시 복구)
+        """
+        now = now or timezone.now()
+        self.heap = []
+        self.fire_times = {}
+        self.synced_at = now
+        todos = ToDo.objects.filter(
+            start_at__gt=now, alert_set__in=REMINDER_OFFSETS
+        ).only("id", "start_at", "alert_set", "reminded_at")
+        for todo in todos.iterator():
+            self.schedule(todo, now)
+        logger.info("할 일 알림 %d개 등록", len(self.fire_times))
+
+    def sync(self, now=None):
+        """
+        마지막 동기화 이후 다른 프로세스에서 변경된 할 일 반영
+        - updated_at은 커밋 전에 정해지므로, 마지막 동기화 후에 커밋된 변경도 반영되도록
+          TODO_REMINDER_SYNC_OVERLAP초 전부터 다시 조회
+        - 다시 조회한 할 일은 schedule()에서 (할 일 id, 알림 시각)이 같으면 무시하고,
+          이미 보낸 알림은 reminded_at으로 걸러냄
+        """
+        now = now or timezone.now()
+        synced_at, self.synced_at = self.synced_at, now
+        overlap = timedelta(seconds=settings.TODO_REMINDER_SYNC_OVERLAP)
+        todos = ToDo.objects.filter(updated_at__gte=synced_at - overlap).only(
+            "id", "start_at", "alert_set", "reminded_at"
+        )
+        for todo in todos.iterator():
+            self.schedule(todo, now)
+
+    def pop_due(self, now):
+        """
+        알림 시각이 된 할 일 id를 최대 batch_size개 꺼냄
+        """
+        todo_ids = []
+        while self.heap and self.heap[0][0] <= now and len(todo_ids) < self.batch_size:
+            fire_at, todo_id = heapq.heappop(self.heap)
+            if self.fire_times.get(todo_id) != fire_at:
+                continue
+            del self.fire_times[todo_id]
+            todo_ids.append(todo_id)
+        return todo_ids
+
+    def next_fire_at(self):
+        """
+        다음 알림 시각, 없으면 None
+        """
+        while self.heap and self.fire_times.get(self.heap[0][1]) != self.heap[0][0]:
+            heapq.heappop(self.heap)
+        return self.heap[0][0] if self.heap else None
+
+    def run(self, now=None):
+        """
+        변경된 할 일을 반영하고 알림 시각이 된 할 일의 알림 저장
+        반환값: 알림을 보낸 할 일 수
+        """
+        now = now or timezone.now()
+        if not self.loaded:
+            self.load(now)
+        else:
+            self.sync(now)
+
+        sent = 0
+        while True:
+            todo_ids = self.pop_due(now)
+            if not todo_ids:
+                return sent
+            sent += send_reminders(todo_ids, now)
+
+
+def send_reminders(todo_ids, now):
+    """
+    할 일 담당자에게 알림 저장
+    알림을 보내기 전에 reminded_at을 알림 시각으로 변경하며, 다른 프로세스가 먼저
+    변경했거나 할 일이 변경, 삭제된 경우 알림을 보내지 않음
+    반환값: 알림을 보낸 할 일 수
+    """
+    todos = ToDo.objects.filter(id__in=todo_ids, start_at__gt=now).only(
+        "id", "title", "start_at", "alert_set", "reminded_at"
+    )
+    assignees = {}
+    for todo_id, user_id in ToDoAssignee.objects.filter(
+        todo_id__in=todo_ids
+    ).values_list("todo_id", "assignee_id"):
+        assignees.setdefault(todo_id, []).append(user_id)
+
+    events = []
+    sent = 0
+    with transaction.atomic():
+        for todo in todos:
+            fire_at = get_fire_at(todo)
+            if fire_at is None or fire_at > now:
+                continue
+            claimed = (
+                ToDo.objects.filter(
+                    id=todo.id, start_at=todo.start_at, alert_set=todo.alert_set
+                )
+                .exclude(reminded_at=fire_at)
+                .update(reminded_at=fire_at)
+            )
+            if not claimed:
+                continue
+            sent += 1
+            label = REMINDER_OFFSETS[todo.alert_set][1]
+            url = reverse("todo_detail", args=[todo.id])
+            events.extend(
+                AlertEvent(
+                    user_id,
+                    "alert_todo",
+                    f"'{todo.title}' 할 일 시작 {label} 전입니다.",
+                    url,
+                )
+                for user_id in assignees.get(todo.id, [])
+            )
+        enqueue_alerts(events)
+    return sent
+
+
+reminder_scheduler = ReminderScheduler()
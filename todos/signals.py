@@ -0,0 +1,27 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import ToDo
+from .reminders import reminder_scheduler
+
+
+@receiver(post_save, sender=ToDo)
+def schedule_reminder(sender, instance, **kwargs):
+    """
+    할 일 생성, 수정 시 알림 시각 등록
+    알림 스케줄러를 실행 중인 프로세스에서만 처리하며, 커밋된 뒤 반영
+    """
+    if reminder_scheduler.loaded:
+        transaction.on_commit(partial(reminder_scheduler.schedule, instance))
+
+
+@receiver(post_delete, sender=ToDo)
+def unschedule_reminder(sender, instance, **kwargs):
+    """
+    할 일 삭제 시 알림 시각 삭제
+    """
+    if reminder_scheduler.loaded:
+        transaction.on_commit(partial(reminder_scheduler.unschedule, instance.id))
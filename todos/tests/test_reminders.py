@@ -0,0 +1,138 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from freezegun import freeze_time
+
+from alerts.models import Alert
+from todos.models import ToDo, ToDoAssignee
+from todos.reminders import ReminderScheduler, reminder_scheduler
+
+User = get_user_model()
+
+NOW = datetime(2024, 1, 10, 9, 0, tzinfo=dt_timezone.utc)
+
+
+@freeze_time(NOW)
+class ReminderSchedulerTest(TestCase):
+    def setUp(self):
+        self.user1 = User.objects.create_user(
+            email="test1@naver.com", password="test1", nickname="test1"
+        )
+        self.user2 = User.objects.create_user(
+            email="test2@naver.com", password="test2", nickname="test2"
+        )
+        self.todo = self.create_todo("회의", NOW + timedelta(hours=3), "1시간")
+        self.scheduler = ReminderScheduler()
+
+    def create_todo(self, title, start_at, alert_set):
+        todo = ToDo.objects.create(title=title, start_at=start_at, alert_set=alert_set)
+        for user in [self.user1, self.user2]:
+            ToDoAssignee.objects.create(todo=todo, assignee=user)
+        return todo
+
+    def run_at(self, moment, scheduler=None):
+        with freeze_time(moment), self.captureOnCommitCallbacks(execute=True):
+            return (scheduler or self.scheduler).run()
+
+    def test_send_at_fire_time(self):
+        """
+        알림 시각에 담당자에게 한 번만 알림
+        """
+        self.assertEqual(self.run_at(NOW), 0)
+        self.assertEqual(self.scheduler.next_fire_at(), NOW + timedelta(hours=2))
+        self.assertEqual(self.run_at(NOW + timedelta(hours=1, minutes=59)), 0)
+
+        self.assertEqual(self.run_at(NOW + timedelta(hours=2)), 1)
+        alerts = Alert.objects.filter(category="alert_todo")
+        self.assertEqual(
+            sorted(alerts.values_list("user_id", flat=True)),
+            [self.user1.id, self.user2.id],
+        )
+        self.assertEqual(alerts.first().content, "'회의' 할 일 시작 1시간 전입니다.")
+
+        self.assertEqual(self.run_at(NOW + timedelta(hours=2, minutes=1)), 0)
+        self.assertEqual(alerts.count(), 2)
+
+    def test_skip_without_alert_or_started(self):
+        """
+        알림 설정이 없거나 이미 시작한 할 일은 알리지 않음
+        """
+        self.create_todo("알림 없음", NOW + timedelta(hours=1), "없음")
+        self.create_todo("시작함", NOW - timedelta(minutes=1), "하루 전")
+        self.scheduler.load()
+        self.assertEqual(list(self.scheduler.fire_times), [self.todo.id])
+
+    def test_restart_recovery(self):
+        """
+        재시작 시 보낸 알림은 다시 보내지 않고, 꺼져 있는 동안 지난 알림은 바로 전송
+        """
+        self.run_at(NOW)
+        self.assertEqual(self.run_at(NOW + timedelta(hours=2)), 1)
+        missed = self.create_todo("놓친 알림", NOW + timedelta(hours=8), "6시간")
+
+        restarted = ReminderScheduler()
+        self.assertEqual(
+            self.run_at(NOW + timedelta(hours=3, minutes=-1), restarted), 1
+        )
+        self.assertEqual(
+            Alert.objects.filter(content__startswith="'놓친 알림'").count(), 2
+        )
+        missed.refresh_from_db()
+        self.assertEqual(missed.reminded_at, NOW + timedelta(hours=2))
+
+    def test_sync_changes_from_other_process(self):
+        """
+        스케줄러를 실행하지 않는 프로세스에서 변경한 할 일은 updated_at으로 반영
+        """
+        self.run_at(NOW)
+        with freeze_time(NOW + timedelta(minutes=1)):
+            ToDo.objects.filter(id=self.todo.id).update(
+                start_at=NOW + timedelta(days=2),
+                alert_set="하루 전",
+                updated_at=NOW + timedelta(minutes=1),
+            )
+        self.assertEqual(self.run_at(NOW + timedelta(hours=2)), 0)
+        self.assertEqual(self.scheduler.next_fire_at(), NOW + timedelta(days=1))
+        self.assertEqual(self.run_at(NOW + timedelta(days=1)), 1)
+        self.assertEqual(
+            Alert.objects.get(user=self.user1).content,
+            "'회의' 할 일 시작 하루 전입니다.",
+        )
+
+    def test_sync_late_commit(self):
+        """
+        동기화 후에 커밋되었지만 updated_at은 동기화 전인 할 일도 반영하고,
+        다시 조회해도 알림은 한 번만 전송
+        """
+        self.run_at(NOW)
+        late = self.create_todo("늦은 커밋", NOW + timedelta(hours=2), "1시간")
+        ToDo.objects.filter(id=late.id).update(updated_at=NOW - timedelta(seconds=10))
+
+        self.assertEqual(self.run_at(NOW + timedelta(seconds=30)), 0)
+        self.assertIn(late.id, self.scheduler.fire_times)
+        self.assertEqual(self.run_at(NOW + timedelta(hours=1)), 1)
+        self.assertEqual(self.run_at(NOW + timedelta(hours=1, minutes=1)), 0)
+        self.assertEqual(
+            Alert.objects.filter(content__startswith="'늦은 커밋'").count(), 2
+        )
+
+    def test_signals_update_loaded_scheduler(self):
+        """
+        스케줄러를 실행 중인 프로세스에서는 signals로 알림 시각 갱신
+        """
+        self.addCleanup(setattr, reminder_scheduler, "synced_at", None)
+        self.run_at(NOW, reminder_scheduler)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.todo.start_at = NOW + timedelta(hours=10)
+            self.todo.save()
+        self.assertEqual(
+            reminder_scheduler.fire_times[self.todo.id], NOW + timedelta(hours=9)
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            todo_id = self.todo.id
+            self.todo.delete()
+        self.assertNotIn(todo_id, reminder_scheduler.fire_times)
+        self.assertIsNone(reminder_scheduler.next_fire_at())
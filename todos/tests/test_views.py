@@ -3,11 +3,15 @@ from django.urls import reverse
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 
+from main.testing import QueryBudgetMixin
 from studies.models import Study, Category, StudyMember
 from todos.models import ToDo, ToDoAssignee
 
 User = get_user_model()
 
+# 할 일 리스트 화면의 쿼리 예산
+QUERY_BUDGET = 12
+
 
 class ToDoListTest(TestCase):
     """
@@ -876,3 +880,78 @@ class StudyToDoUpdateTest(TestCase):
         )
 
         self.assertEqual(response.context["form"].initial["assignees"], [2])
+
+
+class ToDoListQueryCountTest(QueryBudgetMixin, TestCase):
+    """
+    할 일 리스트 쿼리 수 테스트
+    할 일, 담당자, 스터디 멤버 수와 관계없이 쿼리 수가 일정한지 확인
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            nickname="testuser1", email="testuser1@example.com", password="test"
+        )
+        category = Category.objects.create(name="TestCategory")
+        self.study = Study.objects.create(
+            category=category,
+            goal="Test Goal",
+            start_at=timezone.now().date(),
+            end_at=timezone.now().date() + timezone.timedelta(days=7),
+            difficulty="상",
+            max_member=20,
+        )
+        StudyMember.objects.create(
+            study=self.study, user=self.user, is_accepted=True, is_manager=True
+        )
+        self.count = 0
+        self.create_todos()
+        self.client.force_login(self.user)
+
+    def create_todos(self):
+        """
+        새 스터디 멤버가 담당자인 스터디 할 일과 개인 할 일 생성
+        """
+        self.count += 1
+        member = User.objects.create_user(
+            nickname=f"member{self.count}",
+            email=f"member{self.count}@example.com",
+            password="test",
+        )
+        StudyMember.objects.create(study=self.study, user=member, is_accepted=True)
+        study_todo = ToDo.objects.create(
+            title=f"study {self.count}",
+            study=self.study,
+            start_at=timezone.now() + timezone.timedelta(days=1),
+        )
+        ToDoAssignee.objects.create(todo=study_todo, assignee=member)
+        ToDoAssignee.objects.create(todo=study_todo, assignee=self.user)
+        personal_todo = ToDo.objects.create(title=f"personal {self.count}")
+        ToDoAssignee.objects.create(todo=personal_todo, assignee=self.user)
+
+    def test_personal_todo_list_query_count(self):
+        """
+        개인 할 일 리스트 쿼리 수 테스트
+        """
+        self.assertQueryBudget(
+            reverse("personal_todo_list"), QUERY_BUDGET, grow=self.create_todos
+        )
+
+    def test_study_todo_list_query_count(self):
+        """
+        스터디 할 일 리스트 쿼리 수 테스트
+        """
+        response = self.assertQueryBudget(
+            reverse("study_todo_list") + f"?study={self.study.id}",
+            QUERY_BUDGET,
+            grow=self.create_todos,
+        )
+        self.assertEqual(len(response.context["todos"]), 6)
+
+    def test_first_study_todo_list_query_count(self):
+        """
+        스터디를 선택하지 않은 스터디 할 일 리스트 쿼리 수 테스트
+        """
+        self.assertQueryBudget(
+            reverse("study_todo_list"), QUERY_BUDGET, grow=self.create_todos
+        )
@@ -1,7 +1,7 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.views import redirect_to_login
 from django.core.exceptions import PermissionDenied
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
 from django.utils import timezone
 from django.shortcuts import redirect
 from django.views.generic import ListView
@@ -10,12 +10,25 @@ from django.views.generic.edit import CreateView, UpdateView, DeleteView
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 
 from .models import ToDo
+from alerts.delivery import alert_users
 from studies.models import Study, StudyMember
 from .forms import PersonalToDoForm, StudyToDoForm
 
 User = get_user_model()
 
 
+def alert_assignees(todo, user_ids, assigned_by):
+    """
+    새로 담당자로 지정된 유저에게 알림 (직접 지정한 유저 제외)
+    """
+    alert_users(
+        [user_id for user_id in user_ids if user_id != assigned_by.id],
+        "alert_todo",
+        f"'{todo.title}' 할 일의 담당자로 지정되었습니다.",
+        url=reverse("todo_detail", args=[todo.id]),
+    )
+
+
 class ToDoList(LoginRequiredMixin, ListView):
     """
     할 일 리스트
@@ -52,7 +65,7 @@ class PersonalToDoList(LoginRequiredMixin, ListView):
         # ToDoAssignee에 연결된 ToDo 목록 가져오기
         todos = ToDo.objects.filter(
             todo_assignees__assignee=self.request.user, study__isnull=True
-        )
+        ).with_card_data()
         return todos
 
     def get_context_data(self, **kwargs):
@@ -81,7 +94,7 @@ class StudyToDoList(LoginRequiredMixin, UserPassesTestMixin, ListView):
 
         # 스터디가 선택되지 않은 경우, 사용자가 속한 첫번째 스터디의 할 일을 가져옴
         if not study_id and user_studies.exists():
-            study = user_studies.first().study.id
+            study = user_studies.first().study_id
             todos = ToDo.objects.filter(study=study)
 
         # 스터디가 선택된 경우, 해당 스터디의 할 일을 가져옴
@@ -96,7 +109,7 @@ class StudyToDoList(LoginRequiredMixin, UserPassesTestMixin, ListView):
         if user_id and user_id != "all":
             todos = todos.filter(todo_assignees__assignee=user_id)
 
-        return todos
+        return todos.with_card_data()
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -110,7 +123,9 @@ class StudyToDoList(LoginRequiredMixin, UserPassesTestMixin, ListView):
                 study__id=study_id, start_at__isnull=False, start_at__gte=timezone.now()
             )[:3]
             context["members"] = {
-                selected_study: StudyMember.objects.filter(study=selected_study)
+                selected_study: StudyMember.objects.filter(
+                    study=selected_study
+                ).select_related("user")
             }
         else:
             first_study = context["studies"].first()
@@ -120,7 +135,9 @@ class StudyToDoList(LoginRequiredMixin, UserPassesTestMixin, ListView):
                 start_at__gte=timezone.now(),
             )[:3]
             context["members"] = {
-                first_study: StudyMember.objects.filter(study=first_study)
+                first_study: StudyMember.objects.filter(
+                    study=first_study
+                ).select_related("user")
             }
 
         return context
@@ -133,7 +150,7 @@ class StudyToDoList(LoginRequiredMixin, UserPassesTestMixin, ListView):
             study_id = StudyMember.objects.filter(user=self.request.user).first()
 
             if study_id is not None:
-                study_id = study_id.study.id
+                study_id = study_id.study_id
 
         # 현재 접근하려는 스터디에 대한 권한 확인
         return StudyMember.objects.filter(
@@ -209,6 +226,9 @@ class StudyToDoCreate(LoginRequiredMixin, UserPassesTestMixin, CreateView):
         assignees = form.cleaned_data.get("assignees")
         for assignee in assignees:
             todo.todo_assignees.create(assignee=assignee.user)
+        alert_assignees(
+            todo, [assignee.user_id for assignee in assignees], self.request.user
+        )
 
         return super().form_valid(form)
 
@@ -260,10 +280,22 @@ class StudyToDoUpdate(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
         todo.save()
 
         assignees = form.cleaned_data.get("assignees")
+        previous_assignee_ids = set(
+            todo.todo_assignees.values_list("assignee_id", flat=True)
+        )
         todo.todo_assignees.filter(todo=todo).delete()
 
         for assignee in assignees:
             todo.todo_assignees.create(assignee=assignee.user)
+        alert_assignees(
+            todo,
+            [
+                assignee.user_id
+                for assignee in assignees
+                if assignee.user_id not in previous_assignee_ids
+            ],
+            self.request.user,
+        )
 
         return super().form_valid(form)
 